@@ -1,3 +1,19 @@
 """shapeandshare.command.runner namespace"""
 
-from .manager import Manager
+from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily exposes the package API so that the command line does not pay for unused imports."""
+
+    if name == "Manager":
+        # pylint: disable=import-outside-toplevel
+        from .manager import Manager
+
+        return Manager
+    if name == "run_alias":
+        # pylint: disable=import-outside-toplevel
+        from .api import run_alias
+
+        return run_alias
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
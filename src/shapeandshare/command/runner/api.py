@@ -0,0 +1,22 @@
+""" Async Python API """
+
+from typing import Any, Optional
+
+from .manager import Manager
+
+
+async def run_alias(alias: str, base_path: Optional[str] = None, config_file: Optional[str] = None, **options: Any):
+    """
+    Runs an alias of a project without blocking the event loop, e.g.
+
+    >>> await asyncio.gather(*(run_alias("build", base_path=path, limiter=limiter) for path in repositories))
+
+    Parameters
+    ----------
+    alias: The alias (from [scripts]) to execute.
+    base_path: The project directory (holding the manager configuration), default: the current working directory.
+    config_file: The filename of the manager config file, default: ".sacrrc"
+    options: jobs, force, output, timeout, limiter and logs, as accepted by Manager.run_alias.
+    """
+
+    await Manager(config_file=config_file, base_path=base_path).run_alias(alias=alias, **options)
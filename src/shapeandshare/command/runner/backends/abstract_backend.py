@@ -1,14 +1,36 @@
 """ Backend Abstract Definition """
 
-import subprocess
+import logging
+import os
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+from ..cache.artifact_cache import ArtifactCache
+from ..cache.state_store import StateStore
+from ..common.utils import bench_argument_parser, run_argument_parser
 from ..contacts.dtos.backend_model import BackendModel
+from ..contacts.dtos.bench_parameters import BenchParameters
+from ..contacts.dtos.manager.logs_parameters import LogsParameters
+from ..contacts.dtos.run_parameters import RunParameters
+from ..contacts.errors.parse_error import ParseError
+from ..contacts.errors.regression_error import RegressionError
 from ..contacts.errors.subprocess_failure_error import SubprocessFailureError
 from ..contacts.errors.unknown_argument_error import UnknownArgumentError
-from ..contacts.errors.unknown_command_error import UnknownCommandError
+from ..contacts.output_type import OutputType
+from ..execution.benchmark import Benchmark
+from ..execution.job_graph import JobGraph
+from ..execution.matrix_report import MatrixReport
+from ..execution.scheduler import Scheduler
+from ..execution.step_recorder import StepRecorder
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from ..cache.remote_cache import RemoteCache
+    from ..cache.run_history import RunHistory
+    from ..execution.step_logs import StepLogs
+    from ..worker.worker_pool import WorkerPool
 
 
 class AbstractBackend(ABC):
@@ -69,36 +91,230 @@ class AbstractBackend(ABC):
         """
 
     @staticmethod
-    def _command_executor(commands: list[str], per_command_timeout: Optional[int] = None) -> None:
+    def _stores(
+        graph: JobGraph,
+        force: bool = False,
+        cache_size: Optional[int] = None,
+        root: Optional[Path] = None,
+        cache_remote: Optional[str] = None,
+    ) -> tuple[Optional[StateStore], Optional[ArtifactCache]]:
+        """
+        Opens the step state store and artifact cache for a run, when any of its commands declare inputs.
+
+        Parameters
+        ----------
+        graph: The job graph of commands to execute.
+        force: Run every command, ignoring the recorded state of prior runs and the artifact cache.
+        cache_size: The artifact cache size limit in bytes (0 disables the artifact cache).
+        root: The project directory, None for the current working directory.
+        cache_remote: The location of the remote cache shared with other machines (see RemoteCache), if any.
+
+        Returns
+        -------
+        The state store and artifact cache, either may be None.
+        """
+
+        state: Optional[StateStore] = None
+        artifacts: Optional[ArtifactCache] = None
+        if not force and any(job.inputs for job in graph.jobs):
+            state = StateStore(root=root)
+            if cache_size != 0:
+                remote: Optional["RemoteCache"] = None
+                if cache_remote:
+                    # http.client is only loaded by the runs sharing a remote cache.
+                    # pylint: disable=import-outside-toplevel
+                    from ..cache.remote_cache import RemoteCache
+
+                    try:
+                        remote = RemoteCache(url=cache_remote)
+                    except ValueError as error:
+                        raise ParseError(f"CacheParameters: field `remote`: {error}") from error
+                artifacts = ArtifactCache(max_size=cache_size, root=root, remote=remote)
+        return state, artifacts
+
+    @staticmethod
+    # pylint: disable=too-many-arguments,too-many-locals
+    def _command_executor(
+        graph: JobGraph,
+        per_command_timeout: Optional[int] = None,
+        jobs: int = 1,
+        force: bool = False,
+        cache_size: Optional[int] = None,
+        output: Optional[str] = None,
+        trace: Optional[str] = None,
+        recorder: Optional[StepRecorder] = None,
+        adaptive: bool = False,
+        workers: Optional[list[str]] = None,
+        logs: Optional[LogsParameters] = None,
+        cache_remote: Optional[str] = None,
+        root: Optional[Path] = None,
+    ) -> None:
         """
-        Handles command execution.
+        Handles command execution, recording the metrics of every step (see StepRecorder), within the run history too
+        (see RunHistory, which orders the steps of later runs), and summarizing the matrix cells of the run (see
+        MatrixReport).  Given workers, commands run on them (see WorkerPool) as many at once as their combined slots
+        allow, without the artifact cache (their outputs remain on the workers).  When capturing logs, the output of
+        every step is also written to a log file of its own (see StepLogs).
 
         Parameters
         ----------
-        commands: The list of commands to execute.
+        graph: The job graph of commands to execute.
         per_command_timeout: The per-command timeout threshold.
+        jobs: The maximum number of commands to run concurrently.
+        force: Run every command, ignoring the recorded state of prior runs and the artifact cache.
+        cache_size: The artifact cache size limit in bytes (0 disables the artifact cache).
+        output: How command output is presented (an OutputType value), by default prefixed when concurrent.
+        trace: Where to write a Chrome trace-event file of the run, if anywhere.
+        recorder: Records the metrics of every step, by default into the metrics log, the run history (and the trace,
+            if any).
+        adaptive: Admit commands as the load and memory of the machine allow (see AdmissionController).
+        workers: The addresses of the workers to run commands on, if any.
+        logs: The step log settings, if any.
+        cache_remote: The location of the remote cache shared with other machines, if any.
+        root: The project directory holding the state, caches, logs and history of runs, None for the current working
+            directory.
+        """
+
+        pool: Optional["WorkerPool"] = AbstractBackend._connect(graph=graph, workers=workers) if workers else None
+        if pool is not None:
+            jobs, adaptive, cache_size = pool.capacity, False, 0
+        state, artifacts = AbstractBackend._stores(
+            graph=graph, force=force, cache_size=cache_size, root=root, cache_remote=cache_remote
+        )
+        history: Optional["RunHistory"] = None
+        if recorder is None:
+            # sqlite3 and statistics are only loaded once a run is recorded, keeping the command line start up lean.
+            # pylint: disable=import-outside-toplevel
+            from ..cache.run_history import RunHistory
+
+            history = RunHistory(root=root)
+            recorder = StepRecorder(alias=graph.alias, trace=trace, root=root, history=history)
+        try:
+            Scheduler(
+                jobs=jobs,
+                per_command_timeout=per_command_timeout,
+                state=state,
+                artifacts=artifacts,
+                output=output,
+                recorder=recorder,
+                adaptive=adaptive,
+                workers=pool,
+                history=history,
+                logs=AbstractBackend._logs(run=recorder.run, logs=logs, root=root),
+            ).execute(graph=graph)
+        finally:
+            if pool is not None:
+                pool.close()
+            recorder.close()
+            if history is not None:
+                history.close()
+            if state is not None:
+                state.close()
+            if artifacts is not None:
+                artifacts.close()
+            if output != OutputType.QUIET:
+                MatrixReport.report(graph=graph, steps=recorder.steps)
+
+    @staticmethod
+    def _shard(graph: JobGraph, shard: tuple[int, int], quiet: bool = False, root: Optional[Path] = None) -> JobGraph:
+        """
+        Narrows a run to one of the shards of balanced expected duration it splits into (see ShardPlanner), balanced by
+        the run history, warning when steps lack a history (as machines may then split differently).
+
+        Parameters
+        ----------
+        graph: The job graph of the whole run.
+        shard: The shard to run (counted from 1) and the number of shards.
+        quiet: Whether to keep the summary of the shard to ourselves.
+        root: The project directory holding the run history, None for the current working directory.
+
+        Returns
+        -------
+        The job graph of the shard.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from ..cache.run_history import RunHistory
+        from ..execution.shard_planner import ShardPlanner
+
+        history: RunHistory = RunHistory(root=root)
+        try:
+            expected: dict[str, float] = history.expected(jobs=graph.jobs)
+        finally:
+            history.close()
+        planner: ShardPlanner = ShardPlanner(index=shard[0], count=shard[1])
+        narrowed: JobGraph = planner.split(graph=graph, expected=expected)
+        if not quiet:
+            print(planner.summary(size=f"{len(narrowed.jobs)} of {len(graph.jobs)} steps"), flush=True)
+        warning: Optional[str] = planner.warning()
+        if warning is not None:
+            logging.getLogger(__name__).warning(warning)
+        return narrowed
+
+    @staticmethod
+    def _logs(run: str, logs: Optional[LogsParameters], root: Optional[Path] = None) -> Optional["StepLogs"]:
+        """
+        Sets up the step logs of a run, when capturing them.
+
+        Parameters
+        ----------
+        run: The identifier of the run.
+        logs: The step log settings, if any.
+        root: The project directory, None for the current working directory.
+
+        Returns
+        -------
+        The step logs, None when not capturing them.
+        """
+
+        if logs is None or not logs.capture:
+            return None
+        # pylint: disable=import-outside-toplevel
+        from ..execution.step_logs import StepLogs
+
+        return StepLogs(run=run, compression=logs.compression, keep=logs.keep, root=root)
+
+    @staticmethod
+    def _connect(graph: JobGraph, workers: list[str]) -> "WorkerPool":
+        """
+        Connects to the workers of a distributed run.
+
+        Parameters
+        ----------
+        graph: The job graph of commands to execute.
+        workers: The addresses of the workers.
+
+        Returns
+        -------
+        The pool of reachable workers.
         """
 
-        # Command executor
-        for command in commands:
-            with subprocess.Popen(command, shell=True) as process:
-                print(f"> {command}")
-                try:
-                    process.wait(timeout=per_command_timeout)
-                except subprocess.TimeoutExpired as error:
-                    raise SubprocessFailureError(
-                        command=command, message=f"Exceeded timeout limit of {per_command_timeout}", returncode=1
-                    ) from error
-                if process.returncode != 0:
-                    if process.stdout:
-                        print(process.stdout)
-                    if process.stderr:
-                        print(process.stderr)
-                    raise SubprocessFailureError(
-                        command=command, message="command failed", returncode=process.returncode
-                    )
-
-    def run_command(self, arguments: list[str], per_command_timeout: Optional[int] = None) -> None:
+        # Sockets are only loaded for distributed runs, keeping the command line start up lean.
+        # pylint: disable=import-outside-toplevel
+        from ..worker.worker_pool import WorkerPool
+
+        try:
+            pool: WorkerPool = WorkerPool(addresses=workers)
+        except ValueError as error:
+            raise UnknownArgumentError(command="run", message=str(error)) from error
+        problems: list[str] = pool.connect()
+        for problem in problems:
+            print(f"Worker unavailable: {problem}", flush=True)
+        if not pool.capacity:
+            raise SubprocessFailureError(command=graph.alias, message="no worker is reachable", returncode=1)
+        return pool
+
+    # pylint: disable=too-many-arguments
+    def run_command(
+        self,
+        arguments: list[str],
+        per_command_timeout: Optional[int] = None,
+        jobs: Optional[int] = None,
+        cache_size: Optional[int] = None,
+        logs: Optional[LogsParameters] = None,
+        cache_remote: Optional[str] = None,
+        root: Optional[Path] = None,
+    ) -> None:
         """
         Run a command
 
@@ -106,13 +322,150 @@ class AbstractBackend(ABC):
         ----------
         arguments: The arguments to execute.
         per_command_timeout: The per-command time out threshold.
+        jobs: The default maximum number of concurrent commands (overridden by `-j N`).
+        cache_size: The artifact cache size limit in bytes (0 disables the artifact cache).
+        logs: The step log settings, if any.
+        cache_remote: The location of the remote cache shared with other machines, if any.
+        root: The project directory holding the state, caches, logs and history of runs (the input and output
+            patterns of commands are relative to it), None for the current working directory.
+        """
+
+        parameters: RunParameters = run_argument_parser(arguments=arguments, jobs=jobs)
+        graph: JobGraph = JobGraph.build(model=self.model, alias=parameters.alias)
+        if parameters.shard is not None:
+            graph = AbstractBackend._shard(
+                graph=graph, shard=parameters.shard, quiet=parameters.output == OutputType.QUIET, root=root
+            )
+            if not graph.jobs:
+                return
+        AbstractBackend._command_executor(
+            graph=graph,
+            per_command_timeout=per_command_timeout,
+            jobs=parameters.jobs,
+            force=parameters.force,
+            cache_size=cache_size,
+            output=parameters.output,
+            trace=parameters.trace,
+            adaptive=parameters.adaptive,
+            workers=parameters.workers,
+            logs=logs,
+            cache_remote=cache_remote,
+            root=root,
+        )
+
+    def bench_command(
+        self, arguments: list[str], per_command_timeout: Optional[int] = None, jobs: Optional[int] = None
+    ) -> None:
+        """
+        Benchmark a command (see Benchmark), every run ignores the recorded state of prior runs.  Results are saved
+        (by default to the results of the alias) unless that would replace the baseline they were compared against.
+
+        Parameters
+        ----------
+        arguments: The arguments to execute.
+        per_command_timeout: The per-command time out threshold.
+        jobs: The default maximum number of concurrent commands (overridden by `-j N`).
         """
 
-        if len(arguments) != 1:
-            raise UnknownArgumentError(command="run", message="Expected exactly 1 argument to run!")
-        if arguments[0] in self.model.scripts:
-            AbstractBackend._command_executor(
-                commands=self.model.scripts[arguments[0]], per_command_timeout=per_command_timeout
+        parameters: BenchParameters = bench_argument_parser(arguments=arguments, jobs=jobs)
+        graph: JobGraph = JobGraph.build(model=self.model, alias=parameters.alias)
+        benchmark: Benchmark = Benchmark(alias=parameters.alias, runs=parameters.runs, warmup=parameters.warmup)
+        summary: dict = benchmark.measure(
+            execute=lambda recorder: AbstractBackend._command_executor(
+                graph=graph,
+                per_command_timeout=per_command_timeout,
+                jobs=parameters.jobs,
+                force=True,
+                output=parameters.output or OutputType.QUIET,
+                recorder=recorder,
+                adaptive=parameters.adaptive,
             )
+        )
+
+        baseline: Optional[dict] = None
+        if parameters.baseline is not None:
+            if Path(parameters.baseline).is_file():
+                baseline = Benchmark.load(path=Path(parameters.baseline))
+            else:
+                print(f"No baseline found at {parameters.baseline}")
+        threshold: float = Benchmark.DEFAULT_THRESHOLD if parameters.threshold is None else parameters.threshold
+        regressions: list[str] = benchmark.report(summary=summary, baseline=baseline, threshold=threshold)
+        save: Path = Path(parameters.save) if parameters.save else Benchmark.DEFAULT_DIRECTORY / f"{graph.alias}.json"
+        if not parameters.save and baseline is not None and save.resolve() == Path(parameters.baseline).resolve():
+            # The baseline only moves when asked to, so a regressed run cannot become the new baseline.
+            print(f"Results not saved over the baseline {save.as_posix()} (use --save to replace it)")
         else:
-            raise UnknownCommandError(f"Unknown command {arguments[0]} in [scripts]")
+            benchmark.save(path=save, summary=summary)
+            print(f"Results saved to {save.as_posix()}")
+        if regressions:
+            raise RegressionError(f"Regressed by more than {threshold}%: {', '.join(regressions)}")
+
+    # pylint: disable=too-many-arguments,too-many-locals
+    async def run_alias(
+        self,
+        alias: str,
+        per_command_timeout: Optional[int] = None,
+        jobs: Optional[int] = None,
+        force: bool = False,
+        cache_size: Optional[int] = None,
+        output: Optional[str] = None,
+        timeout: Optional[float] = None,
+        limiter: Optional["asyncio.Semaphore"] = None,
+        cwd: Optional[Path] = None,
+        scope: Optional[str] = None,
+        logs: Optional[LogsParameters] = None,
+        cache_remote: Optional[str] = None,
+    ) -> None:
+        """
+        Run an alias on the running event loop (see AsyncScheduler).
+
+        Parameters
+        ----------
+        alias: The alias (from [scripts]) to execute.
+        per_command_timeout: The per-command time out threshold.
+        jobs: The maximum number of concurrent commands of this run, by default the cpu count.
+        force: Run every command, ignoring the recorded state of prior runs and the artifact cache.
+        cache_size: The artifact cache size limit in bytes (0 disables the artifact cache).
+        output: How command output is presented (an OutputType value), by default prefixed when concurrent.
+        timeout: The maximum duration (in seconds) of the whole run.
+        limiter: A semaphore shared between runs bounding their combined concurrency, if any.
+        cwd: The project directory commands run within, None for the current working directory.
+        scope: Qualifies the job names within prefixed output (e.g. the workspace package), if any.
+        logs: The step log settings (see StepLogs), if any.
+        cache_remote: The location of the remote cache shared with other machines (see RemoteCache), if any.
+        """
+
+        # asyncio is only loaded by API callers, keeping the command line start up lean.
+        # pylint: disable=import-outside-toplevel
+        from ..cache.run_history import RunHistory
+        from ..execution.async_scheduler import AsyncScheduler
+
+        graph: JobGraph = JobGraph.build(model=self.model, alias=alias)
+        state, artifacts = AbstractBackend._stores(
+            graph=graph, force=force, cache_size=cache_size, root=cwd, cache_remote=cache_remote
+        )
+        history: RunHistory = RunHistory(root=cwd)
+        recorder: StepRecorder = StepRecorder(alias=alias, root=cwd, history=history)
+        try:
+            await AsyncScheduler(
+                jobs=jobs or os.cpu_count() or 1,
+                per_command_timeout=per_command_timeout,
+                state=state,
+                artifacts=artifacts,
+                output=output,
+                cwd=cwd.as_posix() if cwd is not None else None,
+                limiter=limiter,
+                recorder=recorder,
+                scope=scope,
+                history=history,
+                logs=AbstractBackend._logs(run=recorder.run, logs=logs, root=cwd),
+            ).execute(graph=graph, timeout=timeout)
+        finally:
+            recorder.close()
+            history.close()
+            if state is not None:
+                state.close()
+            if artifacts is not None:
+                artifacts.close()
+            if output != OutputType.QUIET:
+                MatrixReport.report(graph=graph, steps=recorder.steps)
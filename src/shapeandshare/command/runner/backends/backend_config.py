@@ -4,6 +4,7 @@ import configparser
 import json
 from typing import Optional, Union
 
+from ..cache.config_cache import ConfigCache
 from ..common.utils import init_environment_argument_parser
 from ..contacts.dtos.backend_model import BackendModel
 from .abstract_backend import AbstractBackend
@@ -24,7 +25,7 @@ class BackendConfig(AbstractBackend):
 
     def __init__(self, config_file: Optional[str] = None, base_path: Optional[str] = None):
         super().__init__(config_file=config_file, base_path=base_path)
-        self.model = self._load_config()
+        self.model = ConfigCache(namespace=type(self).__name__).load(source=self.conf, loader=self._load_config)
 
     def init_environment(self, arguments: list[str]) -> None:
         force: bool = init_environment_argument_parser(arguments=arguments)
@@ -1,23 +1,26 @@
 """ Backend Factory Definition"""
 
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
-from ..backends.backend_config import BackendConfig
-from ..backends.backend_package import BackendPackage
 from ..contacts.backend_type import BackendType
 
+if TYPE_CHECKING:
+    from ..backends.backend_config import BackendConfig
+    from ..backends.backend_package import BackendPackage
+
 
 # pylint: disable=too-few-public-methods
 class BackendFactory:
     """
     Backend Factory
     Factory class for the creation of backends.
+    Backends are imported on demand so that only the requested backend is loaded.
     """
 
     @staticmethod
     def build(
         backend_type: BackendType, config_file: Optional[str] = None, base_path: Optional[str] = None
-    ) -> Union[BackendConfig, BackendPackage]:
+    ) -> Union["BackendConfig", "BackendPackage"]:
         """
         Our factory entry point
         Given the provided backend type and parameters will instantiate and return the result.
@@ -33,6 +36,11 @@ class BackendFactory:
         The requested backend.
         """
 
+        # pylint: disable=import-outside-toplevel
         if backend_type == BackendType.CONFIG:
+            from ..backends.backend_config import BackendConfig
+
             return BackendConfig(config_file=config_file, base_path=base_path)
+        from ..backends.backend_package import BackendPackage
+
         return BackendPackage(config_file=config_file, base_path=base_path)
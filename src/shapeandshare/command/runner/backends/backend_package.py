@@ -1,8 +1,11 @@
 """ NPM package.json Config File Backend"""
 
-from typing import Optional
+import json
+from typing import Any, Optional
 
+from ..cache.config_cache import ConfigCache
 from ..contacts.dtos.backend_model import BackendModel
+from ..contacts.errors.parse_error import ParseError
 from ..contacts.errors.unknown_argument_error import UnknownArgumentError
 from .abstract_backend import AbstractBackend
 
@@ -16,13 +19,46 @@ class BackendPackage(AbstractBackend):
     ----------
     DEFAULT_CONFIG_FILE
         The default config file, default: "package.json"
+    DEPENDENCY_FIELDS
+        The fields listing the packages a package depends on, considered for workspace ordering.
     """
 
     DEFAULT_CONFIG_FILE: str = "package.json"
+    DEPENDENCY_FIELDS: tuple[str, ...] = (
+        "dependencies",
+        "devDependencies",
+        "peerDependencies",
+        "optionalDependencies",
+    )
 
     def __init__(self, config_file: Optional[str] = None, base_path: Optional[str] = None):
         super().__init__(config_file=config_file, base_path=base_path)
-        self.model = BackendModel.parse_file(self.conf.resolve().as_posix())
+        self.model = ConfigCache(namespace=type(self).__name__).load(source=self.conf, loader=self._load_config)
+
+    def _load_config(self) -> BackendModel:
+        """
+        Builds the Backend Model from package.json, its name and dependencies describing it within a workspace.
+
+        Returns
+        -------
+        The Backend Model DTO.
+        """
+
+        path: str = self.conf.resolve().as_posix()
+        with open(path, mode="r", encoding="utf-8") as file:
+            try:
+                document: Any = json.load(file)
+            except json.JSONDecodeError as error:
+                raise ParseError(f"{BackendModel.__name__}: unable to parse {path}: {error}") from error
+        model: BackendModel = BackendModel.parse_obj(document)
+        depends: set[str] = set()
+        for field in BackendPackage.DEPENDENCY_FIELDS:
+            if isinstance(document.get(field), dict):
+                depends.update(document[field])
+        model.workspace = {"depends": sorted(depends)}
+        if isinstance(document.get("name"), str):
+            model.workspace["name"] = document["name"]
+        return model
 
     def init_environment(self, arguments: list[str]) -> None:
         if len(arguments) > 0:
@@ -0,0 +1,399 @@
+""" Local Artifact Cache Definition """
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, BinaryIO, Optional
+
+from .state_store import StateStore
+
+if TYPE_CHECKING:
+    from .remote_cache import RemoteCache
+
+
+class ArtifactCache:
+    """
+    Local Artifact Cache
+    A content-addressed store of the declared outputs and captured stdout/stderr of successful jobs.
+
+    Blobs are stored once by content hash under `objects/`, and each job fingerprint has a json manifest under
+    `entries/` listing the output files (path, mode, blob) and the log blobs.  Manifests are touched on every hit and
+    the least recently used entries are evicted (along with any blob no longer referenced) once the blobs exceed
+    the size limit.  The blobs are only measured on the first store (and whenever evicting), after which their total
+    size is kept as blobs are added, so that storing a run does not stat the whole cache.
+
+    Given a remote cache (see RemoteCache), local misses are looked up remotely, fetching the manifest and whichever
+    of its blobs are not stored locally, and stored runs are pushed to it, uploading only the blobs it lacks before
+    publishing the manifest.  The remote cache is best effort: once it fails, the run carries on with the local cache.
+
+    Attributes
+    ----------
+    path
+        The cache location.
+    root
+        The project directory output paths are relative to, None for the current working directory.
+    max_size
+        The maximum total size of the stored blobs in bytes.
+    remote
+        The shared cache runs are also looked up within and pushed to, if any.
+    DEFAULT_PATH
+        The default cache location (within the project root), default: Path(".sacr/artifacts")
+    DEFAULT_MAX_SIZE
+        The default size limit, default: 2 GiB
+    DIGEST
+        The form of blob digests (sha256, in hex).
+    """
+
+    path: Path
+    root: Optional[Path]
+    max_size: int
+    remote: Optional["RemoteCache"]
+    DEFAULT_PATH: Path = Path(".sacr") / "artifacts"
+    DEFAULT_MAX_SIZE: int = 2 * 1024**3
+    DIGEST: re.Pattern = re.compile(r"[0-9a-f]{64}")
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_size: Optional[int] = None,
+        root: Optional[Path] = None,
+        remote: Optional["RemoteCache"] = None,
+    ):
+        self.root = root
+        self.remote = remote
+        if path is None:
+            path = self.DEFAULT_PATH if root is None else root / self.DEFAULT_PATH
+        self.path = path
+        self.max_size = max_size if max_size is not None else self.DEFAULT_MAX_SIZE
+        self._lock: threading.Lock = threading.Lock()
+        self._size: Optional[int] = None
+        for directory in ("objects", "entries", "tmp"):
+            (self.path / directory).mkdir(parents=True, exist_ok=True)
+
+    def _blob_path(self, digest: str) -> Path:
+        """Location of a blob."""
+
+        return self.path / "objects" / digest[:2] / digest[2:]
+
+    def _entry_path(self, key: str) -> Path:
+        """Location of the manifest of a job fingerprint."""
+
+        return self.path / "entries" / f"{key}.json"
+
+    def temporary_file(self) -> BinaryIO:
+        """
+        Opens an anonymous scratch file within the cache (on the same file system as the blobs).
+
+        Returns
+        -------
+        The open binary file.
+        """
+
+        # pylint: disable=consider-using-with
+        return tempfile.TemporaryFile(dir=self.path / "tmp")
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """
+        Finds the manifest of a cached job run.
+
+        Parameters
+        ----------
+        key: The job fingerprint.
+
+        Returns
+        -------
+        The manifest, or None on a cache miss.
+        """
+
+        try:
+            with open(self._entry_path(key=key), mode="r", encoding="utf-8") as file:
+                manifest: Optional[dict] = json.load(file)
+        except (OSError, ValueError):
+            manifest = None
+        if manifest is not None and all(
+            self._blob_path(digest=digest).is_file() for digest in ArtifactCache._blobs(manifest=manifest)
+        ):
+            return manifest
+        return self._pull(key=key)
+
+    def close(self) -> None:
+        """Closes the connections to the remote cache, if any."""
+
+        if self.remote is not None:
+            self.remote.close()
+
+    def restore(self, key: str, manifest: Optional[dict] = None) -> bool:
+        """
+        Restores the outputs of a cached job run (its output is replayed by the scheduler, see logs).
+
+        Parameters
+        ----------
+        key: The job fingerprint.
+        manifest: The manifest of the job run, when already looked up.
+
+        Returns
+        -------
+        True on a cache hit, False otherwise.
+        """
+
+        if manifest is None:
+            manifest = self.lookup(key=key)
+        if manifest is None:
+            return False
+        for item in manifest["files"]:
+            target: Path = Path(StateStore.locate(file=item["path"], root=self.root))
+            target.parent.mkdir(parents=True, exist_ok=True)
+            temporary: Path = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.sacr")
+            shutil.copyfile(self._blob_path(digest=item["blob"]), temporary)
+            os.chmod(temporary, item["mode"])
+            os.replace(temporary, target)
+        os.utime(self._entry_path(key=key))
+        return True
+
+    def logs(self, manifest: dict) -> list[Path]:
+        """
+        The captured output of a cached job run.
+
+        Parameters
+        ----------
+        manifest: The manifest of the job run.
+
+        Returns
+        -------
+        The blobs holding its stdout and stderr.
+        """
+
+        return [self._blob_path(digest=manifest["stdout"]), self._blob_path(digest=manifest["stderr"])]
+
+    def store(self, key: str, outputs: list[str], stdout: BinaryIO, stderr: BinaryIO) -> None:
+        """
+        Stores the outputs and logs of a successful job run.
+
+        Parameters
+        ----------
+        key: The job fingerprint.
+        outputs: The declared output glob patterns.
+        stdout: The captured standard output.
+        stderr: The captured standard error.
+        """
+
+        files: list[dict] = []
+        for file in StateStore.expand(patterns=outputs, root=self.root):
+            location: str = StateStore.locate(file=file, root=self.root)
+            with open(location, mode="rb") as handle:
+                files.append(
+                    {"path": file, "mode": os.stat(location).st_mode & 0o7777, "blob": self._put(source=handle)}
+                )
+        stdout.seek(0)
+        stderr.seek(0)
+        manifest: dict = {
+            "files": files,
+            "stdout": self._put(source=stdout),
+            "stderr": self._put(source=stderr),
+            "created": time.time(),
+        }
+
+        self._write_entry(key=key, manifest=manifest)
+        self._push(key=key, manifest=manifest)
+        self.evict()
+
+    def _write_entry(self, key: str, manifest: dict) -> None:
+        """
+        Writes the manifest of a job fingerprint.
+
+        Parameters
+        ----------
+        key: The job fingerprint.
+        manifest: The manifest.
+        """
+
+        entry_path: Path = self._entry_path(key=key)
+        temporary: Path = entry_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temporary, mode="w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+        os.replace(temporary, entry_path)
+
+    def _pull(self, key: str) -> Optional[dict]:
+        """
+        Looks up a job fingerprint within the remote cache, downloading the blobs of its manifest which are not stored
+        locally.
+
+        Parameters
+        ----------
+        key: The job fingerprint.
+
+        Returns
+        -------
+        The manifest (now stored locally), or None on a miss.
+        """
+
+        remote: Optional["RemoteCache"] = self.remote
+        if remote is None:
+            return None
+        try:
+            manifest: Optional[dict] = remote.entry(key=key)
+            if manifest is None:
+                return None
+            ArtifactCache._verify(manifest=manifest)
+            blobs: dict[str, Path] = {
+                digest: self._blob_path(digest=digest)
+                for digest in ArtifactCache._blobs(manifest=manifest)
+                if not self._blob_path(digest=digest).is_file()
+            }
+            remote.download(blobs=blobs, scratch=self.path / "tmp")
+            self._grow(size=sum(path.stat().st_size for path in blobs.values()))
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            self._disable_remote(error=error)
+            return None
+        self._write_entry(key=key, manifest=manifest)
+        return manifest
+
+    def _push(self, key: str, manifest: dict) -> None:
+        """
+        Pushes a stored job run to the remote cache: uploading the blobs it lacks, then publishing the manifest.
+
+        Parameters
+        ----------
+        key: The job fingerprint.
+        manifest: The manifest.
+        """
+
+        remote: Optional["RemoteCache"] = self.remote
+        if remote is None:
+            return
+        try:
+            missing: set[str] = remote.missing(digests=sorted(ArtifactCache._blobs(manifest=manifest)))
+            remote.upload(blobs={digest: self._blob_path(digest=digest) for digest in missing})
+            remote.publish(key=key, manifest=manifest)
+        except (OSError, ValueError) as error:
+            self._disable_remote(error=error)
+
+    def _disable_remote(self, error: BaseException) -> None:
+        """
+        Stops using the remote cache for the rest of the run, as it failed.
+
+        Parameters
+        ----------
+        error: How it failed.
+        """
+
+        remote: Optional["RemoteCache"] = self.remote
+        self.remote = None
+        if remote is not None:
+            logging.getLogger(__name__).warning("[SKIPPING] Remote cache %s unavailable: %s", remote.url, error)
+            remote.close()
+
+    def _put(self, source: BinaryIO) -> str:
+        """
+        Stores a blob, streaming it from the source.
+
+        Parameters
+        ----------
+        source: The open binary source.
+
+        Returns
+        -------
+        The blob digest.
+        """
+
+        hasher = hashlib.sha256()
+        with self.temporary_file() as scratch:
+            for block in iter(lambda: source.read(1024 * 1024), b""):
+                hasher.update(block)
+                scratch.write(block)
+            digest: str = hasher.hexdigest()
+            blob_path: Path = self._blob_path(digest=digest)
+            if not blob_path.exists():
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                temporary: Path = blob_path.with_name(f"{blob_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                scratch.seek(0)
+                with open(temporary, mode="wb") as file:
+                    shutil.copyfileobj(scratch, file)
+                    self._grow(size=file.tell())
+                os.replace(temporary, blob_path)
+        return digest
+
+    def _grow(self, size: int) -> None:
+        """
+        Accounts for blobs added to the cache.
+
+        Parameters
+        ----------
+        size: Their size in bytes.
+        """
+
+        with self._lock:
+            if self._size is not None:
+                self._size += size
+
+    def evict(self) -> None:
+        """Evicts the least recently used entries until the stored blobs fit within the size limit."""
+
+        with self._lock:
+            if self._size is not None and self._size <= self.max_size:
+                return
+            blobs: dict[str, int] = {}
+            for prefix in os.scandir(self.path / "objects"):
+                for blob in os.scandir(prefix.path):
+                    blobs[prefix.name + blob.name] = blob.stat().st_size
+            total: int = sum(blobs.values())
+            self._size = total
+            if total <= self.max_size:
+                return
+
+            entries: list[tuple[float, Path, dict]] = []
+            for entry in os.scandir(self.path / "entries"):
+                try:
+                    with open(entry.path, mode="r", encoding="utf-8") as file:
+                        entries.append((entry.stat().st_mtime, Path(entry.path), json.load(file)))
+                except (OSError, ValueError):
+                    continue
+            entries.sort(key=lambda item: item[0])
+
+            referenced: dict[str, int] = {}
+            for _, _, manifest in entries:
+                for digest in ArtifactCache._blobs(manifest=manifest):
+                    referenced[digest] = referenced.get(digest, 0) + 1
+
+            for _, entry_path, manifest in entries:
+                if total <= self.max_size:
+                    break
+                entry_path.unlink(missing_ok=True)
+                for digest in ArtifactCache._blobs(manifest=manifest):
+                    referenced[digest] -= 1
+                    if referenced[digest] == 0 and digest in blobs:
+                        self._blob_path(digest=digest).unlink(missing_ok=True)
+                        total -= blobs.pop(digest)
+            self._size = total
+            logging.getLogger(__name__).debug("Artifact cache evicted down to %s bytes", total)
+
+    @staticmethod
+    def _verify(manifest: dict) -> None:
+        """
+        Checks a manifest received from the remote cache only references blobs by digest and files within the project.
+
+        Parameters
+        ----------
+        manifest: The manifest.
+        """
+
+        for digest in ArtifactCache._blobs(manifest=manifest):
+            if not ArtifactCache.DIGEST.fullmatch(digest):
+                raise ValueError(f"Invalid blob digest `{digest}` within a remote manifest")
+        for item in manifest["files"]:
+            path: PurePosixPath = PurePosixPath(item["path"])
+            if path.is_absolute() or ".." in path.parts or not isinstance(item["mode"], int):
+                raise ValueError(f"Unsafe output `{item['path']}` within a remote manifest")
+
+    @staticmethod
+    def _blobs(manifest: dict) -> set[str]:
+        """The blobs referenced by a manifest."""
+
+        return {item["blob"] for item in manifest["files"]} | {manifest["stdout"], manifest["stderr"]}
@@ -0,0 +1,287 @@
+""" Cache Request Handler Definition """
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import re
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from .cache_server import CacheServer
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    """
+    Cache Request Handler
+    Serves a request of the remote artifact cache protocol (see RemoteCache) from the folder of its CacheServer.
+    Uploads are streamed into a scratch file while being hashed and only moved into place once their digest checks
+    out, so partial or corrupt uploads are never served.  Blobs are sent with socket.sendfile (within the kernel).
+
+    Attributes
+    ----------
+    BLOCK_SIZE
+        The size of the chunks uploads are received in, default: 1 MiB
+    MAX_DOCUMENT
+        The largest manifest or digest list accepted, default: 16 MiB
+    NAME
+        The form of blob digests and step fingerprints (sha256, in hex).
+    """
+
+    server: "CacheServer"
+    protocol_version: str = "HTTP/1.1"
+    BLOCK_SIZE: int = 1024 * 1024
+    MAX_DOCUMENT: int = 16 * 1024 * 1024
+    NAME: re.Pattern = re.compile(r"/(blobs|entries)/([0-9a-f]{64})")
+
+    def do_HEAD(self) -> None:  # pylint: disable=invalid-name
+        """Reports whether a blob or manifest is stored."""
+
+        self._fetch(send=False)
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Sends a blob or manifest."""
+
+        self._fetch(send=True)
+
+    def do_PUT(self) -> None:  # pylint: disable=invalid-name
+        """Stores a blob or manifest."""
+
+        target: Optional[tuple[str, str]] = self._target()
+        if target is None:
+            return
+        length: Optional[int] = self._length(limit=None if target[0] == "blobs" else self.MAX_DOCUMENT)
+        if length is None:
+            return
+        if target[0] == "blobs":
+            self._store_blob(digest=target[1], length=length)
+            return
+        try:
+            manifest: dict = json.loads(self.rfile.read(length))
+            if not isinstance(manifest, dict):
+                raise ValueError("not an object")
+        except ValueError as error:
+            self._reply(status=400, document={"error": f"invalid manifest: {error}"})
+            return
+        self._place(path=self.server.entry(key=target[1]), data=json.dumps(manifest).encode("utf-8"))
+        self._reply(status=201)
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Answers which of the listed blobs are not stored (`/blobs/missing`)."""
+
+        if not self._authorized():
+            return
+        if self.path != "/blobs/missing":
+            self._reply(status=404, close=True)
+            return
+        length: Optional[int] = self._length(limit=self.MAX_DOCUMENT)
+        if length is None:
+            return
+        try:
+            digests: list = json.loads(self.rfile.read(length))
+            if not isinstance(digests, list) or not all(
+                isinstance(digest, str) and self.NAME.fullmatch(f"/blobs/{digest}") for digest in digests
+            ):
+                raise ValueError("expected a list of sha256 digests")
+        except ValueError as error:
+            self._reply(status=400, document={"error": str(error)})
+            return
+        self._reply(
+            status=200, document=[digest for digest in digests if not self.server.blob(digest=digest).is_file()]
+        )
+
+    def log_message(self, format: str, *args) -> None:  # pylint: disable=redefined-builtin
+        """Logs requests at debug level rather than to stderr."""
+
+        logging.getLogger(__name__).debug("%s %s", self.address_string(), format % args)
+
+    def _fetch(self, send: bool) -> None:
+        """
+        Answers a GET or HEAD of a blob or manifest.
+
+        Parameters
+        ----------
+        send: Whether to send the content (GET) or only report it (HEAD).
+        """
+
+        target: Optional[tuple[str, str]] = self._target()
+        if target is None:
+            return
+        kind, name = target
+        path: Path = self.server.blob(digest=name) if kind == "blobs" else self.server.entry(key=name)
+        try:
+            file = open(path, mode="rb")  # pylint: disable=consider-using-with
+        except OSError:
+            self._reply(status=404)
+            return
+        with file:
+            size: int = os.fstat(file.fileno()).st_size
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream" if kind == "blobs" else "application/json")
+            self.send_header("Content-Length", str(size))
+            self.end_headers()
+            if send:
+                self.connection.sendfile(file)
+                if kind == "entries":
+                    os.utime(path)
+        self.server.served += 1
+
+    def _store_blob(self, digest: str, length: int) -> None:
+        """
+        Receives a blob, verifying its digest.
+
+        Parameters
+        ----------
+        digest: The digest the blob is stored under.
+        length: The size of the blob.
+        """
+
+        target: Path = self.server.blob(digest=digest)
+        if target.is_file():
+            self._receive(length=length)
+            self._reply(status=200)
+            return
+        hasher = hashlib.sha256()
+        scratch: Path = self.server.scratch(name=digest)
+        try:
+            with open(scratch, mode="wb") as file:
+
+                def sink(chunk: bytes) -> None:
+                    hasher.update(chunk)
+                    file.write(chunk)
+
+                received: int = self._receive(length=length, sink=sink)
+            if received != length:
+                self.close_connection = True
+                return
+            if hasher.hexdigest() != digest:
+                self._reply(status=400, document={"error": "the content does not match the digest"})
+                return
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(scratch, target)
+        finally:
+            scratch.unlink(missing_ok=True)
+        self._reply(status=201)
+
+    def _receive(self, length: int, sink: Optional[Callable[[bytes], None]] = None) -> int:
+        """
+        Reads the request body in chunks.
+
+        Parameters
+        ----------
+        length: The size of the body.
+        sink: Receives each chunk, if anything (otherwise the body is discarded).
+
+        Returns
+        -------
+        The number of bytes received (short of the length should the client go away).
+        """
+
+        received: int = 0
+        while received < length:
+            chunk: bytes = self.rfile.read(min(self.BLOCK_SIZE, length - received))
+            if not chunk:
+                break
+            if sink is not None:
+                sink(chunk)
+            received += len(chunk)
+        return received
+
+    def _place(self, path: Path, data: bytes) -> None:
+        """
+        Writes a file atomically.
+
+        Parameters
+        ----------
+        path: The file.
+        data: The content.
+        """
+
+        scratch: Path = self.server.scratch(name=path.name)
+        try:
+            scratch.write_bytes(data)
+            os.replace(scratch, path)
+        finally:
+            scratch.unlink(missing_ok=True)
+
+    def _target(self) -> Optional[tuple[str, str]]:
+        """
+        Authorizes the request and parses its path, answering it when either fails.
+
+        Returns
+        -------
+        The kind (`blobs` or `entries`) and name of what the request targets, None when already answered.
+        """
+
+        if not self._authorized():
+            return None
+        match: Optional[re.Match] = self.NAME.fullmatch(self.path)
+        if match is None:
+            self._reply(status=404, close=True)
+            return None
+        return match.group(1), match.group(2)
+
+    def _authorized(self) -> bool:
+        """
+        Checks the request presents the token of the server (when it has one), answering it when not.
+
+        Returns
+        -------
+        Whether the request may proceed.
+        """
+
+        if self.server.token is None:
+            return True
+        presented: str = self.headers.get("Authorization", "")
+        if hmac.compare_digest(presented.encode("utf-8"), f"Bearer {self.server.token}".encode("utf-8")):
+            return True
+        self._reply(status=401, document={"error": "invalid token"}, close=True)
+        return False
+
+    def _length(self, limit: Optional[int]) -> Optional[int]:
+        """
+        The size of the request body, answering the request when it is missing or too large.
+
+        Parameters
+        ----------
+        limit: The largest size accepted, if any.
+
+        Returns
+        -------
+        The size, None when already answered.
+        """
+
+        value: Optional[str] = self.headers.get("Content-Length")
+        if value is None or not value.isdigit():
+            self._reply(status=411, close=True)
+            return None
+        if limit is not None and int(value) > limit:
+            self._reply(status=413, close=True)
+            return None
+        return int(value)
+
+    def _reply(self, status: int, document=None, close: bool = False) -> None:
+        """
+        Answers the request.
+
+        Parameters
+        ----------
+        status: The response status.
+        document: The json body of the response, if any.
+        close: Close the connection afterwards (when the request body was not read).
+        """
+
+        body: bytes = json.dumps(document).encode("utf-8") if document is not None else b""
+        if close:
+            self.close_connection = True
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if close:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.served += 1
@@ -0,0 +1,133 @@
+""" Cache Server Definition """
+
+import os
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Optional
+
+from .cache_request_handler import CacheRequestHandler
+from .remote_cache import RemoteCache
+
+
+class CacheServer(ThreadingHTTPServer):
+    """
+    Cache Server
+    The reference implementation of the remote artifact cache protocol (see RemoteCache), `sacr cache-server`: blobs
+    and manifests are stored within a local folder laid out as the local artifact cache (`objects/ab/cdef...` and
+    `entries/<fingerprint>.json`).  Requests are served on a thread each over keep-alive connections (see
+    CacheRequestHandler).  Nothing is evicted, manifests are touched whenever fetched so that the least recently used
+    can be pruned externally (e.g. `find entries -atime +30`).
+
+    Attributes
+    ----------
+    path
+        The folder the blobs and manifests are stored within.
+    token
+        The shared secret clients must present, if any.
+    served
+        The number of requests served.
+    DEFAULT_HOST
+        The host of addresses given as a port alone, default: "127.0.0.1"
+    DEFAULT_PATH
+        The default storage folder (within the project root), default: Path(".sacr/cache-server")
+    """
+
+    path: Path
+    token: Optional[str]
+    served: int
+    DEFAULT_HOST: str = "127.0.0.1"
+    DEFAULT_PATH: Path = Path(".sacr") / "cache-server"
+    daemon_threads: bool = True
+
+    def __init__(self, address: str, path: Path, token: Optional[str] = None):
+        self.path = path
+        self.token = token
+        self.served = 0
+        for directory in ("objects", "entries", "tmp"):
+            (self.path / directory).mkdir(parents=True, exist_ok=True)
+        super().__init__(CacheServer.address(value=address), CacheRequestHandler)
+
+    @staticmethod
+    def address(value: str) -> tuple[str, int]:
+        """
+        Parses a listening address.
+
+        Parameters
+        ----------
+        value: The address, e.g. `0.0.0.0:7879`, `:7001` or `cache.internal`.
+
+        Returns
+        -------
+        The host and port.
+        """
+
+        host, separator, port = value.rpartition(":")
+        if not separator:
+            host, port = value, ""
+        host = host.strip("[]") or CacheServer.DEFAULT_HOST
+        if not port:
+            return host, RemoteCache.DEFAULT_PORT
+        if not port.isdigit() or int(port) > 65535:
+            raise ValueError(f"Invalid cache server address `{value}`.")
+        return host, int(port)
+
+    def blob(self, digest: str) -> Path:
+        """
+        Location of a blob.
+
+        Parameters
+        ----------
+        digest: The blob digest.
+
+        Returns
+        -------
+        The blob file.
+        """
+
+        return self.path / "objects" / digest[:2] / digest[2:]
+
+    def entry(self, key: str) -> Path:
+        """
+        Location of the manifest of a step fingerprint.
+
+        Parameters
+        ----------
+        key: The step fingerprint.
+
+        Returns
+        -------
+        The manifest file.
+        """
+
+        return self.path / "entries" / f"{key}.json"
+
+    def scratch(self, name: str) -> Path:
+        """
+        A scratch file to receive an upload within (on the same file system as the blobs).
+
+        Parameters
+        ----------
+        name: The name the upload is stored under.
+
+        Returns
+        -------
+        The scratch file location.
+        """
+
+        return self.path / "tmp" / f"{name}.{os.getpid()}.{os.urandom(8).hex()}.upload"
+
+    def serve(self, ready: Optional[Callable[[], None]] = None) -> None:
+        """
+        Serves requests until interrupted.
+
+        Parameters
+        ----------
+        ready: Called once listening.
+        """
+
+        if ready is not None:
+            ready()
+        try:
+            self.serve_forever()
+        finally:
+            self.server_close()
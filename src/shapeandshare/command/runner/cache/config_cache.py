@@ -0,0 +1,206 @@
+""" Parsed Configuration Cache Definition """
+
+import hashlib
+import logging
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ConfigCache:
+    """
+    Parsed Configuration Cache
+    Persists parsed configuration models under `.sacr/cache` (next to the configuration file) so that unchanged
+    files are not re-parsed or re-validated on every invocation.
+
+    Entries are keyed on the resolved path of the configuration file and validated against its size, mtime and
+    content hash.  When size and mtime match (and the file was not modified within RACY_WINDOW_NS of the entry being
+    written) the entry is used without reading the file; otherwise the content hash decides.
+
+    Attributes
+    ----------
+    namespace
+        Distinguishes the loaders sharing a configuration file (e.g. the backend class name).
+    CACHE_DIRECTORY
+        The cache location relative to the configuration file, default: Path(".sacr/cache")
+    CACHE_VERSION
+        The cache entry format version, entries of any other version are ignored.
+    DISABLE_ENVIRONMENT_VARIABLE
+        Setting this environment variable to a non-empty value other than "0" bypasses the cache.
+    RACY_WINDOW_NS
+        Files modified this close to the entry being written are always re-hashed, default: 2 seconds
+    """
+
+    namespace: str
+    CACHE_DIRECTORY: Path = Path(".sacr") / "cache"
+    CACHE_VERSION: int = 8
+    DISABLE_ENVIRONMENT_VARIABLE: str = "SACR_NO_CONFIG_CACHE"
+    RACY_WINDOW_NS: int = 2_000_000_000
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    @staticmethod
+    def enabled() -> bool:
+        """
+        Whether the cache is in use.
+
+        Returns
+        -------
+        False when disabled through the environment.
+        """
+
+        return os.environ.get(ConfigCache.DISABLE_ENVIRONMENT_VARIABLE, "0") in ("", "0")
+
+    def entry_path(self, source: Path) -> Path:
+        """
+        Location of the cache entry for a configuration file.
+
+        Parameters
+        ----------
+        source: The configuration file.
+
+        Returns
+        -------
+        Path to the cache entry.
+        """
+
+        key: str = hashlib.sha256(f"{self.namespace}:{source.resolve().as_posix()}".encode("utf-8")).hexdigest()
+        return source.parent / self.CACHE_DIRECTORY / f"config-{key[:32]}.pickle"
+
+    def load(self, source: Path, loader: Callable[[], T]) -> T:
+        """
+        Loads a parsed configuration, from the cache when the file is unchanged.
+
+        Parameters
+        ----------
+        source: The configuration file.
+        loader: Parses the configuration file when the cache can not be used.
+
+        Returns
+        -------
+        The parsed configuration.
+        """
+
+        if not ConfigCache.enabled() or not source.is_file():
+            return loader()
+
+        entry_path: Path = self.entry_path(source=source)
+        before: os.stat_result = source.stat()
+        entry: Optional[dict] = self._read(entry_path=entry_path)
+
+        if entry is not None and self._fresh(entry=entry, stat=before):
+            return entry["value"]
+
+        digest: str = ConfigCache.digest(source=source)
+        if entry is not None and entry["digest"] == digest:
+            # Touched but unchanged, refresh the recorded stat.
+            self._write(entry_path=entry_path, stat=before, digest=digest, value=entry["value"])
+            return entry["value"]
+
+        value: T = loader()
+        after: os.stat_result = source.stat()
+        if (after.st_size, after.st_mtime_ns) == (before.st_size, before.st_mtime_ns):
+            self._write(entry_path=entry_path, stat=before, digest=digest, value=value)
+        return value
+
+    @staticmethod
+    def digest(source: Path) -> str:
+        """
+        Content hash of a file.
+
+        Parameters
+        ----------
+        source: The file to hash.
+
+        Returns
+        -------
+        The hex encoded sha256 digest.
+        """
+
+        hasher = hashlib.sha256()
+        with open(source, mode="rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                hasher.update(block)
+        return hasher.hexdigest()
+
+    def _fresh(self, entry: dict, stat: os.stat_result) -> bool:
+        """
+        Whether an entry can be used based on the file stat alone.
+
+        Parameters
+        ----------
+        entry: The cache entry.
+        stat: The current stat of the configuration file.
+
+        Returns
+        -------
+        True if the size and mtime match and the mtime is not within the racy window.
+        """
+
+        return (
+            entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+            and stat.st_mtime_ns < entry["written_ns"] - self.RACY_WINDOW_NS
+        )
+
+    def _read(self, entry_path: Path) -> Optional[dict]:
+        """
+        Reads a cache entry.
+
+        Parameters
+        ----------
+        entry_path: The cache entry location.
+
+        Returns
+        -------
+        The entry, or None if it is missing, unreadable or of another version.
+        """
+
+        try:
+            with open(entry_path, mode="rb") as file:
+                entry: Any = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        # pylint: disable=broad-except
+        except Exception as error:
+            logging.getLogger(__name__).debug("[SKIPPING] Unreadable config cache entry {%s}: %s", entry_path, error)
+            return None
+        # pylint: enable=broad-except
+        if not isinstance(entry, dict) or entry.get("version") != self.CACHE_VERSION:
+            return None
+        return entry
+
+    def _write(self, entry_path: Path, stat: os.stat_result, digest: str, value: Any) -> None:
+        """
+        Writes a cache entry, atomically replacing any prior entry.
+
+        Parameters
+        ----------
+        entry_path: The cache entry location.
+        stat: The stat of the configuration file the value was parsed from.
+        digest: The content hash of the configuration file.
+        value: The parsed configuration.
+        """
+
+        entry: dict = {
+            "version": self.CACHE_VERSION,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "digest": digest,
+            "written_ns": time.time_ns(),
+            "value": value,
+        }
+        temporary: Path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temporary, mode="wb") as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, entry_path)
+        except OSError as error:
+            logging.getLogger(__name__).debug("[SKIPPING] Config cache write failed {%s}: %s", entry_path, error)
+            temporary.unlink(missing_ok=True)
@@ -0,0 +1,340 @@
+""" Remote Artifact Cache Definition """
+
+import hashlib
+import json
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Callable, Optional, Union
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    import http.client
+
+
+# pylint: disable=too-many-instance-attributes
+class RemoteCache:
+    """
+    Remote Artifact Cache
+    A client of a content-addressed artifact cache shared over HTTP (e.g. `sacr cache-server`), through which
+    machines restore the outputs of steps which already ran elsewhere (see ArtifactCache).  The protocol:
+
+    - `GET`, `HEAD` and `PUT` of `/blobs/<sha256>`, the server verifying the digest of every blob it receives.
+    - `POST /blobs/missing` with a json list of digests, answered with the json list of those the server lacks.
+    - `GET` and `PUT` of `/entries/<fingerprint>`, the json manifest of a step (published once its blobs are).
+
+    Blobs stream between files and the network in both directions (never held in memory as a whole), downloads
+    being verified against their digest before they are moved into place.  Transfers run concurrently over a pool of
+    keep-alive connections.  When SACR_CACHE_TOKEN is set, requests present it as a bearer token.
+
+    Attributes
+    ----------
+    url
+        The location of the cache, e.g. `http://cache.internal:7879`.
+    DEFAULT_PORT
+        The port of the cache server, default: 7879
+    TRANSFERS
+        The maximum number of concurrent transfers (and pooled connections), default: 8
+    TIMEOUT
+        Seconds to wait for the server to connect or respond, default: 30
+    BLOCK_SIZE
+        The size of the chunks blobs are streamed in, default: 1 MiB
+    BATCH_SIZE
+        The maximum number of digests checked per request, default: 1000
+    TOKEN_ENVIRONMENT_VARIABLE
+        The shared secret presented to (and required by) the cache server, when set.
+    """
+
+    url: str
+    DEFAULT_PORT: int = 7879
+    TRANSFERS: int = 8
+    TIMEOUT: float = 30
+    BLOCK_SIZE: int = 1024 * 1024
+    BATCH_SIZE: int = 1000
+    TOKEN_ENVIRONMENT_VARIABLE: str = "SACR_CACHE_TOKEN"
+
+    def __init__(self, url: str, transfers: Optional[int] = None):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Invalid remote cache `{url}`, expected http(s)://host[:port][/path].")
+        self.url = url
+        self._secure: bool = parts.scheme == "https"
+        self._host: str = parts.hostname
+        self._port: int = parts.port or (443 if self._secure else RemoteCache.DEFAULT_PORT)
+        self._prefix: str = parts.path.rstrip("/")
+        self._transfers: int = transfers or RemoteCache.TRANSFERS
+        self._headers: dict[str, str] = {}
+        token: Optional[str] = RemoteCache.token()
+        if token is not None:
+            self._headers["Authorization"] = f"Bearer {token}"
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+
+    @staticmethod
+    def token() -> Optional[str]:
+        """
+        The shared secret of the cache server and its clients.
+
+        Returns
+        -------
+        The token, None when not set.
+        """
+
+        return os.environ.get(RemoteCache.TOKEN_ENVIRONMENT_VARIABLE) or None
+
+    def close(self) -> None:
+        """Closes the pooled connections."""
+
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def entry(self, key: str) -> Optional[dict]:
+        """
+        Fetches the manifest of a step fingerprint.
+
+        Parameters
+        ----------
+        key: The step fingerprint.
+
+        Returns
+        -------
+        The manifest, None when the cache has none.
+        """
+
+        status, body = self._exchange(method="GET", path=f"/entries/{key}")
+        if status == 404:
+            return None
+        RemoteCache._expect(status=status, method="GET", path=f"/entries/{key}")
+        return json.loads(body)
+
+    def publish(self, key: str, manifest: dict) -> None:
+        """
+        Publishes the manifest of a step fingerprint (once its blobs are uploaded).
+
+        Parameters
+        ----------
+        key: The step fingerprint.
+        manifest: The manifest.
+        """
+
+        body: bytes = json.dumps(manifest).encode("utf-8")
+        status, _ = self._exchange(
+            method="PUT", path=f"/entries/{key}", body=body, headers={"Content-Type": "application/json"}
+        )
+        RemoteCache._expect(status=status, method="PUT", path=f"/entries/{key}")
+
+    def missing(self, digests: list[str]) -> set[str]:
+        """
+        Checks which blobs the cache lacks, in batches.
+
+        Parameters
+        ----------
+        digests: The blob digests.
+
+        Returns
+        -------
+        The digests of the blobs the cache lacks.
+        """
+
+        missing: set[str] = set()
+        for start in range(0, len(digests), RemoteCache.BATCH_SIZE):
+            body: bytes = json.dumps(digests[start : start + RemoteCache.BATCH_SIZE]).encode("utf-8")
+            status, answer = self._exchange(
+                method="POST", path="/blobs/missing", body=body, headers={"Content-Type": "application/json"}
+            )
+            RemoteCache._expect(status=status, method="POST", path="/blobs/missing")
+            missing.update(json.loads(answer))
+        return missing
+
+    def download(self, blobs: dict[str, Path], scratch: Path) -> None:
+        """
+        Downloads blobs concurrently, each verified against its digest before being moved into place.
+
+        Parameters
+        ----------
+        blobs: The location of each blob, by digest.
+        scratch: The folder partial downloads are written within (on the same file system as the blobs).
+        """
+
+        self._concurrently(
+            action=lambda item: self._download(digest=item[0], target=item[1], scratch=scratch), items=blobs
+        )
+
+    def upload(self, blobs: dict[str, Path]) -> None:
+        """
+        Uploads blobs concurrently, streaming them from their files.
+
+        Parameters
+        ----------
+        blobs: The location of each blob, by digest.
+        """
+
+        self._concurrently(action=lambda item: self._upload(digest=item[0], source=item[1]), items=blobs)
+
+    def _concurrently(self, action: Callable[[tuple[str, Path]], None], items: dict[str, Path]) -> None:
+        """
+        Applies a transfer to every blob, as many at once as TRANSFERS allows, raising the first failure.
+
+        Parameters
+        ----------
+        action: The transfer of a blob.
+        items: The location of each blob, by digest.
+        """
+
+        if len(items) <= 1:
+            for item in items.items():
+                action(item)
+            return
+        with ThreadPoolExecutor(max_workers=min(self._transfers, len(items))) as executor:
+            for future in [executor.submit(action, item) for item in items.items()]:
+                future.result()
+
+    def _download(self, digest: str, target: Path, scratch: Path) -> None:
+        """
+        Downloads a blob.
+
+        Parameters
+        ----------
+        digest: The blob digest.
+        target: Where the blob is stored.
+        scratch: The folder the partial download is written within.
+        """
+
+        hasher = hashlib.sha256()
+        temporary: Path = scratch / f"{digest}.{os.getpid()}.{id(hasher)}.download"
+        try:
+            with open(temporary, mode="wb") as file:
+
+                def sink(chunk: bytes) -> None:
+                    hasher.update(chunk)
+                    file.write(chunk)
+
+                status, _ = self._exchange(method="GET", path=f"/blobs/{digest}", sink=sink)
+            RemoteCache._expect(status=status, method="GET", path=f"/blobs/{digest}")
+            if hasher.hexdigest() != digest:
+                raise ValueError(f"Corrupt blob {digest} received from {self.url}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temporary, target)
+        finally:
+            temporary.unlink(missing_ok=True)
+
+    def _upload(self, digest: str, source: Path) -> None:
+        """
+        Uploads a blob.
+
+        Parameters
+        ----------
+        digest: The blob digest.
+        source: The blob file.
+        """
+
+        with open(source, mode="rb") as file:
+            status, _ = self._exchange(
+                method="PUT",
+                path=f"/blobs/{digest}",
+                body=file,
+                headers={
+                    "Content-Type": "application/octet-stream",
+                    "Content-Length": str(os.fstat(file.fileno()).st_size),
+                },
+            )
+        RemoteCache._expect(status=status, method="PUT", path=f"/blobs/{digest}")
+
+    # pylint: disable=too-many-arguments
+    def _exchange(
+        self,
+        method: str,
+        path: str,
+        body: Union[bytes, BinaryIO, None] = None,
+        headers: Optional[dict[str, str]] = None,
+        sink: Optional[Callable[[bytes], None]] = None,
+    ) -> tuple[int, bytes]:
+        """
+        Performs a request over a pooled connection, retrying once over a new connection should a pooled one turn out
+        to be closed by the server.
+
+        Parameters
+        ----------
+        method: The request method.
+        path: The request path (below the cache location).
+        body: The request body, if any (files are streamed from their current position).
+        headers: Further request headers.
+        sink: Receives the body of a successful response in chunks, rather than it being returned.
+
+        Returns
+        -------
+        The response status and body (empty when streamed into the sink).
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import http.client
+
+        start: Optional[int] = body.tell() if body is not None and not isinstance(body, bytes) else None
+        retry: bool = True
+        while True:
+            connection, pooled = self._acquire()
+            try:
+                connection.request(method, self._prefix + path, body=body, headers={**self._headers, **(headers or {})})
+                response: http.client.HTTPResponse = connection.getresponse()
+                content: bytes = b""
+                if sink is not None and response.status == 200:
+                    for chunk in iter(lambda: response.read(RemoteCache.BLOCK_SIZE), b""):
+                        sink(chunk)
+                else:
+                    content = response.read()
+            except (ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if not (retry and pooled):
+                    raise
+                retry = False
+                if start is not None:
+                    body.seek(start)
+                continue
+            except http.client.HTTPException as error:
+                connection.close()
+                raise ConnectionError(f"{method} {path} failed: {error!r}") from error
+            except BaseException:
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._idle.put(connection)
+            return response.status, content
+
+    def _acquire(self) -> tuple["http.client.HTTPConnection", bool]:
+        """
+        Takes an idle pooled connection, or opens a new one.
+
+        Returns
+        -------
+        The connection, and whether it was pooled.
+        """
+
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            pass
+        # pylint: disable=import-outside-toplevel
+        import http.client
+
+        factory: type = http.client.HTTPSConnection if self._secure else http.client.HTTPConnection
+        return factory(self._host, self._port, timeout=RemoteCache.TIMEOUT, blocksize=RemoteCache.BLOCK_SIZE), False
+
+    @staticmethod
+    def _expect(status: int, method: str, path: str) -> None:
+        """
+        Checks the response to a request succeeded.
+
+        Parameters
+        ----------
+        status: The response status.
+        method: The request method.
+        path: The request path.
+        """
+
+        if status not in (200, 201, 204):
+            raise ConnectionError(f"{method} {path} answered {status}")
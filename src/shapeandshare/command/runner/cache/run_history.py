@@ -0,0 +1,203 @@
+""" Run History Definition """
+
+import logging
+import sqlite3
+import statistics
+from pathlib import Path
+from typing import Iterable, Optional
+
+from ..contacts.dtos.step_metrics import StepMetrics
+from ..contacts.step_status import StepStatus
+from ..execution.job import Job
+
+
+class RunHistory:
+    """
+    Run History
+    Records the outcome and duration of every step of every run within a local sqlite database, so that later runs
+    can start the steps expected to take longest first and forecast how long they take (see BaseScheduler), and so
+    that `sacr stats` can show how an alias performs over time.
+
+    The expected duration of a step is the median wall time of its last SAMPLES runs which actually ran its command
+    (steps which were up to date, restored, failed or cancelled say little about how long the command takes).  Only
+    the newest KEEP_RUNS runs are kept.  The history is best effort: once the database can not be used, nothing more is
+    recorded and nothing is expected.
+
+    Attributes
+    ----------
+    path
+        The database location.
+    DEFAULT_PATH
+        The default database location (within the project root), default: Path(".sacr/history")
+    SAMPLES
+        The number of recent runs of a step its expected duration is derived from, default: 10
+    KEEP_RUNS
+        The number of runs kept, default: 1000
+    """
+
+    path: Path
+    DEFAULT_PATH: Path = Path(".sacr") / "history"
+    SAMPLES: int = 10
+    KEEP_RUNS: int = 1000
+
+    def __init__(self, root: Optional[Path] = None, path: Optional[Path] = None):
+        self.path = path or (RunHistory.DEFAULT_PATH if root is None else root / RunHistory.DEFAULT_PATH)
+        self._connection: Optional[sqlite3.Connection] = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path.as_posix(), timeout=30, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS runs "
+                "(run TEXT PRIMARY KEY, alias TEXT NOT NULL, started REAL NOT NULL, wall REAL NOT NULL, "
+                "status TEXT NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS steps "
+                "(run TEXT NOT NULL, step TEXT NOT NULL, command TEXT NOT NULL, status TEXT NOT NULL, "
+                "started REAL NOT NULL, wall REAL NOT NULL, returncode INTEGER)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS steps_by_name ON steps (step, command, started)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS runs_by_alias ON runs (alias, started)")
+        except (OSError, sqlite3.Error) as error:
+            self._disable(error=error)
+
+    def close(self) -> None:
+        """Closes the database."""
+
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def record(self, run: str, alias: str, steps: list[StepMetrics]) -> None:
+        """
+        Records a run and its steps.
+
+        Parameters
+        ----------
+        run: The identifier of the run.
+        alias: The alias which was run.
+        steps: The metrics of the steps which concluded.
+        """
+
+        if self._connection is None or not steps:
+            return
+        started: float = min(step.started for step in steps)
+        wall: float = max(step.started + step.wall for step in steps) - started
+        status: str = "passed"
+        if any(step.status == StepStatus.FAILED for step in steps):
+            status = "failed"
+        elif any(step.status == StepStatus.CANCELLED for step in steps):
+            status = "cancelled"
+        try:
+            with self._connection:
+                self._connection.execute("BEGIN")
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO runs (run, alias, started, wall, status) VALUES (?, ?, ?, ?, ?)",
+                    (run, alias, started, wall, status),
+                )
+                self._connection.executemany(
+                    "INSERT INTO steps (run, step, command, status, started, wall, returncode) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (run, step.step, step.command, step.status, step.started, step.wall, step.returncode)
+                        for step in steps
+                    ],
+                )
+                self._connection.execute(
+                    "DELETE FROM runs WHERE run NOT IN (SELECT run FROM runs ORDER BY started DESC LIMIT ?)",
+                    (RunHistory.KEEP_RUNS,),
+                )
+                self._connection.execute("DELETE FROM steps WHERE run NOT IN (SELECT run FROM runs)")
+        except sqlite3.Error as error:
+            self._disable(error=error)
+
+    def expected(self, jobs: Iterable[Job]) -> dict[str, float]:
+        """
+        The expected durations of jobs.
+
+        Parameters
+        ----------
+        jobs: The jobs.
+
+        Returns
+        -------
+        The expected wall time (seconds) by job name, for the jobs with a history.
+        """
+
+        expected: dict[str, float] = {}
+        if self._connection is None:
+            return expected
+        try:
+            for job in jobs:
+                samples: list[float] = [
+                    row[0]
+                    for row in self._connection.execute(
+                        "SELECT wall FROM steps WHERE step = ? AND command = ? AND status = ? "
+                        "ORDER BY started DESC LIMIT ?",
+                        (job.name, job.display, StepStatus.RAN.value, RunHistory.SAMPLES),
+                    )
+                ]
+                if samples:
+                    expected[job.name] = statistics.median(samples)
+        except sqlite3.Error as error:
+            self._disable(error=error)
+        return expected
+
+    def runs(self, alias: str, limit: int) -> list[tuple[str, float, float, str]]:
+        """
+        The most recent runs of an alias.
+
+        Parameters
+        ----------
+        alias: The alias.
+        limit: The maximum number of runs.
+
+        Returns
+        -------
+        The identifier, start (seconds since the epoch), wall time and status of each run, oldest first.
+        """
+
+        if self._connection is None:
+            return []
+        rows: list[tuple[str, float, float, str]] = self._connection.execute(
+            "SELECT run, started, wall, status FROM runs WHERE alias = ? ORDER BY started DESC LIMIT ?",
+            (alias, limit),
+        ).fetchall()
+        return rows[::-1]
+
+    def steps(self, runs: list[str]) -> dict[str, list[tuple[str, float, str]]]:
+        """
+        The steps of runs.
+
+        Parameters
+        ----------
+        runs: The identifiers of the runs.
+
+        Returns
+        -------
+        The run, wall time and status of each step, by step name (in order of first appearance).
+        """
+
+        steps: dict[str, list[tuple[str, float, str]]] = {}
+        if self._connection is None or not runs:
+            return steps
+        placeholders: str = ", ".join("?" * len(runs))
+        for step, run, wall, status in self._connection.execute(
+            f"SELECT step, run, wall, status FROM steps WHERE run IN ({placeholders}) ORDER BY started",
+            runs,
+        ):
+            steps.setdefault(step, []).append((run, wall, status))
+        return steps
+
+    def _disable(self, error: BaseException) -> None:
+        """
+        Stops using the database, as it can not be used.
+
+        Parameters
+        ----------
+        error: Why the database can not be used.
+        """
+
+        logging.getLogger(__name__).debug("[SKIPPING] Run history unavailable {%s}: %s", self.path, error)
+        self.close()
@@ -0,0 +1,228 @@
+""" Step State Store Definition """
+
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from ..execution.job import Job
+
+
+class StateStore:
+    """
+    Step State Store
+    Records the fingerprint of every successful job run within a local sqlite database, so that jobs whose
+    fingerprint is unchanged (and whose declared outputs exist) can be skipped, like make but with content hashes
+    instead of mtimes.
+
+    A fingerprint covers the alias, the command, the declared environment variables and the path and content hash of
+    every file matched by the declared inputs.  Only jobs with declared inputs are fingerprinted.  File hashes are
+    memoized against the file size and mtime so unchanged trees are not re-read.  Glob patterns and file paths are
+    relative to the project root.
+
+    Attributes
+    ----------
+    path
+        The database location.
+    root
+        The project directory, None for the current working directory.
+    DEFAULT_PATH
+        The default database location (within the project root), default: Path(".sacr/state")
+    FINGERPRINT_VERSION
+        Included within every fingerprint, bumped when the fingerprint format changes.
+    RACY_WINDOW_NS
+        Files modified this close to being hashed are always re-hashed, default: 2 seconds
+    """
+
+    path: Path
+    root: Optional[Path]
+    DEFAULT_PATH: Path = Path(".sacr") / "state"
+    FINGERPRINT_VERSION: int = 1
+    RACY_WINDOW_NS: int = 2_000_000_000
+
+    def __init__(self, path: Optional[Path] = None, root: Optional[Path] = None):
+        self.root = root
+        if path is None:
+            path = self.DEFAULT_PATH if root is None else root / self.DEFAULT_PATH
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: sqlite3.Connection = sqlite3.connect(
+            self.path.as_posix(), timeout=30, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS steps (key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS files "
+            "(path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "digest TEXT NOT NULL, hashed_ns INTEGER NOT NULL)"
+        )
+
+    def close(self) -> None:
+        """Closes the database."""
+
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def expand(patterns: list[str], root: Optional[Path] = None) -> list[str]:
+        """
+        Expands glob patterns (supporting `**`) into the files they match, directories are walked recursively.
+
+        Parameters
+        ----------
+        patterns: The glob patterns.
+        root: The directory the patterns are relative to, None for the current working directory.
+
+        Returns
+        -------
+        The sorted, de-duplicated, matched file paths (relative to the root).
+        """
+
+        files: set[str] = set()
+        for pattern in patterns:
+            for match in glob.glob(StateStore.locate(file=pattern, root=root), recursive=True):
+                if os.path.isdir(match):
+                    for directory, _, names in os.walk(match):
+                        files.update(os.path.join(directory, name) for name in names)
+                elif os.path.lexists(match):
+                    # glob yields `folder/` for `folder/**` even when the folder does not exist.
+                    files.add(match)
+        if root is not None:
+            files = {os.path.relpath(file, root) for file in files}
+        return sorted(os.path.normpath(file) for file in files)
+
+    @staticmethod
+    def locate(file: str, root: Optional[Path] = None) -> str:
+        """
+        Locates a project relative path.
+
+        Parameters
+        ----------
+        file: The path, relative to the root.
+        root: The project directory, None for the current working directory.
+
+        Returns
+        -------
+        The path to use from the current working directory.
+        """
+
+        return file if root is None else os.path.join(root, file)
+
+    def fingerprint(self, job: Job) -> Optional[str]:
+        """
+        Computes the fingerprint of a job.
+
+        Parameters
+        ----------
+        job: The job.
+
+        Returns
+        -------
+        The hex encoded fingerprint, or None if the job declares no inputs.
+        """
+
+        if not job.inputs:
+            return None
+        hasher = hashlib.sha256()
+        hasher.update(json.dumps([self.FINGERPRINT_VERSION, job.alias, job.command]).encode("utf-8"))
+        for name in sorted(job.environment):
+            hasher.update(json.dumps(["env", name, os.environ.get(name)]).encode("utf-8"))
+        for file in StateStore.expand(patterns=job.inputs, root=self.root):
+            hasher.update(json.dumps(["file", file, self.digest(file=file)]).encode("utf-8"))
+        return hasher.hexdigest()
+
+    def digest(self, file: str) -> str:
+        """
+        Content hash of a file, memoized against its size and mtime.
+
+        Parameters
+        ----------
+        file: The file to hash (relative to the root).
+
+        Returns
+        -------
+        The hex encoded sha256 digest.
+        """
+
+        file = StateStore.locate(file=file, root=self.root)
+        stat: os.stat_result = os.stat(file)
+        key: str = os.path.abspath(file)
+        with self._lock:
+            row: Optional[tuple] = self._connection.execute(
+                "SELECT size, mtime_ns, digest, hashed_ns FROM files WHERE path = ?", (key,)
+            ).fetchone()
+        if (
+            row is not None
+            and (row[0], row[1]) == (stat.st_size, stat.st_mtime_ns)
+            and stat.st_mtime_ns < row[3] - self.RACY_WINDOW_NS
+        ):
+            return row[2]
+
+        hasher = hashlib.sha256()
+        with open(file, mode="rb") as handle:
+            for block in iter(lambda: handle.read(1024 * 1024), b""):
+                hasher.update(block)
+        digest: str = hasher.hexdigest()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, digest, hashed_ns) VALUES (?, ?, ?, ?, ?)",
+                (key, stat.st_size, stat.st_mtime_ns, digest, time.time_ns()),
+            )
+        return digest
+
+    def up_to_date(self, job: Job, fingerprint: Optional[str]) -> bool:
+        """
+        Whether a job can be skipped.
+
+        Parameters
+        ----------
+        job: The job.
+        fingerprint: The current fingerprint of the job.
+
+        Returns
+        -------
+        True if the job's last successful run had the same fingerprint and every declared output exists.
+        """
+
+        if fingerprint is None:
+            return False
+        with self._lock:
+            row: Optional[tuple] = self._connection.execute(
+                "SELECT fingerprint FROM steps WHERE key = ?", (job.name,)
+            ).fetchone()
+        if row is None or row[0] != fingerprint:
+            return False
+        # As within expand, glob yields `folder/` for `folder/**` even when the folder does not exist.
+        return all(
+            any(
+                os.path.lexists(match)
+                for match in glob.glob(StateStore.locate(file=pattern, root=self.root), recursive=True)
+            )
+            for pattern in job.outputs
+        )
+
+    def record(self, job: Job, fingerprint: Optional[str]) -> None:
+        """
+        Records a successful job run.
+
+        Parameters
+        ----------
+        job: The job.
+        fingerprint: The fingerprint of the job computed before it ran.
+        """
+
+        if fingerprint is None:
+            return
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO steps (key, fingerprint, updated) VALUES (?, ?, ?)",
+                (job.name, fingerprint, time.time()),
+            )
@@ -1,10 +1,21 @@
 """ Command Line Tool Hook """
 
-from .manager import Manager
+import sys
+
+from .daemon.daemon_client import DaemonClient
 
 
 def main():
     """Main entry point"""
+
+    # Served by a running daemon when possible, otherwise run locally.
+    code = DaemonClient.forward(arguments=sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+
+    # pylint: disable=import-outside-toplevel
+    from .manager import Manager
+
     Manager().main()
 
 
@@ -0,0 +1,213 @@
+""" Glob Walker Definition """
+
+import fnmatch
+import os
+import re
+from typing import Callable, Optional
+
+
+class GlobWalker:
+    """
+    Glob Walker
+    Expands glob patterns (supporting `**`) natively, without relying on a shell to expand them.
+
+    Patterns sharing a literal base directory are matched together within a single os.scandir walk.  Directories no
+    pattern can match within are pruned, matched directories are not descended into (they are matched as a whole),
+    and symbolic links are never followed.  As with glob, wildcards do not match names starting with a dot unless
+    the pattern segment does.
+
+    Attributes
+    ----------
+    MAGIC
+        Characters which make a pattern segment a wildcard.
+    """
+
+    MAGIC: re.Pattern = re.compile(r"[*?\[]")
+
+    def __init__(self):
+        self._matchers: dict[str, Callable[[str], Optional[re.Match]]] = {}
+
+    def expand(self, patterns: list[str]) -> list[str]:
+        """
+        Expands patterns into the paths they match.
+
+        Parameters
+        ----------
+        patterns: The glob patterns (or plain paths).
+
+        Returns
+        -------
+        The matched paths, in walk order, without duplicates.
+        """
+
+        matches: dict[str, None] = {}
+        walks: dict[str, list[list[str]]] = {}
+        for pattern in patterns:
+            base, segments = GlobWalker.split(pattern=pattern)
+            if not segments:
+                if os.path.lexists(base):
+                    matches[base] = None
+            else:
+                walks.setdefault(base, []).append(segments)
+
+        for base, group in walks.items():
+            if os.path.isdir(base):
+                states: set[tuple[int, int]] = {(index, 0) for index in range(len(group))}
+                for match in self._walk(directory=base, patterns=group, states=self._closure(group, states)):
+                    matches[match] = None
+        return list(matches)
+
+    @staticmethod
+    def split(pattern: str) -> tuple[str, list[str]]:
+        """
+        Splits a pattern into its literal base directory and its remaining segments.
+
+        Parameters
+        ----------
+        pattern: The glob pattern.
+
+        Returns
+        -------
+        The base directory and the segments to match below it (none for a plain path).
+        """
+
+        parts: list[str] = [part for part in os.path.normpath(pattern).split(os.sep) if part]
+        base: list[str] = [os.sep] if pattern.startswith(os.sep) else []
+        for index, part in enumerate(parts):
+            if GlobWalker.MAGIC.search(part):
+                return os.path.join(*base) if base else ".", parts[index:]
+            base.append(part)
+        return os.path.join(*base) if base else ".", []
+
+    def covers(self, pattern: str, path: str) -> bool:
+        """
+        Whether a path is covered by a pattern, without touching the file system (so the path need not exist): the
+        pattern matches the path itself or one of its parent directories (as matched directories count as a whole).
+
+        Parameters
+        ----------
+        pattern: The glob pattern (or plain path).
+        path: The path, relative to the same directory as the pattern.
+
+        Returns
+        -------
+        True when covered.
+        """
+
+        parts: list[str] = os.path.normpath(pattern).split(os.sep)
+        segments: list[list[str]] = [[part for part in parts if part not in ("", ".")]]
+        if not segments[0]:
+            return True
+        states: set[tuple[int, int]] = self._closure(segments, {(0, 0)})
+        for name in (part for part in os.path.normpath(path).split(os.sep) if part not in ("", ".")):
+            following: set[tuple[int, int]] = set()
+            for _, index in states:
+                segment: str = segments[0][index]
+                if segment == "**":
+                    if name.startswith("."):
+                        continue
+                    if index + 1 == len(segments[0]):
+                        return True
+                    following.add((0, index))
+                elif self._matches(segment=segment, name=name):
+                    if index + 1 == len(segments[0]):
+                        return True
+                    following.add((0, index + 1))
+            if not following:
+                return False
+            states = self._closure(segments, following)
+        return False
+
+    def _matches(self, segment: str, name: str) -> bool:
+        """
+        Whether a name matches a pattern segment.
+
+        Parameters
+        ----------
+        segment: The pattern segment.
+        name: The directory entry name.
+
+        Returns
+        -------
+        True on a match.
+        """
+
+        if name.startswith(".") and not segment.startswith("."):
+            return False
+        if not GlobWalker.MAGIC.search(segment):
+            return segment == name
+        matcher = self._matchers.get(segment)
+        if matcher is None:
+            matcher = self._matchers[segment] = re.compile(fnmatch.translate(segment)).match
+        return matcher(name) is not None
+
+    @staticmethod
+    def _closure(patterns: list[list[str]], states: set[tuple[int, int]]) -> set[tuple[int, int]]:
+        """
+        Adds the states reached by `**` matching no directories at all.
+
+        Parameters
+        ----------
+        patterns: The segments of each pattern.
+        states: The (pattern, segment) positions to match directory entries against.
+
+        Returns
+        -------
+        The completed states.
+        """
+
+        pending: list[tuple[int, int]] = list(states)
+        while pending:
+            pattern, index = pending.pop()
+            if patterns[pattern][index] == "**" and index + 1 < len(patterns[pattern]):
+                following: tuple[int, int] = (pattern, index + 1)
+                if following not in states:
+                    states.add(following)
+                    pending.append(following)
+        return states
+
+    def _walk(self, directory: str, patterns: list[list[str]], states: set[tuple[int, int]]) -> list[str]:
+        """
+        Matches the entries of a directory, descending into the directories patterns may still match within.
+
+        Parameters
+        ----------
+        directory: The directory to scan.
+        patterns: The segments of each pattern.
+        states: The (pattern, segment) positions to match the entries against.
+
+        Returns
+        -------
+        The matched paths.
+        """
+
+        matches: list[str] = []
+        try:
+            entries: list[os.DirEntry] = sorted(os.scandir(directory), key=lambda item: item.name)
+        except OSError:
+            return matches
+        for entry in entries:
+            is_directory: bool = entry.is_dir(follow_symlinks=False)
+            matched: bool = False
+            following: set[tuple[int, int]] = set()
+            for pattern, index in states:
+                segment: str = patterns[pattern][index]
+                last: bool = index + 1 == len(patterns[pattern])
+                if segment == "**":
+                    if last and not entry.name.startswith("."):
+                        matched = True
+                    elif is_directory and not entry.name.startswith("."):
+                        following.add((pattern, index))
+                elif self._matches(segment=segment, name=entry.name):
+                    if last:
+                        matched = True
+                    elif is_directory:
+                        following.add((pattern, index + 1))
+            path: str = os.path.normpath(entry.path)
+            if matched:
+                matches.append(path)
+            elif following:
+                matches.extend(
+                    self._walk(directory=entry.path, patterns=patterns, states=self._closure(patterns, following))
+                )
+        return matches
@@ -0,0 +1,190 @@
+""" Path Cleaner Definition """
+
+import os
+import shutil
+import subprocess
+import sys
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Optional
+
+
+# pylint: disable=too-few-public-methods
+class PathCleaner:
+    """
+    Path Cleaner
+    Removes files and folders (like `rm -rf`) on a thread pool.  The immediate children of each folder are removed
+    concurrently, so that a few very large trees (node_modules, .tox) do not serialize the whole clean.
+
+    In fast mode targets are instead renamed into a trash folder (a single rename each, when on the same file system)
+    and a detached background process removes the trash, so that clean returns immediately.  Targets which cannot be
+    renamed are removed in place.  The current working directory and its parents are never removed.
+
+    Attributes
+    ----------
+    jobs
+        The number of removal threads, by default a few more than the cpu count (removal is I/O bound).
+    fast
+        Move targets into the trash folder and remove them in the background.
+    trash
+        The trash folder used by fast mode.
+    DEFAULT_TRASH
+        The default trash folder, default: .sacr/trash
+    CHUNK_SIZE
+        The number of files removed per task, default: 256
+    """
+
+    jobs: int
+    fast: bool
+    trash: Path
+    DEFAULT_TRASH: Path = Path(".sacr") / "trash"
+    CHUNK_SIZE: int = 256
+
+    def __init__(self, jobs: Optional[int] = None, fast: bool = False, trash: Optional[Path] = None):
+        self.jobs = jobs or min(32, (os.cpu_count() or 1) + 4)
+        self.fast = fast
+        self.trash = trash or PathCleaner.DEFAULT_TRASH
+
+    def remove(self, paths: list[str]) -> None:
+        """
+        Removes files and folders.
+
+        Parameters
+        ----------
+        paths: The files and/or folders to remove, missing paths are ignored.
+        """
+
+        targets: list[str] = [path for path in paths if PathCleaner._removable(path=path)]
+        if self.fast:
+            targets = self._discard(paths=targets)
+
+        folders: list[str] = []
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            tasks: list[Future] = []
+            for target in targets:
+                if os.path.isdir(target) and not os.path.islink(target):
+                    folders.append(target)
+                    tasks.extend(self._fan_out(pool=pool, folder=target))
+                else:
+                    tasks.append(pool.submit(PathCleaner._unlink, [target]))
+            wait(tasks)
+            # What remains of each folder (itself, or anything its children could not take with them).
+            wait([pool.submit(shutil.rmtree, folder, ignore_errors=True) for folder in folders])
+
+    def _fan_out(self, pool: ThreadPoolExecutor, folder: str) -> list[Future]:
+        """
+        Submits the removal of the children of a folder, a task per sub folder and per chunk of files.
+
+        Parameters
+        ----------
+        pool: The removal threads.
+        folder: The folder to empty.
+
+        Returns
+        -------
+        The submitted tasks.
+        """
+
+        tasks: list[Future] = []
+        files: list[str] = []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        tasks.append(pool.submit(shutil.rmtree, entry.path, ignore_errors=True))
+                    else:
+                        files.append(entry.path)
+        except OSError:
+            return tasks
+        for index in range(0, len(files), self.CHUNK_SIZE):
+            tasks.append(pool.submit(PathCleaner._unlink, files[index : index + self.CHUNK_SIZE]))
+        return tasks
+
+    def _discard(self, paths: list[str]) -> list[str]:
+        """
+        Moves paths into the trash and starts removing the trash in the background.
+
+        Parameters
+        ----------
+        paths: The paths to discard.
+
+        Returns
+        -------
+        The paths which could not be moved (e.g. on another file system), to be removed in place.
+        """
+
+        remaining: list[str] = []
+        discarded: bool = False
+        for path in paths:
+            # Every path gets a folder of its own, so that the trash only ever holds folders.
+            holder: Path = self.trash / uuid.uuid4().hex
+            try:
+                holder.mkdir(parents=True)
+                os.rename(path, holder / os.path.basename(os.path.normpath(path)))
+                discarded = True
+            except OSError:
+                shutil.rmtree(holder, ignore_errors=True)
+                remaining.append(path)
+
+        if discarded:
+            # Includes whatever an earlier (interrupted) background removal left behind.
+            with os.scandir(self.trash) as entries:
+                trash: list[str] = [entry.path for entry in entries]
+            # pylint: disable=consider-using-with
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    "-c",
+                    "import shutil, sys\nfor path in sys.argv[1:]: shutil.rmtree(path, ignore_errors=True)",
+                    *trash,
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        return remaining
+
+    @staticmethod
+    def _removable(path: str) -> bool:
+        """
+        Whether a path exists and may be removed (it is neither the working directory nor one of its parents).
+
+        Parameters
+        ----------
+        path: The path to check.
+
+        Returns
+        -------
+        True when the path should be removed.
+        """
+
+        if not os.path.lexists(path):
+            return False
+        if os.path.islink(path):
+            return True
+        resolved: str = os.path.realpath(path)
+        working: str = os.path.realpath(os.getcwd())
+        if working == resolved or working.startswith(resolved.rstrip(os.sep) + os.sep):
+            print(f"Refusing to remove `{path}`, it contains the working directory.", file=sys.stderr)
+            return False
+        return True
+
+    @staticmethod
+    def _unlink(paths: list[str]) -> None:
+        """
+        Removes files (or links).
+
+        Parameters
+        ----------
+        paths: The files to remove.
+        """
+
+        for path in paths:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except IsADirectoryError:
+                shutil.rmtree(path, ignore_errors=True)
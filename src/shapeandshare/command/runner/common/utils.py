@@ -1,28 +1,219 @@
 """ Helpers """
 
-import shutil
-from pathlib import Path
+import os
+from typing import Optional
 
+from ..contacts.daemon_action import DaemonAction
+from ..contacts.dtos.bench_parameters import BenchParameters
+from ..contacts.dtos.cache_server_parameters import CacheServerParameters
+from ..contacts.dtos.clean_parameters import CleanParameters
+from ..contacts.dtos.daemon_parameters import DaemonParameters
+from ..contacts.dtos.run_parameters import RunParameters
+from ..contacts.dtos.stats_parameters import StatsParameters
+from ..contacts.dtos.watch_parameters import WatchParameters
+from ..contacts.dtos.worker_parameters import WorkerParameters
 from ..contacts.errors.unknown_argument_error import UnknownArgumentError
+from ..contacts.output_type import OutputType
+
+SIZE_SUFFIXES: str = "KMGT"
+BENCH_OPTIONS: dict[str, tuple[str, type]] = {
+    "-n": ("runs", int),
+    "--runs": ("runs", int),
+    "--warmup": ("warmup", int),
+    "--baseline": ("baseline", str),
+    "--save": ("save", str),
+    "--threshold": ("threshold", float),
+}
 
 
 def clean(arguments: list[str]) -> None:
     """
-    Removes files, folders specified.
+    Removes files, folders specified.  Glob patterns (including `**`) are expanded natively, as commands may run
+    without a shell to expand them.
+
+    Parameters
+    ----------
+    arguments: list of files, folders and/or patterns to remove, optionally preceded by `-j N` and `--fast`.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from .glob_walker import GlobWalker
+    from .path_cleaner import PathCleaner
+
+    parameters: CleanParameters = clean_argument_parser(arguments=arguments)
+    targets: list[str] = GlobWalker().expand(patterns=parameters.paths)
+    PathCleaner(jobs=parameters.jobs, fast=parameters.fast).remove(paths=targets)
+
+
+def clean_argument_parser(arguments: list[str]) -> CleanParameters:
+    """
+    `clean` subcommand argument parser.
+
+    Parameters
+    ----------
+    arguments: the arguments
+
+    Returns
+    -------
+    CleanParameters DTO
+    """
+
+    paths: list[str] = []
+    jobs: Optional[int] = None
+    fast: bool = False
+
+    remaining: list[str] = list(arguments)
+    while remaining:
+        argument: str = remaining.pop(0)
+        if argument == "--":
+            paths.extend(remaining)
+            break
+        if argument in ("-j", "--jobs"):
+            if not remaining:
+                raise UnknownArgumentError(command="clean", message=f"`{argument}` requires a value.")
+            jobs = parse_jobs(command="clean", value=remaining.pop(0))
+        elif argument.startswith("--jobs="):
+            jobs = parse_jobs(command="clean", value=argument[len("--jobs=") :])
+        elif argument.startswith("-j") and len(argument) > 2:
+            jobs = parse_jobs(command="clean", value=argument[2:])
+        elif argument == "--fast":
+            fast = True
+        elif argument.startswith("-"):
+            raise UnknownArgumentError(command="clean", message=f"Unknown option `{argument}`, use `--` before paths.")
+        else:
+            paths.append(argument)
+    return CleanParameters(paths=paths, jobs=jobs, fast=fast)
+
+
+def daemon_argument_parser(arguments: list[str]) -> DaemonParameters:
+    """
+    `daemon` subcommand argument parser.
+
+    Parameters
+    ----------
+    arguments: the arguments
+
+    Returns
+    -------
+    DaemonParameters DTO
+    """
+
+    actions: list[str] = []
+    detach: bool = False
+    for argument in arguments:
+        if argument in ("-d", "--detach"):
+            detach = True
+        elif argument.startswith("-"):
+            raise UnknownArgumentError(command="daemon", message=f"Unknown option `{argument}`.")
+        else:
+            actions.append(argument)
+
+    if len(actions) > 1:
+        raise UnknownArgumentError(command="daemon", message="Expected at most 1 action (start, stop or status).")
+    try:
+        action: DaemonAction = DaemonAction(actions[0]) if actions else DaemonAction.START
+    except ValueError as error:
+        raise UnknownArgumentError(
+            command="daemon", message=f"Unknown action `{actions[0]}`, expected start, stop or status."
+        ) from error
+    return DaemonParameters(action=action, detach=detach)
+
+
+def worker_argument_parser(arguments: list[str], jobs: Optional[int] = None) -> WorkerParameters:
+    """
+    `worker` subcommand argument parser.
+
+    Parameters
+    ----------
+    arguments: the arguments
+    jobs: The default number of concurrent steps, when not provided the cpu count is used.
+
+    Returns
+    -------
+    WorkerParameters DTO
+    """
+
+    listen: Optional[str] = None
+    remaining: list[str] = list(arguments)
+    while remaining:
+        argument: str = remaining.pop(0)
+        if argument in ("-j", "--jobs", "--listen"):
+            if not remaining:
+                raise UnknownArgumentError(command="worker", message=f"`{argument}` requires a value.")
+            remaining.insert(0, f"{'--jobs' if argument == '-j' else argument}={remaining.pop(0)}")
+        elif argument.startswith("--jobs=") or (argument.startswith("-j") and len(argument) > 2):
+            value: str = argument[len("--jobs=") :] if argument.startswith("--jobs=") else argument[2:]
+            jobs = parse_jobs(command="worker", value=value)
+        elif argument.startswith("--listen="):
+            listen = argument[len("--listen=") :]
+        else:
+            raise UnknownArgumentError(command="worker", message=f"Unknown option `{argument}`.")
+    return WorkerParameters(listen=listen, jobs=jobs or os.cpu_count() or 1)
+
+
+def cache_server_argument_parser(arguments: list[str]) -> CacheServerParameters:
+    """
+    `cache-server` subcommand argument parser.
+
+    Parameters
+    ----------
+    arguments: the arguments
+
+    Returns
+    -------
+    CacheServerParameters DTO
+    """
+
+    options: dict[str, Optional[str]] = {"listen": None, "path": None}
+    remaining: list[str] = list(arguments)
+    while remaining:
+        argument: str = remaining.pop(0)
+        name, separator, value = argument.partition("=")
+        if name not in ("--listen", "--path"):
+            raise UnknownArgumentError(command="cache-server", message=f"Unknown option `{argument}`.")
+        if not separator:
+            if not remaining:
+                raise UnknownArgumentError(command="cache-server", message=f"`{argument}` requires a value.")
+            value = remaining.pop(0)
+        options[name[2:]] = value
+    return CacheServerParameters(**options)
+
+
+def stats_argument_parser(arguments: list[str]) -> StatsParameters:
+    """
+    `stats` subcommand argument parser.
 
     Parameters
     ----------
-    arguments: list of files and/or folders to remove.
+    arguments: the arguments
+
+    Returns
+    -------
+    StatsParameters DTO
     """
 
-    for item in arguments:
-        item_obj: Path = Path(item)
-        if item_obj.exists():
-            if item_obj.is_file():
-                item_obj.unlink(missing_ok=True)
-            else:
-                # process as dir
-                shutil.rmtree(path=item_obj.resolve().as_posix(), ignore_errors=True)
+    aliases: list[str] = []
+    runs: Optional[int] = None
+    remaining: list[str] = list(arguments)
+    while remaining:
+        argument: str = remaining.pop(0)
+        if argument in ("-n", "--runs"):
+            if not remaining:
+                raise UnknownArgumentError(command="stats", message=f"`{argument}` requires a value.")
+            remaining.insert(0, f"--runs={remaining.pop(0)}")
+        elif argument.startswith("--runs="):
+            value: str = argument[len("--runs=") :]
+            if not value.isdigit() or int(value) < 1:
+                raise UnknownArgumentError(command="stats", message=f"Invalid value `{value}` for `--runs`.")
+            runs = int(value)
+        elif argument.startswith("-"):
+            raise UnknownArgumentError(command="stats", message=f"Unknown option `{argument}`.")
+        else:
+            aliases.append(argument)
+
+    if len(aliases) != 1:
+        raise UnknownArgumentError(command="stats", message=f"Expected 1 subcommand but received {len(aliases)}.")
+    return StatsParameters(alias=aliases[0], **({} if runs is None else {"runs": runs}))
 
 
 def init_environment_argument_parser(arguments: list[str]) -> bool:
@@ -47,3 +238,305 @@ def init_environment_argument_parser(arguments: list[str]) -> bool:
     elif len(arguments) > 1:
         raise UnknownArgumentError(command="init", message="Only one argument `--force` is supported.")
     return force
+
+
+def parse_jobs(command: str, value: str) -> int:
+    """
+    Parses a job (concurrency) count.
+
+    Parameters
+    ----------
+    command: The subcommand being parsed (used for error reporting).
+    value: The raw value to parse.
+
+    Returns
+    -------
+    The number of jobs, always at least 1.
+    """
+
+    try:
+        jobs: int = int(value)
+    except ValueError as error:
+        raise UnknownArgumentError(command=command, message=f"Invalid job count `{value}`.") from error
+    if jobs < 1:
+        raise UnknownArgumentError(command=command, message=f"Job count must be at least 1, got `{value}`.")
+    return jobs
+
+
+def parse_shard(command: str, value: str) -> tuple[int, int]:
+    """
+    Parses a shard of a run, `K/N` (the Kth of N shards).
+
+    Parameters
+    ----------
+    command: The subcommand being parsed (used for error reporting).
+    value: The raw value to parse.
+
+    Returns
+    -------
+    The shard (counted from 1) and the number of shards.
+    """
+
+    index, separator, count = value.partition("/")
+    if not separator or not index.isdigit() or not count.isdigit() or not 1 <= int(index) <= int(count):
+        raise UnknownArgumentError(command=command, message=f"Invalid shard `{value}`, expected K/N with 1 <= K <= N.")
+    return int(index), int(count)
+
+
+def parse_size(command: str, value: Optional[str]) -> Optional[int]:
+    """
+    Parses a byte size such as `512M` or `2G` (binary multiples).
+
+    Parameters
+    ----------
+    command: The subcommand being parsed (used for error reporting).
+    value: The raw value to parse.
+
+    Returns
+    -------
+    The size in bytes, or None when no value is provided.
+    """
+
+    if value is None:
+        return None
+    text: str = str(value).strip().upper().removesuffix("B")
+    multiplier: int = 1
+    if text and text[-1] in SIZE_SUFFIXES:
+        multiplier = 1024 ** (SIZE_SUFFIXES.index(text[-1]) + 1)
+        text = text[:-1]
+    try:
+        return int(float(text) * multiplier)
+    except ValueError as error:
+        raise UnknownArgumentError(command=command, message=f"Invalid size `{value}`.") from error
+
+
+def parse_output(command: str, value: str) -> str:
+    """
+    Parses an output mode.
+
+    Parameters
+    ----------
+    command: The subcommand being parsed (used for error reporting).
+    value: The raw value to parse.
+
+    Returns
+    -------
+    The output mode (an OutputType value).
+    """
+
+    try:
+        return OutputType(value).value
+    except ValueError as error:
+        choices: str = ", ".join(item.value for item in OutputType)
+        raise UnknownArgumentError(
+            command=command, message=f"Invalid output mode `{value}`, expected one of: {choices}."
+        ) from error
+
+
+# pylint: disable=too-many-branches,too-many-statements,too-many-locals
+def run_argument_parser(arguments: list[str], jobs: Optional[int] = None, command: str = "run") -> RunParameters:
+    """
+    `run` subcommand argument parser.
+
+    Parameters
+    ----------
+    arguments: the arguments
+    jobs: The default number of concurrent jobs, when not provided the cpu count is used.
+    command: The subcommand being parsed (used for error reporting).
+
+    Returns
+    -------
+    RunParameters DTO
+    """
+
+    aliases: list[str] = []
+    force: bool = False
+    output: Optional[str] = None
+    trace: Optional[str] = None
+    adaptive: bool = False
+    workspace: bool = False
+    since: Optional[str] = None
+    filters: list[str] = []
+    workers: list[str] = []
+    logs: bool = False
+    shard: Optional[tuple[int, int]] = None
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
+    remaining: list[str] = list(arguments)
+    while remaining:
+        argument: str = remaining.pop(0)
+        if argument in ("-j", "--jobs"):
+            if not remaining:
+                raise UnknownArgumentError(command=command, message=f"`{argument}` requires a value.")
+            remaining.insert(0, f"--jobs={remaining.pop(0)}")
+        elif argument.startswith("--jobs=") or (argument.startswith("-j") and len(argument) > 2):
+            value: str = argument[len("--jobs=") :] if argument.startswith("--jobs=") else argument[2:]
+            # `auto` uses every cpu, admitting jobs as the load and memory of the machine allow.
+            adaptive = value == "auto"
+            jobs = (os.cpu_count() or 1) if adaptive else parse_jobs(command=command, value=value)
+        elif argument in ("-f", "--force"):
+            force = True
+        elif argument == "--output":
+            if not remaining:
+                raise UnknownArgumentError(command=command, message=f"`{argument}` requires a value.")
+            output = parse_output(command=command, value=remaining.pop(0))
+        elif argument.startswith("--output="):
+            output = parse_output(command=command, value=argument[len("--output=") :])
+        elif argument == "--trace":
+            if not remaining:
+                raise UnknownArgumentError(command=command, message=f"`{argument}` requires a value.")
+            trace = remaining.pop(0)
+        elif argument.startswith("--trace="):
+            trace = argument[len("--trace=") :]
+        elif argument in ("-w", "--workspace"):
+            workspace = True
+        elif argument == "--logs":
+            logs = True
+        elif argument in ("--filter", "--since", "--workers", "--shard"):
+            if not remaining:
+                raise UnknownArgumentError(command=command, message=f"`{argument}` requires a value.")
+            remaining.insert(0, f"{argument}={remaining.pop(0)}")
+        elif argument.startswith("--filter="):
+            # Filters select workspace packages, so imply a workspace run.
+            workspace = True
+            filters.append(argument[len("--filter=") :])
+        elif argument.startswith("--since="):
+            workspace = True
+            since = argument[len("--since=") :]
+        elif argument.startswith("--workers="):
+            workers.extend(address for address in argument[len("--workers=") :].split(",") if address)
+        elif argument.startswith("--shard="):
+            shard = parse_shard(command=command, value=argument[len("--shard=") :])
+        elif argument.startswith("-"):
+            raise UnknownArgumentError(command=command, message=f"Unknown option `{argument}`.")
+        else:
+            aliases.append(argument)
+
+    if len(aliases) != 1:
+        raise UnknownArgumentError(command=command, message="Expected exactly 1 argument to run!")
+    if workspace and command != "run":
+        raise UnknownArgumentError(
+            command=command, message="`--workspace`, `--filter` and `--since` only apply to `run`."
+        )
+    if workers and command != "run":
+        raise UnknownArgumentError(command=command, message="`--workers` only applies to `run`.")
+    if shard is not None and command != "run":
+        raise UnknownArgumentError(command=command, message="`--shard` only applies to `run`.")
+    if logs and command == "bench":
+        raise UnknownArgumentError(command=command, message="`--logs` does not apply to `bench`.")
+    if trace is not None and command == "watch":
+        raise UnknownArgumentError(command=command, message="`--trace` does not apply to `watch`.")
+    return RunParameters(
+        alias=aliases[0],
+        jobs=jobs,
+        force=force,
+        output=output,
+        trace=trace,
+        adaptive=adaptive,
+        workspace=workspace,
+        filters=filters,
+        since=since,
+        workers=workers,
+        logs=logs,
+        shard=shard,
+    )
+
+
+def watch_argument_parser(arguments: list[str], jobs: Optional[int] = None) -> WatchParameters:
+    """
+    `watch` subcommand argument parser, accepting the `run` arguments as well.
+
+    Parameters
+    ----------
+    arguments: the arguments
+    jobs: The default number of concurrent jobs, when not provided the cpu count is used.
+
+    Returns
+    -------
+    WatchParameters DTO
+    """
+
+    debounce: Optional[float] = None
+    ignore: list[str] = []
+    poll: bool = False
+    run_arguments: list[str] = []
+
+    remaining: list[str] = list(arguments)
+    while remaining:
+        argument: str = remaining.pop(0)
+        if argument in ("--debounce", "--ignore"):
+            if not remaining:
+                raise UnknownArgumentError(command="watch", message=f"`{argument}` requires a value.")
+            remaining.insert(0, f"{argument}={remaining.pop(0)}")
+        elif argument.startswith("--debounce="):
+            value: str = argument[len("--debounce=") :]
+            try:
+                debounce = max(0.0, float(value))
+            except ValueError as error:
+                raise UnknownArgumentError(command="watch", message=f"Invalid debounce `{value}`.") from error
+        elif argument.startswith("--ignore="):
+            ignore.append(argument[len("--ignore=") :])
+        elif argument == "--poll":
+            poll = True
+        else:
+            run_arguments.append(argument)
+
+    parameters: RunParameters = run_argument_parser(arguments=run_arguments, jobs=jobs, command="watch")
+    return WatchParameters(
+        alias=parameters.alias,
+        jobs=parameters.jobs,
+        force=parameters.force,
+        output=parameters.output,
+        trace=parameters.trace,
+        adaptive=parameters.adaptive,
+        logs=parameters.logs,
+        debounce=debounce,
+        ignore=ignore,
+        poll=poll,
+    )
+
+
+def bench_argument_parser(arguments: list[str], jobs: Optional[int] = None) -> BenchParameters:
+    """
+    `bench` subcommand argument parser, accepting the `run` arguments as well.
+
+    Parameters
+    ----------
+    arguments: the arguments
+    jobs: The default number of concurrent jobs, when not provided the cpu count is used.
+
+    Returns
+    -------
+    BenchParameters DTO
+    """
+
+    options: dict = {}
+    run_arguments: list[str] = []
+
+    remaining: list[str] = list(arguments)
+    while remaining:
+        argument: str = remaining.pop(0)
+        name, separator, value = argument.partition("=")
+        if name not in BENCH_OPTIONS:
+            run_arguments.append(argument)
+            continue
+        if not separator:
+            if not remaining:
+                raise UnknownArgumentError(command="bench", message=f"`{name}` requires a value.")
+            value = remaining.pop(0)
+        field, kind = BENCH_OPTIONS[name]
+        try:
+            options[field] = kind(value)
+        except ValueError as error:
+            raise UnknownArgumentError(command="bench", message=f"Invalid value `{value}` for `{name}`.") from error
+
+    parameters: RunParameters = run_argument_parser(arguments=run_arguments, jobs=jobs, command="bench")
+    return BenchParameters(
+        alias=parameters.alias,
+        jobs=parameters.jobs,
+        force=True,
+        output=parameters.output,
+        adaptive=parameters.adaptive,
+        **options,
+    )
@@ -10,3 +10,9 @@ class CommandType(str, Enum):
     INIT = "init"
     RUN = "run"
     CLEAN = "clean"
+    WATCH = "watch"
+    BENCH = "bench"
+    DAEMON = "daemon"
+    WORKER = "worker"
+    STATS = "stats"
+    CACHE_SERVER = "cache-server"
@@ -0,0 +1,11 @@
+""" Daemon Action Definition """
+
+from enum import Enum
+
+
+class DaemonAction(str, Enum):
+    """Daemon Action Enumeration"""
+
+    START = "start"
+    STOP = "stop"
+    STATUS = "status"
@@ -1,9 +1,9 @@
 """ Backend Model (Data Storage)"""
 
-# pylint: disable=no-name-in-module,too-few-public-methods
-from pydantic import BaseModel
+from .base_model import BaseModel
 
 
+# pylint: disable=too-few-public-methods
 class BackendModel(BaseModel):
     """
     BackendModel DTO
@@ -11,6 +11,24 @@ class BackendModel(BaseModel):
     Attributes
     ----------
     scripts: The alias : command map
+    depends: The alias : prerequisite aliases map
+    parallel: The alias : flag map, marking aliases whose commands may run concurrently
+    inputs: The alias : input file glob patterns map
+    outputs: The alias : output file glob patterns map
+    environment: The alias : environment variable names map
+    session: The alias : flag map, marking aliases whose commands share a single shell session
+    matrix: The alias : parameter : values map, fanning aliases out over every combination of the parameter values
+    resources: The alias : resources map, declaring what each command of an alias requires (see JobResources)
+    workspace: The package name and the workspace packages it depends on (see WorkspaceDiscovery)
     """
 
     scripts: dict
+    depends: dict = {}
+    parallel: dict = {}
+    inputs: dict = {}
+    outputs: dict = {}
+    environment: dict = {}
+    session: dict = {}
+    matrix: dict = {}
+    resources: dict = {}
+    workspace: dict = {}
@@ -1,15 +1,256 @@
 """ BaseModel Definition """
 
-# pylint: disable=no-name-in-module,too-few-public-methods
-from pydantic import BaseModel as PydanticBaseModel
+import json
+import typing
+from enum import Enum
+from typing import Any, Union
 
+from ..errors.parse_error import ParseError
 
-class BaseModel(PydanticBaseModel):
-    """Base Model DTO"""
+_NoneType: type = type(None)
+_TRUE_VALUES: tuple = ("1", "true", "yes", "on")
+_FALSE_VALUES: tuple = ("0", "false", "no", "off")
 
-    class Config:
-        """Global Config"""
 
-        arbitrary_types_allowed = True
-        use_enum_values = True
-        validate_assignment = True
+class _ModelMeta(type):
+    """
+    Model Metaclass
+    Derives `__slots__` from the annotated fields of a model, moving any field defaults aside.
+    """
+
+    def __new__(cls, name: str, bases: tuple, namespace: dict):
+        fields: list[str] = [field for field in namespace.get("__annotations__", {}) if not field.startswith("_")]
+        defaults: dict = {}
+        for base in reversed(bases):
+            defaults.update(getattr(base, "__field_defaults__", {}))
+        for field in fields:
+            if field in namespace:
+                defaults[field] = namespace.pop(field)
+        namespace["__slots__"] = tuple(fields)
+        namespace["__field_defaults__"] = defaults
+        return super().__new__(cls, name, bases, namespace)
+
+
+class BaseModel(metaclass=_ModelMeta):
+    """
+    Base Model DTO
+    A lightweight `__slots__` model.  Fields are declared as annotated class attributes (optionally with a default),
+    values are coerced to the annotated types by `parse_obj`, unknown keys are ignored and enum fields store their
+    values.  Assignment is not validated.
+    """
+
+    __field_defaults__: dict = {}
+
+    def __init__(self, **data: Any):
+        fields: dict = type(self).fields()
+        for field, annotation in fields.items():
+            if field in data:
+                value: Any = BaseModel._coerce(field=field, annotation=annotation, value=data[field])
+            elif field in self.__field_defaults__:
+                value = BaseModel._copy_default(self.__field_defaults__[field])
+            elif _NoneType in typing.get_args(annotation):
+                value = None
+            else:
+                raise ParseError(f"{type(self).__name__}: field `{field}` is required")
+            object.__setattr__(self, field, value)
+
+    @classmethod
+    def fields(cls) -> dict:
+        """
+        The annotated fields of the model (including inherited fields).
+
+        Returns
+        -------
+        The field name : type map.
+        """
+
+        if "_fields_cache" not in cls.__dict__:
+            fields: dict = {}
+            for klass in reversed(cls.__mro__):
+                if isinstance(klass, _ModelMeta):
+                    fields.update(
+                        {
+                            name: annotation
+                            for name, annotation in typing.get_type_hints(klass).items()
+                            if name in klass.__dict__.get("__slots__", ())
+                        }
+                    )
+            setattr(cls, "_fields_cache", fields)
+        return cls.__dict__["_fields_cache"]
+
+    @classmethod
+    def parse_obj(cls, obj: Any):
+        """
+        Builds the model from a mapping, coercing values to the annotated field types.
+
+        Parameters
+        ----------
+        obj: The mapping to load.
+
+        Returns
+        -------
+        The populated model.
+        """
+
+        if isinstance(obj, cls):
+            return obj
+        if not isinstance(obj, dict):
+            raise ParseError(f"{cls.__name__}: expected a mapping, got {type(obj).__name__}")
+        return cls(**obj)
+
+    @classmethod
+    def parse_file(cls, path: str):
+        """
+        Builds the model from a json file.
+
+        Parameters
+        ----------
+        path: The json file to load.
+
+        Returns
+        -------
+        The populated model.
+        """
+
+        with open(path, mode="r", encoding="utf-8") as file:
+            try:
+                obj: Any = json.load(file)
+            except json.JSONDecodeError as error:
+                raise ParseError(f"{cls.__name__}: unable to parse {path}: {error}") from error
+        return cls.parse_obj(obj)
+
+    @classmethod
+    def construct(cls, **data: Any):
+        """
+        Builds the model without any coercion or validation.
+
+        Parameters
+        ----------
+        data: The field values.
+
+        Returns
+        -------
+        The populated model.
+        """
+
+        model = object.__new__(cls)
+        for field in cls.fields():
+            if field in data:
+                value: Any = data[field]
+            else:
+                value = BaseModel._copy_default(cls.__field_defaults__.get(field))
+            object.__setattr__(model, field, value)
+        return model
+
+    def as_dict(self) -> dict:
+        """
+        The model as a plain dictionary.
+
+        Returns
+        -------
+        The field name : value map, with nested models converted.
+        """
+
+        return {
+            field: value.as_dict() if isinstance(value, BaseModel) else value
+            for field, value in ((field, getattr(self, field)) for field in type(self).fields())
+        }
+
+    def __getstate__(self) -> dict:
+        return {field: getattr(self, field) for field in type(self).fields()}
+
+    def __setstate__(self, state: dict) -> None:
+        # Fields added since the state was saved take their defaults.
+        for field in type(self).fields():
+            default: Any = BaseModel._copy_default(self.__field_defaults__.get(field))
+            object.__setattr__(self, field, state.get(field, default))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, type(self)):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        values: str = ", ".join(f"{field}={getattr(self, field)!r}" for field in type(self).fields())
+        return f"{type(self).__name__}({values})"
+
+    @staticmethod
+    def _copy_default(value: Any) -> Any:
+        """Copies mutable defaults so that instances never share them."""
+
+        if isinstance(value, (dict, list, set)):
+            return type(value)(value)
+        return value
+
+    # pylint: disable=too-many-return-statements,too-many-branches
+    @staticmethod
+    def _coerce(field: str, annotation: Any, value: Any) -> Any:
+        """
+        Coerces a value to an annotated type.
+
+        Parameters
+        ----------
+        field: The field being coerced (used for error reporting).
+        annotation: The annotated type.
+        value: The raw value.
+
+        Returns
+        -------
+        The coerced value.
+        """
+
+        origin: Any = typing.get_origin(annotation)
+        if annotation is Any:
+            return value
+        if origin is Union:
+            arguments: tuple = typing.get_args(annotation)
+            if value is None and _NoneType in arguments:
+                return None
+            errors: list[str] = []
+            for argument in arguments:
+                if argument is _NoneType:
+                    continue
+                try:
+                    return BaseModel._coerce(field=field, annotation=argument, value=value)
+                except ParseError as error:
+                    errors.append(str(error))
+            raise ParseError("; ".join(errors))
+        if origin is not None:
+            annotation = origin
+        if value is None:
+            raise ParseError(f"field `{field}` may not be null")
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            return annotation.parse_obj(value)
+        if isinstance(annotation, type) and issubclass(annotation, Enum):
+            try:
+                return annotation(value).value
+            except ValueError as error:
+                raise ParseError(f"field `{field}`: {error}") from error
+        if annotation is bool:
+            if isinstance(value, bool):
+                return value
+            if str(value).lower() in _TRUE_VALUES:
+                return True
+            if str(value).lower() in _FALSE_VALUES:
+                return False
+            raise ParseError(f"field `{field}`: value could not be parsed to a boolean")
+        if annotation in (int, float):
+            if isinstance(value, annotation) and not isinstance(value, bool):
+                return value
+            try:
+                return annotation(value)
+            except (TypeError, ValueError) as error:
+                raise ParseError(f"field `{field}`: value is not a valid {annotation.__name__}") from error
+        if annotation is str:
+            if isinstance(value, str):
+                return value
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return str(value)
+            raise ParseError(f"field `{field}`: str type expected")
+        if isinstance(annotation, type) and not isinstance(value, annotation):
+            raise ParseError(f"field `{field}`: {annotation.__name__} type expected")
+        return value
+
+    # pylint: enable=too-many-return-statements,too-many-branches
@@ -0,0 +1,26 @@
+""" Bench Command Parameters """
+
+from typing import Optional
+
+from .run_parameters import RunParameters
+
+
+# pylint: disable=too-few-public-methods
+class BenchParameters(RunParameters):
+    """
+    BenchParameters DTO
+
+    Attributes
+    ----------
+    runs: The number of measured runs.
+    warmup: The number of runs discarded before measuring.
+    baseline: A saved benchmark to compare against, if any.
+    save: Where to save the results, by default `.sacr/bench/<alias>.json`.
+    threshold: The percentage by which a median may exceed the baseline before being a regression.
+    """
+
+    runs: Optional[int] = None
+    warmup: Optional[int] = None
+    baseline: Optional[str] = None
+    save: Optional[str] = None
+    threshold: Optional[float] = None
@@ -0,0 +1,20 @@
+""" Cache Server Command Parameters """
+
+from typing import Optional
+
+from .base_model import BaseModel
+
+
+# pylint: disable=too-few-public-methods
+class CacheServerParameters(BaseModel):
+    """
+    CacheServerParameters DTO
+
+    Attributes
+    ----------
+    listen: The address to listen on (`host:port`), by default the default port locally.
+    path: The folder the cache is stored within, by default `.sacr/cache-server` within the project.
+    """
+
+    listen: Optional[str] = None
+    path: Optional[str] = None
@@ -0,0 +1,22 @@
+""" Clean Command Parameters """
+
+from typing import Optional
+
+from .base_model import BaseModel
+
+
+# pylint: disable=too-few-public-methods
+class CleanParameters(BaseModel):
+    """
+    CleanParameters DTO
+
+    Attributes
+    ----------
+    paths: The files, folders and/or glob patterns (`**` matches any number of folders) to remove.
+    jobs: The number of removal threads, by default a few more than the cpu count.
+    fast: Move targets into the trash (.sacr/trash) and remove them in the background.
+    """
+
+    paths: list[str]
+    jobs: Optional[int] = None
+    fast: bool = False
@@ -0,0 +1,19 @@
+""" Daemon Command Parameters """
+
+from ..daemon_action import DaemonAction
+from .base_model import BaseModel
+
+
+# pylint: disable=too-few-public-methods
+class DaemonParameters(BaseModel):
+    """
+    DaemonParameters DTO
+
+    Attributes
+    ----------
+    action: What to do: start the daemon (the default), stop it or report its status.
+    detach: Run the daemon in the background.
+    """
+
+    action: DaemonAction = DaemonAction.START
+    detach: bool = False
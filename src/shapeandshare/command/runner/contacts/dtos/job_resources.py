@@ -0,0 +1,26 @@
+""" Job Resources """
+
+from typing import Optional
+
+from .base_model import BaseModel
+
+
+# pylint: disable=too-few-public-methods
+class JobResources(BaseModel):
+    """
+    JobResources DTO
+
+    Attributes
+    ----------
+    cpu: The number of concurrency slots (cpus) each command of the alias occupies.
+    mem: The memory (bytes) each command of the alias is expected to use, reserved while it runs.
+    nice: The niceness increment applied to each process of the alias, if any.
+    ionice: The I/O scheduling class (and level) of each process of the alias, e.g. `idle` or `best-effort:7`.
+    limits: The resource limits (setrlimit) of each process of the alias, e.g. {"as": "4G", "nofile": 1024}.
+    """
+
+    cpu: float = 1.0
+    mem: Optional[int] = None
+    nice: Optional[int] = None
+    ionice: Optional[str] = None
+    limits: dict = {}
@@ -0,0 +1,20 @@
+""" Manager Config Cache Parameters """
+
+from typing import Optional
+
+from ..base_model import BaseModel
+
+
+# pylint: disable=too-few-public-methods
+class CacheParameters(BaseModel):
+    """
+    CacheParameters DTO
+
+    Attributes
+    ----------
+    size: The maximum size of the local artifact cache, e.g. "2G" (0 disables the cache).
+    remote: The location of a remote cache shared with other machines, e.g. "http://cache.internal:7879".
+    """
+
+    size: Optional[str]
+    remote: Optional[str] = None
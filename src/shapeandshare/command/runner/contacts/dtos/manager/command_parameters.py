@@ -12,6 +12,8 @@ class CommandParameters(BaseModel):
     Attributes
     ----------
     timeout: The maximum duration (in seconds) a process can run before being stopped.
+    jobs: The maximum number of commands to run concurrently (defaults to the cpu count).
     """
 
     timeout: Optional[int]
+    jobs: Optional[int]
@@ -0,0 +1,21 @@
+""" Manager Config Logs Parameters """
+
+from ...log_compression import LogCompression
+from ..base_model import BaseModel
+
+
+# pylint: disable=too-few-public-methods
+class LogsParameters(BaseModel):
+    """
+    LogsParameters DTO
+
+    Attributes
+    ----------
+    capture: Whether the output of every step is written to a log file of its own (see StepLogs).
+    compression: How step logs are compressed (gzip, xz or none).
+    keep: The number of runs whose logs are kept.
+    """
+
+    capture: bool = False
+    compression: LogCompression = LogCompression.GZIP
+    keep: int = 10
@@ -1,8 +1,10 @@
 """ Manager Configuration Definition"""
 
 from ..base_model import BaseModel
+from .cache_parameters import CacheParameters
 from .command_parameters import CommandParameters
 from .config_parameters import ConfigParameters
+from .logs_parameters import LogsParameters
 
 
 # pylint: disable=too-few-public-methods
@@ -14,7 +16,11 @@ class ManagerConfig(BaseModel):
     ----------
     command: Manager Command Parameters DTO
     config: Manager Config Parameters DTO
+    cache: Manager Cache Parameters DTO
+    logs: Manager Logs Parameters DTO
     """
 
     command: CommandParameters
     config: ConfigParameters
+    cache: CacheParameters
+    logs: LogsParameters
@@ -0,0 +1,41 @@
+""" Run Command Parameters """
+
+from typing import Optional
+
+from ..output_type import OutputType
+from .base_model import BaseModel
+
+
+# pylint: disable=too-few-public-methods
+class RunParameters(BaseModel):
+    """
+    RunParameters DTO
+
+    Attributes
+    ----------
+    alias: The alias (from [scripts]) to execute.
+    jobs: The maximum number of commands to run concurrently.
+    force: Run every command, even those whose inputs are unchanged since their last successful run.
+    output: How command output is presented, by default prefixed when commands may run concurrently.
+    trace: Where to write a Chrome trace-event file of the run, if anywhere.
+    adaptive: Admit commands as the load and memory of the machine allow (`-j auto`).
+    workspace: Run the alias across the packages of the workspace (see WorkspaceRunner).
+    filters: The filters selecting the workspace packages to run, if any.
+    since: Only run the workspace packages affected by the changes since this git ref (and their dependents), if any.
+    workers: The addresses of the workers to run commands on (see WorkerPool), if any.
+    logs: Write the output of every step to a log file of its own (see StepLogs), whatever the configuration.
+    shard: Only run the Kth of N shards of balanced expected duration (see ShardPlanner), as (K, N), if any.
+    """
+
+    alias: str
+    jobs: int
+    force: bool = False
+    output: Optional[OutputType] = None
+    trace: Optional[str] = None
+    adaptive: bool = False
+    workspace: bool = False
+    filters: list[str] = []
+    since: Optional[str] = None
+    workers: list[str] = []
+    logs: bool = False
+    shard: Optional[tuple[int, int]] = None
@@ -0,0 +1,18 @@
+""" Stats Command Parameters """
+
+from .base_model import BaseModel
+
+
+# pylint: disable=too-few-public-methods
+class StatsParameters(BaseModel):
+    """
+    StatsParameters DTO
+
+    Attributes
+    ----------
+    alias: The alias whose runs are shown.
+    runs: The maximum number of recent runs shown.
+    """
+
+    alias: str
+    runs: int = 20
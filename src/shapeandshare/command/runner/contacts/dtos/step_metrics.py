@@ -0,0 +1,43 @@
+""" Step Metrics Definition """
+
+from typing import Optional
+
+from ..step_status import StepStatus
+from .base_model import BaseModel
+
+
+# pylint: disable=too-few-public-methods
+class StepMetrics(BaseModel):
+    """
+    StepMetrics DTO
+
+    Attributes
+    ----------
+    run: The identifier of the run the step belongs to.
+    alias: The alias (from [scripts]) the step belongs to.
+    step: The step name, e.g. `build[2]`.
+    command: The command of the step.
+    status: How the step concluded.
+    started: When the step started (seconds since the epoch).
+    queued: Seconds the step waited for a free slot once its prerequisites succeeded.
+    wall: Seconds the step took.
+    user: User CPU seconds of its process (and the descendants it waited on), when measured.
+    system: System CPU seconds of its process (and the descendants it waited on), when measured.
+    max_rss: The peak resident set size (bytes) of its process or largest descendant, when measured.
+    returncode: The exit status of its process, if it ran one.
+    worker: The concurrency slot the step ran in.
+    """
+
+    run: str
+    alias: str
+    step: str
+    command: str
+    status: StepStatus
+    started: float
+    queued: float
+    wall: float
+    user: Optional[float] = None
+    system: Optional[float] = None
+    max_rss: Optional[int] = None
+    returncode: Optional[int] = None
+    worker: int = 0
@@ -0,0 +1,22 @@
+""" Watch Command Parameters """
+
+from typing import Optional
+
+from .run_parameters import RunParameters
+
+
+# pylint: disable=too-few-public-methods
+class WatchParameters(RunParameters):
+    """
+    WatchParameters DTO
+
+    Attributes
+    ----------
+    debounce: Seconds without further changes to wait for before re-running.
+    ignore: Additional name patterns (fnmatch) of files and folders which are never watched.
+    poll: Poll for changes instead of using inotify.
+    """
+
+    debounce: Optional[float] = None
+    ignore: list[str] = []
+    poll: bool = False
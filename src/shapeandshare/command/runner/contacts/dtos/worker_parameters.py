@@ -0,0 +1,20 @@
+""" Worker Command Parameters """
+
+from typing import Optional
+
+from .base_model import BaseModel
+
+
+# pylint: disable=too-few-public-methods
+class WorkerParameters(BaseModel):
+    """
+    WorkerParameters DTO
+
+    Attributes
+    ----------
+    listen: The address to listen on (`host:port` or a Unix domain socket path), by default the default port locally.
+    jobs: The maximum number of steps to run concurrently.
+    """
+
+    listen: Optional[str] = None
+    jobs: int
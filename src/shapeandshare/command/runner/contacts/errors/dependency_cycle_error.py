@@ -0,0 +1,5 @@
+"""Dependency Cycle Error Definition"""
+
+
+class DependencyCycleError(Exception):
+    """Dependency Cycle Error"""
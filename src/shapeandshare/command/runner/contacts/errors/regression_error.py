@@ -0,0 +1,5 @@
+"""Regression Error Definition"""
+
+
+class RegressionError(Exception):
+    """Regression Error"""
@@ -1,5 +1,6 @@
 """Subprocess Failure Error Definition"""
 import json
+from typing import Optional
 
 
 class SubprocessFailureError(Exception):
@@ -8,14 +9,16 @@ class SubprocessFailureError(Exception):
     command: str
     message: str
     returncode: int
+    output: Optional[str]
 
     # pylint: disable=super-init-not-called,fixme
     # TODO: address linting.
-    def __init__(self, command: str, message: str, returncode: int):
+    def __init__(self, command: str, message: str, returncode: int, output: Optional[str] = None):
         # super.__init__()
         self.command = command
         self.message = message
         self.returncode = returncode
+        self.output = output
 
     def __str__(self):
         message: str = json.dumps({"command": self.command, "message": self.message, "returncode": self.returncode})
@@ -0,0 +1,11 @@
+""" Log Compression Definition """
+
+from enum import Enum
+
+
+class LogCompression(str, Enum):
+    """Log Compression Enumeration"""
+
+    GZIP = "gzip"
+    XZ = "xz"
+    NONE = "none"
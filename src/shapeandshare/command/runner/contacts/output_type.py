@@ -0,0 +1,12 @@
+""" Output Type Definition """
+
+from enum import Enum
+
+
+class OutputType(str, Enum):
+    """Output Type Enumeration"""
+
+    PREFIXED = "prefixed"
+    PLAIN = "plain"
+    INHERIT = "inherit"
+    QUIET = "quiet"
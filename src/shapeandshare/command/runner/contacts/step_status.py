@@ -0,0 +1,13 @@
+""" Step Status Definition """
+
+from enum import Enum
+
+
+class StepStatus(str, Enum):
+    """Step Status Enumeration"""
+
+    RAN = "ran"
+    UP_TO_DATE = "up to date"
+    RESTORED = "restored"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
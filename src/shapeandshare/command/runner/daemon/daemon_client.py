@@ -0,0 +1,213 @@
+""" Daemon Client Definition """
+
+import json
+import os
+import signal
+import socket
+import sys
+from typing import Any, Optional
+
+
+class DaemonClient:
+    """
+    Daemon Client
+    The thin side of `sacr daemon`: forwards a command line invocation (its arguments, working directory, environment
+    and umask) to a running daemon, handing over its standard streams (over the Unix domain socket, SCM_RIGHTS) so that
+    output reaches the terminal directly, then relays interrupts and exits with the exit code the daemon reports.
+    Only the standard library is imported, keeping start up minimal.  Whenever no daemon is reachable (or it runs
+    another installation of sacr) the invocation is left to run locally, as are the servers `sacr daemon`,
+    `sacr worker` and `sacr cache-server` themselves.
+
+    Attributes
+    ----------
+    DISABLE_ENVIRONMENT_VARIABLE
+        Setting this environment variable to a non-empty value other than "0" never forwards to the daemon.
+    SOCKET_ENVIRONMENT_VARIABLE
+        Overrides the location of the daemon socket.
+    FORWARDED_SIGNALS
+        The signals relayed to the command while it runs within the daemon.
+    HEADER_SIZE
+        The size of the length prefix of requests, default: 4
+    """
+
+    DISABLE_ENVIRONMENT_VARIABLE: str = "SACR_NO_DAEMON"
+    SOCKET_ENVIRONMENT_VARIABLE: str = "SACR_DAEMON_SOCKET"
+    FORWARDED_SIGNALS: tuple = ("SIGINT", "SIGTERM", "SIGHUP", "SIGQUIT")
+    HEADER_SIZE: int = 4
+
+    @staticmethod
+    def socket_path() -> str:
+        """
+        Location of the daemon socket, private to the current user.
+
+        Returns
+        -------
+        The socket path, within $XDG_RUNTIME_DIR when set, otherwise within the temporary directory.
+        """
+
+        if os.environ.get(DaemonClient.SOCKET_ENVIRONMENT_VARIABLE):
+            return os.environ[DaemonClient.SOCKET_ENVIRONMENT_VARIABLE]
+        runtime: Optional[str] = os.environ.get("XDG_RUNTIME_DIR")
+        if runtime:
+            return os.path.join(runtime, "sacr", "daemon.sock")
+        return os.path.join(os.environ.get("TMPDIR", "/tmp"), f"sacr-{os.getuid()}", "daemon.sock")
+
+    @staticmethod
+    def identity() -> str:
+        """
+        Identifies this installation, so that a daemon running other code is never used.
+
+        Returns
+        -------
+        The interpreter, the package location and the modification time of the package.
+        """
+
+        package: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return f"{sys.executable}:{package}:{os.stat(os.path.join(package, 'manager.py')).st_mtime_ns}"
+
+    @staticmethod
+    def connect() -> Optional[socket.socket]:
+        """
+        Connects to the daemon.
+
+        Returns
+        -------
+        The connection, None when no daemon is reachable.
+        """
+
+        if not hasattr(socket, "AF_UNIX") or not hasattr(socket, "send_fds"):
+            return None
+        path: str = DaemonClient.socket_path()
+        if not os.path.exists(path):
+            return None
+        connection: socket.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            connection.connect(path)
+        except OSError:
+            connection.close()
+            return None
+        return connection
+
+    @staticmethod
+    def send(connection: socket.socket, message: dict, fds: Optional[list[int]] = None) -> None:
+        """
+        Sends a request (length prefixed JSON), optionally handing over file descriptors.
+
+        Parameters
+        ----------
+        connection: The connection to the daemon.
+        message: The request.
+        fds: The file descriptors to hand over, if any.
+        """
+
+        payload: bytes = json.dumps(message).encode("utf-8")
+        data: bytes = len(payload).to_bytes(DaemonClient.HEADER_SIZE, "big") + payload
+        sent: int = socket.send_fds(connection, [data], fds or [])
+        if sent < len(data):
+            connection.sendall(data[sent:])
+
+    @staticmethod
+    def request(message: dict) -> Optional[dict]:
+        """
+        Sends a control request (e.g. status or stop) and awaits its reply.
+
+        Parameters
+        ----------
+        message: The request.
+
+        Returns
+        -------
+        The reply, None when no daemon is reachable.
+        """
+
+        connection: Optional[socket.socket] = DaemonClient.connect()
+        if connection is None:
+            return None
+        with connection:
+            DaemonClient.send(connection=connection, message=message)
+            line: bytes = connection.makefile("rb").readline()
+        return json.loads(line) if line else None
+
+    @staticmethod
+    def forward(arguments: list[str]) -> Optional[int]:
+        """
+        Runs a command line invocation within the daemon, if one is running.
+
+        Parameters
+        ----------
+        arguments: The command line arguments (without the program name).
+
+        Returns
+        -------
+        The exit code of the invocation, None when it was not forwarded (and should run locally).
+        """
+
+        if os.environ.get(DaemonClient.DISABLE_ENVIRONMENT_VARIABLE, "0") not in ("", "0"):
+            return None
+        if arguments and arguments[0] in ("daemon", "worker", "cache-server"):
+            return None
+        connection: Optional[socket.socket] = DaemonClient.connect()
+        if connection is None:
+            return None
+
+        with connection:
+            # The daemon can not read from our terminal (it is not in its foreground process group).
+            stdin: int = os.open(os.devnull, os.O_RDONLY) if os.isatty(0) else 0
+            umask: int = os.umask(0)
+            os.umask(umask)
+            try:
+                DaemonClient.send(
+                    connection=connection,
+                    message={
+                        "command": "run",
+                        "identity": DaemonClient.identity(),
+                        "argv": arguments,
+                        "cwd": os.getcwd(),
+                        "env": dict(os.environ),
+                        "umask": umask,
+                    },
+                    fds=[stdin, 1, 2],
+                )
+            except OSError:
+                return None
+            finally:
+                if stdin != 0:
+                    os.close(stdin)
+            return DaemonClient._await(connection=connection)
+
+    @staticmethod
+    def _await(connection: socket.socket) -> Optional[int]:
+        """
+        Relays signals to the invocation until the daemon reports its exit code.
+
+        Parameters
+        ----------
+        connection: The connection the invocation was forwarded over.
+
+        Returns
+        -------
+        The exit code, None when the daemon declined the invocation.
+        """
+
+        def relay(number: int, _: Any) -> None:
+            try:
+                connection.sendall(json.dumps({"signal": number}).encode("utf-8") + b"\n")
+            except OSError:
+                pass
+
+        previous: dict = {}
+        for name in DaemonClient.FORWARDED_SIGNALS:
+            if hasattr(signal, name):
+                previous[getattr(signal, name)] = signal.signal(getattr(signal, name), relay)
+        try:
+            reply: bytes = connection.makefile("rb").readline()
+        finally:
+            for number, handler in previous.items():
+                signal.signal(number, handler)
+        if not reply:
+            print("sacr: lost the connection to the daemon", file=sys.stderr)
+            return 1
+        result: dict = json.loads(reply)
+        if result.get("fallback"):
+            return None
+        return int(result["returncode"])
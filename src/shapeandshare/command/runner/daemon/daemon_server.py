@@ -0,0 +1,543 @@
+""" Daemon Server Definition """
+
+import importlib
+import json
+import os
+import selectors
+import signal
+import socket
+import stat
+import struct
+import sys
+import time
+import traceback
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .daemon_client import DaemonClient
+
+if TYPE_CHECKING:
+    from ..manager import Manager
+
+
+# pylint: disable=too-many-instance-attributes
+class DaemonServer:
+    """
+    Daemon Server
+    The warm side of `sacr daemon`: keeps the modules of sacr imported and, per project directory, a Manager whose
+    settings (ManagerConfig) and backend (BackendModel) are already parsed.  Before every invocation the configuration
+    files are stat'ed and re-parsed when changed.  Invocations (see DaemonClient) are served by forked children, so
+    each runs isolated (within its own process group, working directory, environment and umask) with the standard
+    streams the client handed over, while the parent remains single threaded and only accepts connections, relays
+    signals and reports exit codes.  Only connections from the same user are served.
+
+    Attributes
+    ----------
+    path
+        The socket path.
+    started
+        When the daemon started (seconds since the epoch).
+    served
+        The number of invocations served.
+    PRELOAD
+        The modules imported up front (relative to the package), so that invocations never import them.
+    REQUEST_TIMEOUT
+        Seconds a connection is given to send its request, default: 5
+    MAX_FDS
+        The maximum number of file descriptors accepted with a request, default: 3
+    """
+
+    path: str
+    started: float
+    served: int
+    PRELOAD: tuple = (
+        "manager",
+        "backends.backend_config",
+        "backends.backend_package",
+        "backends.backend_factory",
+        "cache.artifact_cache",
+        "cache.config_cache",
+        "cache.state_store",
+        "execution.scheduler",
+        "execution.job_graph",
+        "execution.matrix_report",
+    )
+    REQUEST_TIMEOUT: float = 5
+    MAX_FDS: int = 3
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or DaemonClient.socket_path()
+        self.started = time.time()
+        self.served = 0
+        self._managers: dict[str, tuple[tuple, "Manager"]] = {}
+        self._children: dict[int, socket.socket] = {}
+        self._selector: selectors.BaseSelector = selectors.DefaultSelector()
+        self._listener: Optional[socket.socket] = None
+        self._wakeup: Optional[tuple[socket.socket, socket.socket]] = None
+        self._stopping: bool = False
+
+    def serve(self, ready: Optional[Callable[[], None]] = None) -> None:
+        """
+        Serves invocations until stopped (via `sacr daemon stop`, SIGTERM or SIGINT).
+
+        Parameters
+        ----------
+        ready: Called once the daemon is listening, if provided.
+        """
+
+        for module in DaemonServer.PRELOAD:
+            importlib.import_module(f"..{module}", package=__package__)
+        self._listen()
+        # Children exiting wake the selector up.
+        self._wakeup = socket.socketpair()
+        for end in self._wakeup:
+            end.setblocking(False)
+        signal.set_wakeup_fd(self._wakeup[1].fileno(), warn_on_full_buffer=False)
+        signal.signal(signal.SIGCHLD, lambda *_: None)
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        self._selector.register(self._wakeup[0], selectors.EVENT_READ, self._reap)
+        if ready is not None:
+            ready()
+
+        try:
+            while not self._stopping or self._children:
+                for key, _ in self._selector.select():
+                    key.data(key.fileobj)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._shutdown()
+
+    def detach(self) -> int:
+        """
+        Starts serving within a background process (detached from the terminal).
+
+        Returns
+        -------
+        The process id of the daemon.
+        """
+
+        self.prepare()
+        sys.stdout.flush()
+        sys.stderr.flush()
+        read_fd, write_fd = os.pipe()
+        pid: int = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            self._daemonize(write_fd=write_fd)
+        os.close(write_fd)
+        os.waitpid(pid, 0)
+        with os.fdopen(read_fd, mode="rb") as pipe:
+            reported: bytes = pipe.read()
+        return int(reported or 0)
+
+    def _daemonize(self, write_fd: int) -> None:
+        """
+        Detaches from the terminal and serves (within the child forked by detach), never returning.
+
+        Parameters
+        ----------
+        write_fd: Where the process id of the daemon is reported once it is listening.
+        """
+
+        code: int = 1
+        try:
+            os.setsid()
+            if os.fork():
+                code = 0
+                return
+            log: int = os.open(f"{self.path}.log", os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            null: int = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(null, 0)
+            os.dup2(log, 1)
+            os.dup2(log, 2)
+            os.close(null)
+            os.close(log)
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+
+            def report() -> None:
+                os.write(write_fd, str(os.getpid()).encode("ascii"))
+                os.close(write_fd)
+
+            self.serve(ready=report)
+            code = 0
+        except BaseException:  # pylint: disable=broad-except
+            traceback.print_exc()
+        finally:
+            os._exit(code)  # pylint: disable=protected-access
+
+    def prepare(self) -> None:
+        """Creates the folder of the socket (private to the user), replacing a stale socket."""
+
+        folder: str = os.path.dirname(self.path)
+        os.makedirs(folder, mode=0o700, exist_ok=True)
+        if os.stat(folder).st_uid != os.getuid():
+            raise PermissionError(f"{folder} is owned by another user")
+        if os.path.exists(self.path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(self.path)
+                except OSError:
+                    os.unlink(self.path)
+                    return
+            raise FileExistsError(f"A daemon is already listening on {self.path}")
+
+    def _listen(self) -> None:
+        """Binds the socket."""
+
+        self.prepare()
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(self.path)
+        os.chmod(self.path, stat.S_IRUSR | stat.S_IWUSR)
+        self._listener.listen(64)
+        self._selector.register(self._listener, selectors.EVENT_READ, self._accept)
+
+    def _shutdown(self) -> None:
+        """Stops listening, terminating any invocation still running."""
+
+        for pid in list(self._children):
+            DaemonServer._signal(pid=pid, number=signal.SIGTERM)
+        self._close()
+        signal.set_wakeup_fd(-1)
+        self._selector.close()
+
+    def _close(self) -> None:
+        """Stops listening (removing the socket), leaving running invocations to complete."""
+
+        if self._listener is None:
+            return
+        self._selector.unregister(self._listener)
+        self._listener.close()
+        self._listener = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _accept(self, listener: socket.socket) -> None:
+        """
+        Accepts a connection and serves its request.
+
+        Parameters
+        ----------
+        listener: The listening socket.
+        """
+
+        connection, _ = listener.accept()
+        fds: list[int] = []
+        try:
+            connection.settimeout(DaemonServer.REQUEST_TIMEOUT)
+            if not DaemonServer._same_user(connection=connection):
+                connection.close()
+                return
+            request, fds = DaemonServer._receive(connection=connection)
+            if request.get("command") == "run":
+                self._run(connection=connection, request=request, fds=fds)
+                return
+            if request.get("command") == "stop":
+                self._stopping = True
+                self._close()
+            DaemonServer._reply(connection=connection, message=self._status())
+            connection.close()
+        except (OSError, ValueError, KeyError) as error:
+            print(f"sacr daemon: rejected a request: {error}", file=sys.stderr, flush=True)
+            connection.close()
+        finally:
+            for fd in fds:
+                os.close(fd)
+
+    def _status(self) -> dict:
+        """
+        Describes the daemon.
+
+        Returns
+        -------
+        Its process id, socket, start time, projects, invocations served and invocations running.
+        """
+
+        return {
+            "pid": os.getpid(),
+            "socket": self.path,
+            "started": self.started,
+            "projects": sorted(self._managers),
+            "served": self.served,
+            "running": len(self._children),
+            "stopping": self._stopping,
+        }
+
+    def _run(self, connection: socket.socket, request: dict, fds: list[int]) -> None:
+        """
+        Serves an invocation within a forked child.
+
+        Parameters
+        ----------
+        connection: The connection of the client.
+        request: The invocation.
+        fds: The standard streams of the client.
+        """
+
+        if request.get("identity") != DaemonClient.identity() or len(fds) != 3 or self._stopping:
+            DaemonServer._reply(connection=connection, message={"fallback": True})
+            connection.close()
+            return
+        manager: "Manager" = self._manager(cwd=request["cwd"])
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid: int = os.fork()
+        if pid == 0:
+            self._child(request=request, fds=fds, manager=manager)
+        self.served += 1
+        connection.setblocking(False)
+        self._children[pid] = connection
+        self._selector.register(connection, selectors.EVENT_READ, lambda _: self._relay(pid=pid))
+
+    def _manager(self, cwd: str) -> "Manager":
+        """
+        The warm manager of a project directory, re-parsing its configuration when changed.
+
+        Parameters
+        ----------
+        cwd: The project directory.
+
+        Returns
+        -------
+        The manager, with its settings and backend loaded when they parse.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from ..manager import Manager
+
+        cached: Optional[tuple[tuple, Manager]] = self._managers.get(cwd)
+        if cached is not None and cached[0] == DaemonServer._signature(manager=cached[1]):
+            return cached[1]
+        manager: Manager = Manager(base_path=cwd)
+        try:
+            manager.backend.model  # pylint: disable=pointless-statement
+        except Exception:  # pylint: disable=broad-except
+            # Left for the invocation to report.
+            self._managers.pop(cwd, None)
+            return Manager(base_path=cwd)
+        self._managers[cwd] = (DaemonServer._signature(manager=manager), manager)
+        return manager
+
+    @staticmethod
+    def _signature(manager: "Manager") -> tuple:
+        """
+        Identifies the state of the configuration files of a manager.
+
+        Parameters
+        ----------
+        manager: The manager, with its backend loaded.
+
+        Returns
+        -------
+        The modification time, size and inode of each configuration file (None when missing).
+        """
+
+        signature: list = []
+        for path in (manager.config_file, manager.backend.conf):
+            try:
+                status: os.stat_result = os.stat(path)
+                signature.append((status.st_mtime_ns, status.st_size, status.st_ino))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _child(self, request: dict, fds: list[int], manager: "Manager") -> None:
+        """
+        Runs an invocation (within the forked child), never returning.
+
+        Parameters
+        ----------
+        request: The invocation.
+        fds: The standard streams of the client.
+        manager: The warm manager of the project.
+        """
+
+        code: int = 1
+        try:
+            os.setpgid(0, 0)
+            signal.set_wakeup_fd(-1)
+            for number in (signal.SIGCHLD, signal.SIGTERM, signal.SIGHUP):
+                signal.signal(number, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            self._selector.close()
+            for connection in self._children.values():
+                connection.close()
+            if self._listener is not None:
+                self._listener.close()
+            for end in self._wakeup:
+                end.close()
+
+            for target, fd in enumerate(fds):
+                os.dup2(fd, target)
+                os.close(fd)
+            os.chdir(request["cwd"])
+            os.environ.clear()
+            os.environ.update(request["env"])
+            os.umask(request["umask"])
+            sys.stdin = open(  # pylint: disable=consider-using-with
+                0, mode="r", encoding=sys.stdin.encoding, closefd=False
+            )
+            sys.stdout = open(  # pylint: disable=consider-using-with
+                1, mode="w", buffering=1 if os.isatty(1) else -1, encoding=sys.stdout.encoding, closefd=False
+            )
+            sys.stderr = open(  # pylint: disable=consider-using-with
+                2, mode="w", buffering=1, encoding=sys.stderr.encoding, errors="backslashreplace", closefd=False
+            )
+            sys.argv = ["sacr"] + list(request["argv"])
+            code = 0
+            manager.main()
+        except SystemExit as error:
+            code = error.code if isinstance(error.code, int) else (0 if error.code is None else 1)
+            if not isinstance(error.code, (int, type(None))):
+                print(error.code, file=sys.stderr)
+        except KeyboardInterrupt:
+            traceback.print_exc()
+            code = 128 + signal.SIGINT
+        except BaseException:  # pylint: disable=broad-except
+            traceback.print_exc()
+            code = 1
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(code)  # pylint: disable=protected-access
+
+    def _relay(self, pid: int) -> None:
+        """
+        Relays the signals a client sends to its invocation, terminating the invocation when the client disconnects.
+
+        Parameters
+        ----------
+        pid: The process of the invocation.
+        """
+
+        connection: socket.socket = self._children[pid]
+        try:
+            data: bytes = connection.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._selector.unregister(connection)
+            DaemonServer._signal(pid=pid, number=signal.SIGTERM)
+            return
+        for line in data.splitlines():
+            try:
+                DaemonServer._signal(pid=pid, number=int(json.loads(line)["signal"]))
+            except (ValueError, KeyError, TypeError):
+                continue
+
+    def _reap(self, wakeup: socket.socket) -> None:
+        """
+        Reports the exit codes of the invocations which ended.
+
+        Parameters
+        ----------
+        wakeup: The wake up socket signals are written to.
+        """
+
+        try:
+            while wakeup.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+        for pid in list(self._children):
+            try:
+                reaped, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                reaped, status = pid, 1 << 8
+            if reaped == 0:
+                continue
+            connection: socket.socket = self._children.pop(pid)
+            if connection.fileno() in self._selector.get_map():
+                self._selector.unregister(connection)
+            code: int = os.waitstatus_to_exitcode(status)
+            try:
+                connection.setblocking(True)
+                DaemonServer._reply(connection=connection, message={"returncode": 128 - code if code < 0 else code})
+            except OSError:
+                pass
+            connection.close()
+
+    @staticmethod
+    def _signal(pid: int, number: int) -> None:
+        """
+        Signals the process group of an invocation.
+
+        Parameters
+        ----------
+        pid: The process of the invocation (leading its process group).
+        number: The signal.
+        """
+
+        try:
+            os.killpg(pid, number)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    @staticmethod
+    def _same_user(connection: socket.socket) -> bool:
+        """
+        Whether a connection comes from the user running the daemon (where the peer can be identified).
+
+        Parameters
+        ----------
+        connection: The connection.
+
+        Returns
+        -------
+        False when the peer belongs to another user.
+        """
+
+        if not hasattr(socket, "SO_PEERCRED"):
+            return True
+        credentials: bytes = connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        _, uid, _ = struct.unpack("3i", credentials)
+        return uid == os.getuid()
+
+    @staticmethod
+    def _receive(connection: socket.socket) -> tuple[dict, list[int]]:
+        """
+        Receives a request (length prefixed JSON) and the file descriptors handed over with it.
+
+        Parameters
+        ----------
+        connection: The connection.
+
+        Returns
+        -------
+        The request and the file descriptors.
+        """
+
+        data, fds, _, _ = socket.recv_fds(connection, 64 * 1024, DaemonServer.MAX_FDS)
+        if len(data) < DaemonClient.HEADER_SIZE:
+            for fd in fds:
+                os.close(fd)
+            raise ValueError("truncated request")
+        size: int = int.from_bytes(data[: DaemonClient.HEADER_SIZE], "big")
+        payload: bytearray = bytearray(data[DaemonClient.HEADER_SIZE :])
+        try:
+            while len(payload) < size:
+                chunk: bytes = connection.recv(size - len(payload))
+                if not chunk:
+                    raise ValueError("truncated request")
+                payload += chunk
+            return json.loads(payload), fds
+        except (OSError, ValueError):
+            for fd in fds:
+                os.close(fd)
+            raise
+
+    @staticmethod
+    def _reply(connection: socket.socket, message: dict) -> None:
+        """
+        Sends a reply (a JSON line).
+
+        Parameters
+        ----------
+        connection: The connection.
+        message: The reply.
+        """
+
+        connection.sendall(json.dumps(message).encode("utf-8") + b"\n")
@@ -0,0 +1,146 @@
+""" Admission Controller Definition """
+
+import os
+from typing import Iterable, Optional
+
+from .job import Job
+
+
+class AdmissionController:
+    """
+    Admission Controller
+    Decides whether a ready job may start alongside the running ones.  Jobs occupy as many concurrency slots as the
+    cpu weight declared for their alias (see JobResources), and the running jobs may not occupy more than `jobs`
+    slots.  When adaptive (`-j auto`), jobs are also held back while the machine is busy: while the 1-minute load
+    average leaves no cpu for the job's weight, or while the available memory (less the memory reserved by the running
+    jobs) can not fit the job's declared memory plus a safety margin.  A job is always admitted when nothing else is
+    running, so that heavy jobs still run (on their own).
+
+    Attributes
+    ----------
+    jobs
+        The number of concurrency slots.
+    adaptive
+        Whether the live load and memory of the machine are taken into account.
+    cpus
+        The number of cpus of the machine.
+    POLL_INTERVAL
+        Seconds between re-evaluations of held back jobs when adaptive, default: 0.5
+    MEMORY_MARGIN
+        The fraction of the total memory kept free when adaptive, default: 0.05
+    LOADAVG_PATH
+        The kernel load average, default: /proc/loadavg
+    MEMINFO_PATH
+        The kernel memory statistics, default: /proc/meminfo
+    """
+
+    jobs: int
+    adaptive: bool
+    cpus: int
+    POLL_INTERVAL: float = 0.5
+    MEMORY_MARGIN: float = 0.05
+    LOADAVG_PATH: str = "/proc/loadavg"
+    MEMINFO_PATH: str = "/proc/meminfo"
+
+    def __init__(self, jobs: int, adaptive: bool = False):
+        self.jobs = max(1, jobs)
+        self.adaptive = adaptive
+        self.cpus = os.cpu_count() or 1
+
+    def admits(self, job: Job, running: Iterable[Job]) -> bool:
+        """
+        Decides whether a job may start.
+
+        Parameters
+        ----------
+        job: The job ready to start.
+        running: The jobs currently running.
+
+        Returns
+        -------
+        Whether the job may start now.
+        """
+
+        running = list(running)
+        if not running:
+            return True
+        weight: float = AdmissionController.weight(job=job)
+        used: float = sum(AdmissionController.weight(job=other) for other in running)
+        if used + weight > self.jobs:
+            return False
+        if not self.adaptive:
+            return True
+
+        load: Optional[float] = AdmissionController.load()
+        # Our own jobs are part of the load average (or soon will be), so the load is at least what they occupy.
+        if load is not None and max(load, used) + weight > self.cpus:
+            return False
+        memory: Optional[tuple[int, int]] = AdmissionController.memory()
+        if memory is not None and job.resources is not None and job.resources.mem:
+            available, total = memory
+            reserved: int = sum(other.resources.mem or 0 for other in running if other.resources is not None)
+            if available - reserved < job.resources.mem + total * self.MEMORY_MARGIN:
+                return False
+        return True
+
+    @staticmethod
+    def weight(job: Job) -> float:
+        """
+        The number of concurrency slots a job occupies.
+
+        Parameters
+        ----------
+        job: The job.
+
+        Returns
+        -------
+        The cpu weight of the job, default: 1
+        """
+
+        return job.resources.cpu if job.resources is not None else 1.0
+
+    @staticmethod
+    def load() -> Optional[float]:
+        """
+        The load of the machine.
+
+        Returns
+        -------
+        The 1-minute load average, capped by the number of tasks runnable right now (as the average lags behind
+        jobs which just ended), None when unavailable.
+        """
+
+        try:
+            with open(AdmissionController.LOADAVG_PATH, mode="r", encoding="ascii") as file:
+                fields: list[str] = file.read().split()
+            # Excluding ourselves, reading the file.
+            return min(float(fields[0]), max(0.0, float(fields[3].split("/")[0]) - 1))
+        except (OSError, IndexError, ValueError):
+            pass
+        try:
+            return os.getloadavg()[0]
+        except (AttributeError, OSError):
+            return None
+
+    @staticmethod
+    def memory() -> Optional[tuple[int, int]]:
+        """
+        The memory of the machine.
+
+        Returns
+        -------
+        The available and total memory in bytes, None when unavailable.
+        """
+
+        values: dict[str, int] = {}
+        try:
+            with open(AdmissionController.MEMINFO_PATH, mode="r", encoding="ascii") as file:
+                for line in file:
+                    name, _, value = line.partition(":")
+                    if name in ("MemAvailable", "MemTotal"):
+                        values[name] = int(value.split()[0]) * 1024
+        except (OSError, IndexError, ValueError):
+            return None
+        if len(values) != 2:
+            return None
+        return values["MemAvailable"], values["MemTotal"]
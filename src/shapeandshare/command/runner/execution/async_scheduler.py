@@ -0,0 +1,522 @@
+""" Async Job Scheduler Definition """
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from asyncio import StreamReader
+from asyncio.subprocess import PIPE, Process
+from collections import deque
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+from ..contacts.errors.subprocess_failure_error import SubprocessFailureError
+from ..contacts.step_status import StepStatus
+from .base_scheduler import BaseScheduler
+from .command_resolver import CommandResolver
+from .job import Job
+from .job_graph import JobGraph
+from .output_stream import OutputStream
+from .process_pipeline import ProcessPipeline
+from .shell_session import ShellSession
+from .step_log import StepLog
+
+
+# pylint: disable=too-few-public-methods
+class AsyncScheduler(BaseScheduler):
+    """
+    Async Job Scheduler
+    The asyncio counterpart of Scheduler: runs the jobs of a job graph as tasks on the running event loop, starting
+    each job once all of its prerequisites succeed, so that many runs can be driven from a single event loop.
+
+    Processes are spawned with asyncio.create_subprocess_exec (or _shell, for commands requiring a shell, while the
+    stages of a pipeline are connected through os.pipe) and their output is streamed through an OutputStream per
+    pipe.  Concurrency is bounded per run by `jobs`, and optionally across runs by a shared `limiter` semaphore.
+    Steps are bounded by the per-command timeout and the whole run by the timeout given to execute.  Cancelling the
+    awaiting task (or the first failure, or a timeout) terminates every running process, though a failure within a
+    matrix cell only holds back the jobs depending on it.  Blocking work (hashing inputs, the state store, the
+    artifact cache and shell sessions) runs within worker threads.  Process settings (see ProcessLimits) are applied
+    as by Scheduler, though admission is bounded by `jobs` alone.  The
+    remaining settings are described by BaseScheduler.
+
+    Attributes
+    ----------
+    cwd
+        The directory commands run within, None for the current working directory.
+    limiter
+        A semaphore shared between runs bounding their combined concurrency, if any.
+    READ_SIZE
+        The maximum number of bytes read from a pipe at once, default: 65536
+    """
+
+    cwd: Optional[str]
+    limiter: Optional[asyncio.Semaphore]
+    READ_SIZE: int = 64 * 1024
+
+    def __init__(self, cwd: Optional[str] = None, limiter: Optional[asyncio.Semaphore] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.cwd = cwd
+        self.limiter = limiter
+        self._sessions: dict[str, ShellSession] = {}
+        self._streamed: bool = True
+
+    async def execute(self, graph: JobGraph, timeout: Optional[float] = None) -> None:
+        """
+        Runs every job within the graph.
+
+        Parameters
+        ----------
+        graph: The job graph to execute.
+        timeout: The maximum duration (in seconds) of the whole run.
+        """
+
+        self._streamed = self._streams(graph=graph)
+        self._plan(graph=graph)
+        try:
+            await asyncio.wait_for(self._execute(graph=graph), timeout=timeout)
+        except asyncio.TimeoutError as error:
+            raise SubprocessFailureError(
+                command=graph.alias or "", message=f"Exceeded run timeout limit of {timeout}", returncode=1
+            ) from error
+
+    async def _execute(self, graph: JobGraph) -> None:
+        """
+        Runs every job within the graph, without a deadline.
+
+        Parameters
+        ----------
+        graph: The job graph to execute.
+        """
+
+        waiting_on: dict[Job, int] = {job: len(job.dependencies) for job in graph.jobs}
+        ready: deque[Job] = deque()
+        running: dict[asyncio.Task, Job] = {}
+        failure: Optional[BaseException] = None
+        stopping: bool = False
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self.jobs)
+        self._queue(jobs=graph.roots(), ready=ready)
+
+        try:
+            while ready or running:
+                while ready and not stopping:
+                    job: Job = ready.popleft()
+                    running[asyncio.ensure_future(self._run(job=job, semaphore=semaphore))] = job
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    job = running.pop(task)
+                    error: Optional[BaseException] = None if task.cancelled() else task.exception()
+                    if error is None and not task.cancelled():
+                        self._release(job=job, waiting_on=waiting_on, ready=ready)
+                        continue
+                    failure = failure or error
+                    # A failed matrix cell only holds back its own dependents, the other cells carry on.
+                    if error is not None and not job.cell and not stopping:
+                        stopping = True
+                        for other in running:
+                            other.cancel()
+                if stopping:
+                    ready.clear()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            await self._close_sessions()
+
+        if failure is not None:
+            raise failure
+
+    async def _close_sessions(self) -> None:
+        """Ends every shell session."""
+
+        sessions: list[ShellSession] = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            await asyncio.to_thread(session.close)
+
+    async def _run(self, job: Job, semaphore: asyncio.Semaphore) -> None:
+        """
+        Runs a single job once a slot is available.
+
+        Parameters
+        ----------
+        job: The job to run.
+        semaphore: Bounds the concurrency of this run.
+        """
+
+        async with semaphore:
+            if self.limiter is None:
+                await self._measure(job=job)
+                return
+            async with self.limiter:
+                await self._measure(job=job)
+
+    async def _measure(self, job: Job) -> None:
+        """
+        Runs a single job, recording its metrics.  Process resource usage is not measured, as asyncio reaps processes.
+
+        Parameters
+        ----------
+        job: The job to run.
+        """
+
+        started: float = time.monotonic()
+        slot: int = self._claim_slot()
+        try:
+            status: str = await self._run_job(job=job)
+        except asyncio.CancelledError as error:
+            self._record(job=job, status=StepStatus.CANCELLED, started=started, slot=slot, error=error)
+            raise
+        except BaseException as error:
+            self._record(job=job, status=StepStatus.FAILED, started=started, slot=slot, error=error)
+            raise
+        finally:
+            self._free_slot(slot=slot)
+        self._record(job=job, status=status, started=started, slot=slot)
+
+    async def _run_job(self, job: Job) -> str:
+        """
+        Runs a single job.
+
+        Parameters
+        ----------
+        job: The job to run.
+
+        Returns
+        -------
+        How the job concluded (a StepStatus value).
+        """
+
+        if job.session is not None:
+            await self._launch_in_session(job=job)
+            return StepStatus.RAN
+
+        fingerprint: Optional[str] = None
+        if self.state is not None:
+            fingerprint = await asyncio.to_thread(self.state.fingerprint, job)
+            if await asyncio.to_thread(self.state.up_to_date, job, fingerprint):
+                self._announce(job=job, note="up to date")
+                return StepStatus.UP_TO_DATE
+
+        status: str = StepStatus.RAN
+
+        if self.artifacts is not None and fingerprint is not None:
+            manifest: Optional[dict] = await asyncio.to_thread(self.artifacts.lookup, fingerprint)
+            if manifest is not None:
+                self._announce(job=job, note="restored from cache")
+                await asyncio.to_thread(self.artifacts.restore, fingerprint, manifest)
+                await self._replay(job=job, manifest=manifest)
+                await asyncio.to_thread(self._log_restored, job, manifest)
+                status = StepStatus.RESTORED
+            else:
+                with self.artifacts.temporary_file() as stdout, self.artifacts.temporary_file() as stderr:
+                    await self._launch(job=job, capture=(stdout, stderr))
+                    await asyncio.to_thread(self.artifacts.store, fingerprint, job.outputs, stdout, stderr)
+        else:
+            await self._launch(job=job)
+
+        if self.state is not None:
+            await asyncio.to_thread(self.state.record, job, fingerprint)
+        return status
+
+    async def _launch_in_session(self, job: Job) -> None:
+        """
+        Runs a job within the shell session of its alias, starting the session if required.
+
+        Parameters
+        ----------
+        job: The job to run.
+        """
+
+        session: Optional[ShellSession] = self._sessions.get(job.session)
+        if session is None or not session.alive:
+            session = await asyncio.to_thread(ShellSession, self.cwd)
+            self._sessions[job.session] = session
+        self._announce(job=job)
+        tail: deque = OutputStream.new_tail()
+        pumps: list[asyncio.Task] = []
+        if self._streamed:
+            readers: tuple[int, int] = session.outputs()
+            pumps = self._stream(
+                job=job,
+                readers=(await AsyncScheduler._reader(fd=readers[0]), await AsyncScheduler._reader(fd=readers[1])),
+                capture=None,
+                tail=tail,
+            )
+        try:
+            returncode: int = await asyncio.to_thread(session.run, job.display, self.per_command_timeout)
+        except asyncio.CancelledError:
+            await asyncio.to_thread(session.terminate)
+            raise
+        except subprocess.TimeoutExpired as error:
+            await asyncio.to_thread(session.terminate)
+            raise self._failure(job=job, returncode=1, tail=tail, timed_out=True) from error
+        finally:
+            if pumps:
+                _, pending = await asyncio.wait(pumps, timeout=self.DRAIN_TIMEOUT)
+                for pump in pending:
+                    pump.cancel()
+        if returncode != 0:
+            raise self._failure(job=job, returncode=returncode, tail=tail)
+
+    async def _pump(self, reader: asyncio.StreamReader, stream: OutputStream) -> None:
+        """
+        Copies a process pipe into an output stream until end of file.
+
+        Parameters
+        ----------
+        reader: The process pipe.
+        stream: The output stream.
+        """
+
+        try:
+            while True:
+                chunk: bytes = await reader.read(self.READ_SIZE)
+                if not chunk:
+                    return
+                stream.write(chunk=chunk)
+        finally:
+            stream.finish()
+
+    async def _replay(self, job: Job, manifest: dict) -> None:
+        """
+        Writes out the cached output of a job restored from the artifact cache through output streams, exactly as the
+        output of its process would have been (labelled, or only kept as the tail when quiet).
+
+        Parameters
+        ----------
+        job: The restored job.
+        manifest: The artifact cache manifest of the job.
+        """
+
+        sources: list[Path] = self.artifacts.logs(manifest=manifest)
+        if not self._streamed:
+            await asyncio.to_thread(self._replay_inherited, sources)
+            return
+        tail: deque = OutputStream.new_tail()
+        for source, target in zip(sources, (sys.stdout, sys.stderr)):
+            target.flush()
+            stream: OutputStream = OutputStream(
+                label=self._label(job=job), target=self._target(stream=target), tail=tail
+            )
+            with open(source, mode="rb") as file:
+                try:
+                    while True:
+                        chunk: bytes = await asyncio.to_thread(file.read, self.READ_SIZE)
+                        if not chunk:
+                            break
+                        stream.write(chunk=chunk)
+                finally:
+                    stream.finish()
+
+    def _stream(
+        self,
+        job: Job,
+        readers: tuple[Optional[StreamReader], Optional[StreamReader]],
+        capture: Optional[tuple[BinaryIO, BinaryIO]],
+        tail: deque,
+    ) -> list[asyncio.Task]:
+        """
+        Starts copying the stdout and stderr pipes of a process into output streams (and the log of the job, when
+        logging), unless output is inherited.
+
+        Parameters
+        ----------
+        job: The job the process belongs to.
+        readers: The stdout and stderr pipes.
+        capture: Files receiving a copy of the stdout and stderr of the process, if any.
+        tail: Receives the trailing lines of the output.
+
+        Returns
+        -------
+        The copying tasks.
+        """
+
+        if not self._streamed:
+            return []
+        pumps: list[asyncio.Task] = []
+        log: Optional[StepLog] = self.logs.open(job=job) if self.logs is not None else None
+        for index, (reader, target) in enumerate(zip(readers, (sys.stdout, sys.stderr))):
+            target.flush()
+            stream: OutputStream = OutputStream(
+                label=self._label(job=job),
+                target=self._target(stream=target),
+                capture=capture[index] if capture is not None else None,
+                tail=tail,
+                log=log,
+            )
+            pumps.append(asyncio.ensure_future(self._pump(reader=reader, stream=stream)))
+        return pumps
+
+    async def _launch(self, job: Job, capture: Optional[tuple[BinaryIO, BinaryIO]] = None) -> None:
+        """
+        Launches the process of a job and waits for it to complete.
+
+        Parameters
+        ----------
+        job: The job to run.
+        capture: Files receiving a copy of the stdout and stderr of the process, if any.
+        """
+
+        stages: Optional[list[list[str]]] = CommandResolver.stages(command=job.command)
+        self._announce(job=job)
+        try:
+            if stages is None:
+                processes, readers = await self._spawn(job=job)
+            else:
+                processes, readers = await self._spawn_pipeline(job=job, stages=stages)
+        except (OSError, subprocess.SubprocessError) as error:
+            raise self._failure(job=job, returncode=127, message=str(error)) from error
+
+        tail: deque = OutputStream.new_tail()
+        pumps: list[asyncio.Task] = self._stream(job=job, readers=readers, capture=capture, tail=tail)
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(process.wait() for process in processes)), timeout=self.per_command_timeout
+            )
+        except asyncio.TimeoutError as error:
+            await asyncio.gather(*(AsyncScheduler._terminate(process=process) for process in processes))
+            raise self._failure(job=job, returncode=1, tail=tail, timed_out=True) from error
+        except asyncio.CancelledError:
+            await asyncio.gather(*(AsyncScheduler._terminate(process=process) for process in processes))
+            raise
+        finally:
+            if pumps:
+                _, pending = await asyncio.wait(pumps, timeout=self.DRAIN_TIMEOUT)
+                for pump in pending:
+                    pump.cancel()
+        returncodes: list[Optional[int]] = [process.returncode for process in processes]
+        returncode: int = ProcessPipeline.outcome(returncodes=returncodes)
+        if returncode != 0:
+            message: Optional[str] = None
+            if stages is not None:
+                message = ProcessPipeline.describe(stages=stages, returncodes=returncodes)
+            raise self._failure(job=job, returncode=returncode, tail=tail, message=message)
+
+    async def _spawn(self, job: Job) -> tuple[list[Process], tuple[Optional[StreamReader], Optional[StreamReader]]]:
+        """
+        Spawns the process of a job.
+
+        Parameters
+        ----------
+        job: The job to run.
+
+        Returns
+        -------
+        The process, and its stdout and stderr pipes (None when output is inherited).
+        """
+
+        resolved: Optional[tuple[str, list[str]]] = self._resolver.resolve(command=job.command)
+        pipe: Optional[int] = PIPE if self._streamed else None
+        preexec: Optional[Callable[[], None]] = job.limits.apply if job.limits is not None else None
+        if resolved is None:
+            process: Process = await asyncio.create_subprocess_shell(
+                job.command, stdout=pipe, stderr=pipe, cwd=self.cwd, preexec_fn=preexec
+            )
+        else:
+            process = await asyncio.create_subprocess_exec(
+                *resolved[1], executable=resolved[0], stdout=pipe, stderr=pipe, cwd=self.cwd, preexec_fn=preexec
+            )
+        return [process], (process.stdout, process.stderr)
+
+    async def _spawn_pipeline(
+        self, job: Job, stages: list[list[str]]
+    ) -> tuple[list[Process], tuple[Optional[StreamReader], Optional[StreamReader]]]:
+        """
+        Spawns the processes of a pipeline job (see ProcessPipeline), connected stdout to stdin through os.pipe and
+        sharing a single stderr pipe, stopping those already spawned should one fail to spawn.
+
+        Parameters
+        ----------
+        job: The job to run.
+        stages: The argv of each stage.
+
+        Returns
+        -------
+        The process of each stage, and the stdout (of the last) and stderr pipes (None when output is inherited).
+        """
+
+        preexec: Optional[Callable[[], None]] = job.limits.apply if job.limits is not None else None
+        errors: tuple[Optional[int], Optional[int]] = os.pipe() if self._streamed else (None, None)
+        processes: list[Process] = []
+        reader: Optional[int] = None
+        try:
+            for index, argv in enumerate(stages):
+                last: bool = index == len(stages) - 1
+                next_reader, writer = (None, None) if last else os.pipe()
+                try:
+                    processes.append(
+                        await asyncio.create_subprocess_exec(
+                            *argv,
+                            executable=self._resolver.which(name=argv[0]) or argv[0],
+                            stdin=reader,
+                            stdout=(PIPE if self._streamed else None) if last else writer,
+                            stderr=errors[1],
+                            cwd=self.cwd,
+                            preexec_fn=preexec,
+                        )
+                    )
+                finally:
+                    # The stages hold the pipe ends from here on.
+                    if reader is not None:
+                        os.close(reader)
+                    if writer is not None:
+                        os.close(writer)
+                    reader = next_reader
+        except BaseException:
+            for fd in (reader, errors[0]):
+                if fd is not None:
+                    os.close(fd)
+            await asyncio.gather(*(AsyncScheduler._terminate(process=process) for process in processes))
+            raise
+        finally:
+            # Only the stages hold the write end, so the stderr pipe reaches end of file once every stage exits.
+            if errors[1] is not None:
+                os.close(errors[1])
+
+        stderr: Optional[StreamReader] = await AsyncScheduler._reader(fd=errors[0]) if errors[0] is not None else None
+        return processes, (processes[-1].stdout, stderr)
+
+    @staticmethod
+    async def _reader(fd: int) -> StreamReader:
+        """
+        Reads the read end of a pipe on the running event loop.
+
+        Parameters
+        ----------
+        fd: The read end of the pipe (the reader takes ownership of the descriptor).
+
+        Returns
+        -------
+        The stream reader of the pipe.
+        """
+
+        reader: StreamReader = StreamReader()
+        await asyncio.get_running_loop().connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader), os.fdopen(fd, mode="rb", buffering=0)
+        )
+        return reader
+
+    @staticmethod
+    async def _terminate(process: Process) -> None:
+        """
+        Terminates a process, killing it if it does not exit within the grace period.
+
+        Parameters
+        ----------
+        process: The process to stop.
+        """
+
+        if process.returncode is not None:
+            return
+        try:
+            process.terminate()
+            await asyncio.wait_for(process.wait(), timeout=AsyncScheduler.TERMINATE_GRACE_PERIOD)
+        except ProcessLookupError:
+            return
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
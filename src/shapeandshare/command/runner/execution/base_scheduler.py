@@ -0,0 +1,437 @@
+""" Base Job Scheduler Definition """
+
+import heapq
+import shutil
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Iterable, Optional, TextIO
+
+from ..cache.artifact_cache import ArtifactCache
+from ..cache.state_store import StateStore
+from ..contacts.errors.subprocess_failure_error import SubprocessFailureError
+from ..contacts.output_type import OutputType
+from ..contacts.step_status import StepStatus
+from .command_resolver import CommandResolver
+from .job import Job
+from .job_graph import JobGraph
+from .output_stream import OutputStream
+from .step_recorder import StepRecorder
+
+if TYPE_CHECKING:
+    import resource
+
+    from ..cache.run_history import RunHistory
+    from .step_logs import StepLogs
+
+
+# pylint: disable=too-few-public-methods,too-many-instance-attributes
+class BaseScheduler:
+    """
+    Base Job Scheduler
+    What the blocking (Scheduler) and asyncio (AsyncScheduler) schedulers share: their settings, the presentation of
+    jobs and their output, and the bookkeeping of the job graph.
+
+    Given a run history, ready jobs start longest critical path first: by the expected duration of the job plus that of
+    the longest chain of jobs depending on it (jobs without a history are expected to take the median of those with
+    one), so that a long job is not left to start last.  The expected duration of the whole run (simulating the jobs
+    on the available slots) is shown up front.
+
+    Attributes
+    ----------
+    jobs
+        The maximum number of jobs to run concurrently.
+    per_command_timeout
+        The per-command timeout threshold.
+    state
+        The step state store used to skip up to date jobs, if any.
+    artifacts
+        The artifact cache used to restore and store job outputs, if any.
+    output
+        How process output is presented (an OutputType value), by default prefixed when jobs may run concurrently.
+    recorder
+        Records the metrics of every step, if any.
+    scope
+        Qualifies the job names within prefixed output (e.g. the workspace package being run), if any.
+    history
+        The run history ordering ready jobs and forecasting the run, if any.
+    logs
+        Receives the output of every step as a log file of its own (see StepLogs), if any.
+    TERMINATE_GRACE_PERIOD
+        Seconds cancelled processes are given to exit before being killed (shared by all of them), default: 5
+    DRAIN_TIMEOUT
+        Seconds the output of an exited process is awaited (background processes may hold its pipes), default: 1
+    """
+
+    jobs: int
+    per_command_timeout: Optional[int]
+    state: Optional[StateStore]
+    artifacts: Optional[ArtifactCache]
+    output: Optional[str]
+    recorder: Optional[StepRecorder]
+    scope: Optional[str]
+    history: Optional["RunHistory"]
+    logs: Optional["StepLogs"]
+    TERMINATE_GRACE_PERIOD: int = 5
+    DRAIN_TIMEOUT: int = 1
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        jobs: int = 1,
+        per_command_timeout: Optional[int] = None,
+        state: Optional[StateStore] = None,
+        artifacts: Optional[ArtifactCache] = None,
+        output: Optional[str] = None,
+        recorder: Optional[StepRecorder] = None,
+        scope: Optional[str] = None,
+        history: Optional["RunHistory"] = None,
+        logs: Optional["StepLogs"] = None,
+    ):
+        self.jobs = max(1, jobs)
+        self.per_command_timeout = per_command_timeout
+        self.state = state
+        self.artifacts = artifacts
+        self.output = output
+        self.recorder = recorder
+        self.scope = scope
+        self.history = history
+        self.logs = logs
+        self._priority: dict[Job, float] = {}
+        self._prefixed: bool = False
+        self._quiet: bool = False
+        self._resolver: CommandResolver = CommandResolver()
+        self._ready_at: dict[Job, float] = {}
+        self._usage: dict[Job, "resource.struct_rusage"] = {}
+        self._slots: list[int] = []
+        self._slot_count: int = 0
+        self._slot_lock: threading.Lock = threading.Lock()
+
+    def _streams(self, graph: JobGraph) -> bool:
+        """
+        Decides how process output is presented for a run.
+
+        Parameters
+        ----------
+        graph: The job graph about to be executed.
+
+        Returns
+        -------
+        Whether process output is streamed (rather than inherited).
+        """
+
+        output: str = self.output or (
+            OutputType.PREFIXED if self.jobs > 1 and len(graph.jobs) > 1 else OutputType.PLAIN
+        )
+        self._prefixed = output == OutputType.PREFIXED
+        self._quiet = output == OutputType.QUIET
+        return output != OutputType.INHERIT
+
+    def _label(self, job: Job) -> Optional[str]:
+        """
+        The prefix of the output lines of a job.
+
+        Parameters
+        ----------
+        job: The job.
+
+        Returns
+        -------
+        The job name (within the scope, if any) when output is prefixed, otherwise None.
+        """
+
+        if not self._prefixed:
+            return None
+        return job.name if self.scope is None else f"{self.scope}:{job.name}"
+
+    def _target(self, stream: TextIO) -> Optional[BinaryIO]:
+        """
+        Where process output destined for a stream is written.
+
+        Parameters
+        ----------
+        stream: sys.stdout or sys.stderr.
+
+        Returns
+        -------
+        The binary stream, None when output is quiet (only the tail is kept, for failure reports).
+        """
+
+        return None if self._quiet else stream.buffer
+
+    def _log_restored(self, job: Job, manifest: dict) -> None:
+        """
+        Creates the log of a job restored from the artifact cache out of its cached output, when logging.
+
+        Parameters
+        ----------
+        job: The restored job.
+        manifest: The artifact cache manifest of the job.
+        """
+
+        if self.logs is not None and self.artifacts is not None:
+            self.logs.restore(job=job, sources=self.artifacts.logs(manifest=manifest))
+
+    @staticmethod
+    def _replay_inherited(sources: list[Path]) -> None:
+        """
+        Writes the cached stdout and stderr of a job restored from the artifact cache straight out, as its process
+        would have when output is inherited.
+
+        Parameters
+        ----------
+        sources: The cached stdout and stderr (see ArtifactCache.logs).
+        """
+
+        for source, target in zip(sources, (sys.stdout, sys.stderr)):
+            target.flush()
+            with open(source, mode="rb") as file:
+                shutil.copyfileobj(file, target.buffer)
+            target.buffer.flush()
+
+    def _announce(self, job: Job, note: Optional[str] = None) -> None:
+        """
+        Prints the command of a job as it starts.
+
+        Parameters
+        ----------
+        job: The job.
+        note: Why the command is not actually run, if so.
+        """
+
+        if self._quiet:
+            return
+        message: str = f"> {job.display}" if note is None else f"> {job.display} ({note})"
+        # A single write, so that announcements of concurrent jobs do not interleave with one another.
+        label: Optional[str] = self._label(job=job)
+        print(f"[{label}] {message}\n" if label is not None else f"{message}\n", end="", flush=True)
+
+    def _plan(self, graph: JobGraph) -> None:
+        """
+        Prioritizes the jobs of a run by their critical path (see RunHistory) and, when several jobs may run at once
+        (where the order matters), shows its expected duration.
+
+        Parameters
+        ----------
+        graph: The job graph about to be executed.
+        """
+
+        self._priority = {}
+        expected: dict[str, float] = self.history.expected(jobs=graph.jobs) if self.history is not None else {}
+        if not expected:
+            return
+        typical: float = statistics.median(expected.values())
+        durations: dict[Job, float] = {job: expected.get(job.name, typical) for job in graph.jobs}
+        # Dependents before their prerequisites, so each job adds its longest chain of dependents.
+        for job in reversed(BaseScheduler._ordered(graph=graph)):
+            self._priority[job] = durations[job] + max((self._priority[item] for item in job.dependents), default=0.0)
+        if not self._quiet and self.jobs > 1 and len(graph.jobs) > 1:
+            forecast: float = self._forecast(graph=graph, durations=durations)
+            known: int = sum(1 for job in graph.jobs if job.name in expected)
+            print(
+                f"Expected to take {BaseScheduler.duration(forecast)} "
+                f"(from the history of {known} of {len(graph.jobs)} steps)",
+                flush=True,
+            )
+
+    @staticmethod
+    def _ordered(graph: JobGraph) -> list[Job]:
+        """
+        Orders the jobs of a graph so that every job follows its prerequisites.
+
+        Parameters
+        ----------
+        graph: The job graph.
+
+        Returns
+        -------
+        The jobs, prerequisites first.
+        """
+
+        waiting_on: dict[Job, int] = {job: len(job.dependencies) for job in graph.jobs}
+        ordered: list[Job] = list(graph.roots())
+        for job in ordered:
+            for dependent in job.dependents:
+                waiting_on[dependent] -= 1
+                if waiting_on[dependent] == 0:
+                    ordered.append(dependent)
+        return ordered
+
+    def _forecast(self, graph: JobGraph, durations: dict[Job, float]) -> float:
+        """
+        Simulates a run, starting ready jobs by priority whenever a slot is free.
+
+        Parameters
+        ----------
+        graph: The job graph.
+        durations: The expected duration of every job.
+
+        Returns
+        -------
+        The expected duration (seconds) of the run.
+        """
+
+        waiting_on: dict[Job, int] = {job: len(job.dependencies) for job in graph.jobs}
+        ready: list[Job] = sorted(graph.roots(), key=lambda item: self._priority[item], reverse=True)
+        running: list[tuple[float, int, Job]] = []
+        clock: float = 0.0
+        while ready or running:
+            while ready and len(running) < self.jobs:
+                job: Job = ready.pop(0)
+                heapq.heappush(running, (clock + durations[job], id(job), job))
+            clock, _, job = heapq.heappop(running)
+            for dependent in job.dependents:
+                waiting_on[dependent] -= 1
+                if waiting_on[dependent] == 0:
+                    ready.append(dependent)
+            ready.sort(key=lambda item: self._priority[item], reverse=True)
+        return clock
+
+    @staticmethod
+    def duration(seconds: float) -> str:
+        """
+        Formats an expected duration.
+
+        Parameters
+        ----------
+        seconds: The duration.
+
+        Returns
+        -------
+        The duration, e.g. `4.2s` or `3m 05s`.
+        """
+
+        if seconds < 60:
+            return f"{seconds:.1f}s"
+        minutes, remainder = divmod(round(seconds), 60)
+        return f"{minutes}m {remainder:02d}s"
+
+    def _queue(self, jobs: Iterable[Job], ready: deque) -> None:
+        """
+        Queues jobs whose prerequisites all succeeded, keeping the queue ordered by priority (when planned).
+
+        Parameters
+        ----------
+        jobs: The jobs ready to run.
+        ready: The queue of jobs ready to run.
+        """
+
+        now: float = time.monotonic()
+        for job in jobs:
+            self._ready_at[job] = now
+            ready.append(job)
+        if self._priority:
+            # A stable sort, so jobs of equal priority keep their order.
+            ordered: list[Job] = sorted(ready, key=lambda item: self._priority.get(item, 0.0), reverse=True)
+            ready.clear()
+            ready.extend(ordered)
+
+    def _release(self, job: Job, waiting_on: dict[Job, int], ready: deque) -> None:
+        """
+        Marks a job as succeeded, queueing the dependents it was the last prerequisite of.
+
+        Parameters
+        ----------
+        job: The job which succeeded.
+        waiting_on: The number of outstanding prerequisites of each job.
+        ready: The queue of jobs ready to run.
+        """
+
+        released: list[Job] = []
+        for dependent in job.dependents:
+            waiting_on[dependent] -= 1
+            if waiting_on[dependent] == 0:
+                released.append(dependent)
+        self._queue(jobs=released, ready=ready)
+
+    def _claim_slot(self) -> int:
+        """
+        Claims the lowest free concurrency slot (the track a step is drawn on within traces).
+
+        Returns
+        -------
+        The slot.
+        """
+
+        with self._slot_lock:
+            if self._slots:
+                return heapq.heappop(self._slots)
+            self._slot_count += 1
+            return self._slot_count - 1
+
+    def _free_slot(self, slot: int) -> None:
+        """
+        Frees a concurrency slot.
+
+        Parameters
+        ----------
+        slot: The slot.
+        """
+
+        with self._slot_lock:
+            heapq.heappush(self._slots, slot)
+
+    def _record(self, job: Job, status: str, started: float, slot: int, error: Optional[BaseException] = None) -> None:
+        """
+        Records the metrics of a concluded step, when recording.
+
+        Parameters
+        ----------
+        job: The job of the step.
+        status: How the step concluded (a StepStatus value).
+        started: When the step started (time.monotonic).
+        slot: The concurrency slot the step ran in.
+        error: Why the step failed, if it did.
+        """
+
+        usage: Optional["resource.struct_rusage"] = self._usage.pop(job, None)
+        if self.recorder is None:
+            return
+        returncode: Optional[int] = getattr(error, "returncode", None) if error is not None else None
+        if status == StepStatus.RAN and error is None:
+            returncode = 0
+        self.recorder.record(
+            job=job,
+            status=status,
+            started=started,
+            queued=max(0.0, started - self._ready_at.get(job, started)),
+            worker=slot,
+            returncode=returncode,
+            usage=usage,
+        )
+
+    def _failure(
+        self,
+        job: Job,
+        returncode: int,
+        tail: Optional[deque] = None,
+        timed_out: bool = False,
+        message: Optional[str] = None,
+    ) -> SubprocessFailureError:
+        """
+        Describes a failed job.
+
+        Parameters
+        ----------
+        job: The job which failed.
+        returncode: The exit status of its process.
+        tail: The tail of its output, if retained.
+        timed_out: Whether it exceeded the per-command timeout.
+        message: Why it failed, by default derived from the above.
+
+        Returns
+        -------
+        The error to raise.
+        """
+
+        if message is None:
+            message = f"Exceeded timeout limit of {self.per_command_timeout}" if timed_out else "command failed"
+        return SubprocessFailureError(
+            command=job.display,
+            message=message,
+            returncode=1 if timed_out else returncode,
+            output=OutputStream.render_tail(tail=tail) if tail is not None else None,
+        )
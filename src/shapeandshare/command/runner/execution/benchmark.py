@@ -0,0 +1,216 @@
+""" Benchmark Definition """
+
+import json
+import math
+import os
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from .step_recorder import StepRecorder
+
+
+class Benchmark:
+    """
+    Benchmark
+    Runs an alias repeatedly (after discarding warmup runs) and summarizes the wall time of the whole alias and of
+    each of its steps (min, median, p95, mean and stddev).  Results can be saved as JSON and compared against a
+    previously saved baseline: a median more than `threshold` percent slower than the baseline is a regression.
+
+    Attributes
+    ----------
+    alias
+        The alias being benchmarked.
+    runs
+        The number of measured runs.
+    warmup
+        The number of runs discarded before measuring.
+    samples
+        The measured wall times (seconds) of the alias (keyed by its name) and of each step (keyed by step name).
+    DEFAULT_RUNS
+        The default number of measured runs, default: 10
+    DEFAULT_WARMUP
+        The default number of warmup runs, default: 1
+    DEFAULT_THRESHOLD
+        The default regression threshold (percent), default: 5
+    DEFAULT_DIRECTORY
+        Where results are saved by default (as `<alias>.json`), default: .sacr/bench
+    """
+
+    alias: str
+    runs: int
+    warmup: int
+    samples: dict[str, list[float]]
+    DEFAULT_RUNS: int = 10
+    DEFAULT_WARMUP: int = 1
+    DEFAULT_THRESHOLD: float = 5.0
+    DEFAULT_DIRECTORY: Path = Path(".sacr") / "bench"
+
+    def __init__(self, alias: str, runs: Optional[int] = None, warmup: Optional[int] = None):
+        self.alias = alias
+        self.runs = max(1, runs or Benchmark.DEFAULT_RUNS)
+        self.warmup = max(0, Benchmark.DEFAULT_WARMUP if warmup is None else warmup)
+        self.samples = {}
+
+    def measure(self, execute: Callable[[StepRecorder], None]) -> dict[str, dict[str, float]]:
+        """
+        Runs and measures the alias.
+
+        Parameters
+        ----------
+        execute: Runs the alias once, recording its steps with the given recorder.
+
+        Returns
+        -------
+        The summary (see summarize).
+        """
+
+        self.samples = {self.alias: []}
+        for iteration in range(self.warmup + self.runs):
+            measured: bool = iteration >= self.warmup
+            label: str = f"run {iteration - self.warmup + 1}/{self.runs}" if measured else "warmup"
+            print(f"[bench] {self.alias}: {label}", flush=True)
+            recorder: StepRecorder = StepRecorder(alias=self.alias, path=None)
+            started: float = time.perf_counter()
+            execute(recorder)
+            elapsed: float = time.perf_counter() - started
+            if measured:
+                self.samples[self.alias].append(elapsed)
+                for step in recorder.steps:
+                    self.samples.setdefault(step.step, []).append(step.wall)
+        return self.summarize()
+
+    def summarize(self) -> dict[str, dict[str, float]]:
+        """
+        Summarizes the samples.
+
+        Returns
+        -------
+        The statistics of the alias and of each step (in name order), by name.
+        """
+
+        names: list[str] = [self.alias] + sorted(name for name in self.samples if name != self.alias)
+        return {name: Benchmark.describe(values=self.samples[name]) for name in names if self.samples.get(name)}
+
+    @staticmethod
+    def describe(values: list[float]) -> dict[str, float]:
+        """
+        Summarizes a sample.
+
+        Parameters
+        ----------
+        values: The measured durations.
+
+        Returns
+        -------
+        The min, median, p95 (nearest rank), mean and stddev of the sample, and its size.
+        """
+
+        ordered: list[float] = sorted(values)
+        return {
+            "runs": len(ordered),
+            "min": ordered[0],
+            "median": statistics.median(ordered),
+            "p95": ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)],
+            "mean": statistics.fmean(ordered),
+            "stddev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        }
+
+    def report(
+        self,
+        summary: dict[str, dict[str, float]],
+        baseline: Optional[dict[str, dict[str, float]]] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> list[str]:
+        """
+        Prints the summary, compared against a baseline when provided.
+
+        Parameters
+        ----------
+        summary: The summary to print.
+        baseline: The summary of a previous benchmark, if any.
+        threshold: The percentage by which a median may exceed the baseline before being a regression.
+
+        Returns
+        -------
+        The names whose median regressed.
+        """
+
+        regressions: list[str] = []
+        width: int = max(len(name) for name in summary) + 2
+        header: str = f"{'':<{width}}{'min':>10}{'median':>10}{'p95':>10}{'stddev':>10}"
+        print(header + (f"{'baseline':>10}{'change':>9}" if baseline else ""))
+        for name, stats in summary.items():
+            line: str = f"{name:<{width}}" + "".join(
+                f"{Benchmark._seconds(stats[key]):>10}" for key in ("min", "median", "p95", "stddev")
+            )
+            previous: Optional[dict[str, float]] = (baseline or {}).get(name)
+            if previous and previous.get("median"):
+                change: float = (stats["median"] - previous["median"]) / previous["median"] * 100
+                line += f"{Benchmark._seconds(previous['median']):>10}{change:>+8.1f}%"
+                if change > threshold:
+                    line += "  REGRESSION"
+                    regressions.append(name)
+            print(line)
+        return regressions
+
+    def save(self, path: Path, summary: dict[str, dict[str, float]]) -> None:
+        """
+        Saves a summary (and the raw samples) as JSON.
+
+        Parameters
+        ----------
+        path: The file to write.
+        summary: The summary to save.
+        """
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary: Path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(temporary, mode="w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "alias": self.alias,
+                    "created": time.time(),
+                    "runs": self.runs,
+                    "warmup": self.warmup,
+                    "results": summary,
+                    "samples": self.samples,
+                },
+                file,
+                indent=2,
+            )
+        os.replace(temporary, path)
+
+    @staticmethod
+    def load(path: Path) -> dict[str, dict[str, float]]:
+        """
+        Loads the summary of a saved benchmark.
+
+        Parameters
+        ----------
+        path: The saved benchmark.
+
+        Returns
+        -------
+        Its summary.
+        """
+
+        with open(path, mode="r", encoding="utf-8") as file:
+            return json.load(file)["results"]
+
+    @staticmethod
+    def _seconds(value: float) -> str:
+        """
+        Formats a duration.
+
+        Parameters
+        ----------
+        value: The duration in seconds.
+
+        Returns
+        -------
+        The duration in milliseconds under a second, otherwise in seconds.
+        """
+
+        return f"{value * 1000:.1f}ms" if value < 1 else f"{value:.3f}s"
@@ -0,0 +1,126 @@
+""" Command Resolver Definition """
+
+import os
+import shlex
+import shutil
+import threading
+from typing import Optional, Union
+
+
+class CommandResolver:
+    """
+    Command Resolver
+    Decides whether a command can be executed directly (without a shell) and resolves its executable.
+
+    Commands given in argv-list form are always executed directly, as are pipelines given as a list of argv lists (see
+    stages and ProcessPipeline).  Command strings are executed directly when they
+    contain no shell syntax (see SHELL_CHARACTERS and SHELL_BUILTINS), otherwise they fall back to the shell.
+    Executable lookups on PATH are cached for the lifetime of the resolver (a single run).
+
+    Attributes
+    ----------
+    SHELL_CHARACTERS
+        Characters which require a shell to interpret the command.
+    SHELL_BUILTINS
+        Commands which only exist as shell builtins or keywords.
+    """
+
+    SHELL_CHARACTERS: frozenset = frozenset("|&;<>()$`\\*?[]#~{}!\n")
+    SHELL_BUILTINS: frozenset = frozenset(
+        [".", ":", "alias", "break", "case", "cd", "continue", "eval", "exec", "exit", "export", "for", "if"]
+        + ["readonly", "return", "set", "shift", "source", "trap", "ulimit", "umask", "unset", "until", "while"]
+    )
+
+    def __init__(self):
+        self._lock: threading.Lock = threading.Lock()
+        self._executables: dict[str, Optional[str]] = {}
+
+    @staticmethod
+    def display(command: Union[str, list[str], list[list[str]]]) -> str:
+        """
+        Renders a command for display.
+
+        Parameters
+        ----------
+        command: The command string, argv list or pipeline.
+
+        Returns
+        -------
+        The command as a string (pipelines as the shell would write them).
+        """
+
+        if isinstance(command, str):
+            return command
+        stages: Optional[list[list[str]]] = CommandResolver.stages(command=command)
+        if stages is not None:
+            return " | ".join(shlex.join(stage) for stage in stages)
+        return shlex.join(command)
+
+    @staticmethod
+    def stages(command: Union[str, list[str], list[list[str]]]) -> Optional[list[list[str]]]:
+        """
+        The stages of a pipeline command.
+
+        Parameters
+        ----------
+        command: The command string, argv list or pipeline.
+
+        Returns
+        -------
+        The argv of each stage, or None if the command is not a pipeline (a list of argv lists).
+        """
+
+        if isinstance(command, list) and command and all(isinstance(stage, list) for stage in command):
+            return command
+        return None
+
+    def which(self, name: str) -> Optional[str]:
+        """
+        Resolves an executable on PATH, caching the result.
+
+        Parameters
+        ----------
+        name: The executable name or path.
+
+        Returns
+        -------
+        The path of the executable, or None if it can not be found.
+        """
+
+        with self._lock:
+            if name not in self._executables:
+                executable: Optional[str] = shutil.which(name)
+                self._executables[name] = os.path.abspath(executable) if executable is not None else None
+            return self._executables[name]
+
+    def resolve(self, command: Union[str, list[str]]) -> Optional[tuple[str, list[str]]]:
+        """
+        Resolves a command which can be executed without a shell.
+
+        Parameters
+        ----------
+        command: The command string or argv list.
+
+        Returns
+        -------
+        The resolved executable and the argv, or None if the command requires a shell.  Argv-list commands whose
+        executable can not be found are returned unresolved.
+        """
+
+        if isinstance(command, list):
+            executable: Optional[str] = self.which(name=command[0])
+            return executable or command[0], command
+
+        if not command.strip() or CommandResolver.SHELL_CHARACTERS.intersection(command):
+            return None
+        try:
+            argv: list[str] = shlex.split(command)
+        except ValueError:
+            return None
+        if not argv or "=" in argv[0] or argv[0] in CommandResolver.SHELL_BUILTINS:
+            return None
+        executable = self.which(name=argv[0])
+        if executable is None:
+            # Let the shell report it, as it always has.
+            return None
+        return executable, argv
@@ -0,0 +1,109 @@
+""" History Report Definition """
+
+import statistics
+import time
+
+from ..cache.run_history import RunHistory
+from ..contacts.step_status import StepStatus
+
+
+# pylint: disable=too-few-public-methods
+class HistoryReport:
+    """
+    History Report
+    Shows how the runs of an alias performed over time (`sacr stats <alias>`): the wall time and outcome of each recent
+    run, drawn as a bar relative to the slowest, how the latest run compares with the median, and the median wall time
+    of each step over those runs (counting only the runs which actually ran its command), slowest first.
+
+    Attributes
+    ----------
+    BAR_WIDTH
+        The width of the bar of the slowest run, default: 30
+    """
+
+    BAR_WIDTH: int = 30
+
+    @staticmethod
+    def report(history: RunHistory, alias: str, limit: int) -> None:
+        """
+        Prints the trend of the recent runs of an alias.
+
+        Parameters
+        ----------
+        history: The run history.
+        alias: The alias.
+        limit: The maximum number of runs shown.
+        """
+
+        runs: list[tuple[str, float, float, str]] = history.runs(alias=alias, limit=limit)
+        if not runs:
+            print(f"No recorded runs of `{alias}` (runs are recorded within {history.path}).")
+            return
+        HistoryReport._runs(alias=alias, runs=runs)
+        HistoryReport._steps(history=history, runs=[run for run, _, _, _ in runs])
+
+    @staticmethod
+    def _runs(alias: str, runs: list[tuple[str, float, float, str]]) -> None:
+        """
+        Prints the wall time and outcome of each run, and how the latest compares with the median.
+
+        Parameters
+        ----------
+        alias: The alias.
+        runs: The identifier, start, wall time and status of each run, oldest first.
+        """
+
+        slowest: float = max(wall for _, _, wall, _ in runs) or 1.0
+        print(f"Runs of `{alias}` (latest {len(runs)}):")
+        for _, started, wall, status in runs:
+            gauge: str = "#" * max(1, round(wall / slowest * HistoryReport.BAR_WIDTH))
+            moment: str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started))
+            print(f"  {moment}  {status:<10}{HistoryReport._seconds(wall):>10}  {gauge}")
+
+        passed: list[float] = [wall for _, _, wall, status in runs if status == "passed"]
+        if passed:
+            median: float = statistics.median(passed)
+            line: str = f"Median of passing runs: {HistoryReport._seconds(median)}"
+            _, _, latest, status = runs[-1]
+            if status == "passed" and median > 0:
+                line += f", latest {HistoryReport._seconds(latest)} ({(latest - median) / median * 100:+.1f}%)"
+            print(line)
+
+    @staticmethod
+    def _steps(history: RunHistory, runs: list[str]) -> None:
+        """
+        Prints the median wall time of each step over the runs which ran it, slowest first.
+
+        Parameters
+        ----------
+        history: The run history.
+        runs: The identifiers of the runs.
+        """
+
+        durations: dict[str, list[float]] = {
+            step: [wall for _, wall, status in samples if status == StepStatus.RAN.value]
+            for step, samples in history.steps(runs=runs).items()
+        }
+        medians: dict[str, float] = {step: statistics.median(walls) for step, walls in durations.items() if walls}
+        if not medians:
+            return
+        width: int = max(len(step) for step in medians) + 2
+        print("Steps (median of the runs which ran them):")
+        for step, median in sorted(medians.items(), key=lambda item: item[1], reverse=True):
+            print(f"  {step:<{width}}{HistoryReport._seconds(median):>10}{len(durations[step]):>6} runs")
+
+    @staticmethod
+    def _seconds(value: float) -> str:
+        """
+        Formats the wall time of a run or step.
+
+        Parameters
+        ----------
+        value: The wall time (seconds).
+
+        Returns
+        -------
+        The wall time, e.g. `840ms` or `12.41s`.
+        """
+
+        return f"{value * 1000:.0f}ms" if value < 1 else f"{value:.2f}s"
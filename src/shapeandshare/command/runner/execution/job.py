@@ -0,0 +1,144 @@
+""" Job Definition """
+
+from typing import TYPE_CHECKING, Optional, Union
+
+from ..contacts.dtos.job_resources import JobResources
+from .command_resolver import CommandResolver
+
+if TYPE_CHECKING:
+    from .process_limits import ProcessLimits
+
+
+# pylint: disable=too-many-instance-attributes
+class Job:
+    """
+    Job
+    A single command of an alias and its position within the job graph.
+
+    Attributes
+    ----------
+    alias
+        The alias (from [scripts]) the command belongs to.
+    index
+        The position of the command within the alias.
+    command
+        The command to execute: a command string, an argv list or a pipeline (a list of argv lists).
+    dependencies
+        The jobs which must complete successfully before this job can start.
+    dependents
+        The jobs waiting on this job.
+    inputs
+        The glob patterns of the files the alias consumes (from [inputs]).
+    outputs
+        The glob patterns of the files the alias produces (from [outputs]).
+    environment
+        The names of the environment variables the alias depends on (from [environment]).
+    session
+        The shell session the job runs within (from [session]), if any.
+    cell
+        The matrix parameters (from [matrix]) the job was expanded with, if any.
+    resources
+        The resources the job requires (from [resources]), if declared.
+    limits
+        The settings applied to the process of the job (from [resources]), if any.
+    """
+
+    alias: str
+    index: int
+    command: Union[str, list[str], list[list[str]]]
+    dependencies: set["Job"]
+    dependents: list["Job"]
+    inputs: list[str]
+    outputs: list[str]
+    environment: list[str]
+    session: Optional[str]
+    cell: dict[str, str]
+    resources: Optional[JobResources]
+    limits: Optional["ProcessLimits"]
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        alias: str,
+        index: int,
+        command: Union[str, list[str], list[list[str]]],
+        dependencies: Optional[set["Job"]] = None,
+        inputs: Optional[list[str]] = None,
+        outputs: Optional[list[str]] = None,
+        environment: Optional[list[str]] = None,
+        session: Optional[str] = None,
+        cell: Optional[dict[str, str]] = None,
+        resources: Optional[JobResources] = None,
+        limits: Optional["ProcessLimits"] = None,
+    ):
+        self.alias = alias
+        self.index = index
+        self.command = command
+        self.dependencies = set()
+        self.dependents = []
+        self.inputs = inputs or []
+        self.outputs = outputs or []
+        self.environment = environment or []
+        self.session = session
+        self.cell = cell or {}
+        self.resources = resources
+        self.limits = limits
+        for dependency in dependencies or set():
+            self.depends_on(dependency)
+
+    @property
+    def group(self) -> str:
+        """
+        Class Property
+        The alias, qualified by the matrix cell the job belongs to.
+
+        Returns
+        -------
+        The alias, e.g. `test{python=3.9,db=pg}` within a matrix cell.
+        """
+
+        if not self.cell:
+            return self.alias
+        return f"{self.alias}{{{','.join(f'{key}={value}' for key, value in self.cell.items())}}}"
+
+    @property
+    def name(self) -> str:
+        """
+        Class Property
+        Human-readable job name.
+
+        Returns
+        -------
+        The alias (and matrix cell) and command position, e.g. `prebuild[2]`.
+        """
+
+        return f"{self.group}[{self.index}]"
+
+    @property
+    def display(self) -> str:
+        """
+        Class Property
+        The command rendered for display.
+
+        Returns
+        -------
+        The command as a string.
+        """
+
+        return CommandResolver.display(command=self.command)
+
+    def depends_on(self, job: "Job") -> None:
+        """
+        Adds a prerequisite job.
+
+        Parameters
+        ----------
+        job: The job which must complete first.
+        """
+
+        if job not in self.dependencies:
+            self.dependencies.add(job)
+            job.dependents.append(self)
+
+    def __repr__(self) -> str:
+        return f"Job({self.name}: {self.display})"
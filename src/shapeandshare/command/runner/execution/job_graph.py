@@ -0,0 +1,395 @@
+""" Job Graph Definition """
+
+import itertools
+import re
+import shlex
+from typing import Optional, Union
+
+from ..common.utils import parse_size
+from ..contacts.dtos.backend_model import BackendModel
+from ..contacts.dtos.job_resources import JobResources
+from ..contacts.errors.dependency_cycle_error import DependencyCycleError
+from ..contacts.errors.parse_error import ParseError
+from ..contacts.errors.unknown_argument_error import UnknownArgumentError
+from ..contacts.errors.unknown_command_error import UnknownCommandError
+from .job import Job
+from .process_limits import ProcessLimits
+
+
+class JobGraph:
+    """
+    Job Graph
+    The dependency graph of every command needed to run an alias.
+
+    Commands of an alias are chained one after another unless the alias is marked within [parallel].
+    Aliases listed within [depends] are expanded once and must complete before the alias starts.
+    Declarations from [inputs], [outputs] and [environment] are attached to each job of the alias, and the commands of
+    aliases marked within [session] (and not within [parallel]) share a shell session.
+    Aliases declaring a [matrix] are expanded once per cell (every combination of the parameter values), substituting
+    the `{name}` placeholders of the parameters into their commands, inputs and outputs.  Cells are independent of one
+    another, so they run concurrently, and aliases invoked from within a cell are expanded within that cell too.
+    The [resources] of an alias (cpu and memory weights, niceness, I/O class and resource limits) are attached to each
+    of its jobs.
+    Commands which only invoke `sacr run <alias>` (optionally chained with `&&`) are expanded in place against the
+    already loaded model rather than starting a new interpreter.
+
+    Attributes
+    ----------
+    model
+        The BackendModel DTO the graph is built from.
+    jobs
+        Every job within the graph, in declaration order.
+    alias
+        The alias the graph was built for, if built via build.
+    PLACEHOLDER
+        Matches the `{name}` placeholders of matrix parameters.
+    """
+
+    model: BackendModel
+    jobs: list[Job]
+    alias: Optional[str] = None
+    PLACEHOLDER: re.Pattern = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+    def __init__(self, model: BackendModel):
+        self.model = model
+        self.jobs = []
+        self._resolved: dict[str, set[Job]] = {}
+        self._resources: dict[str, tuple[Optional[JobResources], Optional[ProcessLimits]]] = {}
+        self._stack: list[str] = []
+
+    @staticmethod
+    def build(model: BackendModel, alias: str) -> "JobGraph":
+        """
+        Builds the job graph for an alias.
+
+        Parameters
+        ----------
+        model: The BackendModel DTO to resolve aliases against.
+        alias: The alias to build the graph for.
+
+        Returns
+        -------
+        The populated job graph.
+        """
+
+        graph: JobGraph = JobGraph(model=model)
+        graph.alias = alias
+        graph._expand(alias=alias, after=set())  # pylint: disable=protected-access
+        return graph
+
+    @staticmethod
+    def as_list(value: Union[list, str, None]) -> list:
+        """
+        Normalizes a config value which may be a single item or a list of items.
+
+        Parameters
+        ----------
+        value: The config value.
+
+        Returns
+        -------
+        The value as a list.
+        """
+
+        if value is None:
+            return []
+        if isinstance(value, list):
+            return value
+        return [value]
+
+    def roots(self) -> list[Job]:
+        """
+        Jobs without any prerequisites.
+
+        Returns
+        -------
+        The jobs which can start immediately.
+        """
+
+        return [job for job in self.jobs if not job.dependencies]
+
+    def sinks(self) -> list[Job]:
+        """
+        Jobs nothing waits on.
+
+        Returns
+        -------
+        The final jobs of the graph, in declaration order.
+        """
+
+        return [job for job in self.jobs if not job.dependents]
+
+    def subgraph(self, jobs: set[Job]) -> "JobGraph":
+        """
+        Narrows the graph to some of its jobs, which must include every prerequisite of each of them.  The jobs are
+        moved rather than copied: their dependents outside the subgraph are dropped.
+
+        Parameters
+        ----------
+        jobs: The jobs to keep.
+
+        Returns
+        -------
+        The graph of the kept jobs, in declaration order.
+        """
+
+        graph: JobGraph = JobGraph(model=self.model)
+        graph.alias = self.alias
+        graph.jobs = [job for job in self.jobs if job in jobs]
+        for job in graph.jobs:
+            job.dependents = [dependent for dependent in job.dependents if dependent in jobs]
+        return graph
+
+    def _dependency(self, alias: str) -> set[Job]:
+        """
+        Expands a prerequisite alias once, re-using the prior expansion on subsequent requests.
+
+        Parameters
+        ----------
+        alias: The prerequisite alias.
+
+        Returns
+        -------
+        The final jobs of the prerequisite alias.
+        """
+
+        if alias not in self._resolved:
+            self._resolved[alias] = self._expand(alias=alias, after=set())
+        return self._resolved[alias]
+
+    def _expand(self, alias: str, after: set[Job], cell: Optional[dict[str, str]] = None) -> set[Job]:
+        """
+        Adds the jobs of an alias to the graph, once per matrix cell when the alias declares a matrix.
+
+        Parameters
+        ----------
+        alias: The alias to expand.
+        after: The jobs which must complete before the alias starts.
+        cell: The parameters of the matrix cell the alias is expanded within, if any.
+
+        Returns
+        -------
+        The final jobs of the alias, which anything following the alias must wait on.
+        """
+
+        if alias in self._stack:
+            cycle: str = " -> ".join(self._stack[self._stack.index(alias) :] + [alias])
+            raise DependencyCycleError(f"Dependency cycle detected: {cycle}")
+        if alias not in self.model.scripts:
+            raise UnknownCommandError(f"Unknown command {alias} in [scripts]")
+
+        self._stack.append(alias)
+        requirements: set[Job] = set(after)
+        for dependency in JobGraph.as_list(self.model.depends.get(alias)):
+            requirements |= self._dependency(alias=dependency)
+
+        finals: set[Job] = set()
+        for values in self._cells(alias=alias, cell=cell or {}):
+            finals |= self._expand_cell(alias=alias, after=requirements, cell=values)
+        self._stack.pop()
+        return finals
+
+    def _cells(self, alias: str, cell: dict[str, str]) -> list[dict[str, str]]:
+        """
+        Expands the matrix of an alias (from [matrix]) into its cells, every combination of the parameter values.
+
+        Parameters
+        ----------
+        alias: The alias.
+        cell: The parameters of the matrix cell the alias is expanded within, if any.
+
+        Returns
+        -------
+        The parameters of every cell, in declaration order, or just the given parameters without a matrix.
+        """
+
+        matrix: Optional[dict] = self.model.matrix.get(alias)
+        if not matrix:
+            return [cell]
+        if not isinstance(matrix, dict) or not all(isinstance(values, list) and values for values in matrix.values()):
+            raise ParseError(f"[matrix] {alias} must map each parameter to a non-empty list of values")
+        return [
+            {**cell, **{key: str(value) for key, value in zip(matrix.keys(), combination)}}
+            for combination in itertools.product(*matrix.values())
+        ]
+
+    def _expand_cell(self, alias: str, after: set[Job], cell: dict[str, str]) -> set[Job]:
+        """
+        Adds the commands of an alias (for a single matrix cell) to the graph.
+
+        Parameters
+        ----------
+        alias: The alias to expand.
+        after: The jobs which must complete before the alias starts.
+        cell: The matrix parameters substituted into the commands, if any.
+
+        Returns
+        -------
+        The final jobs of the alias.
+        """
+
+        parallel: bool = bool(self.model.parallel.get(alias, False))
+        session: Optional[str] = None
+        if self.model.session.get(alias, False) and not parallel:
+            # Unique per expansion, an alias expanded twice gets two sessions.
+            session = f"{alias}#{len(self.jobs)}"
+        finals: set[Job] = set() if parallel else after
+        for index, command in enumerate(JobGraph.as_list(self.model.scripts[alias])):
+            step_finals: set[Job] = self._expand_step(
+                alias=alias,
+                index=index,
+                command=JobGraph.substitute(value=command, cell=cell),
+                after=after if parallel else finals,
+                session=session,
+                cell=cell,
+            )
+            if parallel:
+                finals |= step_finals
+            else:
+                finals = step_finals
+
+        if parallel and not finals:
+            return after
+        return finals
+
+    @staticmethod
+    def substitute(value: Union[list, str], cell: dict[str, str]) -> Union[list, str]:
+        """
+        Substitutes matrix parameters into a command (or pattern), only `{name}` placeholders of the parameters of the
+        cell are replaced so that other braces (e.g. `${HOME}` or `{a,b}`) are left to the shell.
+
+        Parameters
+        ----------
+        value: The command string, argv list or pattern.
+        cell: The matrix parameters.
+
+        Returns
+        -------
+        The value with its placeholders replaced.
+        """
+
+        if not cell:
+            return value
+        if isinstance(value, list):
+            return [JobGraph.substitute(value=item, cell=cell) for item in value]
+        return JobGraph.PLACEHOLDER.sub(lambda match: cell.get(match.group(1), match.group(0)), value)
+
+    # pylint: disable=too-many-arguments
+    def _expand_step(
+        self,
+        alias: str,
+        index: int,
+        command: str,
+        after: set[Job],
+        session: Optional[str] = None,
+        cell: Optional[dict[str, str]] = None,
+    ) -> set[Job]:
+        """
+        Adds a single command of an alias to the graph.
+
+        Parameters
+        ----------
+        alias: The alias the command belongs to.
+        index: The position of the command within the alias.
+        command: The command.
+        after: The jobs which must complete before the command starts.
+        session: The shell session of the alias, if any.
+        cell: The matrix parameters the command was expanded with, if any.
+
+        Returns
+        -------
+        The final jobs of the command.
+        """
+
+        nested: Optional[list[str]] = JobGraph.nested_aliases(command=command)
+        if nested is None:
+            job: Job = Job(
+                alias=alias,
+                index=index,
+                command=command,
+                dependencies=after,
+                inputs=JobGraph.substitute(value=JobGraph.as_list(self.model.inputs.get(alias)), cell=cell or {}),
+                outputs=JobGraph.substitute(value=JobGraph.as_list(self.model.outputs.get(alias)), cell=cell or {}),
+                environment=JobGraph.as_list(self.model.environment.get(alias)),
+                session=session,
+                cell=cell,
+            )
+            job.resources, job.limits = self._requirements(alias=alias)
+            self.jobs.append(job)
+            return {job}
+
+        finals: set[Job] = after
+        for nested_alias in nested:
+            finals = self._expand(alias=nested_alias, after=finals, cell=cell)
+        return finals
+
+    def _requirements(self, alias: str) -> tuple[Optional[JobResources], Optional[ProcessLimits]]:
+        """
+        Resolves the resources (from [resources]) of an alias once.
+
+        Parameters
+        ----------
+        alias: The alias.
+
+        Returns
+        -------
+        The resources the commands of the alias require and the settings applied to their processes, if any.
+        """
+
+        if alias not in self._resources:
+            declared: Optional[dict] = self.model.resources.get(alias)
+            if declared is None:
+                self._resources[alias] = (None, None)
+            elif not isinstance(declared, dict):
+                raise ParseError(f"[resources] {alias} must be a mapping")
+            else:
+                try:
+                    resources: JobResources = JobResources.parse_obj(
+                        {**declared, "mem": parse_size(command="run", value=declared.get("mem"))}
+                    )
+                    self._resources[alias] = (resources, ProcessLimits.create(resources=resources))
+                except UnknownArgumentError as error:
+                    raise ParseError(f"[resources] {alias}: {error.message}") from error
+                except ParseError as error:
+                    raise ParseError(f"[resources] {alias}: {error}") from error
+        return self._resources[alias]
+
+    # pylint: disable=too-many-return-statements
+    @staticmethod
+    def nested_aliases(command: str) -> Optional[list[str]]:
+        """
+        Detects commands which only invoke other aliases, e.g. `sacr run lint:isort && sacr run lint:black`.
+
+        Parameters
+        ----------
+        command: The command to inspect.
+
+        Returns
+        -------
+        The invoked aliases in order, or None if the command does anything else.
+        """
+
+        if isinstance(command, list):
+            if len(command) == 3 and command[0:2] == ["sacr", "run"] and not command[2].startswith("-"):
+                return [command[2]]
+            return None
+        if "sacr" not in command:
+            return None
+        try:
+            lexer: shlex.shlex = shlex.shlex(command, posix=True, punctuation_chars=True)
+            lexer.whitespace_split = True
+            tokens: list[str] = list(lexer)
+        except ValueError:
+            return None
+
+        aliases: list[str] = []
+        for position in range(0, len(tokens), 4):
+            invocation: list[str] = tokens[position : position + 3]
+            if len(invocation) != 3 or invocation[0:2] != ["sacr", "run"] or invocation[2].startswith("-"):
+                return None
+            if position + 3 < len(tokens) and tokens[position + 3] != "&&":
+                return None
+            aliases.append(invocation[2])
+        if len(tokens) % 4 != 3:
+            return None
+        return aliases
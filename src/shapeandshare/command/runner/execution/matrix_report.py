@@ -0,0 +1,73 @@
+""" Matrix Report Definition """
+
+from typing import Optional
+
+from ..contacts.dtos.step_metrics import StepMetrics
+from ..contacts.step_status import StepStatus
+from .job import Job
+from .job_graph import JobGraph
+
+
+# pylint: disable=too-few-public-methods
+class MatrixReport:
+    """
+    Matrix Report
+    Summarizes a run of matrix aliases per cell: whether every step of the cell passed, the exit code of the step which
+    failed (if any) and how long the cell took.  Cells whose steps never started (as a prerequisite failed) are
+    reported as not run.
+    """
+
+    @staticmethod
+    def report(graph: JobGraph, steps: list[StepMetrics]) -> None:
+        """
+        Prints the summary of the matrix cells of a run, if it had any.
+
+        Parameters
+        ----------
+        graph: The job graph which was executed.
+        steps: The metrics of the steps which concluded.
+        """
+
+        cells: dict[str, list[Job]] = {}
+        for job in graph.jobs:
+            if job.cell:
+                cells.setdefault(job.group, []).append(job)
+        if not cells:
+            return
+
+        recorded: dict[str, StepMetrics] = {step.step: step for step in steps}
+        width: int = max(len(group) for group in cells) + 2
+        print(f"Matrix summary ({len(cells)} cells):", flush=True)
+        for group, jobs in cells.items():
+            concluded: list[StepMetrics] = [recorded[job.name] for job in jobs if job.name in recorded]
+            status, returncode = MatrixReport._outcome(concluded=concluded, expected=len(jobs))
+            duration: str = "-"
+            if concluded:
+                end: float = max(step.started + step.wall for step in concluded)
+                duration = f"{end - min(step.started for step in concluded):.2f}s"
+            code: str = "-" if returncode is None else str(returncode)
+            print(f"  {group:<{width}}{status:<11}{code:>5}{duration:>10}", flush=True)
+
+    @staticmethod
+    def _outcome(concluded: list[StepMetrics], expected: int) -> tuple[str, Optional[int]]:
+        """
+        Decides the outcome of a cell.
+
+        Parameters
+        ----------
+        concluded: The metrics of the steps of the cell which concluded.
+        expected: The number of steps of the cell.
+
+        Returns
+        -------
+        The status of the cell and its exit code, if known.
+        """
+
+        for step in concluded:
+            if step.status == StepStatus.FAILED:
+                return "failed", 1 if step.returncode is None else step.returncode
+        if not concluded:
+            return "not run", None
+        if len(concluded) < expected or any(step.status == StepStatus.CANCELLED for step in concluded):
+            return "cancelled", None
+        return "passed", 0
@@ -0,0 +1,167 @@
+""" Output Pipeline Definition """
+
+import os
+import selectors
+import threading
+from collections import deque
+from typing import BinaryIO, Optional
+
+from .output_stream import OutputStream
+from .step_log import StepLog
+
+
+# pylint: disable=too-many-instance-attributes
+class OutputPipeline:
+    """
+    Output Pipeline
+    Reads the stdout and stderr pipes of every running job from a single thread (via selectors, i.e. epoll/kqueue),
+    handing what is read to the OutputStream of each pipe, which writes complete lines out as they arrive.  Output
+    which only an uncompressed step log needs is spliced into the log instead, never being read (see StepLog).
+
+    Attributes
+    ----------
+    READ_SIZE
+        The maximum number of bytes read per wake up, default: 65536
+    """
+
+    READ_SIZE: int = 64 * 1024
+
+    def __init__(self):
+        self._selector: selectors.BaseSelector = selectors.DefaultSelector()
+        self._lock: threading.Lock = threading.Lock()
+        self._pending: list[OutputStream] = []
+        self._abandoned: list[OutputStream] = []
+        self._closed: bool = False
+        self._wake_read, self._wake_write = os.pipe()
+        self._selector.register(self._wake_read, selectors.EVENT_READ)
+        self._thread: threading.Thread = threading.Thread(target=self._loop, name="sacr-output", daemon=True)
+        self._thread.start()
+
+    # pylint: disable=too-many-arguments
+    def register(
+        self,
+        fd: int,
+        label: Optional[str],
+        target: Optional[BinaryIO],
+        capture: Optional[BinaryIO],
+        tail: deque,
+        log: Optional[StepLog] = None,
+    ) -> OutputStream:
+        """
+        Starts reading a pipe.  The pipeline takes ownership of (and eventually closes) the descriptor.
+
+        Parameters
+        ----------
+        fd: The read end of the pipe.
+        label: Prefixed to every line written out, if any.
+        target: Where lines are written to, None to only keep the tail.
+        capture: Receives an unmodified copy of the stream, if any.
+        tail: Receives the trailing lines of the stream (shared between a job's stdout and stderr).
+        log: Receives a copy of the stream (shared between a job's stdout and stderr), if any.
+
+        Returns
+        -------
+        The registered stream.
+        """
+
+        os.set_blocking(fd, False)
+        stream: OutputStream = OutputStream(label=label, target=target, capture=capture, tail=tail, fd=fd, log=log)
+        with self._lock:
+            self._pending.append(stream)
+        os.write(self._wake_write, b"\0")
+        return stream
+
+    def abandon(self, stream: OutputStream) -> None:
+        """
+        Stops reading a stream before end of file (e.g. a background grandchild still holds the pipe open), once
+        whatever is already buffered within the pipe has been written out.
+
+        Parameters
+        ----------
+        stream: The stream to abandon.
+        """
+
+        if stream.done.is_set():
+            return
+        with self._lock:
+            self._abandoned.append(stream)
+        os.write(self._wake_write, b"\0")
+        stream.done.wait()
+
+    def close(self) -> None:
+        """Stops the pipeline thread once every registered stream is done."""
+
+        with self._lock:
+            self._closed = True
+        os.write(self._wake_write, b"\0")
+        self._thread.join()
+        self._selector.close()
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+
+    def _loop(self) -> None:
+        """The pipeline thread."""
+
+        streams: dict[int, OutputStream] = {}
+        while True:
+            with self._lock:
+                for stream in self._pending:
+                    streams[stream.fd] = stream
+                    self._selector.register(stream.fd, selectors.EVENT_READ, stream)
+                self._pending.clear()
+                for stream in self._abandoned:
+                    # Descriptors are reused once closed, so match the stream itself.
+                    if streams.get(stream.fd) is stream:
+                        self._read(stream=stream, drain=True)
+                        self._finish(stream=streams.pop(stream.fd))
+                self._abandoned.clear()
+                if self._closed and not streams:
+                    return
+
+            for key, _ in self._selector.select():
+                if key.fd == self._wake_read:
+                    os.read(self._wake_read, 4096)
+                elif not self._read(stream=key.data):
+                    self._finish(stream=streams.pop(key.fd))
+
+    def _read(self, stream: OutputStream, drain: bool = False) -> bool:
+        """
+        Reads from a stream without blocking.
+
+        Parameters
+        ----------
+        stream: The stream.
+        drain: Keep reading until nothing more is available.
+
+        Returns
+        -------
+        False once the stream reached end of file.
+        """
+
+        while True:
+            try:
+                if stream.spliceable:
+                    if not stream.splice(size=self.READ_SIZE):
+                        return False
+                else:
+                    chunk: bytes = os.read(stream.fd, self.READ_SIZE)
+                    if not chunk:
+                        return False
+                    stream.write(chunk=chunk)
+            except BlockingIOError:
+                return True
+            if not drain:
+                return True
+
+    def _finish(self, stream: OutputStream) -> None:
+        """
+        Releases a stream.
+
+        Parameters
+        ----------
+        stream: The stream.
+        """
+
+        self._selector.unregister(stream.fd)
+        os.close(stream.fd)
+        stream.finish()
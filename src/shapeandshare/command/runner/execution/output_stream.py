@@ -0,0 +1,189 @@
+""" Output Stream Definition """
+
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, BinaryIO, Optional
+
+if TYPE_CHECKING:
+    from .step_log import StepLog
+
+
+# pylint: disable=too-many-instance-attributes
+class OutputStream:
+    """
+    Output Stream
+    The stdout or stderr of a running job: bytes fed in are written out line by line as they arrive, optionally
+    prefixed with a label, copied unmodified to a capture file and to the log of the step, and retained within a
+    bounded tail.  When nothing but an uncompressed log needs the output (e.g. quiet output, see `spliceable`), it is
+    moved straight into the log instead and the tail read back from it once the stream ends.
+
+    Memory stays flat regardless of how much a job writes: partial lines are flushed once they exceed
+    MAX_LINE_LENGTH and only the last TAIL_LINES lines (each truncated to MAX_LINE_LENGTH) are retained, to be
+    reported should the job fail.
+
+    Attributes
+    ----------
+    label
+        Prefixed to every line written out, if any (e.g. `[build[0]] `).
+    target
+        Where lines are written to (our own stdout or stderr), None when quiet or once writing to it failed.
+    capture
+        Receives an unmodified copy of the stream, if any.
+    log
+        The log of the step (shared between its stdout and stderr, see StepLog), if any.
+    tail
+        The last lines of the stream (see new_tail), may be shared between the stdout and stderr of a job.
+    fd
+        The read end of the pipe, when read by an OutputPipeline.
+    done
+        Set once the stream reached end of file (or was abandoned).
+    TAIL_LINES
+        The number of trailing lines retained per job, default: 50
+    MAX_LINE_LENGTH
+        The maximum retained line length and the partial line flush threshold, default: 4096
+    """
+
+    label: Optional[bytes]
+    target: Optional[BinaryIO]
+    capture: Optional[BinaryIO]
+    log: Optional["StepLog"]
+    tail: deque
+    fd: Optional[int]
+    done: threading.Event
+    TAIL_LINES: int = 50
+    MAX_LINE_LENGTH: int = 4096
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        label: Optional[str],
+        target: Optional[BinaryIO],
+        capture: Optional[BinaryIO] = None,
+        tail: Optional[deque] = None,
+        fd: Optional[int] = None,
+        log: Optional["StepLog"] = None,
+    ):
+        self.label = f"[{label}] ".encode("utf-8") if label else None
+        self.target = target
+        self.capture = capture
+        self.log = log
+        self.tail = tail if tail is not None else OutputStream.new_tail()
+        self.fd = fd
+        self.done = threading.Event()
+        self._partial: bytes = b""
+        self._spliced: bool = False
+
+    @staticmethod
+    def new_tail() -> deque:
+        """
+        Creates an empty, bounded tail buffer.
+
+        Returns
+        -------
+        The tail buffer.
+        """
+
+        return deque(maxlen=OutputStream.TAIL_LINES)
+
+    @staticmethod
+    def render_tail(tail: deque) -> Optional[str]:
+        """
+        Renders a tail buffer.
+
+        Parameters
+        ----------
+        tail: The tail buffer.
+
+        Returns
+        -------
+        The retained lines as text, or None if there are none.
+        """
+
+        if not tail:
+            return None
+        return b"\n".join(tail).decode("utf-8", errors="replace")
+
+    def write(self, chunk: bytes) -> None:
+        """
+        Writes out the complete lines of a chunk, retaining them within the tail.
+
+        Parameters
+        ----------
+        chunk: The bytes read.
+        """
+
+        if self.capture is not None:
+            self.capture.write(chunk)
+        if self.log is not None:
+            self.log.write(chunk=chunk)
+        lines: list[bytes] = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        if len(self._partial) > self.MAX_LINE_LENGTH:
+            lines.append(self._partial)
+            self._partial = b""
+        self._emit(lines=lines)
+
+    @property
+    def spliceable(self) -> bool:
+        """
+        Class Property
+        Whether the output is only needed within an uncompressed log, so can be spliced into it (see splice).
+
+        Returns
+        -------
+        True when the stream has a direct log, but neither a target nor a capture file.
+        """
+
+        return self.log is not None and self.log.direct and self.target is None and self.capture is None
+
+    def splice(self, size: int) -> int:
+        """
+        Moves output from the pipe into the log without reading it.
+
+        Parameters
+        ----------
+        size: The maximum number of bytes moved.
+
+        Returns
+        -------
+        The number of bytes moved, 0 at end of file.
+        """
+
+        self._spliced = True
+        return self.log.splice(fd=self.fd, size=size)
+
+    def finish(self) -> None:
+        """Writes out the final partial line, marking the stream as done and releasing its log."""
+
+        if self._partial:
+            self._emit(lines=[self._partial])
+            self._partial = b""
+        if self.log is not None:
+            if self._spliced:
+                # The output never passed through the tail, read the tail back from the log instead.
+                lines: list[bytes] = self.log.tail()
+                self.tail.clear()
+                self.tail.extend(line[: self.MAX_LINE_LENGTH] for line in lines)
+            self.log.release()
+        self.done.set()
+
+    def _emit(self, lines: list[bytes]) -> None:
+        """
+        Writes lines to the target.
+
+        Parameters
+        ----------
+        lines: The lines, without line endings.
+        """
+
+        if not lines:
+            return
+        if self.target is not None:
+            prefix: bytes = self.label or b""
+            try:
+                self.target.write(b"".join(prefix + line + b"\n" for line in lines))
+                self.target.flush()
+            except (OSError, ValueError):
+                # Our own output went away (e.g. a closed pipe), keep draining the process regardless.
+                self.target = None
+        self.tail.extend(line[: self.MAX_LINE_LENGTH] for line in lines)
@@ -0,0 +1,194 @@
+""" Process Limits Definition """
+
+import os
+import sys
+from typing import Callable, Optional, Union
+
+from ..common.utils import parse_size
+from ..contacts.dtos.job_resources import JobResources
+from ..contacts.errors.parse_error import ParseError
+from ..contacts.errors.unknown_argument_error import UnknownArgumentError
+
+
+class ProcessLimits:
+    """
+    Process Limits
+    The niceness, I/O scheduling class and resource limits (setrlimit) of the processes of an alias (see
+    JobResources).  They are applied within the child process before it executes the command (as its preexec_fn, so
+    such processes are not started via posix_spawn) and are inherited by everything the command starts.  Settings are
+    validated and resolved up front (raising ParseError), leaving only the system calls themselves to the child.
+    Limits above the current hard limit are lowered to it, and the I/O scheduling class is ignored where ioprio_set is
+    unavailable (anywhere but Linux).
+
+    Attributes
+    ----------
+    nice
+        The niceness increment, if any.
+    ioprio
+        The I/O priority (class and level, see ioprio_set(2)), if any.
+    limits
+        The resource and the (soft, hard) limit of every resource limit.
+    IOPRIO_CLASSES
+        The I/O scheduling classes by name.
+    IOPRIO_CLASS_SHIFT
+        The position of the class within an I/O priority.
+    IOPRIO_WHO_PROCESS
+        ioprio_set applies to a single process.
+    DEFAULT_IOPRIO_LEVEL
+        The level of classes given without one, default: 4
+    SYS_IOPRIO_SET
+        The ioprio_set system call number of each architecture.
+    """
+
+    nice: Optional[int]
+    ioprio: Optional[int]
+    limits: list[tuple[int, tuple[int, int]]]
+    IOPRIO_CLASSES: dict[str, int] = {"realtime": 1, "best-effort": 2, "idle": 3}
+    IOPRIO_CLASS_SHIFT: int = 13
+    IOPRIO_WHO_PROCESS: int = 1
+    DEFAULT_IOPRIO_LEVEL: int = 4
+    SYS_IOPRIO_SET: dict[str, int] = {
+        "x86_64": 251,
+        "aarch64": 30,
+        "riscv64": 30,
+        "i686": 289,
+        "armv7l": 314,
+        "ppc64le": 273,
+        "s390x": 282,
+    }
+
+    def __init__(self, resources: JobResources):
+        self.nice = resources.nice or None
+        self.ioprio = ProcessLimits._ioprio(value=resources.ionice) if resources.ionice else None
+        self.limits = [ProcessLimits._limit(name=name, value=value) for name, value in resources.limits.items()]
+        self._syscall: Optional[Callable[..., int]] = None
+        self._number: int = 0
+        if self.ioprio is not None and sys.platform == "linux":
+            # Only loaded when required, keeping the command line start up lean.
+            # pylint: disable=import-outside-toplevel
+            import ctypes
+            import ctypes.util
+            import platform
+
+            self._number = ProcessLimits.SYS_IOPRIO_SET.get(platform.machine(), 0)
+            library: Optional[str] = ctypes.util.find_library("c")
+            if self._number and library is not None:
+                self._syscall = ctypes.CDLL(library, use_errno=True).syscall
+
+    @staticmethod
+    def create(resources: Optional[JobResources]) -> Optional["ProcessLimits"]:
+        """
+        Resolves the process settings of an alias.
+
+        Parameters
+        ----------
+        resources: The resources of the alias, if declared.
+
+        Returns
+        -------
+        The process settings, None when there are none to apply.
+        """
+
+        if resources is None or not (resources.nice or resources.ionice or resources.limits):
+            return None
+        return ProcessLimits(resources=resources)
+
+    def apply(self) -> None:
+        """Applies the settings to the current process (called within the child, before it executes the command)."""
+
+        if self.nice:
+            os.nice(self.nice)
+        if self._syscall is not None:
+            self._syscall(self._number, ProcessLimits.IOPRIO_WHO_PROCESS, 0, self.ioprio)
+        if self.limits:
+            # pylint: disable=import-outside-toplevel
+            import resource
+
+            for which, limit in self.limits:
+                resource.setrlimit(which, limit)
+
+    @staticmethod
+    def _ioprio(value: str) -> int:
+        """
+        Resolves an I/O scheduling class.
+
+        Parameters
+        ----------
+        value: The class and optional level, e.g. `idle` or `best-effort:7`.
+
+        Returns
+        -------
+        The I/O priority.
+        """
+
+        name, _, level = value.partition(":")
+        if name not in ProcessLimits.IOPRIO_CLASSES:
+            choices: str = ", ".join(ProcessLimits.IOPRIO_CLASSES)
+            raise ParseError(f"Invalid ionice class `{name}`, expected one of: {choices}")
+        try:
+            priority: int = int(level) if level else ProcessLimits.DEFAULT_IOPRIO_LEVEL
+        except ValueError as error:
+            raise ParseError(f"Invalid ionice level `{level}`") from error
+        if not 0 <= priority <= 7:
+            raise ParseError(f"Invalid ionice level `{level}`, expected 0 to 7")
+        return ProcessLimits.IOPRIO_CLASSES[name] << ProcessLimits.IOPRIO_CLASS_SHIFT | priority
+
+    @staticmethod
+    def _limit(name: str, value: Union[int, str, list]) -> tuple[int, tuple[int, int]]:
+        """
+        Resolves a resource limit.
+
+        Parameters
+        ----------
+        name: The resource, e.g. `as` for RLIMIT_AS.
+        value: The limit (e.g. `4G` or `unlimited`), or its soft and hard limits.
+
+        Returns
+        -------
+        The resource and its (soft, hard) limit, no higher than the current hard limit.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import resource
+
+        which: Optional[int] = getattr(resource, f"RLIMIT_{name.upper()}", None)
+        if which is None:
+            raise ParseError(f"Unknown resource limit `{name}`")
+        values: list = value if isinstance(value, list) else [value, value]
+        if len(values) != 2:
+            raise ParseError(f"Resource limit `{name}` must be a limit or a [soft, hard] pair")
+        hard: int = resource.getrlimit(which)[1]
+        soft, ceiling = (ProcessLimits._bound(name=name, value=item, hard=hard) for item in values)
+        if ceiling != resource.RLIM_INFINITY and (soft == resource.RLIM_INFINITY or soft > ceiling):
+            soft = ceiling
+        return which, (soft, ceiling)
+
+    @staticmethod
+    def _bound(name: str, value: Union[int, str], hard: int) -> int:
+        """
+        Resolves a single limit.
+
+        Parameters
+        ----------
+        name: The resource (used for error reporting).
+        value: The limit, e.g. `4G`, `1024` or `unlimited`.
+        hard: The current hard limit of the resource.
+
+        Returns
+        -------
+        The limit, no higher than the current hard limit.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import resource
+
+        if str(value).lower() in ("unlimited", "infinity"):
+            limit: int = resource.RLIM_INFINITY
+        else:
+            try:
+                limit = parse_size(command="run", value=value)
+            except UnknownArgumentError as error:
+                raise ParseError(f"Resource limit `{name}`: {error.message}") from error
+        if hard != resource.RLIM_INFINITY and (limit == resource.RLIM_INFINITY or limit > hard):
+            return hard
+        return limit
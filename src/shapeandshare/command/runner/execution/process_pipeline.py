@@ -0,0 +1,320 @@
+""" Process Pipeline Definition """
+
+import os
+import signal
+import subprocess
+import time
+from typing import TYPE_CHECKING, BinaryIO, Callable, Optional
+
+from .command_resolver import CommandResolver
+from .process_reaper import ProcessReaper
+
+if TYPE_CHECKING:
+    import resource
+
+
+class ProcessPipeline:
+    """
+    Process Pipeline
+    The processes of a pipeline command (a list of argv lists, e.g. `[["zcat", "data.gz"], ["sort"]]`), started
+    directly rather than via the shell and connected stdout to stdin through os.pipe: the first stage reads the given
+    stdin, the last writes to the given stdout and every stage writes to the given stderr.  The stages can share a new
+    process group (led by the first stage), so that the pipeline can be signalled as a whole.
+
+    Like the shell with `set -o pipefail`, the pipeline fails when any stage fails, with the exit status of the last
+    stage which failed, while the exit status of every stage is kept for reporting (see describe).  The pipeline
+    mimics enough of subprocess.Popen (pid, poll, wait, terminate, kill, returncode, stdout, stderr) to be awaited and
+    terminated in its place.
+
+    Attributes
+    ----------
+    stages
+        The argv of each stage.
+    processes
+        The processes of the stages started so far.
+    stdout
+        The stdout pipe of the last stage, when requested.
+    stderr
+        The stderr pipe shared by the stages, when requested.
+    """
+
+    stages: list[list[str]]
+    processes: list[subprocess.Popen]
+    stdout: Optional[BinaryIO]
+    stderr: Optional[BinaryIO]
+
+    def __init__(self, stages: list[list[str]], resolver: Optional[CommandResolver] = None):
+        self.stages = stages
+        self.processes = []
+        self.stdout = None
+        self.stderr = None
+        self._resolver: CommandResolver = resolver or CommandResolver()
+
+    @property
+    def pid(self) -> int:
+        """
+        Class Property
+        The process id of the first stage (leading the process group of a pipeline started within a new one).
+
+        Returns
+        -------
+        The process id.
+        """
+
+        return self.processes[0].pid
+
+    @property
+    def returncodes(self) -> list[Optional[int]]:
+        """
+        Class Property
+        The exit status of every stage.
+
+        Returns
+        -------
+        The exit status of each stage, None for those still running.
+        """
+
+        return [process.returncode for process in self.processes]
+
+    @property
+    def returncode(self) -> Optional[int]:
+        """
+        Class Property
+        The exit status of the pipeline (pipefail).
+
+        Returns
+        -------
+        The exit status of the last stage which failed (0 when none did), None while any stage is running.
+        """
+
+        return ProcessPipeline.outcome(returncodes=self.returncodes)
+
+    # pylint: disable=too-many-arguments,too-many-locals
+    def start(
+        self,
+        stdout: Optional[int],
+        stderr: Optional[int],
+        stdin: Optional[int] = None,
+        preexec_fn: Optional[Callable[[], None]] = None,
+        new_group: bool = False,
+        **options,
+    ) -> None:
+        """
+        Starts every stage, stopping those already started should one fail to start.
+
+        Parameters
+        ----------
+        stdout: Where the last stage writes to (as accepted by subprocess.Popen, PIPE providing `stdout`).
+        stderr: Where every stage writes its errors to (PIPE providing a single `stderr` shared by the stages).
+        stdin: What the first stage reads from.
+        preexec_fn: Called within every stage before executing, if provided.
+        new_group: Start the stages within a new process group, led by the first stage.
+        options: Further subprocess.Popen options applied to every stage (e.g. cwd, env).
+        """
+
+        errors: Optional[int] = None
+        if stderr == subprocess.PIPE:
+            read_fd, errors = os.pipe()
+            self.stderr = open(read_fd, mode="rb", buffering=0)  # pylint: disable=consider-using-with
+        reader: Optional[int] = None
+        try:
+            for index, argv in enumerate(self.stages):
+                last: bool = index == len(self.stages) - 1
+                next_reader, writer = (None, None) if last else os.pipe()
+                try:
+                    # pylint: disable=consider-using-with,subprocess-popen-preexec-fn
+                    self.processes.append(
+                        subprocess.Popen(
+                            argv,
+                            executable=self._resolver.which(name=argv[0]) or argv[0],
+                            stdin=stdin if index == 0 else reader,
+                            stdout=stdout if last else writer,
+                            stderr=stderr if errors is None else errors,
+                            preexec_fn=self._preexec(group=new_group, apply=preexec_fn),
+                            **options,
+                        )
+                    )
+                finally:
+                    # Only the stages hold the pipe ends, so each sees end of file once its neighbour exits.
+                    for fd in (reader, writer):
+                        if fd is not None:
+                            os.close(fd)
+                    reader = next_reader
+        except BaseException:
+            if reader is not None:
+                os.close(reader)
+            self.kill()
+            if self.stderr is not None:
+                self.stderr.close()
+            raise
+        finally:
+            if errors is not None:
+                os.close(errors)
+        self.stdout = self.processes[-1].stdout
+
+    def __enter__(self) -> "ProcessPipeline":
+        return self
+
+    def __exit__(self, *args) -> None:
+        if self.stderr is not None:
+            self.stderr.close()
+        for process in self.processes:
+            process.__exit__(*args)
+
+    def poll(self) -> Optional[int]:
+        """
+        Checks whether every stage exited.
+
+        Returns
+        -------
+        The exit status of the pipeline, None while any stage is running.
+        """
+
+        for process in self.processes:
+            process.poll()
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """
+        Waits for every stage to exit.
+
+        Parameters
+        ----------
+        timeout: The maximum number of seconds to wait, raising subprocess.TimeoutExpired once exceeded.
+
+        Returns
+        -------
+        The exit status of the pipeline.
+        """
+
+        self.reap(timeout=timeout)
+        return self.returncode
+
+    def reap(self, timeout: Optional[float] = None) -> Optional["resource.struct_rusage"]:
+        """
+        Waits for every stage to exit (see ProcessReaper), within a deadline shared by the stages.
+
+        Parameters
+        ----------
+        timeout: The maximum number of seconds to wait, raising subprocess.TimeoutExpired once exceeded.
+
+        Returns
+        -------
+        The combined resource usage of the stages (their cpu times summed, the largest peak RSS), if reported.
+        """
+
+        deadline: Optional[float] = time.monotonic() + timeout if timeout is not None else None
+        usages: list["resource.struct_rusage"] = []
+        for process in self.processes:
+            if process.returncode is not None:
+                continue
+            remaining: Optional[float] = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+            usage: Optional["resource.struct_rusage"] = ProcessReaper.wait(process=process, timeout=remaining)
+            if usage is not None:
+                usages.append(usage)
+        if not usages:
+            return None
+        # pylint: disable=import-outside-toplevel
+        import resource
+
+        fields: list = [sum(values) for values in zip(*usages)]
+        fields[2] = max(usage.ru_maxrss for usage in usages)
+        return resource.struct_rusage(fields)
+
+    def signal(self, number: int) -> None:
+        """
+        Signals every running stage.
+
+        Parameters
+        ----------
+        number: The signal.
+        """
+
+        for process in self.processes:
+            if process.poll() is None:
+                try:
+                    process.send_signal(number)
+                except OSError:
+                    pass
+
+    def terminate(self) -> None:
+        """Terminates every running stage."""
+
+        self.signal(number=signal.SIGTERM)
+
+    def kill(self) -> None:
+        """Kills every running stage and reaps them."""
+
+        self.signal(number=signal.SIGKILL)
+        for process in self.processes:
+            process.wait()
+
+    @staticmethod
+    def describe(stages: list[list[str]], returncodes: list[Optional[int]]) -> str:
+        """
+        Describes how a pipeline failed.
+
+        Parameters
+        ----------
+        stages: The argv of each stage.
+        returncodes: The exit status of each stage.
+
+        Returns
+        -------
+        Which stage failed last, and the exit status of every stage (as bash reports them within PIPESTATUS).
+        """
+
+        statuses: str = "|".join("-" if code is None else str(code) for code in returncodes)
+        failed: list[int] = [index for index, code in enumerate(returncodes) if code]
+        if not failed:
+            return f"pipeline exit statuses {statuses}"
+        stage: int = failed[-1]
+        return (
+            f"stage {stage + 1} of {len(stages)} (`{CommandResolver.display(command=stages[stage])}`) failed, "
+            f"pipeline exit statuses {statuses}"
+        )
+
+    @staticmethod
+    def outcome(returncodes: list[Optional[int]]) -> Optional[int]:
+        """
+        The exit status of a pipeline (pipefail).
+
+        Parameters
+        ----------
+        returncodes: The exit status of each stage.
+
+        Returns
+        -------
+        The exit status of the last stage which failed (0 when none did), None while any stage is running.
+        """
+
+        if any(code is None for code in returncodes):
+            return None
+        return next((code for code in reversed(returncodes) if code), 0)
+
+    def _preexec(self, group: bool, apply: Optional[Callable[[], None]]) -> Optional[Callable[[], None]]:
+        """
+        The function run within a stage before it executes: joining the process group of the pipeline (when started
+        within a new one, the first stage creating it), then applying the given settings.
+
+        Parameters
+        ----------
+        group: Whether the stages share a new process group.
+        apply: The settings applied to every stage, if any.
+
+        Returns
+        -------
+        The function, None when there is nothing to do.
+        """
+
+        if not group:
+            return apply
+        # The zombie of an exited first stage still holds the group, as stages are only reaped once all are started.
+        pgid: int = self.processes[0].pid if self.processes else 0
+
+        def preexec() -> None:
+            os.setpgid(0, pgid)
+            if apply is not None:
+                apply()
+
+        return preexec
@@ -0,0 +1,101 @@
+""" Process Reaper Definition """
+
+import os
+import select
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import resource
+
+
+# pylint: disable=too-few-public-methods
+class ProcessReaper:
+    """
+    Process Reaper
+    Waits for processes via os.wait4, which (unlike Popen.wait) also reports the resource usage of the process and
+    the descendants it waited on.  Timeouts are awaited on a pidfd where available (Linux 5.3+), otherwise by polling
+    with back off.  Where os.wait4 is unavailable (Windows), Popen.wait is used and no usage is reported.
+
+    Attributes
+    ----------
+    MAX_POLL_INTERVAL
+        The longest pause between polls when no pidfd is available, default: 0.05
+    RSS_UNIT
+        The unit of ru_maxrss in bytes (kilobytes on Linux, bytes on macOS).
+    """
+
+    MAX_POLL_INTERVAL: float = 0.05
+    RSS_UNIT: int = 1 if sys.platform == "darwin" else 1024
+
+    @staticmethod
+    def wait(process: subprocess.Popen, timeout: Optional[float] = None) -> Optional["resource.struct_rusage"]:
+        """
+        Waits for a process to exit, setting its returncode.
+
+        Parameters
+        ----------
+        process: The process to wait for.
+        timeout: The maximum number of seconds to wait, raising subprocess.TimeoutExpired once exceeded.
+
+        Returns
+        -------
+        The resource usage of the process, None when unavailable (e.g. it was reaped elsewhere).
+        """
+
+        if not hasattr(os, "wait4"):
+            process.wait(timeout=timeout)
+            return None
+        try:
+            result: Optional[tuple[int, int, "resource.struct_rusage"]] = ProcessReaper._reap(
+                pid=process.pid, timeout=timeout
+            )
+        except ChildProcessError:
+            # Reaped concurrently (e.g. by a cancellation), Popen knows the outcome.
+            process.wait()
+            return None
+        if result is None:
+            raise subprocess.TimeoutExpired(cmd=process.args, timeout=timeout)
+        process.returncode = os.waitstatus_to_exitcode(result[1])
+        return result[2]
+
+    @staticmethod
+    def _reap(pid: int, timeout: Optional[float]) -> Optional[tuple[int, int, "resource.struct_rusage"]]:
+        """
+        Waits for a child process to exit and reaps it.
+
+        Parameters
+        ----------
+        pid: The child process.
+        timeout: The maximum number of seconds to wait, None to wait indefinitely.
+
+        Returns
+        -------
+        The os.wait4 result, or None on timeout.
+        """
+
+        if timeout is None:
+            return os.wait4(pid, 0)
+        try:
+            pidfd: Optional[int] = os.pidfd_open(pid)
+        except (AttributeError, OSError):
+            pidfd = None
+        if pidfd is not None:
+            try:
+                readable: list = select.select([pidfd], [], [], timeout)[0]
+            finally:
+                os.close(pidfd)
+            return os.wait4(pid, 0) if readable else None
+
+        deadline: float = time.monotonic() + timeout
+        interval: float = 0.001
+        while True:
+            result: tuple[int, int, "resource.struct_rusage"] = os.wait4(pid, os.WNOHANG)
+            if result[0] != 0:
+                return result
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+            interval = min(interval * 2, ProcessReaper.MAX_POLL_INTERVAL)
@@ -0,0 +1,507 @@
+""" Job Scheduler Definition """
+
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, Optional, Union
+
+from ..contacts.step_status import StepStatus
+from .admission_controller import AdmissionController
+from .base_scheduler import BaseScheduler
+from .command_resolver import CommandResolver
+from .job import Job
+from .job_graph import JobGraph
+from .output_pipeline import OutputPipeline, OutputStream
+from .process_pipeline import ProcessPipeline
+from .process_reaper import ProcessReaper
+from .shell_session import ShellSession
+from .step_log import StepLog
+
+if TYPE_CHECKING:
+    from ..worker.worker_pool import WorkerPool
+
+
+class Scheduler(BaseScheduler):
+    """
+    Job Scheduler
+    Runs the jobs of a job graph on a bounded worker pool, starting each job once all of its prerequisites succeed.
+    On the first failure every other running job is cancelled and the failure is raised, except that a failure within
+    a matrix cell only holds back the jobs depending on it, so the other cells still run to completion.
+    Commands without shell syntax (and argv-list commands) are spawned directly, pipelines (lists of argv lists) as
+    connected processes (see ProcessPipeline), everything else runs via the shell.
+    Jobs of a session alias run one after another within a shared shell session, and are never skipped or cached
+    (as later commands may depend on the shell state earlier ones set up).
+    When a state store is provided, jobs which are up to date are skipped and successful runs are recorded.
+    When an artifact cache is also provided, fingerprinted jobs are restored from it when possible, otherwise their
+    output is captured (while still being shown) and stored after a successful run.
+    Unless the output is inherited, process output is streamed through an output pipeline (see OutputPipeline), which
+    prefixes lines with the job name when jobs may run concurrently and keeps the tail of each job for failure reports.
+    Jobs only start once admitted (see AdmissionController), taking their declared cpu and memory weights and, when
+    `adaptive` (`-j auto`), the live load and memory of the machine into account.  Processes of aliases declaring a
+    niceness, I/O class or resource limits have them applied before executing (see ProcessLimits).
+    Given a worker pool, commands run on the workers instead (see WorkerPool), their output streamed back through the
+    output pipeline, except for session jobs, which always run locally.  The remaining settings are described by
+    BaseScheduler.
+
+    Attributes
+    ----------
+    workers
+        The workers commands are dispatched to, if any.
+    """
+
+    workers: Optional["WorkerPool"]
+
+    def __init__(self, adaptive: bool = False, workers: Optional["WorkerPool"] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.workers = workers
+        self._admission: AdmissionController = AdmissionController(jobs=self.jobs, adaptive=adaptive)
+        self._pipeline: Optional[OutputPipeline] = None
+        self._cancelled: threading.Event = threading.Event()
+        self._lock: threading.Lock = threading.Lock()
+        self._processes: set[Union[subprocess.Popen, ProcessPipeline]] = set()
+        self._sessions: dict[str, ShellSession] = {}
+
+    def execute(self, graph: JobGraph) -> None:
+        """
+        Runs every job within the graph.
+
+        Parameters
+        ----------
+        graph: The job graph to execute.
+        """
+
+        waiting_on: dict[Job, int] = {job: len(job.dependencies) for job in graph.jobs}
+        ready: deque[Job] = deque()
+        running: dict[Future, Job] = {}
+        failure: Optional[BaseException] = None
+
+        if self._streams(graph=graph):
+            self._pipeline = OutputPipeline()
+        self._plan(graph=graph)
+        self._queue(jobs=graph.roots(), ready=ready)
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            try:
+                while ready or running:
+                    while ready and not self._cancelled.is_set() and len(running) < self.jobs:
+                        if not self._admission.admits(job=ready[0], running=running.values()):
+                            break
+                        job: Job = ready.popleft()
+                        running[pool.submit(self._run, job)] = job
+
+                    # Held back jobs are re-evaluated as the load and memory of the machine change.
+                    held: bool = bool(ready) and self._admission.adaptive
+                    timeout: Optional[float] = AdmissionController.POLL_INTERVAL if held else None
+                    done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job = running.pop(future)
+                        error: Optional[BaseException] = future.exception()
+                        if error is not None:
+                            failure = failure or error
+                            # A failed matrix cell only holds back its own dependents, the other cells carry on.
+                            if not job.cell:
+                                self.cancel()
+                            continue
+                        self._release(job=job, waiting_on=waiting_on, ready=ready)
+                    if self._cancelled.is_set():
+                        ready.clear()
+            except KeyboardInterrupt:
+                self.cancel()
+                raise
+            finally:
+                self._close_sessions()
+                if self._pipeline is not None:
+                    self._pipeline.close()
+                    self._pipeline = None
+
+        if failure is not None:
+            raise failure
+
+    def cancel(self) -> None:
+        """Stops scheduling new jobs and terminates the running ones."""
+
+        self._cancelled.set()
+        with self._lock:
+            processes: list[Union[subprocess.Popen, ProcessPipeline]] = list(self._processes)
+            sessions: list[ShellSession] = list(self._sessions.values())
+        Scheduler._terminate(processes=processes, sessions=sessions)
+        if self.workers is not None:
+            self.workers.cancel()
+
+    def _close_sessions(self) -> None:
+        """Ends every shell session."""
+
+        with self._lock:
+            sessions: list[ShellSession] = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    @staticmethod
+    def _terminate(
+        processes: list[Union[subprocess.Popen, ProcessPipeline]], sessions: Optional[list[ShellSession]] = None
+    ) -> None:
+        """
+        Terminates processes (or every stage of pipelines) and shell sessions all at once, then kills whichever have
+        not exited by the end of the grace period (which they share, rather than being given one each).
+
+        Parameters
+        ----------
+        processes: The processes to stop.
+        sessions: The shell sessions to stop, if any.
+        """
+
+        running: list[Union[subprocess.Popen, ProcessPipeline]] = [
+            process for process in processes if process.poll() is None
+        ]
+        for process in running:
+            process.terminate()
+        for session in sessions or []:
+            session.signal(number=signal.SIGTERM)
+        deadline: float = time.monotonic() + Scheduler.TERMINATE_GRACE_PERIOD
+        for process in running:
+            try:
+                process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                process.kill()
+        for session in sessions or []:
+            session.terminate(grace=max(0.0, deadline - time.monotonic()))
+
+    def _run(self, job: Job) -> None:
+        """
+        Runs a single job, recording its metrics.
+
+        Parameters
+        ----------
+        job: The job to run.
+        """
+
+        started: float = time.monotonic()
+        slot: int = self._claim_slot()
+        try:
+            status: str = self._run_job(job=job)
+        except BaseException as error:
+            failed: str = StepStatus.CANCELLED if self._cancelled.is_set() else StepStatus.FAILED
+            self._record(job=job, status=failed, started=started, slot=slot, error=error)
+            raise
+        finally:
+            self._free_slot(slot=slot)
+        self._record(job=job, status=status, started=started, slot=slot)
+
+    def _run_job(self, job: Job) -> str:
+        """
+        Runs a single job.
+
+        Parameters
+        ----------
+        job: The job to run.
+
+        Returns
+        -------
+        How the job concluded (a StepStatus value).
+        """
+
+        if self._cancelled.is_set():
+            raise self._failure(job=job, returncode=1, message="cancelled")
+
+        if job.session is not None:
+            self._launch_in_session(job=job)
+            return StepStatus.RAN
+
+        fingerprint: Optional[str] = self.state.fingerprint(job=job) if self.state is not None else None
+        if self.state is not None and self.state.up_to_date(job=job, fingerprint=fingerprint):
+            self._announce(job=job, note="up to date")
+            return StepStatus.UP_TO_DATE
+
+        status: str = StepStatus.RAN
+
+        if self.artifacts is not None and fingerprint is not None:
+            manifest: Optional[dict] = self.artifacts.lookup(key=fingerprint)
+            if manifest is not None:
+                self._announce(job=job, note="restored from cache")
+                self.artifacts.restore(key=fingerprint, manifest=manifest)
+                self._replay(job=job, manifest=manifest)
+                self._log_restored(job=job, manifest=manifest)
+                status = StepStatus.RESTORED
+            else:
+                with self.artifacts.temporary_file() as stdout, self.artifacts.temporary_file() as stderr:
+                    self._launch(job=job, capture=(stdout, stderr))
+                    self.artifacts.store(key=fingerprint, outputs=job.outputs, stdout=stdout, stderr=stderr)
+        else:
+            self._launch(job=job)
+
+        if self.state is not None:
+            self.state.record(job=job, fingerprint=fingerprint)
+        return status
+
+    def _launch_in_session(self, job: Job) -> None:
+        """
+        Runs a job within the shell session of its alias, starting the session if required.
+
+        Parameters
+        ----------
+        job: The job to run.
+        """
+
+        with self._lock:
+            session: Optional[ShellSession] = self._sessions.get(job.session)
+            if session is None or not session.alive:
+                session = ShellSession()
+                self._sessions[job.session] = session
+        self._announce(job=job)
+        streams: list[OutputStream] = []
+        tail: deque = deque()
+        if self._pipeline is not None:
+            _, streams, tail = self._stream(job=job, capture=None, readers=session.outputs())
+        if self._cancelled.is_set():
+            session.terminate()
+        try:
+            returncode: int = session.run(command=job.display, timeout=self.per_command_timeout)
+        except subprocess.TimeoutExpired as error:
+            session.terminate()
+            self._drain(streams=streams)
+            raise self._failure(job=job, returncode=1, tail=tail, timed_out=True) from error
+        self._drain(streams=streams)
+        if returncode != 0:
+            raise self._failure(job=job, returncode=returncode, tail=tail)
+
+    def _stream(
+        self, job: Job, capture: Optional[tuple[BinaryIO, BinaryIO]], readers: Optional[tuple[int, int]] = None
+    ) -> tuple[tuple[Optional[int], Optional[int]], list[OutputStream], deque]:
+        """
+        Creates the stdout and stderr pipes of a job, handing their read ends over to the output pipeline (along with
+        the log of the job, when logging).
+
+        Parameters
+        ----------
+        job: The job to create pipes for.
+        capture: Files receiving a copy of the stdout and stderr of the process, if any.
+        readers: The read ends of pipes created elsewhere (e.g. by a shell session) to use instead, if any.
+
+        Returns
+        -------
+        The write ends of the pipes (for the process, None for pipes created elsewhere), the registered streams and
+        their shared tail buffer.
+        """
+
+        tail: deque = OutputStream.new_tail()
+        label: Optional[str] = self._label(job=job)
+        log: Optional[StepLog] = self.logs.open(job=job) if self.logs is not None else None
+        writers: list[Optional[int]] = []
+        streams: list[OutputStream] = []
+        for index, target in enumerate((sys.stdout, sys.stderr)):
+            target.flush()
+            read_fd, write_fd = os.pipe() if readers is None else (readers[index], None)
+            writers.append(write_fd)
+            streams.append(
+                self._pipeline.register(
+                    fd=read_fd,
+                    label=label,
+                    target=self._target(stream=target),
+                    capture=capture[index] if capture is not None else None,
+                    tail=tail,
+                    log=log,
+                )
+            )
+        return (writers[0], writers[1]), streams, tail
+
+    def _replay(self, job: Job, manifest: dict) -> None:
+        """
+        Writes out the cached output of a job restored from the artifact cache through the output pipeline, exactly as
+        the output of its process would have been (labelled, or only kept as the tail when quiet).
+
+        Parameters
+        ----------
+        job: The restored job.
+        manifest: The artifact cache manifest of the job.
+        """
+
+        sources: list[Path] = self.artifacts.logs(manifest=manifest)
+        if self._pipeline is None:
+            self._replay_inherited(sources=sources)
+            return
+        tail: deque = OutputStream.new_tail()
+        label: Optional[str] = self._label(job=job)
+        for source, target in zip(sources, (sys.stdout, sys.stderr)):
+            target.flush()
+            read_fd, write_fd = os.pipe()
+            stream: OutputStream = self._pipeline.register(
+                fd=read_fd, label=label, target=self._target(stream=target), capture=None, tail=tail
+            )
+            with open(source, mode="rb") as file, open(write_fd, mode="wb") as writer:
+                shutil.copyfileobj(file, writer)
+            self._drain(streams=[stream])
+
+    def _drain(self, streams: list[OutputStream]) -> None:
+        """
+        Waits for the output of an exited process to be written out.
+
+        Parameters
+        ----------
+        streams: The streams of the process.
+        """
+
+        deadline: float = time.monotonic() + self.DRAIN_TIMEOUT
+        for stream in streams:
+            if not stream.done.wait(timeout=max(0.0, deadline - time.monotonic())):
+                self._pipeline.abandon(stream=stream)
+
+    def _launch(self, job: Job, capture: Optional[tuple[BinaryIO, BinaryIO]] = None) -> None:
+        """
+        Launches the process of a job and waits for it to complete.
+
+        Parameters
+        ----------
+        job: The job to run.
+        capture: Files receiving a copy of the stdout and stderr of the process, if any.
+        """
+
+        if self.workers is not None:
+            self._dispatch(job=job, capture=capture)
+            return
+        stages: Optional[list[list[str]]] = CommandResolver.stages(command=job.command)
+        self._announce(job=job)
+
+        writers: tuple[Optional[int], Optional[int]] = (None, None)
+        streams: list[OutputStream] = []
+        tail: deque = deque()
+        if self._pipeline is not None:
+            writers, streams, tail = self._stream(job=job, capture=capture)
+        try:
+            process: Union[subprocess.Popen, ProcessPipeline] = self._spawn(job=job, stages=stages, writers=writers)
+        except (OSError, subprocess.SubprocessError) as error:
+            raise self._failure(job=job, returncode=127, message=str(error)) from error
+        finally:
+            # Only the process holds the write ends, so the pipeline sees end of file once it (and its children) exit.
+            for write_fd in writers:
+                if write_fd is not None:
+                    os.close(write_fd)
+
+        with process:
+            with self._lock:
+                self._processes.add(process)
+            if self._cancelled.is_set():
+                Scheduler._terminate(processes=[process])
+            try:
+                self._usage[job] = (
+                    process.reap(timeout=self.per_command_timeout)
+                    if isinstance(process, ProcessPipeline)
+                    else ProcessReaper.wait(process=process, timeout=self.per_command_timeout)
+                )
+            except subprocess.TimeoutExpired as error:
+                Scheduler._terminate(processes=[process])
+                self._drain(streams=streams)
+                raise self._failure(job=job, returncode=1, tail=tail, timed_out=True) from error
+            finally:
+                with self._lock:
+                    self._processes.discard(process)
+            self._drain(streams=streams)
+            if process.returncode != 0:
+                message: Optional[str] = (
+                    ProcessPipeline.describe(stages=stages, returncodes=process.returncodes)
+                    if isinstance(process, ProcessPipeline)
+                    else None
+                )
+                raise self._failure(job=job, returncode=process.returncode, tail=tail, message=message)
+
+    def _spawn(
+        self, job: Job, stages: Optional[list[list[str]]], writers: tuple[Optional[int], Optional[int]]
+    ) -> Union[subprocess.Popen, ProcessPipeline]:
+        """
+        Spawns the process of a job (or the processes of a pipeline job).
+
+        Parameters
+        ----------
+        job: The job to run.
+        stages: The argv of each stage, when the job is a pipeline.
+        writers: Where the stdout and stderr of the process are written to (None to inherit them).
+
+        Returns
+        -------
+        The process (or pipeline).
+        """
+
+        # close_fds=False (our descriptors are non-inheritable) allows the use of posix_spawn.  Process limits are
+        # resolved up front, the child only makes the system calls.
+        if stages is not None:
+            pipeline: ProcessPipeline = ProcessPipeline(stages=stages, resolver=self._resolver)
+            pipeline.start(
+                stdout=writers[0],
+                stderr=writers[1],
+                close_fds=False,
+                preexec_fn=job.limits.apply if job.limits is not None else None,
+            )
+            return pipeline
+        resolved: Optional[tuple[str, list[str]]] = self._resolver.resolve(command=job.command)
+        # pylint: disable=consider-using-with,subprocess-popen-preexec-fn
+        return subprocess.Popen(
+            job.command if resolved is None else resolved[1],
+            executable=None if resolved is None else resolved[0],
+            shell=resolved is None,
+            stdout=writers[0],
+            stderr=writers[1],
+            close_fds=False,
+            preexec_fn=job.limits.apply if job.limits is not None else None,
+        )
+
+    def _dispatch(self, job: Job, capture: Optional[tuple[BinaryIO, BinaryIO]] = None) -> None:
+        """
+        Runs a job on a worker and waits for it to complete.
+
+        Parameters
+        ----------
+        job: The job to run.
+        capture: Files receiving a copy of the stdout and stderr of the process, if any.
+        """
+
+        def started(address: str, lost: Optional[str]) -> None:
+            self._announce(job=job, note=f"on {address}" if lost is None else f"retrying on {address}, lost {lost}")
+
+        writers: tuple[Optional[int], Optional[int]] = (None, None)
+        streams: list[OutputStream] = []
+        tail: deque = deque()
+        if self._pipeline is not None:
+            writers, streams, tail = self._stream(job=job, capture=capture)
+        else:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        request: dict = {
+            "command": job.command,
+            "env": {name: os.environ[name] for name in job.environment if name in os.environ},
+            "timeout": self.per_command_timeout,
+            "resources": job.resources.as_dict() if job.resources is not None else None,
+        }
+        result: Optional[dict] = None
+        problem: str = "cancelled"
+        try:
+            result = self.workers.dispatch(
+                request=request,
+                outputs=(1, 2) if self._pipeline is None else (writers[0], writers[1]),
+                started=started,
+            )
+        except OSError as error:
+            if not self._cancelled.is_set():
+                problem = f"no worker could run the command: {error}"
+        finally:
+            for write_fd in writers:
+                if write_fd is not None:
+                    os.close(write_fd)
+
+        self._drain(streams=streams)
+        if result is None:
+            raise self._failure(job=job, returncode=1, tail=tail, message=problem)
+        if result.get("error"):
+            raise self._failure(job=job, returncode=127, message=str(result["error"]))
+        if result.get("timed_out"):
+            raise self._failure(job=job, returncode=1, tail=tail, timed_out=True)
+        if result.get("returncode") != 0:
+            message: Optional[str] = None
+            if result.get("returncodes"):
+                message = ProcessPipeline.describe(stages=job.command, returncodes=result["returncodes"])
+            raise self._failure(job=job, returncode=int(result.get("returncode", 1)), tail=tail, message=message)
@@ -0,0 +1,168 @@
+""" Shard Planner Definition """
+
+import hashlib
+import json
+import statistics
+from typing import Optional
+
+from .base_scheduler import BaseScheduler
+from .job import Job
+from .job_graph import JobGraph
+
+
+class ShardPlanner:
+    """
+    Shard Planner
+    Splits a run into shards of balanced expected duration, so that several machines (e.g. CI nodes) each run one of
+    them (`sacr run <alias> --shard K/N`).  The units split between shards are the final steps of the run (each with
+    the steps only it waits on: the earlier steps of a matrix cell, or of a chained alias) or, across a workspace, the
+    packages.  Steps several units wait on (e.g. a shared [depends] build) run within every shard needing them, and are
+    left out of the balance.
+
+    A unit is expected to take as long as its steps took in the run history (see RunHistory), steps without a history
+    being expected to take the median of those with one, or, without any history, to take as long as one another (the
+    units are balanced by their number of steps).  Units are placed longest first, each onto the shard expected to
+    finish first (ties going to the lowest shard, then the unit declared first), so every machine computes the same
+    split given the same configuration and history: CI nodes should restore the same history (e.g. from one cache
+    key), and the fingerprint of the split is shown so that a node splitting differently stands out.
+
+    Attributes
+    ----------
+    index
+        The shard to run, counted from 1.
+    count
+        The number of shards.
+    loads
+        The expected wall time of every shard (once assigned).
+    known
+        Whether the expectations came from the run history, rather than the number of steps.
+    steps
+        The number of steps balanced (once assigned).
+    missing
+        The number of those steps without a history (once assigned).
+    plan
+        A fingerprint of the split, differing between machines which split differently (once assigned).
+    """
+
+    index: int
+    count: int
+    loads: list[float]
+    known: bool
+    steps: int
+    missing: int
+    plan: str
+
+    def __init__(self, index: int, count: int):
+        self.index = index
+        self.count = count
+        self.loads = [0.0] * count
+        self.known = False
+        self.steps = 0
+        self.missing = 0
+        self.plan = ""
+
+    def split(self, graph: JobGraph, expected: dict[str, float]) -> JobGraph:
+        """
+        Narrows a job graph to the steps of this shard.
+
+        Parameters
+        ----------
+        graph: The job graph of the whole run.
+        expected: The expected wall time (seconds) by job name, for the jobs with a history (see RunHistory).
+
+        Returns
+        -------
+        The job graph of the shard.
+        """
+
+        owners: dict[Job, set[Job]] = {}
+        # Prerequisites are declared before the jobs waiting on them, so every dependent is visited first.
+        for job in reversed(graph.jobs):
+            owners[job] = set().union(*(owners[dependent] for dependent in job.dependents)) if job.dependents else {job}
+        names: dict[Job, str] = {}
+        for sink in graph.sinks():
+            # An alias run from several others repeats its job names.
+            names[sink] = sink.name if sink.name not in names.values() else f"{sink.name}#{len(names)}"
+        units: dict[str, list[Optional[float]]] = {name: [] for name in names.values()}
+        for job in graph.jobs:
+            if len(owners[job]) == 1:
+                units[names[next(iter(owners[job]))]].append(expected.get(job.name))
+
+        selected: set[str] = set(self.assign(units=units))
+        return graph.subgraph(jobs={job for job in graph.jobs if any(names[sink] in selected for sink in owners[job])})
+
+    def assign(self, units: dict[str, list[Optional[float]]]) -> list[str]:
+        """
+        Balances units between the shards, noting the expected wall time of every shard and a fingerprint of the
+        split (which matches between machines splitting alike).
+
+        Parameters
+        ----------
+        units: The expected wall time (seconds) of each step of every unit by name, None for steps without a history.
+
+        Returns
+        -------
+        The units of this shard, in the order given.
+        """
+
+        durations: list[float] = [duration for steps in units.values() for duration in steps if duration is not None]
+        typical: float = statistics.median(durations) if durations else 1.0
+        weights: dict[str, float] = {
+            unit: sum(typical if duration is None else duration for duration in steps) for unit, steps in units.items()
+        }
+        self.loads = [0.0] * self.count
+        self.known = bool(durations)
+        self.steps = sum(len(steps) for steps in units.values())
+        self.missing = self.steps - len(durations)
+        shards: dict[str, int] = {}
+        # sorted is stable, so equally weighted units keep their declaration order.
+        for unit in sorted(units, key=lambda item: weights[item], reverse=True):
+            shard: int = min(range(self.count), key=lambda position: (self.loads[position], position))
+            shards[unit] = shard
+            self.loads[shard] += weights[unit]
+        self.plan = hashlib.sha256(json.dumps(shards, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+        return [unit for unit in units if shards[unit] == self.index - 1]
+
+    def warning(self) -> Optional[str]:
+        """
+        Warns of a split other machines may not share (once assigned): steps without a history are balanced by
+        guesswork, which machines holding a history for them split differently.
+
+        Returns
+        -------
+        The warning, None when every step has a history.
+        """
+
+        if not self.missing:
+            return None
+        lacking: str = (
+            "no step has a run history"
+            if self.missing == self.steps
+            else f"{self.missing} of {self.steps} steps have no run history"
+        )
+        return (
+            f"Shard {self.index}/{self.count} (plan {self.plan}): {lacking}, should other machines hold a different "
+            "history (.sacr/history) they split the run differently, running some steps twice and others not at all.  "
+            "Restore the same history on every machine and check the plans match."
+        )
+
+    def summary(self, size: str) -> str:
+        """
+        Describes the share of this shard (once assigned).
+
+        Parameters
+        ----------
+        size: How much of the run the shard covers, e.g. `12 of 40 steps`.
+
+        Returns
+        -------
+        The summary, e.g. `Shard 2/4 (plan 9f86d081): 12 of 40 steps, expected to take 1m 05s (longest shard 1m 10s)`.
+        """
+
+        share: str = "balanced by the number of steps (without a history)"
+        if self.known:
+            share = (
+                f"expected to take {BaseScheduler.duration(self.loads[self.index - 1])} "
+                f"(longest shard {BaseScheduler.duration(max(self.loads))})"
+            )
+        return f"Shard {self.index}/{self.count} (plan {self.plan}): {size}, {share}"
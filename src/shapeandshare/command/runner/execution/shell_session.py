@@ -0,0 +1,262 @@
+""" Shell Session Definition """
+
+import os
+import secrets
+import selectors
+import shutil
+import signal
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from shlex import quote
+from typing import Optional
+
+
+class ShellSession:
+    """
+    Shell Session
+    A long-lived shell which runs a sequence of commands, so that shell start up happens once and state (the working
+    directory, exported variables, an activated virtual environment) carries over from one command to the next.
+
+    Commands are written to the shell's stdin.  After each command the shell reports its exit status as a line of
+    `<token> <status>` on a dedicated control pipe, the random token making the sentinel impossible to forge by
+    accident.  Commands run with stdin redirected from /dev/null (stdin carries the session script) and inherit our
+    stdout and stderr, unless fresh output pipes were requested for the command (see outputs), in which case its
+    stdout and stderr are redirected into a pair of named pipes created for it alone.  The shell runs within its own
+    process group, so a timed out or cancelled command is stopped along with the shell.
+
+    Attributes
+    ----------
+    process
+        The shell process.
+    SHELL
+        The shell to run, default: "/bin/sh"
+    TERMINATE_GRACE_PERIOD
+        Seconds the session is given to exit before being killed, default: 5
+    """
+
+    process: subprocess.Popen
+    SHELL: str = "/bin/sh"
+    TERMINATE_GRACE_PERIOD: int = 5
+
+    def __init__(self, cwd: Optional[str] = None):
+        self._token: str = f"__sacr_{secrets.token_hex(8)}__"
+        read_fd, write_fd = os.pipe()
+        try:
+            # pylint: disable=consider-using-with
+            self.process = subprocess.Popen(
+                [self.SHELL, "-s"],
+                stdin=subprocess.PIPE,
+                pass_fds=(write_fd,),
+                start_new_session=True,
+                cwd=cwd,
+            )
+        finally:
+            os.close(write_fd)
+        self._control: Optional[int] = read_fd
+        self._pending: bytes = b""
+        self._directory: Optional[Path] = None
+        self._outputs: list[tuple[Path, int]] = []
+        self._count: int = 0
+        # Re-open the control pipe as fd 3, as /bin/sh may not support multi-digit descriptors in redirections.
+        self._send(script=f"exec 3>/dev/fd/{write_fd}\n")
+
+    @property
+    def alive(self) -> bool:
+        """
+        Class Property
+        Whether the shell is still running.
+
+        Returns
+        -------
+        True while the shell has not exited.
+        """
+
+        return self.process.poll() is None
+
+    def _send(self, script: str) -> None:
+        """
+        Writes script text to the shell.
+
+        Parameters
+        ----------
+        script: The script text.
+        """
+
+        self.process.stdin.write(script.encode("utf-8"))
+        self.process.stdin.flush()
+
+    def outputs(self) -> tuple[int, int]:
+        """
+        Creates the stdout and stderr pipes of the next command run.  Until the command has run, the session holds
+        the write ends open itself, so the pipes only reach end of file once the command is done with them.
+
+        Returns
+        -------
+        The read ends of the stdout and stderr pipes, owned by the caller.
+        """
+
+        if self._directory is None:
+            self._directory = Path(tempfile.mkdtemp(prefix="sacr-session-"))
+        self._count += 1
+        readers: list[int] = []
+        for name in ("stdout", "stderr"):
+            path: Path = self._directory / f"{self._count}.{name}"
+            os.mkfifo(path, mode=0o600)
+            # A fifo opens for reading straight away when non-blocking, after which opening it for writing succeeds.
+            read_fd: int = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            self._outputs.append((path, os.open(path, os.O_WRONLY)))
+            os.set_blocking(read_fd, True)
+            readers.append(read_fd)
+        return readers[0], readers[1]
+
+    def _release(self) -> None:
+        """Closes (and removes) the output pipes of the last command run."""
+
+        for path, write_fd in self._outputs:
+            os.close(write_fd)
+            path.unlink(missing_ok=True)
+        self._outputs.clear()
+
+    def run(self, command: str, timeout: Optional[float] = None) -> int:
+        """
+        Runs a command within the session.
+
+        Parameters
+        ----------
+        command: The command to run.
+        timeout: The maximum duration (in seconds) the command may run.
+
+        Returns
+        -------
+        The exit status of the command (or of the shell, if the command exited it).
+        """
+
+        try:
+            return self._run(command=command, timeout=timeout)
+        finally:
+            self._release()
+
+    def _run(self, command: str, timeout: Optional[float]) -> int:
+        """
+        Runs a command within the session, redirecting its output into the pipes created for it (if any).
+
+        Parameters
+        ----------
+        command: The command to run.
+        timeout: The maximum duration (in seconds) the command may run.
+
+        Returns
+        -------
+        The exit status of the command (or of the shell, if the command exited it).
+        """
+
+        redirects: str = "".join(f" {number}>{quote(str(path))}" for number, (path, _) in zip((1, 2), self._outputs))
+        try:
+            self._send(
+                script=f"{{ {command}\n}} </dev/null{redirects} 3>&-\nprintf '%s %s\\n' {self._token} \"$?\" >&3\n"
+            )
+        except BrokenPipeError:
+            return self.process.wait()
+
+        deadline: Optional[float] = time.monotonic() + timeout if timeout is not None else None
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._control, selectors.EVENT_READ)
+            while True:
+                status: Optional[int] = self._status()
+                if status is not None:
+                    return status
+                remaining: Optional[float] = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise subprocess.TimeoutExpired(cmd=command, timeout=timeout)
+                if not selector.select(timeout=remaining if remaining is not None and remaining < 1 else 1):
+                    if not self.alive:
+                        return self.process.returncode
+                    continue
+                chunk: bytes = os.read(self._control, 4096)
+                if not chunk:
+                    return self.process.wait()
+                self._pending += chunk
+
+    def _status(self) -> Optional[int]:
+        """
+        Consumes a complete status line from the control pipe, if one has been received.
+
+        Returns
+        -------
+        The reported exit status, or None.
+        """
+
+        while b"\n" in self._pending:
+            line, self._pending = self._pending.split(b"\n", 1)
+            parts: list[str] = line.decode("utf-8", errors="replace").split()
+            if len(parts) == 2 and parts[0] == self._token:
+                return int(parts[1])
+        return None
+
+    def close(self) -> None:
+        """Ends the session, letting the shell exit on end of input."""
+
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        try:
+            self.process.wait(timeout=self.TERMINATE_GRACE_PERIOD)
+        except subprocess.TimeoutExpired:
+            self.terminate()
+        if self._control is not None:
+            os.close(self._control)
+            self._control = None
+        self._remove()
+
+    def _remove(self) -> None:
+        """Removes the directory of the output pipes, if any."""
+
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+    def signal(self, number: int) -> bool:
+        """
+        Signals the shell and everything it started.
+
+        Parameters
+        ----------
+        number: The signal to send.
+
+        Returns
+        -------
+        Whether the shell was still running.
+        """
+
+        if not self.alive:
+            return False
+        try:
+            os.killpg(self.process.pid, number)
+        except ProcessLookupError:
+            return False
+        return True
+
+    def terminate(self, grace: Optional[float] = None) -> None:
+        """
+        Stops the shell and everything it started.
+
+        Parameters
+        ----------
+        grace: Seconds the session is given to exit before being killed, by default TERMINATE_GRACE_PERIOD.
+        """
+
+        for number, timeout in (
+            (signal.SIGTERM, self.TERMINATE_GRACE_PERIOD if grace is None else grace),
+            (signal.SIGKILL, self.TERMINATE_GRACE_PERIOD),
+        ):
+            if not self.signal(number=number):
+                break
+            try:
+                self.process.wait(timeout=timeout)
+                break
+            except subprocess.TimeoutExpired:
+                continue
+        self._remove()
@@ -0,0 +1,208 @@
+""" Step Log Definition """
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+from ..contacts.log_compression import LogCompression
+
+if TYPE_CHECKING:
+    import lzma
+    import zlib
+
+
+class StepLog:
+    """
+    Step Log
+    The log file of a step: its stdout and stderr as they arrive, compressed on the fly (gzip or xz, both through
+    their C libraries, so output is handled as raw bytes throughout).  Uncompressed logs can also be written without
+    the output entering the process at all: `splice` moves it from a pipe into the file within the kernel (os.splice,
+    Linux), and `copy` from a file (os.sendfile), falling back to reading and writing where the kernel declines.
+
+    The stdout and stderr streams of a step share its log, each holding it open, and the log is closed once both
+    released it.  Logs are best effort: should writing one fail, it is left incomplete rather than failing the step.
+
+    Attributes
+    ----------
+    path
+        The log file.
+    compression
+        How the log is compressed.
+    GZIP_LEVEL
+        The gzip compression level (favouring throughput), default: 1
+    XZ_PRESET
+        The xz compression preset (favouring throughput), default: 1
+    COPY_SIZE
+        The largest chunk copied at once, default: 1 MiB
+    TAIL_SIZE
+        The number of trailing bytes of an uncompressed log read back for failure reports, default: 64 KiB
+    """
+
+    path: Path
+    compression: LogCompression
+    GZIP_LEVEL: int = 1
+    XZ_PRESET: int = 1
+    COPY_SIZE: int = 1024 * 1024
+    TAIL_SIZE: int = 64 * 1024
+
+    def __init__(self, path: Path, compression: LogCompression, holders: int = 2):
+        self.path = path
+        self.compression = compression
+        self._fd: Optional[int] = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
+        self._compressor: Optional[Union["zlib._Compress", "lzma.LZMACompressor"]] = None
+        # The compression libraries are only loaded by the runs which use them.
+        # pylint: disable=import-outside-toplevel,redefined-outer-name
+        if compression == LogCompression.GZIP:
+            import zlib
+
+            # wbits of 16 + 15 writes the gzip header and trailer around the deflate stream.
+            self._compressor = zlib.compressobj(StepLog.GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        elif compression == LogCompression.XZ:
+            import lzma
+
+            self._compressor = lzma.LZMACompressor(preset=StepLog.XZ_PRESET)
+        self._direct: bool = self._compressor is None and hasattr(os, "splice")
+        self._holders: int = holders
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def direct(self) -> bool:
+        """
+        Class Property
+        Whether output can be moved into the log within the kernel (see splice).
+
+        Returns
+        -------
+        True while the log is open, uncompressed and the kernel supports splicing into it.
+        """
+
+        return self._direct and self._fd is not None
+
+    def write(self, chunk: bytes) -> None:
+        """
+        Appends output to the log.
+
+        Parameters
+        ----------
+        chunk: The output.
+        """
+
+        with self._lock:
+            if self._fd is None:
+                return
+            self._write(data=chunk if self._compressor is None else self._compressor.compress(chunk))
+
+    def splice(self, fd: int, size: int) -> int:
+        """
+        Moves output from a pipe into the log within the kernel, reading and writing it instead should the kernel
+        decline (the log then no longer being direct).
+
+        Parameters
+        ----------
+        fd: The read end of the pipe (non-blocking, raising BlockingIOError when empty).
+        size: The maximum number of bytes moved.
+
+        Returns
+        -------
+        The number of bytes moved, 0 at end of file.
+        """
+
+        with self._lock:
+            if self.direct:
+                try:
+                    return os.splice(fd, self._fd, size, flags=os.SPLICE_F_MOVE | os.SPLICE_F_NONBLOCK)
+                except BlockingIOError:
+                    raise
+                except OSError as error:
+                    logging.getLogger(__name__).debug("Splicing into %s unsupported: %s", self.path, error)
+                    self._direct = False
+        chunk: bytes = os.read(fd, size)
+        self.write(chunk=chunk)
+        return len(chunk)
+
+    def copy(self, source: Path) -> None:
+        """
+        Appends the content of a file to the log (within the kernel, via os.sendfile, when uncompressed).
+
+        Parameters
+        ----------
+        source: The file.
+        """
+
+        with open(source, mode="rb") as file:
+            with self._lock:
+                if self.direct:
+                    try:
+                        while os.sendfile(self._fd, file.fileno(), None, StepLog.COPY_SIZE) > 0:
+                            pass
+                        return
+                    except OSError as error:
+                        # Whatever was sent stays sent, the rest is copied from the current offset.
+                        logging.getLogger(__name__).debug("sendfile into %s unsupported: %s", self.path, error)
+            while True:
+                chunk: bytes = file.read(StepLog.COPY_SIZE)
+                if not chunk:
+                    return
+                self.write(chunk=chunk)
+
+    def tail(self) -> list[bytes]:
+        """
+        Reads back the trailing lines of an uncompressed log.
+
+        Returns
+        -------
+        The lines within the last TAIL_SIZE bytes of the log (without a partial first line).
+        """
+
+        if self.compression != LogCompression.NONE:
+            return []
+        try:
+            with open(self.path, mode="rb") as file:
+                size: int = file.seek(0, os.SEEK_END)
+                file.seek(max(0, size - StepLog.TAIL_SIZE))
+                data: bytes = file.read()
+        except OSError:
+            return []
+        lines: list[bytes] = data.rstrip(b"\n").split(b"\n")
+        return lines[1:] if size > StepLog.TAIL_SIZE else lines
+
+    def release(self) -> None:
+        """Releases the log on behalf of one of its streams, closing it once none hold it."""
+
+        with self._lock:
+            self._holders -= 1
+            if self._holders > 0:
+                return
+        self.close()
+
+    def close(self) -> None:
+        """Flushes the compressor, if any, and closes the log."""
+
+        with self._lock:
+            if self._fd is None:
+                return
+            if self._compressor is not None:
+                self._write(data=self._compressor.flush())
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def _write(self, data: bytes) -> None:
+        """
+        Writes to the log file in full, abandoning the log should writing fail (e.g. the disk is full).
+
+        Parameters
+        ----------
+        data: The (compressed) bytes.
+        """
+
+        view: memoryview = memoryview(data)
+        try:
+            while view:
+                view = view[os.write(self._fd, view) :]
+        except OSError as error:
+            logging.getLogger(__name__).warning("Abandoned the log %s: %s", self.path, error)
+            os.close(self._fd)
+            self._fd = None
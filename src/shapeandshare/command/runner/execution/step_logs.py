@@ -0,0 +1,122 @@
+""" Step Logs Definition """
+
+import logging
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Optional
+
+from ..contacts.log_compression import LogCompression
+from .job import Job
+from .step_log import StepLog
+
+
+class StepLogs:
+    """
+    Step Logs
+    The log files of the steps of a run, one per step within `.sacr/logs/<run-id>/` (e.g. `build[0].log.gz`),
+    holding the stdout and stderr of the step as they arrived (see StepLog).  Steps restored from the artifact cache
+    get their cached output as their log, steps which were up to date (or whose output is inherited) get none.  The
+    folder of the run is created along with its first log, at which point the logs of the oldest runs are removed so
+    that at most `keep` runs remain.
+
+    Attributes
+    ----------
+    run
+        The identifier of the run (see StepRecorder).
+    compression
+        How the logs are compressed.
+    keep
+        The number of runs whose logs are kept (including this one).
+    folder
+        The folder of the logs of the run.
+    DEFAULT_PATH
+        The folder of the logs of every run (within the project root), default: Path(".sacr/logs")
+    EXTENSIONS
+        The file extension by compression.
+    """
+
+    run: str
+    compression: LogCompression
+    keep: int
+    folder: Path
+    DEFAULT_PATH: Path = Path(".sacr") / "logs"
+    EXTENSIONS: dict[LogCompression, str] = {
+        LogCompression.GZIP: ".log.gz",
+        LogCompression.XZ: ".log.xz",
+        LogCompression.NONE: ".log",
+    }
+
+    def __init__(self, run: str, compression: LogCompression, keep: int, root: Optional[Path] = None):
+        self.run = run
+        self.compression = LogCompression(compression)
+        self.keep = max(1, keep)
+        self.folder = (StepLogs.DEFAULT_PATH if root is None else root / StepLogs.DEFAULT_PATH) / run
+        self._created: bool = False
+        self._lock: threading.Lock = threading.Lock()
+
+    def open(self, job: Job, holders: int = 2) -> Optional[StepLog]:
+        """
+        Creates the log of a step.
+
+        Parameters
+        ----------
+        job: The step.
+        holders: The number of streams releasing the log before it is closed.
+
+        Returns
+        -------
+        The log, None when it could not be created.
+        """
+
+        name: str = re.sub(r"[^\w.\-\[\]=,+@]", "_", job.name)
+        try:
+            with self._lock:
+                if not self._created:
+                    self._rotate()
+                    self.folder.mkdir(parents=True, exist_ok=True)
+                    self._created = True
+            return StepLog(
+                path=self.folder / f"{name}{StepLogs.EXTENSIONS[self.compression]}",
+                compression=self.compression,
+                holders=holders,
+            )
+        except OSError as error:
+            logging.getLogger(__name__).warning("[SKIPPING] Unable to create the log of %s: %s", job.name, error)
+            return None
+
+    def restore(self, job: Job, sources: list[Path]) -> None:
+        """
+        Creates the log of a step restored from the artifact cache out of its cached output.
+
+        Parameters
+        ----------
+        job: The step.
+        sources: The cached stdout and stderr of the step.
+        """
+
+        log: Optional[StepLog] = self.open(job=job, holders=1)
+        if log is None:
+            return
+        try:
+            for source in sources:
+                log.copy(source=source)
+        except OSError as error:
+            logging.getLogger(__name__).warning("Incomplete log of %s: %s", job.name, error)
+        finally:
+            log.release()
+
+    def _rotate(self) -> None:
+        """Removes the logs of the oldest runs, leaving room for this one."""
+
+        parent: Path = self.folder.parent
+        if not parent.is_dir():
+            return
+        # Oldest first, by when their logs were last written (run identifiers only resolve to the second).
+        runs: list[Path] = sorted(
+            (path for path in parent.iterdir() if path.is_dir() and path != self.folder),
+            key=lambda path: (path.stat().st_mtime, path.name),
+        )
+        for stale in runs[: max(0, len(runs) - (self.keep - 1))]:
+            shutil.rmtree(stale, ignore_errors=True)
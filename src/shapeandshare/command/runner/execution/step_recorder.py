@@ -0,0 +1,212 @@
+""" Step Recorder Definition """
+
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from ..contacts.dtos.step_metrics import StepMetrics
+from .job import Job
+from .process_reaper import ProcessReaper
+
+if TYPE_CHECKING:
+    import resource
+
+    from ..cache.run_history import RunHistory
+
+
+# pylint: disable=too-many-instance-attributes
+class StepRecorder:
+    """
+    Step Recorder
+    Records the metrics of every step of a run (see StepMetrics).  Each record is appended to a JSON-lines log as the
+    step concludes, and once the run ends the steps can also be written out as a Chrome trace-event file (loadable by
+    Perfetto or chrome://tracing) with a track per concurrency slot and a counter of the running steps, and the run
+    recorded within the run history.
+
+    Attributes
+    ----------
+    run
+        The identifier of the run, time ordered.
+    alias
+        The alias being run.
+    path
+        The JSON-lines log, None to not log.
+    trace
+        The trace-event file written when the run ends, if any.
+    history
+        The run history the run is recorded within when it ends, if any.
+    steps
+        The metrics recorded so far.
+    DEFAULT_PATH
+        The default JSON-lines log, default: .sacr/metrics.jsonl
+    MAX_LOG_SIZE
+        The log is rotated (to `.1`) once it exceeds this many bytes, default: 16 MiB
+    """
+
+    run: str
+    alias: str
+    path: Optional[Path]
+    trace: Optional[Path]
+    history: Optional["RunHistory"]
+    steps: list[StepMetrics]
+    DEFAULT_PATH: Path = Path(".sacr") / "metrics.jsonl"
+    MAX_LOG_SIZE: int = 16 * 1024 * 1024
+
+    def __init__(
+        self,
+        alias: str,
+        path: Optional[Path] = DEFAULT_PATH,
+        trace: Optional[str] = None,
+        root: Optional[Path] = None,
+        history: Optional["RunHistory"] = None,
+    ):
+        self.run = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.alias = alias
+        self.path = root / path if root is not None and path is not None else path
+        self.trace = Path(trace) if trace is not None else None
+        self.history = history
+        self.steps = []
+        self._lock: threading.Lock = threading.Lock()
+        self._log = None
+        # Steps are timed with the monotonic clock, reported against the wall clock.
+        self._epoch: float = time.time() - time.monotonic()
+
+    # pylint: disable=too-many-arguments
+    def record(
+        self,
+        job: Job,
+        status: str,
+        started: float,
+        queued: float,
+        worker: int,
+        returncode: Optional[int] = None,
+        usage: Optional["resource.struct_rusage"] = None,
+    ) -> StepMetrics:
+        """
+        Records a concluded step.
+
+        Parameters
+        ----------
+        job: The job of the step.
+        status: How the step concluded (a StepStatus value).
+        started: When the step started (time.monotonic).
+        queued: Seconds the step waited for a free slot.
+        worker: The concurrency slot the step ran in.
+        returncode: The exit status of its process, if it ran one.
+        usage: The resource usage of its process, when measured.
+
+        Returns
+        -------
+        The recorded metrics.
+        """
+
+        metrics: StepMetrics = StepMetrics(
+            run=self.run,
+            alias=self.alias,
+            step=job.name,
+            command=job.display,
+            status=status,
+            started=round(self._epoch + started, 6),
+            queued=round(queued, 6),
+            wall=round(time.monotonic() - started, 6),
+            user=round(usage.ru_utime, 6) if usage is not None else None,
+            system=round(usage.ru_stime, 6) if usage is not None else None,
+            max_rss=usage.ru_maxrss * ProcessReaper.RSS_UNIT if usage is not None else None,
+            returncode=returncode,
+            worker=worker,
+        )
+        with self._lock:
+            self.steps.append(metrics)
+            if self.path is not None:
+                try:
+                    self._open().write(json.dumps(metrics.as_dict()) + "\n")
+                except OSError:
+                    # Metrics are best effort, never fail a run over them.
+                    self.path = None
+        return metrics
+
+    def close(self) -> None:
+        """Closes the log, records the run within the history and writes the trace-event file, if requested."""
+
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+        if self.history is not None:
+            self.history.record(run=self.run, alias=self.alias, steps=self.steps)
+        if self.trace is not None:
+            self.trace.parent.mkdir(parents=True, exist_ok=True)
+            temporary: Path = self.trace.with_name(f".{self.trace.name}.{os.getpid()}.tmp")
+            with open(temporary, mode="w", encoding="utf-8") as file:
+                json.dump({"traceEvents": self._events(), "displayTimeUnit": "ms"}, file)
+            os.replace(temporary, self.trace)
+            print(f"Trace written to {self.trace}", flush=True)
+
+    def _open(self):
+        """
+        Opens the log for appending, rotating it first when too large.
+
+        Returns
+        -------
+        The open log.
+        """
+
+        if self._log is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists() and self.path.stat().st_size > StepRecorder.MAX_LOG_SIZE:
+                os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+            # pylint: disable=consider-using-with
+            self._log = open(self.path, mode="a", encoding="utf-8", buffering=1)
+        return self._log
+
+    def _events(self) -> list[dict]:
+        """
+        Renders the recorded steps as Chrome trace events.
+
+        Returns
+        -------
+        The trace events (timestamps in microseconds since the run started).
+        """
+
+        pid: int = os.getpid()
+        origin: float = min((step.started for step in self.steps), default=0.0)
+        events: list[dict] = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": f"sacr run {self.alias}"}}
+        ]
+        for worker in sorted({step.worker for step in self.steps}):
+            events.append(
+                {"name": "thread_name", "ph": "M", "pid": pid, "tid": worker, "args": {"name": f"slot {worker}"}}
+            )
+
+        changes: list[tuple[float, int]] = []
+        for step in self.steps:
+            start: float = (step.started - origin) * 1e6
+            events.append(
+                {
+                    "name": step.step,
+                    "cat": step.status,
+                    "ph": "X",
+                    "ts": round(start, 3),
+                    "dur": round(step.wall * 1e6, 3),
+                    "pid": pid,
+                    "tid": step.worker,
+                    "args": {
+                        key: value
+                        for key, value in step.as_dict().items()
+                        if key in ("command", "status", "queued", "user", "system", "max_rss", "returncode")
+                    },
+                }
+            )
+            changes.extend(((start, 1), (start + step.wall * 1e6, -1)))
+
+        running: int = 0
+        for timestamp, change in sorted(changes):
+            running += change
+            events.append(
+                {"name": "running", "ph": "C", "ts": round(timestamp, 3), "pid": pid, "args": {"steps": running}}
+            )
+        return events
@@ -1,26 +1,51 @@
 """ Command Runner Manger Definition """
 
-import configparser
 import logging
 import sys
 from pathlib import Path
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
-from .backends.backend_config import BackendConfig
-from .backends.backend_factory import BackendFactory
-from .backends.backend_package import BackendPackage
-from .common.utils import clean, init_environment_argument_parser
+from .common.utils import (
+    cache_server_argument_parser,
+    clean,
+    daemon_argument_parser,
+    init_environment_argument_parser,
+    parse_size,
+    run_argument_parser,
+    stats_argument_parser,
+    watch_argument_parser,
+    worker_argument_parser,
+)
 from .contacts.command_type import CommandType
+from .contacts.daemon_action import DaemonAction
+from .contacts.dtos.cache_server_parameters import CacheServerParameters
+from .contacts.dtos.daemon_parameters import DaemonParameters
+from .contacts.dtos.manager.logs_parameters import LogsParameters
 from .contacts.dtos.manager.manager_config import ManagerConfig
+from .contacts.dtos.run_parameters import RunParameters
+from .contacts.dtos.stats_parameters import StatsParameters
+from .contacts.dtos.watch_parameters import WatchParameters
+from .contacts.dtos.worker_parameters import WorkerParameters
+from .contacts.errors.dependency_cycle_error import DependencyCycleError
 from .contacts.errors.parse_error import ParseError
+from .contacts.errors.regression_error import RegressionError
 from .contacts.errors.subprocess_failure_error import SubprocessFailureError
 from .contacts.errors.unknown_argument_error import UnknownArgumentError
 from .contacts.errors.unknown_command_error import UnknownCommandError
+from .contacts.output_type import OutputType
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from .backends.backend_config import BackendConfig
+    from .backends.backend_package import BackendPackage
 
 
 class Manager:
     """
     Command Runner Manger
+    Settings and the backend are loaded on first use so that subcommands which need neither (help, clean) start
+    without parsing any configuration.
 
     Attributes
     ----------
@@ -28,6 +53,8 @@ class Manager:
         Backend for use within this manager installation.
     settings
         Manager settings configuration.
+    config_file
+        Path to the manager configuration file.
     DEFAULT_CONFIG_FILE
         The default config file to use for manager settings, default: ".sacrrc"
     DEFAULT_CONFIG_PATH
@@ -36,10 +63,14 @@ class Manager:
         The default per command time out threshold, default: None (no timeout)
     DEFAULT_CONFIG_TYPE
         The default backend type, default: "config"
+    DEFAULT_COMMAND_JOBS
+        The default maximum number of concurrent commands, default: None (the cpu count)
+    DEFAULT_CACHE_SIZE
+        The default maximum size of the local artifact cache, default: "2G"
+    DEFAULT_LOG_CAPTURE
+        Whether the output of every step is written to a log file of its own by default, default: False
     """
 
-    backend: Union[BackendConfig, BackendPackage]
-    settings: ManagerConfig
     config_file: Path
 
     # Global Defaults
@@ -47,6 +78,9 @@ class Manager:
     DEFAULT_CONFIG_PATH: Path = Path(".")
     DEFAULT_COMMAND_TIMEOUT: Optional[int] = None  # In seconds
     DEFAULT_CONFIG_TYPE: str = "config"
+    DEFAULT_COMMAND_JOBS: Optional[int] = None  # Defaults to the cpu count
+    DEFAULT_CACHE_SIZE: str = "2G"
+    DEFAULT_LOG_CAPTURE: bool = False
 
     def __init__(self, config_file: Optional[str] = None, base_path: Optional[str] = None):
         """
@@ -67,12 +101,51 @@ class Manager:
         else:
             base_path = Path(base_path)
         self.config_file = base_path / config_file
-        self.settings = self._load_configuration(config_file=self.config_file)
-        self.backend = BackendFactory.build(
-            backend_type=self.settings.config.type,
-            config_file=self.settings.config.file,
-            base_path=self.settings.config.path,
-        )
+        self._settings: Optional[ManagerConfig] = None
+        self._backend: Optional[Union["BackendConfig", "BackendPackage"]] = None
+
+    @property
+    def settings(self) -> ManagerConfig:
+        """
+        Class Property
+        Manager settings configuration, loaded on first access.
+
+        Returns
+        -------
+        A ManagerConfig DTO.
+        """
+
+        if self._settings is None:
+            # pylint: disable=import-outside-toplevel
+            from .cache.config_cache import ConfigCache
+
+            self._settings = ConfigCache(namespace=type(self).__name__).load(
+                source=self.config_file, loader=lambda: self._load_configuration(config_file=self.config_file)
+            )
+        return self._settings
+
+    @property
+    def backend(self) -> Union["BackendConfig", "BackendPackage"]:
+        """
+        Class Property
+        Backend for use within this manager installation, built on first access.
+
+        Returns
+        -------
+        The configured backend.
+        """
+
+        if self._backend is None:
+            # pylint: disable=import-outside-toplevel
+            from .backends.backend_factory import BackendFactory
+
+            # The backend location is relative to the manager configuration.
+            self._backend = BackendFactory.build(
+                backend_type=self.settings.config.type,
+                config_file=self.settings.config.file,
+                base_path=(self.config_file.parent / (self.settings.config.path or ".")).as_posix(),
+            )
+        return self._backend
 
     def _load_configuration(self, config_file: Path) -> ManagerConfig:
         """
@@ -90,8 +163,10 @@ class Manager:
 
         # load the defaults
         config_partial: dict = {
-            "command": {"timeout": self.DEFAULT_COMMAND_TIMEOUT},
+            "command": {"timeout": self.DEFAULT_COMMAND_TIMEOUT, "jobs": self.DEFAULT_COMMAND_JOBS},
             "config": {"type": self.DEFAULT_CONFIG_TYPE, "file": None, "path": None},
+            "cache": {"size": self.DEFAULT_CACHE_SIZE},
+            "logs": {"capture": self.DEFAULT_LOG_CAPTURE},
         }
 
         # Attempt to load
@@ -99,6 +174,9 @@ class Manager:
             if config_file.is_file():
                 # load file..
                 logging.getLogger(__name__).debug("Loading config file: {%s}", config_file.resolve().as_posix())
+                # pylint: disable=import-outside-toplevel
+                import configparser
+
                 config: configparser.ConfigParser = configparser.ConfigParser()
                 config.read(config_file.resolve().as_posix())
 
@@ -124,15 +202,17 @@ class Manager:
         # pylint: disable=broad-except
         try:
             self._process()
-        except (UnknownCommandError, UnknownArgumentError, ParseError) as error:
+        except (UnknownCommandError, UnknownArgumentError, ParseError, DependencyCycleError) as error:
             # Known Errors
             logging.getLogger(__name__).debug(str(error))
             print(str(error))
             Manager.display_generic_help()
         except SubprocessFailureError as error:
-            print("---- Subprocess Failure ----")
-            print(error)
+            Manager.display_failure(error=error)
             sys.exit(error.returncode)
+        except RegressionError as error:
+            print(str(error))
+            sys.exit(1)
         except Exception as error:
             # We encountered an unhandled exception.  This shouldn't happen.
             print("---- Unhandled Exception ----")
@@ -174,16 +254,374 @@ class Manager:
             self._init_environment(arguments=arguments)
             self.backend.init_environment(arguments=arguments)
         elif subcommand == CommandType.RUN:
-            self.backend.run_command(arguments=arguments, per_command_timeout=self.settings.command.timeout)
+            parameters: RunParameters = run_argument_parser(arguments=arguments, jobs=self.settings.command.jobs)
+            if parameters.workspace:
+                self._workspace(parameters=parameters)
+                return
+            self.backend.run_command(
+                arguments=arguments,
+                per_command_timeout=self.settings.command.timeout,
+                jobs=self.settings.command.jobs,
+                cache_size=parse_size(command="run", value=self.settings.cache.size),
+                logs=self._logs(requested=parameters.logs),
+                cache_remote=self.settings.cache.remote,
+                root=self.config_file.parent,
+            )
         elif subcommand == CommandType.CLEAN:
             clean(arguments=arguments)
+        elif subcommand == CommandType.BENCH:
+            self.backend.bench_command(
+                arguments=arguments, per_command_timeout=self.settings.command.timeout, jobs=self.settings.command.jobs
+            )
+        elif subcommand == CommandType.WATCH:
+            self._watch(arguments=arguments)
+        elif subcommand == CommandType.DAEMON:
+            Manager._daemon(arguments=arguments)
+        elif subcommand == CommandType.WORKER:
+            self._worker(arguments=arguments)
+        elif subcommand == CommandType.STATS:
+            self._stats(arguments=arguments)
+        elif subcommand == CommandType.CACHE_SERVER:
+            self._cache_server(arguments=arguments)
         else:
             raise UnknownCommandError(f"Unknown command {subcommand}")
 
+    # pylint: disable=too-many-arguments
+    async def run_alias(
+        self,
+        alias: str,
+        jobs: Optional[int] = None,
+        force: bool = False,
+        output: Optional[str] = None,
+        timeout: Optional[float] = None,
+        limiter: Optional["asyncio.Semaphore"] = None,
+        logs: bool = False,
+    ) -> None:
+        """
+        Runs an alias without blocking the event loop, the awaitable counterpart of `sacr run <alias>`.
+        Commands run within the directory of the manager configuration file.
+
+        Parameters
+        ----------
+        alias: The alias (from [scripts]) to execute.
+        jobs: The maximum number of concurrent commands of this run, by default the configured jobs or cpu count.
+        force: Run every command, ignoring the recorded state of prior runs and the artifact cache.
+        output: How command output is presented (an OutputType value), by default prefixed when concurrent.
+        timeout: The maximum duration (in seconds) of the whole run (the configured command timeout bounds each step).
+        limiter: A semaphore shared between runs bounding their combined concurrency, if any.
+        logs: Write the output of every step to a log file of its own, even when not configured to (see [logs]).
+        """
+
+        root: Path = self.config_file.parent
+        await self.backend.run_alias(
+            alias=alias,
+            per_command_timeout=self.settings.command.timeout,
+            jobs=jobs or self.settings.command.jobs,
+            force=force,
+            cache_size=parse_size(command="run", value=self.settings.cache.size),
+            output=output,
+            timeout=timeout,
+            limiter=limiter,
+            cwd=None if root == Path(".") else root,
+            logs=self._logs(requested=logs),
+            cache_remote=self.settings.cache.remote,
+        )
+
+    def _logs(self, requested: bool) -> LogsParameters:
+        """
+        The step log settings of a run.
+
+        Parameters
+        ----------
+        requested: Whether capturing logs was requested for the run (`--logs`), whatever the configuration.
+
+        Returns
+        -------
+        The configured [logs] settings, capturing when requested.
+        """
+
+        if not requested or self.settings.logs.capture:
+            return self.settings.logs
+        return LogsParameters(**{**self.settings.logs.as_dict(), "capture": True})
+
+    def _watch(self, arguments: list[str]) -> None:
+        """
+        Runs an alias, then re-runs it whenever its declared inputs (or, without any, the project files) change.
+
+        Parameters
+        ----------
+        arguments: The CLI arguments for the watch command.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+
+        from .execution.job_graph import JobGraph
+        from .watch.alias_watcher import AliasWatcher
+
+        parameters: WatchParameters = watch_argument_parser(arguments=arguments, jobs=self.settings.command.jobs)
+        graph: JobGraph = JobGraph.build(model=self.backend.model, alias=parameters.alias)
+
+        async def attempt() -> None:
+            try:
+                await self.run_alias(
+                    alias=parameters.alias,
+                    jobs=parameters.jobs,
+                    force=parameters.force,
+                    output=parameters.output,
+                    logs=parameters.logs,
+                )
+            except SubprocessFailureError as error:
+                Manager.display_failure(error=error)
+
+        watcher: AliasWatcher = AliasWatcher(
+            run=attempt,
+            debounce=parameters.debounce,
+            poll=parameters.poll,
+            patterns=sorted({pattern for job in graph.jobs for pattern in job.inputs}),
+            root=self.config_file.parent.as_posix(),
+            ignore=parameters.ignore,
+            exclude=sorted({pattern for job in graph.jobs for pattern in job.outputs}),
+        )
+        try:
+            asyncio.run(watcher.watch())
+        except KeyboardInterrupt:
+            print("Stopped watching.")
+
+    def _workspace(self, parameters: RunParameters) -> None:
+        """
+        Runs an alias across the packages of the workspace rooted alongside the manager configuration.
+
+        Parameters
+        ----------
+        parameters: The parsed CLI arguments for the run command.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+
+        from .execution.shard_planner import ShardPlanner
+        from .workspace.change_detector import ChangeDetector
+        from .workspace.workspace_discovery import WorkspaceDiscovery
+        from .workspace.workspace_runner import WorkspaceRunner
+
+        if parameters.trace is not None:
+            raise UnknownArgumentError(command="run", message="`--trace` is not supported with `--workspace`.")
+        if parameters.workers:
+            raise UnknownArgumentError(command="run", message="`--workers` is not supported with `--workspace`.")
+        root: Path = self.config_file.parent
+        runner: WorkspaceRunner = WorkspaceRunner(packages=WorkspaceDiscovery(root=root).packages())
+        affected: Optional[set[str]] = None
+        if parameters.since is not None:
+            detector: ChangeDetector = ChangeDetector(root=root)
+            affected = detector.affected(
+                packages=runner.packages, alias=parameters.alias, files=detector.changed(since=parameters.since)
+            )
+        selected: list = runner.select(alias=parameters.alias, filters=parameters.filters, affected=affected)
+        if not selected:
+            if parameters.since is not None:
+                print(f"No workspace package running {parameters.alias} is affected since {parameters.since}.")
+            else:
+                print(f"No workspace package defines {parameters.alias}.")
+            return
+        if parameters.shard is not None:
+            planner: ShardPlanner = ShardPlanner(index=parameters.shard[0], count=parameters.shard[1])
+            selected, summary = runner.shard(alias=parameters.alias, selected=selected, planner=planner)
+            if parameters.output != OutputType.QUIET:
+                print(summary, flush=True)
+            warning: Optional[str] = planner.warning()
+            if warning is not None:
+                logging.getLogger(__name__).warning(warning)
+            if not selected:
+                return
+        asyncio.run(
+            runner.run(
+                alias=parameters.alias,
+                selected=selected,
+                jobs=parameters.jobs,
+                force=parameters.force,
+                output=parameters.output,
+                per_command_timeout=self.settings.command.timeout,
+                cache_size=parse_size(command="run", value=self.settings.cache.size),
+                logs=self._logs(requested=parameters.logs),
+                cache_remote=self.settings.cache.remote,
+            )
+        )
+
+    @staticmethod
+    def _daemon(arguments: list[str]) -> None:
+        """
+        Starts, stops or reports on the daemon serving invocations of sacr.
+
+        Parameters
+        ----------
+        arguments: The CLI arguments for the daemon command.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import time
+
+        from .daemon.daemon_client import DaemonClient
+        from .daemon.daemon_server import DaemonServer
+
+        parameters: DaemonParameters = daemon_argument_parser(arguments=arguments)
+        status: Optional[dict] = DaemonClient.request(message={"command": "status"})
+        if parameters.action == DaemonAction.STATUS:
+            if status is None:
+                print("No daemon is running.")
+                sys.exit(1)
+            uptime: float = time.time() - status["started"]
+            print(f"Daemon running (pid {status['pid']}), listening on {status['socket']}")
+            print(f"   up {uptime:.0f}s, served {status['served']}, running {status['running']}")
+            for project in status["projects"]:
+                print(f"   warm: {project}")
+        elif parameters.action == DaemonAction.STOP:
+            if status is None:
+                print("No daemon is running.")
+                return
+            DaemonClient.request(message={"command": "stop"})
+            print(f"Daemon stopped (pid {status['pid']}).")
+        elif status is not None:
+            print(f"A daemon is already running (pid {status['pid']}), listening on {status['socket']}")
+        else:
+            server: DaemonServer = DaemonServer()
+            try:
+                if parameters.detach:
+                    pid: int = server.detach()
+                    if not pid:
+                        print(f"The daemon failed to start, see {server.path}.log")
+                        sys.exit(1)
+                    print(f"Daemon started (pid {pid}), listening on {server.path}")
+                    return
+                server.serve(ready=lambda: print(f"Daemon listening on {server.path} (Ctrl+C to stop)", flush=True))
+            except OSError as error:
+                print(f"The daemon failed to start: {error}")
+                sys.exit(1)
+            print("Daemon stopped.")
+
+    def _worker(self, arguments: list[str]) -> None:
+        """
+        Serves the steps of distributed runs (`sacr run --workers`) dispatched to this machine.
+
+        Parameters
+        ----------
+        arguments: The CLI arguments for the worker command.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from .worker.worker_protocol import WorkerProtocol
+        from .worker.worker_server import WorkerServer
+
+        parameters: WorkerParameters = worker_argument_parser(arguments=arguments, jobs=self.settings.command.jobs)
+        server: WorkerServer = WorkerServer(
+            address=parameters.listen or f"{WorkerProtocol.DEFAULT_HOST}:{WorkerProtocol.DEFAULT_PORT}",
+            slots=parameters.jobs,
+        )
+
+        def ready() -> None:
+            print(f"Worker listening on {server.address} with {server.slots} slots (Ctrl+C to stop)", flush=True)
+            target = WorkerProtocol.address(value=server.address)
+            if isinstance(target, tuple) and target[0] not in ("127.0.0.1", "::1", "localhost"):
+                if WorkerProtocol.token() is None:
+                    variable: str = WorkerProtocol.TOKEN_ENVIRONMENT_VARIABLE
+                    print(f"Anyone able to connect can run commands, consider setting {variable}", flush=True)
+
+        try:
+            server.serve(ready=ready)
+        except ValueError as error:
+            raise UnknownArgumentError(command="worker", message=str(error)) from error
+        except OSError as error:
+            print(f"The worker failed to start: {error}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            pass
+        print(f"Worker stopped, {server.served} steps run.")
+
+    def _cache_server(self, arguments: list[str]) -> None:
+        """
+        Serves a remote artifact cache (see RemoteCache) shared by the runs of other machines.
+
+        Parameters
+        ----------
+        arguments: The CLI arguments for the cache-server command.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from .cache.cache_server import CacheServer
+        from .cache.remote_cache import RemoteCache
+
+        parameters: CacheServerParameters = cache_server_argument_parser(arguments=arguments)
+        path: Path = Path(parameters.path) if parameters.path else self.config_file.parent / CacheServer.DEFAULT_PATH
+        try:
+            server: CacheServer = CacheServer(
+                address=parameters.listen or f"{CacheServer.DEFAULT_HOST}:{RemoteCache.DEFAULT_PORT}",
+                path=path,
+                token=RemoteCache.token(),
+            )
+        except ValueError as error:
+            raise UnknownArgumentError(command="cache-server", message=str(error)) from error
+        except OSError as error:
+            print(f"The cache server failed to start: {error}")
+            sys.exit(1)
+
+        def ready() -> None:
+            host, port = server.server_address[:2]
+            print(f"Cache server listening on http://{host}:{port}, storing within {path} (Ctrl+C to stop)", flush=True)
+            if host not in ("127.0.0.1", "::1", "localhost") and server.token is None:
+                variable: str = RemoteCache.TOKEN_ENVIRONMENT_VARIABLE
+                print(f"Anyone able to connect can read and write the cache, consider setting {variable}", flush=True)
+
+        try:
+            server.serve(ready=ready)
+        except KeyboardInterrupt:
+            pass
+        print(f"Cache server stopped, {server.served} requests served.")
+
+    def _stats(self, arguments: list[str]) -> None:
+        """
+        Shows how the recorded runs of an alias performed over time.
+
+        Parameters
+        ----------
+        arguments: The CLI arguments for the stats command.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from .cache.run_history import RunHistory
+        from .execution.history_report import HistoryReport
+
+        parameters: StatsParameters = stats_argument_parser(arguments=arguments)
+        history: RunHistory = RunHistory(root=self.config_file.parent)
+        try:
+            HistoryReport.report(history=history, alias=parameters.alias, limit=parameters.runs)
+        finally:
+            history.close()
+
+    @staticmethod
+    def display_failure(error: SubprocessFailureError) -> None:
+        """
+        Print out a command failure
+
+        Parameters
+        ----------
+        error: The failure.
+        """
+
+        print("---- Subprocess Failure ----")
+        print(error)
+        if error.output:
+            print("---- Output (tail) ----")
+            print(error.output)
+
     @staticmethod
     def display_generic_help() -> None:
         """Print out summary help"""
-        summary: str = "Usage: sacr <command>\n" "\n" "where <command> is one of:\n" "help, init, run, clean"
+        summary: str = (
+            "Usage: sacr <command>\n"
+            "\n"
+            "where <command> is one of:\n"
+            "help, init, run, watch, bench, stats, clean, daemon, worker, cache-server"
+        )
 
         print(summary)
 
@@ -194,14 +632,54 @@ class Manager:
             "Usage: sacr <command>\n"
             "\n"
             "where <command> is one of:\n"
-            "help, init, run, clean\n"
+            "help, init, run, watch, bench, stats, clean, daemon, worker, cache-server\n"
             "\n"
             "help - Displays this help dialog.\n"
             "init - Will create initial configuration file.\n"
             "   This will create default .racrrc and racr.config files in the current working directory\n"
-            "run <subcommand> - Execute the defined subcommand.\n"
+            "run <subcommand> [-j N] [--force] [--output MODE] [--trace FILE] - Execute the defined subcommand.\n"
             "   Subcommands must be defined within a supported file (racr.config, package.json)\n"
-            "clean - Perform unix like `rm -rf` like removal.\n"
+            "   -j N, --jobs N - Maximum number of commands to run concurrently (default: cpu count)\n"
+            "   -j auto - Use every cpu, holding commands back while the load or memory of the machine is high\n"
+            "   -f, --force - Run commands even when their declared inputs are unchanged\n"
+            "   --output MODE - prefixed, plain, inherit or quiet (default: prefixed when running concurrently)\n"
+            "   --trace FILE - Write a Chrome trace-event timeline of the run (per step metrics: .sacr/metrics.jsonl)\n"
+            "   --logs - Write the output of every step to .sacr/logs/<run>/<step>.log.gz (see [logs] in .sacrrc)\n"
+            "   -w, --workspace - Run the subcommand within every package (sacr.config, package.json) below here\n"
+            "   --filter PATTERN - Only run packages matching the name or path (`PATTERN...` adds dependencies,\n"
+            "      `...PATTERN` dependents, `!PATTERN` excludes), implies --workspace\n"
+            "   --since REF - Only run packages affected by the changes since the git ref (and their dependents)\n"
+            "   --workers HOST:PORT,... - Run the commands on `sacr worker` processes (session aliases run here),\n"
+            "      retrying a step on another worker should its worker go away\n"
+            "   --shard K/N - Only run the Kth of N shards (steps, matrix cells or packages) of balanced duration,\n"
+            "      by the run history (.sacr/history) or otherwise the number of steps\n"
+            "watch <subcommand> [run options] [--debounce S] [--ignore PATTERN] [--poll] - Run the subcommand,\n"
+            "   then re-run it whenever its [inputs] (or, without any, the project files) change\n"
+            "   --debounce S - Seconds without further changes to wait for before re-running (default: 0.2)\n"
+            "   --ignore PATTERN - Also ignore files and folders matching the name pattern (repeatable)\n"
+            "   --poll - Poll for changes instead of using inotify\n"
+            "bench <subcommand> [run options] [-n N] [--warmup N] [--baseline FILE] [--save FILE] [--threshold P]\n"
+            "   Run the subcommand repeatedly (quietly, ignoring prior runs) reporting min/median/p95/stddev per step\n"
+            "   -n N, --runs N - Number of measured runs (default: 10), --warmup N - Discarded runs (default: 1)\n"
+            "   --baseline FILE - Compare against saved results, failing when a median regresses over P% (default: 5)\n"
+            "   --save FILE - Where to save the results (default: .sacr/bench/<subcommand>.json)\n"
+            "stats <subcommand> [-n N] - Show the wall time of the recent runs of the subcommand and its steps\n"
+            "   Runs are recorded within .sacr/history, and start their longest steps (by critical path) first\n"
+            "   -n N, --runs N - Number of recent runs shown (default: 20)\n"
+            "clean [-j N] [--fast] <paths...> - Perform unix like `rm -rf` like removal.\n"
+            "   Paths may be glob patterns (`**` matches any number of folders), expanded without a shell\n"
+            "   -j N, --jobs N - Number of removal threads (default: cpu count + 4)\n"
+            "   --fast - Move paths into .sacr/trash and remove them in the background\n"
+            "daemon [start|stop|status] [-d] - Keep sacr and parsed configurations warm, serving later invocations\n"
+            "   -d, --detach - Run the daemon in the background (set SACR_NO_DAEMON=1 to bypass a running daemon)\n"
+            "worker [--listen ADDRESS] [-j N] - Run the commands of `run --workers` dispatched to this machine\n"
+            "   --listen ADDRESS - host:port or a Unix socket path to listen on (default: 127.0.0.1:7878)\n"
+            "   -j N, --jobs N - Maximum number of commands to run concurrently (default: cpu count)\n"
+            "   Set SACR_WORKER_TOKEN (on workers and the coordinator) to require a shared token\n"
+            "cache-server [--listen ADDRESS] [--path DIR] - Serve an artifact cache shared by machines over HTTP\n"
+            "   --listen ADDRESS - host:port to listen on (default: 127.0.0.1:7879)\n"
+            "   --path DIR - Where the cache is stored (default: .sacr/cache-server)\n"
+            "   Point runs at it with `remote = http://HOST:7879` within [cache] of .sacrrc (SACR_CACHE_TOKEN: token)\n"
         )
 
         print(summary)
@@ -210,6 +688,9 @@ class Manager:
         force: bool = init_environment_argument_parser(arguments=arguments)
 
         if self.config_file.exists() and force or not self.config_file.exists():
+            # pylint: disable=import-outside-toplevel
+            import configparser
+
             # write default config
             new_config: configparser.ConfigParser = configparser.ConfigParser(delimiters="=")
             new_config.add_section(section="command")
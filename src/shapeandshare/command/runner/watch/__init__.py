@@ -0,0 +1 @@
+"""shapeandshare.command.runner.watch namespace"""
@@ -0,0 +1,149 @@
+""" Alias Watcher Definition """
+
+import asyncio
+import os
+from typing import Awaitable, Callable, Optional
+
+from .base_watcher import BaseWatcher
+from .inotify_watcher import InotifyWatcher
+from .poll_watcher import PollWatcher
+
+
+# pylint: disable=too-few-public-methods
+class AliasWatcher:
+    """
+    Alias Watcher
+    Runs an alias, then re-runs it whenever its inputs change.  Bursts of changes (a save touching several files, a
+    checkout) are debounced into a single run, and a change arriving while a run is still in progress cancels that run
+    (terminating its processes) before starting over.  Runs rely on the step state store, so only the steps whose
+    inputs actually changed re-execute.
+
+    Attributes
+    ----------
+    run
+        Runs the alias once.
+    debounce
+        Seconds without further changes to wait for before re-running.
+    poll
+        Poll for changes instead of using inotify.
+    DEFAULT_DEBOUNCE
+        The default debounce delay, default: 0.2
+    SUMMARY_PATHS
+        The number of changed paths listed before re-running, default: 3
+    """
+
+    run: Callable[[], Awaitable[None]]
+    debounce: float
+    poll: bool
+    DEFAULT_DEBOUNCE: float = 0.2
+    SUMMARY_PATHS: int = 3
+
+    def __init__(
+        self,
+        run: Callable[[], Awaitable[None]],
+        debounce: Optional[float] = None,
+        poll: bool = False,
+        **kwargs,
+    ):
+        """
+        Class Constructor
+
+        Parameters
+        ----------
+        run: Runs the alias once.
+        debounce: Seconds without further changes to wait for before re-running.
+        poll: Poll for changes instead of using inotify.
+        kwargs: What to watch (see BaseWatcher).
+        """
+
+        self.run = run
+        self.debounce = AliasWatcher.DEFAULT_DEBOUNCE if debounce is None else debounce
+        self.poll = poll
+        self._options: dict = kwargs
+
+    async def watch(self) -> None:
+        """Runs the alias, then re-runs it on every change, until cancelled."""
+
+        watcher: BaseWatcher = await self._start()
+        print(f"Watching {watcher.description}, press Ctrl+C to stop.", flush=True)
+        task: asyncio.Task = asyncio.ensure_future(self._attempt())
+        try:
+            while True:
+                changed: set[str] = await watcher.changes()
+                changed |= await self._settle(watcher=watcher)
+                if not task.done():
+                    print("Changes detected, cancelling the current run.", flush=True)
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                print(f"{AliasWatcher._summary(changed=changed)} changed, re-running.", flush=True)
+                task = asyncio.ensure_future(self._attempt())
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            watcher.close()
+
+    async def _start(self) -> BaseWatcher:
+        """
+        Starts watching, via inotify where available.
+
+        Returns
+        -------
+        The started watcher.
+        """
+
+        if not self.poll:
+            watcher: BaseWatcher = InotifyWatcher(**self._options)
+            try:
+                await watcher.start()
+                return watcher
+            except OSError as error:
+                print(f"inotify unavailable ({error}), polling instead.", flush=True)
+        watcher = PollWatcher(**self._options)
+        await watcher.start()
+        return watcher
+
+    async def _settle(self, watcher: BaseWatcher) -> set[str]:
+        """
+        Waits for a burst of changes to end.
+
+        Parameters
+        ----------
+        watcher: The watcher.
+
+        Returns
+        -------
+        The paths changed meanwhile.
+        """
+
+        changed: set[str] = set()
+        while True:
+            try:
+                changed |= await asyncio.wait_for(watcher.changes(), timeout=self.debounce)
+            except asyncio.TimeoutError:
+                return changed
+
+    @staticmethod
+    def _summary(changed: set[str]) -> str:
+        """
+        Summarizes the changed paths.
+
+        Parameters
+        ----------
+        changed: The absolute paths changed.
+
+        Returns
+        -------
+        The first few paths (relative to the working directory) and how many more changed.
+        """
+
+        paths: list[str] = sorted(os.path.relpath(path) for path in changed)
+        summary: str = ", ".join(paths[: AliasWatcher.SUMMARY_PATHS])
+        if len(paths) > AliasWatcher.SUMMARY_PATHS:
+            summary += f" and {len(paths) - AliasWatcher.SUMMARY_PATHS} more"
+        return summary
+
+    async def _attempt(self) -> None:
+        """Runs the alias once, then reports that changes are awaited."""
+
+        await self.run()
+        print("Waiting for changes...", flush=True)
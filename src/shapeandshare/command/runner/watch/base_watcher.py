@@ -0,0 +1,193 @@
+""" Base File Watcher Definition """
+
+import asyncio
+import fnmatch
+import os
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional
+
+from ..common.glob_walker import GlobWalker
+
+
+class BaseWatcher(ABC):
+    """
+    Base File Watcher
+    Watches the files matched by a set of glob patterns for changes.  The literal base folder of each pattern is
+    watched recursively (a plain file is watched on its own), skipping ignored names and anything excluded (such as
+    the outputs of the watched alias, which would otherwise trigger themselves).  Symbolic links are not followed.
+
+    Attributes
+    ----------
+    root
+        The absolute path the patterns are relative to.
+    folders
+        The absolute paths of the folders watched recursively.
+    files
+        The absolute paths of the files watched on their own.
+    ignore
+        Name patterns (fnmatch) of files and folders which are never watched.
+    exclude
+        The absolute paths of files and folders whose changes are disregarded.
+    DEFAULT_IGNORE
+        Names ignored by default (version control, dependency, cache and virtualenv folders).
+    """
+
+    root: str
+    folders: set[str]
+    files: set[str]
+    ignore: list[str]
+    exclude: list[str]
+    DEFAULT_IGNORE: tuple[str, ...] = (
+        ".git",
+        ".hg",
+        ".svn",
+        ".sacr",
+        "node_modules",
+        "__pycache__",
+        ".tox",
+        ".nox",
+        ".venv",
+        "venv",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".idea",
+        ".DS_Store",
+        "*.swp",
+        "*~",
+    )
+
+    def __init__(
+        self,
+        patterns: list[str],
+        root: str = ".",
+        ignore: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+    ):
+        self.root = os.path.abspath(root)
+        self.folders = set()
+        self.files = set()
+        for pattern in patterns or ["."]:
+            base: str = os.path.join(self.root, GlobWalker.split(pattern=pattern)[0])
+            if os.path.isfile(base):
+                self.files.add(base)
+            else:
+                self.folders.add(base)
+        self.ignore = list(BaseWatcher.DEFAULT_IGNORE) + list(ignore or [])
+        self.exclude = [os.path.join(self.root, GlobWalker.split(pattern=pattern)[0]) for pattern in exclude or []]
+        self._changed: set[str] = set()
+        self._event: Optional[asyncio.Event] = None
+
+    @abstractmethod
+    async def start(self) -> None:
+        """Starts watching (raising OSError when the mechanism is unavailable)."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Stops watching."""
+
+    @property
+    @abstractmethod
+    def description(self) -> str:
+        """
+        Class Property
+        What is being watched and how.
+
+        Returns
+        -------
+        A short summary.
+        """
+
+    async def changes(self) -> set[str]:
+        """
+        Waits for changes.
+
+        Returns
+        -------
+        The absolute paths changed since the last call (at least one).
+        """
+
+        if self._event is None:
+            self._event = asyncio.Event()
+        await self._event.wait()
+        self._event.clear()
+        changed: set[str] = self._changed
+        self._changed = set()
+        return changed
+
+    def _notify(self, path: str) -> None:
+        """
+        Records a change, when relevant.
+
+        Parameters
+        ----------
+        path: The absolute path of the changed file or folder.
+        """
+
+        if not self._relevant(path=path):
+            return
+        self._changed.add(path)
+        if self._event is None:
+            self._event = asyncio.Event()
+        self._event.set()
+
+    def _relevant(self, path: str) -> bool:
+        """
+        Whether a change of a path matters.
+
+        Parameters
+        ----------
+        path: The absolute path of the changed file or folder.
+
+        Returns
+        -------
+        True when the path is watched, and neither ignored nor excluded.
+        """
+
+        if path in self.files:
+            return True
+        if any(path == item or path.startswith(item + os.sep) for item in self.exclude):
+            return False
+        if not any(path == folder or path.startswith(folder.rstrip(os.sep) + os.sep) for folder in self.folders):
+            return False
+        return not any(self._ignored(name=name) for name in os.path.relpath(path, self.root).split(os.sep))
+
+    def _ignored(self, name: str) -> bool:
+        """
+        Whether a file or folder name is ignored.
+
+        Parameters
+        ----------
+        name: The name.
+
+        Returns
+        -------
+        True when ignored.
+        """
+
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self.ignore)
+
+    def _scan(self, folder: str) -> Iterator[os.DirEntry]:
+        """
+        Walks a folder (without following symbolic links), pruning ignored and excluded entries.
+
+        Parameters
+        ----------
+        folder: The folder to walk.
+
+        Returns
+        -------
+        The entries below the folder.
+        """
+
+        pending: list[str] = [folder]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if self._ignored(name=entry.name) or entry.path in self.exclude:
+                            continue
+                        yield entry
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+            except OSError:
+                continue
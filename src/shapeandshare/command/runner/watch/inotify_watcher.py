@@ -0,0 +1,211 @@
+""" Inotify File Watcher Definition """
+
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+from typing import Optional
+
+from .base_watcher import BaseWatcher
+
+
+class InotifyWatcher(BaseWatcher):
+    """
+    Inotify File Watcher
+    Watches for changes via Linux inotify (through libc), so that waiting costs nothing however large the tree.
+    inotify watches folders (not trees), so every watched folder is registered during a single initial scan and
+    folders created (or moved in) later are registered as they appear.  Should the kernel queue overflow, every watched
+    path is reported as changed.  start raises OSError when inotify is unavailable or the watch limit is reached.
+
+    Attributes
+    ----------
+    IN_*
+        The inotify flags and event types used (see inotify(7)).
+    MASK
+        The inotify events watched for.
+    READ_SIZE
+        The maximum number of bytes of events read at once, default: 65536
+    EVENT
+        The layout of the fixed size part of an inotify event (wd, mask, cookie, len).
+    """
+
+    IN_MODIFY: int = 0x00000002
+    IN_ATTRIB: int = 0x00000004
+    IN_CLOSE_WRITE: int = 0x00000008
+    IN_MOVED_FROM: int = 0x00000040
+    IN_MOVED_TO: int = 0x00000080
+    IN_CREATE: int = 0x00000100
+    IN_DELETE: int = 0x00000200
+    IN_DELETE_SELF: int = 0x00000400
+    IN_MOVE_SELF: int = 0x00000800
+    IN_Q_OVERFLOW: int = 0x00004000
+    IN_IGNORED: int = 0x00008000
+    IN_ONLYDIR: int = 0x01000000
+    IN_DONT_FOLLOW: int = 0x02000000
+    IN_EXCL_UNLINK: int = 0x04000000
+    IN_ISDIR: int = 0x40000000
+    IN_NONBLOCK: int = os.O_NONBLOCK
+    IN_CLOEXEC: int = 0o2000000
+
+    MASK: int = (
+        IN_MODIFY
+        | IN_ATTRIB
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_DELETE_SELF
+        | IN_MOVE_SELF
+        | IN_ONLYDIR
+        | IN_DONT_FOLLOW
+        | IN_EXCL_UNLINK
+    )
+    READ_SIZE: int = 64 * 1024
+    EVENT: struct.Struct = struct.Struct("iIII")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._libc: Optional[ctypes.CDLL] = None
+        self._fd: Optional[int] = None
+        self._watches: dict[int, tuple[str, bool]] = {}
+
+    @property
+    def description(self) -> str:
+        """
+        Class Property
+        What is being watched and how.
+
+        Returns
+        -------
+        A short summary.
+        """
+
+        return f"{len(self._watches)} folders (inotify)"
+
+    async def start(self) -> None:
+        """Starts watching (raising OSError when inotify is unavailable or the watch limit is reached)."""
+
+        libc: ctypes.CDLL = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._libc = libc
+        self._fd = libc.inotify_init1(InotifyWatcher.IN_NONBLOCK | InotifyWatcher.IN_CLOEXEC)
+        if self._fd < 0:
+            self._fd = None
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        try:
+            await asyncio.to_thread(self._register_all)
+        except OSError:
+            self.close()
+            raise
+        asyncio.get_running_loop().add_reader(self._fd, self._read)
+
+    def close(self) -> None:
+        """Stops watching."""
+
+        if self._fd is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self._fd)
+        except RuntimeError:
+            pass
+        os.close(self._fd)
+        self._fd = None
+        self._watches.clear()
+
+    def _register_all(self) -> None:
+        """Registers every watched folder (and the parent folder of every watched file)."""
+
+        for folder in self.folders:
+            self._register_tree(folder=folder)
+        for folder in {os.path.dirname(file) for file in self.files}:
+            self._register(folder=folder, recursive=False)
+
+    def _register_tree(self, folder: str) -> None:
+        """
+        Registers a folder and every folder below it.
+
+        Parameters
+        ----------
+        folder: The absolute path of the folder.
+        """
+
+        self._register(folder=folder, recursive=True)
+        for entry in self._scan(folder=folder):
+            if entry.is_dir(follow_symlinks=False):
+                self._register(folder=entry.path, recursive=True)
+
+    def _register(self, folder: str, recursive: bool) -> None:
+        """
+        Registers a folder, folders which are gone (or unreadable) are skipped.
+
+        Parameters
+        ----------
+        folder: The absolute path of the folder.
+        recursive: Whether folders created within it are registered too.
+        """
+
+        descriptor: int = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), InotifyWatcher.MASK)
+        if descriptor < 0:
+            error: int = ctypes.get_errno()
+            if error in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return
+            raise OSError(error, os.strerror(error), folder)
+        previous: Optional[tuple[str, bool]] = self._watches.get(descriptor)
+        self._watches[descriptor] = (folder, recursive or (previous is not None and previous[1]))
+
+    def _read(self) -> None:
+        """Handles the pending events (called by the event loop)."""
+
+        while self._fd is not None:
+            try:
+                buffer: bytes = os.read(self._fd, self.READ_SIZE)
+            except BlockingIOError:
+                return
+            offset: int = 0
+            while offset < len(buffer):
+                descriptor, mask, _, length = InotifyWatcher.EVENT.unpack_from(buffer, offset)
+                offset += InotifyWatcher.EVENT.size
+                name: str = os.fsdecode(buffer[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                self._handle(descriptor=descriptor, mask=mask, name=name)
+
+    def _handle(self, descriptor: int, mask: int, name: str) -> None:
+        """
+        Handles an event.
+
+        Parameters
+        ----------
+        descriptor: The watch the event belongs to.
+        mask: The event type.
+        name: The name of the file or folder within the watched folder, empty for the folder itself.
+        """
+
+        if mask & InotifyWatcher.IN_Q_OVERFLOW:
+            # Events were lost, anything may have changed.
+            for path in self.folders | self.files:
+                self._notify(path=path)
+            return
+        if mask & InotifyWatcher.IN_IGNORED:
+            self._watches.pop(descriptor, None)
+            return
+        watch: Optional[tuple[str, bool]] = self._watches.get(descriptor)
+        if watch is None:
+            return
+        folder, recursive = watch
+        path: str = os.path.join(folder, name) if name else folder
+        if (
+            recursive
+            and mask & InotifyWatcher.IN_ISDIR
+            and mask & (InotifyWatcher.IN_CREATE | InotifyWatcher.IN_MOVED_TO)
+            and self._relevant(path=path)
+        ):
+            try:
+                self._register_tree(folder=path)
+            except OSError:
+                # Out of watches, changes within this folder go unnoticed.
+                pass
+        self._notify(path=path)
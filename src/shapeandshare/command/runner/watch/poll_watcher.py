@@ -0,0 +1,95 @@
+""" Polling File Watcher Definition """
+
+import asyncio
+import os
+from typing import Optional
+
+from .base_watcher import BaseWatcher
+
+
+class PollWatcher(BaseWatcher):
+    """
+    Polling File Watcher
+    Watches for changes by periodically comparing snapshots (modification time, size and inode) of the watched files,
+    the fallback where inotify is unavailable.  Scans run within a worker thread and prune ignored folders.
+
+    Attributes
+    ----------
+    interval
+        Seconds between scans.
+    DEFAULT_INTERVAL
+        The default seconds between scans, default: 1
+    """
+
+    interval: float
+    DEFAULT_INTERVAL: float = 1
+
+    def __init__(self, interval: Optional[float] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.interval = interval or PollWatcher.DEFAULT_INTERVAL
+        self._snapshot: dict[str, tuple[int, int, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def description(self) -> str:
+        """
+        Class Property
+        What is being watched and how.
+
+        Returns
+        -------
+        A short summary.
+        """
+
+        return f"{len(self._snapshot)} paths (polling every {self.interval}s)"
+
+    async def start(self) -> None:
+        """Starts watching."""
+
+        self._snapshot = await asyncio.to_thread(self._take)
+        self._task = asyncio.ensure_future(self._poll())
+
+    def close(self) -> None:
+        """Stops watching."""
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _poll(self) -> None:
+        """Compares snapshots until cancelled."""
+
+        while True:
+            await asyncio.sleep(self.interval)
+            snapshot: dict[str, tuple[int, int, int]] = await asyncio.to_thread(self._take)
+            for path in snapshot.keys() ^ self._snapshot.keys():
+                self._notify(path=path)
+            for path, stat in snapshot.items():
+                if self._snapshot.get(path, stat) != stat:
+                    self._notify(path=path)
+            self._snapshot = snapshot
+
+    def _take(self) -> dict[str, tuple[int, int, int]]:
+        """
+        Snapshots the watched files and folders.
+
+        Returns
+        -------
+        The modification time (ns), size and inode of each path.
+        """
+
+        snapshot: dict[str, tuple[int, int, int]] = {}
+        for file in self.files:
+            try:
+                stat: os.stat_result = os.stat(file, follow_symlinks=False)
+            except OSError:
+                continue
+            snapshot[file] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        for folder in self.folders:
+            for entry in self._scan(folder=folder):
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        return snapshot
@@ -0,0 +1,318 @@
+""" Worker Pool Definition """
+
+import os
+import socket
+import threading
+from typing import Callable, Optional
+
+from .worker_protocol import WorkerProtocol
+
+
+class WorkerPool:
+    """
+    Worker Pool
+    The coordinating side of distributed runs (`sacr run --workers`): dispatches steps to the workers (see
+    WorkerServer) with free slots, the least busy first, writing their output into the given descriptors as it
+    arrives.  Connections are kept open between steps.  When a worker goes away mid-step (its connection drops, or it
+    sends nothing, not even a heartbeat, for LIVENESS_TIMEOUT) the step is retried on another worker, preferably, up
+    to MAX_ATTEMPTS times.  A worker which can no longer be connected to is not used for the rest of the run, and once
+    none remain steps fail.
+
+    Attributes
+    ----------
+    addresses
+        The addresses of the workers.
+    CONNECT_TIMEOUT
+        Seconds a worker is given to accept a connection and introduce itself, default: 5
+    LIVENESS_TIMEOUT
+        Seconds without hearing from a worker running a step before it is considered gone, default: 15
+    MAX_ATTEMPTS
+        The number of workers a step is tried on before it fails, default: 3
+    """
+
+    addresses: list[str]
+    CONNECT_TIMEOUT: float = 5
+    LIVENESS_TIMEOUT: float = 15
+    MAX_ATTEMPTS: int = 3
+
+    def __init__(self, addresses: list[str]):
+        for address in addresses:
+            WorkerProtocol.address(value=address)
+        self.addresses = list(dict.fromkeys(addresses))
+        self._slots: dict[str, int] = {}
+        self._busy: dict[str, int] = {address: 0 for address in self.addresses}
+        self._idle: dict[str, list[socket.socket]] = {address: [] for address in self.addresses}
+        self._active: set[socket.socket] = set()
+        self._condition: threading.Condition = threading.Condition()
+        self._cancelled: bool = False
+
+    @property
+    def capacity(self) -> int:
+        """
+        Class Property
+        The combined slots of the reachable workers.
+
+        Returns
+        -------
+        The number of steps the workers can run concurrently.
+        """
+
+        with self._condition:
+            return sum(self._slots.values())
+
+    def connect(self) -> list[str]:
+        """
+        Connects to every worker, learning their slots.
+
+        Returns
+        -------
+        Why each unreachable worker could not be used.
+        """
+
+        problems: list[str] = []
+        for address in self.addresses:
+            try:
+                connection, slots = WorkerPool._open(address=address)
+            except OSError as error:
+                problems.append(f"{address}: {error}")
+                continue
+            with self._condition:
+                self._slots[address] = slots
+                self._idle[address].append(connection)
+        return problems
+
+    def dispatch(self, request: dict, outputs: tuple[int, int], started: Callable[[str, Optional[str]], None]) -> dict:
+        """
+        Runs a step on a worker, retrying it on another worker should its worker go away.
+
+        Parameters
+        ----------
+        request: The step (its command, environment, timeout and resources).
+        outputs: The descriptors the stdout and stderr of the step are written into.
+        started: Called as each attempt starts, with the worker address and, when retrying, what was lost.
+
+        Returns
+        -------
+        The exit frame of the step (its returncode, whether it timed out, or why it could not start).
+        """
+
+        lost: Optional[str] = None
+        avoid: Optional[str] = None
+        for _ in range(WorkerPool.MAX_ATTEMPTS):
+            address: str = self._acquire(avoid=avoid)
+            connection: Optional[socket.socket] = None
+            try:
+                connection = self._connection(address=address)
+                started(address, lost)
+                result: dict = WorkerPool._exchange(connection=connection, request=request, outputs=outputs)
+            except OSError as error:
+                self._discard(connection=connection)
+                if self._cancelled:
+                    raise
+                lost, avoid = f"{address} ({error})", address
+                self._probe(address=address)
+                continue
+            finally:
+                self._release(address=address, connection=connection)
+            with self._condition:
+                self._idle[address].append(connection)
+            return result
+        raise ConnectionError(f"gave up after {WorkerPool.MAX_ATTEMPTS} attempts, lost {lost}")
+
+    def cancel(self) -> None:
+        """Stops dispatching, disconnecting from the running steps (which their workers then terminate)."""
+
+        with self._condition:
+            self._cancelled = True
+            active: list[socket.socket] = list(self._active)
+            self._condition.notify_all()
+        for connection in active:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """Disconnects from every worker."""
+
+        with self._condition:
+            idle: list[socket.socket] = [item for connections in self._idle.values() for item in connections]
+            for connections in self._idle.values():
+                connections.clear()
+        for connection in idle:
+            connection.close()
+
+    @staticmethod
+    def _open(address: str) -> tuple[socket.socket, int]:
+        """
+        Opens a connection to a worker.
+
+        Parameters
+        ----------
+        address: The worker address.
+
+        Returns
+        -------
+        The connection and the number of slots of the worker.
+        """
+
+        connection: socket.socket = WorkerProtocol.connect(address=address, timeout=WorkerPool.CONNECT_TIMEOUT)
+        try:
+            WorkerProtocol.send(
+                connection=connection,
+                header={"type": "hello", "version": WorkerProtocol.VERSION, "token": WorkerProtocol.token()},
+            )
+            reply, _ = WorkerProtocol.receive(connection=connection)
+            if reply.get("type") != "hello":
+                raise ConnectionRefusedError(reply.get("message") or "not a sacr worker")
+            connection.settimeout(WorkerPool.LIVENESS_TIMEOUT)
+        except OSError:
+            connection.close()
+            raise
+        return connection, max(1, int(reply.get("slots", 1)))
+
+    def _acquire(self, avoid: Optional[str]) -> str:
+        """
+        Claims a slot on the least busy worker, waiting for one to free up.
+
+        Parameters
+        ----------
+        avoid: The worker to use only when no other has a free slot, if any.
+
+        Returns
+        -------
+        The address of the worker.
+        """
+
+        with self._condition:
+            while True:
+                if self._cancelled:
+                    raise ConnectionError("cancelled")
+                if not self._slots:
+                    raise ConnectionError("no worker is reachable")
+                free: list[str] = [address for address, slots in self._slots.items() if self._busy[address] < slots]
+                if free:
+                    address: str = max(free, key=lambda item: (item != avoid, self._slots[item] - self._busy[item]))
+                    self._busy[address] += 1
+                    return address
+                self._condition.wait()
+
+    def _release(self, address: str, connection: Optional[socket.socket]) -> None:
+        """
+        Frees a slot claimed on a worker.
+
+        Parameters
+        ----------
+        address: The address of the worker.
+        connection: The connection the step used, if any.
+        """
+
+        with self._condition:
+            self._busy[address] -= 1
+            self._active.discard(connection)
+            self._condition.notify_all()
+
+    def _connection(self, address: str) -> socket.socket:
+        """
+        A connection to a worker, reusing an idle one when possible.
+
+        Parameters
+        ----------
+        address: The address of the worker.
+
+        Returns
+        -------
+        The connection, tracked as active (so that cancel can interrupt it).
+        """
+
+        with self._condition:
+            connection: Optional[socket.socket] = self._idle[address].pop() if self._idle[address] else None
+        if connection is None:
+            connection, _ = WorkerPool._open(address=address)
+        with self._condition:
+            self._active.add(connection)
+        return connection
+
+    def _discard(self, connection: Optional[socket.socket]) -> None:
+        """
+        Closes a connection which failed.
+
+        Parameters
+        ----------
+        connection: The connection, if one was made.
+        """
+
+        if connection is None:
+            return
+        with self._condition:
+            self._active.discard(connection)
+        connection.close()
+
+    def _probe(self, address: str) -> None:
+        """
+        Checks whether a worker is still reachable after losing a connection to it, no longer using it when not.
+
+        Parameters
+        ----------
+        address: The address of the worker.
+        """
+
+        try:
+            connection, slots = WorkerPool._open(address=address)
+        except OSError:
+            with self._condition:
+                self._slots.pop(address, None)
+                for stale in self._idle[address]:
+                    stale.close()
+                self._idle[address].clear()
+                self._condition.notify_all()
+            return
+        with self._condition:
+            self._slots[address] = slots
+            self._idle[address].append(connection)
+
+    @staticmethod
+    def _exchange(connection: socket.socket, request: dict, outputs: tuple[int, int]) -> dict:
+        """
+        Sends a step to a worker, writing out its output until it exits.
+
+        Parameters
+        ----------
+        connection: The connection to the worker.
+        request: The step.
+        outputs: The descriptors the stdout and stderr of the step are written into.
+
+        Returns
+        -------
+        The exit frame of the step.
+        """
+
+        WorkerProtocol.send(connection=connection, header={**request, "type": "run"})
+        while True:
+            header, payload = WorkerProtocol.receive(connection=connection)
+            kind: Optional[str] = header.get("type")
+            if kind == "exit":
+                return header
+            if kind == "error":
+                raise ConnectionError(header.get("message") or "refused by the worker")
+            if kind == "output" and header.get("stream") in (1, 2):
+                WorkerPool._write(fd=outputs[header["stream"] - 1], data=payload)
+            # Heartbeats only show the worker is still there.
+
+    @staticmethod
+    def _write(fd: int, data: bytes) -> None:
+        """
+        Writes output out in full (output which can not be written is dropped, it does not fail the step).
+
+        Parameters
+        ----------
+        fd: The descriptor.
+        data: The output.
+        """
+
+        view: memoryview = memoryview(data)
+        try:
+            while view:
+                view = view[os.write(fd, view) :]
+        except OSError:
+            pass
@@ -0,0 +1,180 @@
+""" Worker Protocol Definition """
+
+import json
+import os
+import socket
+from typing import Optional, Union
+
+
+class WorkerProtocol:
+    """
+    Worker Protocol
+    The wire format spoken between a coordinating `sacr run --workers` and `sacr worker`: frames of a length prefixed
+    JSON header, followed by `size` bytes of raw payload when the header declares one (process output is relayed
+    as-is, never re-encoded).  A connection opens with a `hello` exchange (the protocol version and shared token from
+    the coordinator, the number of slots from the worker), then carries one step at a time: a `run` request answered
+    by `output` frames (stream 1 or 2), `heartbeat` frames while the step is quiet, and a final `exit` frame (which,
+    for pipelines, also carries the exit status of every stage as `returncodes`).
+
+    Addresses are either `host:port` (TCP, the host defaulting to localhost and the port to DEFAULT_PORT) or a Unix
+    domain socket path (`unix:PATH`, or any address containing a `/`).
+
+    Attributes
+    ----------
+    VERSION
+        The protocol version, peers of any other version are refused.
+    DEFAULT_HOST
+        The host of addresses given as a port alone, default: "127.0.0.1"
+    DEFAULT_PORT
+        The port of addresses given as a host alone, default: 7878
+    TOKEN_ENVIRONMENT_VARIABLE
+        The shared secret a worker requires of coordinators, and coordinators present, when set.
+    HEADER_SIZE
+        The size of the length prefix of headers, default: 4
+    MAX_HEADER
+        The largest header accepted, default: 16 MiB
+    """
+
+    VERSION: int = 1
+    DEFAULT_HOST: str = "127.0.0.1"
+    DEFAULT_PORT: int = 7878
+    TOKEN_ENVIRONMENT_VARIABLE: str = "SACR_WORKER_TOKEN"
+    HEADER_SIZE: int = 4
+    MAX_HEADER: int = 16 * 1024 * 1024
+
+    @staticmethod
+    def address(value: str) -> Union[str, tuple[str, int]]:
+        """
+        Parses a worker address.
+
+        Parameters
+        ----------
+        value: The address, e.g. `build-2:7878`, `:7001`, `unix:/run/sacr.sock` or `/run/sacr.sock`.
+
+        Returns
+        -------
+        The socket path, or the host and port.
+        """
+
+        if value.startswith("unix:"):
+            return value[len("unix:") :]
+        if "/" in value:
+            return value
+        host, separator, port = value.rpartition(":")
+        if not separator:
+            host, port = value, ""
+        host = host.strip("[]") or WorkerProtocol.DEFAULT_HOST
+        if not port:
+            return host, WorkerProtocol.DEFAULT_PORT
+        if not port.isdigit() or int(port) > 65535:
+            raise ValueError(f"Invalid worker address `{value}`.")
+        return host, int(port)
+
+    @staticmethod
+    def token() -> Optional[str]:
+        """
+        The shared secret of workers and coordinators.
+
+        Returns
+        -------
+        The token, None when not set.
+        """
+
+        return os.environ.get(WorkerProtocol.TOKEN_ENVIRONMENT_VARIABLE) or None
+
+    @staticmethod
+    def connect(address: str, timeout: Optional[float] = None) -> socket.socket:
+        """
+        Connects to a worker.
+
+        Parameters
+        ----------
+        address: The worker address.
+        timeout: Seconds to wait for the connection (and every later read), None to wait indefinitely.
+
+        Returns
+        -------
+        The connection.
+        """
+
+        target: Union[str, tuple[str, int]] = WorkerProtocol.address(value=address)
+        if isinstance(target, str):
+            connection: socket.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(timeout)
+            try:
+                connection.connect(target)
+            except OSError:
+                connection.close()
+                raise
+            return connection
+        connection = socket.create_connection(target, timeout=timeout)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return connection
+
+    @staticmethod
+    def send(connection: socket.socket, header: dict, payload: bytes = b"") -> None:
+        """
+        Sends a frame.
+
+        Parameters
+        ----------
+        connection: The connection.
+        header: The frame header (`size` is set from the payload, when there is one).
+        payload: The raw payload, if any.
+        """
+
+        if payload:
+            header = {**header, "size": len(payload)}
+        encoded: bytes = json.dumps(header).encode("utf-8")
+        connection.sendall(len(encoded).to_bytes(WorkerProtocol.HEADER_SIZE, "big") + encoded + payload)
+
+    @staticmethod
+    def receive(connection: socket.socket) -> tuple[dict, bytes]:
+        """
+        Receives a frame.
+
+        Parameters
+        ----------
+        connection: The connection.
+
+        Returns
+        -------
+        The frame header and its payload (empty without one), raises ConnectionError when the peer went away.
+        """
+
+        length: int = int.from_bytes(WorkerProtocol._exactly(connection, WorkerProtocol.HEADER_SIZE), "big")
+        if length > WorkerProtocol.MAX_HEADER:
+            raise ConnectionError(f"Oversized frame header ({length} bytes)")
+        try:
+            header: dict = json.loads(WorkerProtocol._exactly(connection, length))
+        except ValueError as error:
+            raise ConnectionError(f"Malformed frame header: {error}") from error
+        if not isinstance(header, dict):
+            raise ConnectionError("Malformed frame header")
+        size: int = int(header.get("size", 0))
+        return header, WorkerProtocol._exactly(connection, size) if size > 0 else b""
+
+    @staticmethod
+    def _exactly(connection: socket.socket, size: int) -> bytes:
+        """
+        Reads an exact number of bytes.
+
+        Parameters
+        ----------
+        connection: The connection.
+        size: The number of bytes.
+
+        Returns
+        -------
+        The bytes read, raises ConnectionError when the peer closes the connection first.
+        """
+
+        buffer: bytearray = bytearray(size)
+        view: memoryview = memoryview(buffer)
+        received: int = 0
+        while received < size:
+            count: int = connection.recv_into(view[received:])
+            if count == 0:
+                raise ConnectionError("Connection closed by peer")
+            received += count
+        return bytes(buffer)
@@ -0,0 +1,369 @@
+""" Worker Server Definition """
+
+import hmac
+import logging
+import os
+import select
+import signal
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from ..contacts.dtos.job_resources import JobResources
+from ..contacts.errors.parse_error import ParseError
+from ..contacts.errors.unknown_argument_error import UnknownArgumentError
+from ..execution.command_resolver import CommandResolver
+from ..execution.process_limits import ProcessLimits
+from ..execution.process_pipeline import ProcessPipeline
+from .worker_protocol import WorkerProtocol
+
+
+# pylint: disable=too-few-public-methods,too-many-instance-attributes
+class WorkerServer:
+    """
+    Worker Server
+    The remote side of distributed runs (`sacr worker`): runs the steps coordinators dispatch to it (see WorkerPool)
+    within its own working directory (a checkout of the same project) and environment, plus the variables the alias
+    declares within [environment] as set on the coordinator.  Each connection is served by its own thread and carries
+    one step at a time, while at most `slots` steps run at once across every connection.  Output is relayed as it is
+    produced, with heartbeats while a step is quiet (so coordinators notice a worker which went away), and each step
+    runs within its own process group, which is terminated when the step times out or its coordinator disconnects.
+
+    Attributes
+    ----------
+    address
+        The address listened on (with the actual port, once listening on port 0).
+    slots
+        The maximum number of steps run concurrently.
+    served
+        The number of steps run.
+    HELLO_TIMEOUT
+        Seconds a connection is given to introduce itself, default: 5
+    HEARTBEAT_INTERVAL
+        Seconds without output after which a heartbeat is sent, default: 5
+    POLL_INTERVAL
+        Seconds between checks of whether a quiet step exited, default: 0.5
+    READ_SIZE
+        The largest chunk of output relayed at once, default: 64 KiB
+    TERMINATE_GRACE_PERIOD
+        Seconds a terminated step is given to exit before being killed, default: 5
+    DRAIN_TIMEOUT
+        Seconds the output of an exited step is awaited (background processes may hold its pipes), default: 1
+    """
+
+    address: str
+    slots: int
+    served: int
+    HELLO_TIMEOUT: float = 5
+    HEARTBEAT_INTERVAL: float = 5
+    POLL_INTERVAL: float = 0.5
+    READ_SIZE: int = 64 * 1024
+    TERMINATE_GRACE_PERIOD: int = 5
+    DRAIN_TIMEOUT: int = 1
+
+    def __init__(self, address: str, slots: int):
+        self.address = address
+        self.slots = max(1, slots)
+        self.served = 0
+        self._available: threading.BoundedSemaphore = threading.BoundedSemaphore(self.slots)
+        self._lock: threading.Lock = threading.Lock()
+        self._processes: set[Union[subprocess.Popen, ProcessPipeline]] = set()
+        self._resolver: CommandResolver = CommandResolver()
+        self._token: Optional[str] = WorkerProtocol.token()
+
+    def serve(self, ready: Optional[Callable[[], None]] = None) -> None:
+        """
+        Serves coordinators until interrupted (SIGINT or SIGTERM).
+
+        Parameters
+        ----------
+        ready: Called once the worker is listening, if provided.
+        """
+
+        target: Union[str, tuple[str, int]] = WorkerProtocol.address(value=self.address)
+        listener: socket.socket = self._listen(target=target)
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        if ready is not None:
+            ready()
+        try:
+            while True:
+                connection, _ = listener.accept()
+                peer: str = WorkerServer._peer(connection=connection)
+                threading.Thread(target=self._connection, args=(connection, peer), daemon=True).start()
+        finally:
+            listener.close()
+            if isinstance(target, str) and os.path.exists(target):
+                os.unlink(target)
+            with self._lock:
+                processes: list[Union[subprocess.Popen, ProcessPipeline]] = list(self._processes)
+            for process in processes:
+                WorkerServer._signal(process=process, number=signal.SIGTERM)
+
+    def _listen(self, target: Union[str, tuple[str, int]]) -> socket.socket:
+        """
+        Binds the listening socket, replacing a stale Unix domain socket.
+
+        Parameters
+        ----------
+        target: The socket path, or the host and port.
+
+        Returns
+        -------
+        The listening socket.
+        """
+
+        if isinstance(target, tuple):
+            listener: socket.socket = socket.create_server(target, backlog=64)
+            host, port = listener.getsockname()[:2]
+            self.address = f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+            return listener
+
+        if Path(target).is_socket():
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(target)
+                except OSError:
+                    os.unlink(target)
+                else:
+                    raise FileExistsError(f"A worker is already listening on {target}")
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            listener.bind(target)
+            listener.listen(64)
+        except OSError:
+            listener.close()
+            raise
+        return listener
+
+    @staticmethod
+    def _peer(connection: socket.socket) -> str:
+        """
+        Describes the peer of a connection.
+
+        Parameters
+        ----------
+        connection: The connection.
+
+        Returns
+        -------
+        The address of the peer (`local` over a Unix domain socket).
+        """
+
+        name = connection.getpeername()
+        return f"{name[0]}:{name[1]}" if isinstance(name, tuple) else "local"
+
+    def _connection(self, connection: socket.socket, peer: str) -> None:
+        """
+        Serves a connection until the coordinator closes it.
+
+        Parameters
+        ----------
+        connection: The connection.
+        peer: The address of the coordinator.
+        """
+
+        with connection:
+            try:
+                connection.settimeout(WorkerServer.HELLO_TIMEOUT)
+                hello, _ = WorkerProtocol.receive(connection=connection)
+                refusal: Optional[str] = self._refusal(hello=hello)
+                if refusal is not None:
+                    logging.getLogger(__name__).warning("Refused coordinator %s: %s", peer, refusal)
+                    WorkerProtocol.send(connection=connection, header={"type": "error", "message": refusal})
+                    return
+                WorkerProtocol.send(
+                    connection=connection,
+                    header={
+                        "type": "hello",
+                        "version": WorkerProtocol.VERSION,
+                        "slots": self.slots,
+                        "host": socket.gethostname(),
+                    },
+                )
+                connection.settimeout(None)
+                while True:
+                    request, _ = WorkerProtocol.receive(connection=connection)
+                    if request.get("type") != "run":
+                        raise ConnectionError(f"Unexpected request `{request.get('type')}`")
+                    with self._available:
+                        self._step(connection=connection, request=request, peer=peer)
+            except OSError as error:
+                logging.getLogger(__name__).debug("Coordinator %s disconnected: %s", peer, error)
+
+    def _refusal(self, hello: dict) -> Optional[str]:
+        """
+        Checks the introduction of a coordinator.
+
+        Parameters
+        ----------
+        hello: The hello frame of the coordinator.
+
+        Returns
+        -------
+        Why the coordinator is refused, None when it is accepted.
+        """
+
+        if hello.get("type") != "hello" or hello.get("version") != WorkerProtocol.VERSION:
+            return f"protocol version {WorkerProtocol.VERSION} required"
+        if self._token is not None and not hmac.compare_digest(
+            str(hello.get("token") or "").encode("utf-8"), self._token.encode("utf-8")
+        ):
+            return f"invalid token (see {WorkerProtocol.TOKEN_ENVIRONMENT_VARIABLE})"
+        return None
+
+    def _step(self, connection: socket.socket, request: dict, peer: str) -> None:
+        """
+        Runs a step, relaying its output and then its exit status.
+
+        Parameters
+        ----------
+        connection: The connection of the coordinator.
+        request: The run request.
+        peer: The address of the coordinator.
+        """
+
+        command: Union[str, list[str]] = request["command"]
+        print(f"[{peer}] > {CommandResolver.display(command=command)}", flush=True)
+        try:
+            resources: Optional[dict] = request.get("resources")
+            limits: Optional[ProcessLimits] = (
+                ProcessLimits.create(resources=JobResources.parse_obj(resources)) if resources else None
+            )
+            stages: Optional[list[list[str]]] = CommandResolver.stages(command=command)
+            process: Union[subprocess.Popen, ProcessPipeline]
+            if stages is not None:
+                process = ProcessPipeline(stages=stages, resolver=self._resolver)
+                process.start(
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    env={**os.environ, **request.get("env", {})},
+                    new_group=True,
+                    preexec_fn=limits.apply if limits is not None else None,
+                )
+            else:
+                resolved: Optional[tuple[str, list[str]]] = self._resolver.resolve(command=command)
+                # pylint: disable=consider-using-with,subprocess-popen-preexec-fn
+                process = subprocess.Popen(
+                    command if resolved is None else resolved[1],
+                    executable=None if resolved is None else resolved[0],
+                    shell=resolved is None,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    env={**os.environ, **request.get("env", {})},
+                    start_new_session=True,
+                    preexec_fn=limits.apply if limits is not None else None,
+                )
+        except (OSError, subprocess.SubprocessError, ParseError, UnknownArgumentError) as error:
+            WorkerProtocol.send(connection=connection, header={"type": "exit", "returncode": 127, "error": str(error)})
+            return
+
+        with process:
+            with self._lock:
+                self._processes.add(process)
+                self.served += 1
+            try:
+                timed_out: bool = self._relay(connection=connection, process=process, timeout=request.get("timeout"))
+            finally:
+                if process.poll() is None:
+                    WorkerServer._terminate(process=process)
+                with self._lock:
+                    self._processes.discard(process)
+        exit_frame: dict = {"type": "exit", "returncode": process.returncode, "timed_out": timed_out}
+        if stages is not None:
+            exit_frame["returncodes"] = process.returncodes
+        WorkerProtocol.send(connection=connection, header=exit_frame)
+
+    def _relay(
+        self, connection: socket.socket, process: Union[subprocess.Popen, ProcessPipeline], timeout: Optional[float]
+    ) -> bool:
+        """
+        Relays the output of a step until it exits (and its output is drained).
+
+        Parameters
+        ----------
+        connection: The connection of the coordinator.
+        process: The process of the step.
+        timeout: The per-command timeout threshold, if any.
+
+        Returns
+        -------
+        Whether the step exceeded its timeout (and was terminated).
+        """
+
+        timed_out: bool = False
+        started: float = time.monotonic()
+        deadline: Optional[float] = started + timeout if timeout else None
+        exited: Optional[float] = None
+        quiet_since: float = started
+        streams: dict[int, int] = {process.stdout.fileno(): 1, process.stderr.fileno(): 2}
+        poller: select.poll = select.poll()
+        for fd in streams:
+            poller.register(fd, select.POLLIN)
+        # The coordinator sends nothing while a step runs, so readability means it went away.
+        poller.register(connection.fileno(), select.POLLIN)
+        while streams:
+            now: float = time.monotonic()
+            if exited is None and process.poll() is not None:
+                exited = now
+            if exited is not None and now - exited >= WorkerServer.DRAIN_TIMEOUT:
+                break
+            if deadline is not None and now >= deadline:
+                timed_out = True
+                deadline = None
+                WorkerServer._terminate(process=process)
+                continue
+            if now - quiet_since >= WorkerServer.HEARTBEAT_INTERVAL:
+                WorkerProtocol.send(connection=connection, header={"type": "heartbeat"})
+                quiet_since = now
+            for fd, _ in poller.poll(WorkerServer.POLL_INTERVAL * 1000):
+                if fd not in streams:
+                    raise ConnectionError("Coordinator went away")
+                chunk: bytes = os.read(fd, WorkerServer.READ_SIZE)
+                if not chunk:
+                    poller.unregister(fd)
+                    del streams[fd]
+                    continue
+                WorkerProtocol.send(
+                    connection=connection, header={"type": "output", "stream": streams[fd]}, payload=chunk
+                )
+                quiet_since = time.monotonic()
+        process.wait()
+        return timed_out
+
+    @staticmethod
+    def _signal(process: Union[subprocess.Popen, ProcessPipeline], number: int) -> None:
+        """
+        Signals the process group of a step.
+
+        Parameters
+        ----------
+        process: The process of the step (the leader of its process group).
+        number: The signal.
+        """
+
+        try:
+            os.killpg(process.pid, number)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _terminate(process: Union[subprocess.Popen, ProcessPipeline]) -> None:
+        """
+        Terminates the process group of a step, killing it if the step does not exit within the grace period.
+
+        Parameters
+        ----------
+        process: The process of the step.
+        """
+
+        WorkerServer._signal(process=process, number=signal.SIGTERM)
+        try:
+            process.wait(timeout=WorkerServer.TERMINATE_GRACE_PERIOD)
+        except subprocess.TimeoutExpired:
+            WorkerServer._signal(process=process, number=signal.SIGKILL)
+            process.wait()
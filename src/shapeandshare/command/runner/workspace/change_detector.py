@@ -0,0 +1,152 @@
+""" Change Detector Definition """
+
+import fnmatch
+import os
+import subprocess
+from pathlib import Path
+
+from ..common.glob_walker import GlobWalker
+from ..contacts.errors.unknown_argument_error import UnknownArgumentError
+from ..execution.job_graph import JobGraph
+from ..watch.base_watcher import BaseWatcher
+from .workspace_package import WorkspacePackage
+
+
+class ChangeDetector:
+    """
+    Change Detector
+    Maps the files changed since a git ref to the workspace packages they affect, via the `git` command line.
+
+    Changed files are those differing between the working tree and the merge base of the ref and HEAD (so that
+    `--since origin/main` covers the changes of a branch, not those made on main meanwhile), including staged,
+    unstaged, deleted and untracked files (renames count as a deletion and an addition), though not those within the
+    folders file watching ignores (such as `.sacr`, see BaseWatcher).  A package is affected for an alias when a
+    changed file is covered by the declared [inputs] of the alias (or of any alias it runs), or, where the alias runs
+    commands without declared inputs, when the file lies within the package (and not within a nested package).
+    Changes to the configuration file of a package affect it too.
+
+    Attributes
+    ----------
+    root
+        The workspace root.
+    """
+
+    root: Path
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._walker: GlobWalker = GlobWalker()
+
+    def changed(self, since: str) -> list[str]:
+        """
+        The files changed since a git ref.
+
+        Parameters
+        ----------
+        since: The git ref (branch, tag or commit).
+
+        Returns
+        -------
+        The changed files within the workspace, relative to the root.
+        """
+
+        try:
+            base: str = self._git("merge-base", since, "HEAD").strip()
+        except UnknownArgumentError:
+            # Unrelated histories (or a shallow clone) have no merge base, compare against the ref itself.
+            try:
+                base = self._git("rev-parse", "--verify", "--end-of-options", f"{since}^{{commit}}").strip()
+            except UnknownArgumentError as error:
+                raise UnknownArgumentError(command="run", message=f"Unknown git ref `{since}`.") from error
+        diff: str = self._git("diff", "--name-only", "--no-renames", "--relative", "-z", base, "--")
+        untracked: str = self._git("ls-files", "--others", "--exclude-standard", "-z")
+        return sorted(
+            {
+                os.path.normpath(file)
+                for file in (diff + untracked).split("\0")
+                if file and not ChangeDetector._ignored(file=file)
+            }
+        )
+
+    def affected(self, packages: list[WorkspacePackage], alias: str, files: list[str]) -> set[str]:
+        """
+        The packages affected by changed files.
+
+        Parameters
+        ----------
+        packages: Every package within the workspace.
+        alias: The alias being run.
+        files: The changed files, relative to the root.
+
+        Returns
+        -------
+        The names of the packages defining the alias whose run the changes affect.
+        """
+
+        affected: set[str] = set()
+        paths: list[str] = sorted((package.path for package in packages), key=len, reverse=True)
+        owners: dict[str, str] = {}
+        for file in files:
+            # The innermost package holding the file, if any.
+            owners[file] = next((path for path in paths if file.startswith(f"{path}/")), "")
+
+        for package in packages:
+            if not package.defines(alias=alias):
+                continue
+            graph: JobGraph = JobGraph.build(model=package.backend.model, alias=alias)
+            patterns: set[str] = {pattern for job in graph.jobs for pattern in job.inputs}
+            undeclared: bool = any(not job.inputs for job in graph.jobs)
+            config: str = os.path.normpath(os.path.join(package.path, package.backend.config_file))
+            for file in files:
+                relative: str = os.path.relpath(file, package.path)
+                if (
+                    file == config
+                    or (undeclared and owners[file] == package.path)
+                    or any(self._walker.covers(pattern=pattern, path=relative) for pattern in patterns)
+                ):
+                    affected.add(package.name)
+                    break
+        return affected
+
+    @staticmethod
+    def _ignored(file: str) -> bool:
+        """
+        Whether a changed file is disregarded.
+
+        Parameters
+        ----------
+        file: The file, relative to the root.
+
+        Returns
+        -------
+        True when within a folder file watching ignores.
+        """
+
+        return any(
+            fnmatch.fnmatch(part, pattern) for part in file.split("/")[:-1] for pattern in BaseWatcher.DEFAULT_IGNORE
+        )
+
+    def _git(self, *arguments: str) -> str:
+        """
+        Runs a git command within the workspace.
+
+        Parameters
+        ----------
+        arguments: The arguments of the git command.
+
+        Returns
+        -------
+        The output of the command.
+        """
+
+        try:
+            completed: subprocess.CompletedProcess = subprocess.run(
+                ["git", *arguments], cwd=self.root, capture_output=True, text=True, check=False
+            )
+        except OSError as error:
+            raise UnknownArgumentError(command="run", message=f"`--since` requires git: {error}") from error
+        if completed.returncode != 0:
+            raise UnknownArgumentError(
+                command="run", message=f"git {arguments[0]} failed: {completed.stderr.strip() or completed.returncode}"
+            )
+        return completed.stdout
@@ -0,0 +1,234 @@
+""" Workspace Discovery Definition """
+
+import fnmatch
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from ..backends.backend_factory import BackendFactory
+from ..cache.config_cache import ConfigCache
+from ..contacts.backend_type import BackendType
+from ..contacts.errors.parse_error import ParseError
+from ..execution.job_graph import JobGraph
+from ..watch.base_watcher import BaseWatcher
+from .workspace_package import WorkspacePackage
+
+
+class WorkspaceDiscovery:
+    """
+    Workspace Discovery
+    Finds every package (a folder with a sacr.config, or otherwise a package.json) under a workspace root, skipping
+    the workspace root itself (whose aliases typically drive the workspace) and the folders file watching ignores
+    (version control, dependency and cache folders, see BaseWatcher).  Symbolic links are not followed.
+
+    The packages found are cached under `.sacr/cache` (within the root) together with the modification time of every
+    folder walked.  Adding, removing or renaming an entry changes the modification time of its folder, so while none
+    changed (and none were modified within RACY_WINDOW_NS of the cache being written) the cache is used without walking
+    the tree.  The configuration of each package is loaded through its backend (and so the configuration cache).
+
+    Attributes
+    ----------
+    root
+        The workspace root.
+    CACHE_FILE
+        The cache location, relative to the root, default: Path(".sacr/cache/workspace.json")
+    CACHE_VERSION
+        The cache format version, caches of any other version are ignored.
+    CONFIG_FILES
+        The configuration files marking a package and the backend loading each, by precedence.
+    RACY_WINDOW_NS
+        Folders modified this close to the cache being written are always walked again, default: 2 seconds
+    """
+
+    root: Path
+    CACHE_FILE: Path = ConfigCache.CACHE_DIRECTORY / "workspace.json"
+    CACHE_VERSION: int = 1
+    CONFIG_FILES: tuple[tuple[str, BackendType], ...] = (
+        ("sacr.config", BackendType.CONFIG),
+        ("package.json", BackendType.PACKAGE),
+    )
+    RACY_WINDOW_NS: int = ConfigCache.RACY_WINDOW_NS
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def packages(self) -> list[WorkspacePackage]:
+        """
+        Loads every package within the workspace, resolving their dependencies on one another.
+
+        Returns
+        -------
+        The packages, ordered by path.
+        """
+
+        packages: list[WorkspacePackage] = []
+        for path, backend_type in self.locate():
+            backend = BackendFactory.build(backend_type=backend_type, base_path=(self.root / path).as_posix())
+            declared: dict = backend.model.workspace if isinstance(backend.model.workspace, dict) else {}
+            names: list = JobGraph.as_list(declared.get("name"))
+            packages.append(WorkspacePackage(name=str(names[0]) if names else path, path=path, backend=backend))
+
+        by_reference: dict[str, WorkspacePackage] = {package.path: package for package in packages}
+        for package in packages:
+            if package.name in by_reference and by_reference[package.name] is not package:
+                other: WorkspacePackage = by_reference[package.name]
+                raise ParseError(f"Workspace packages {other.path} and {package.path} are both named {package.name}")
+            by_reference[package.name] = package
+        for package in packages:
+            declared = package.backend.model.workspace if isinstance(package.backend.model.workspace, dict) else {}
+            # Dependencies are referenced by name or path, anything else (e.g. a registry package) is not ours.
+            references: list[str] = [
+                reference if reference in by_reference else os.path.normpath(reference)
+                for reference in map(str, JobGraph.as_list(declared.get("depends")))
+            ]
+            package.depends = sorted(
+                {
+                    by_reference[reference].name
+                    for reference in references
+                    if reference in by_reference and by_reference[reference] is not package
+                }
+            )
+        return packages
+
+    def locate(self) -> list[tuple[str, BackendType]]:
+        """
+        Finds the packages within the workspace, from the cache while the tree is unchanged.
+
+        Returns
+        -------
+        The folder (relative to the root) and backend type of every package, ordered by path.
+        """
+
+        cache: Path = self.root / WorkspaceDiscovery.CACHE_FILE
+        cached: Optional[dict] = WorkspaceDiscovery._read(path=cache) if ConfigCache.enabled() else None
+        if cached is not None and self._fresh(entry=cached):
+            return [(path, BackendType(backend_type)) for path, backend_type in cached["packages"]]
+
+        if ConfigCache.enabled():
+            # Created up front, as creating it modifies the root.
+            cache.parent.mkdir(parents=True, exist_ok=True)
+        folders: dict[str, int] = {}
+        packages: list[tuple[str, BackendType]] = []
+        started: int = time.time_ns()
+        self._walk(folder=".", folders=folders, packages=packages)
+        packages.sort()
+        if ConfigCache.enabled():
+            WorkspaceDiscovery._write(
+                path=cache,
+                entry={
+                    "version": WorkspaceDiscovery.CACHE_VERSION,
+                    "written_ns": started,
+                    "folders": folders,
+                    "packages": packages,
+                },
+            )
+        return packages
+
+    def _walk(self, folder: str, folders: dict[str, int], packages: list[tuple[str, BackendType]]) -> None:
+        """
+        Walks a folder of the workspace, recording its modification time and any package it holds.
+
+        Parameters
+        ----------
+        folder: The folder, relative to the root.
+        folders: The modification time of every folder walked.
+        packages: The packages found.
+        """
+
+        location: Path = self.root / folder
+        try:
+            folders[folder] = location.stat().st_mtime_ns
+            with os.scandir(location) as iterator:
+                entries: list[os.DirEntry] = list(iterator)
+        except OSError as error:
+            logging.getLogger(__name__).debug("[SKIPPING] Unreadable workspace folder {%s}: %s", location, error)
+            return
+
+        names: set[str] = {entry.name for entry in entries if entry.is_file()}
+        if folder != ".":
+            for name, backend_type in WorkspaceDiscovery.CONFIG_FILES:
+                if name in names:
+                    packages.append((folder, backend_type))
+                    break
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            if any(fnmatch.fnmatch(entry.name, pattern) for pattern in BaseWatcher.DEFAULT_IGNORE):
+                continue
+            self._walk(
+                folder=entry.name if folder == "." else f"{folder}/{entry.name}", folders=folders, packages=packages
+            )
+
+    def _fresh(self, entry: dict) -> bool:
+        """
+        Whether the cached packages can be used, as no folder of the workspace changed since they were found.
+
+        Parameters
+        ----------
+        entry: The cache entry.
+
+        Returns
+        -------
+        True when every folder walked still has its recorded modification time.
+        """
+
+        for folder, mtime_ns in entry["folders"].items():
+            try:
+                current: int = (self.root / folder).stat().st_mtime_ns
+            except OSError:
+                return False
+            if current != mtime_ns or current >= entry["written_ns"] - WorkspaceDiscovery.RACY_WINDOW_NS:
+                return False
+        return True
+
+    @staticmethod
+    def _read(path: Path) -> Optional[dict]:
+        """
+        Reads the cache.
+
+        Parameters
+        ----------
+        path: The cache location.
+
+        Returns
+        -------
+        The cache entry, None if it is missing, unreadable or of another version.
+        """
+
+        try:
+            with open(path, mode="r", encoding="utf-8") as file:
+                entry: Any = json.load(file)
+        except FileNotFoundError:
+            return None
+        # pylint: disable=broad-except
+        except Exception as error:
+            logging.getLogger(__name__).debug("[SKIPPING] Unreadable workspace cache {%s}: %s", path, error)
+            return None
+        # pylint: enable=broad-except
+        if not isinstance(entry, dict) or entry.get("version") != WorkspaceDiscovery.CACHE_VERSION:
+            return None
+        return entry
+
+    @staticmethod
+    def _write(path: Path, entry: dict) -> None:
+        """
+        Writes the cache, atomically replacing any prior cache.
+
+        Parameters
+        ----------
+        path: The cache location.
+        entry: The cache entry.
+        """
+
+        temporary: Path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temporary, mode="w", encoding="utf-8") as file:
+                json.dump(entry, file)
+            os.replace(temporary, path)
+        except OSError as error:
+            logging.getLogger(__name__).debug("[SKIPPING] Workspace cache write failed {%s}: %s", path, error)
+            temporary.unlink(missing_ok=True)
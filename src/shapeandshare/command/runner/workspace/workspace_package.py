@@ -0,0 +1,69 @@
+""" Workspace Package Definition """
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    from ..backends.backend_config import BackendConfig
+    from ..backends.backend_package import BackendPackage
+
+
+# pylint: disable=too-few-public-methods
+class WorkspacePackage:
+    """
+    Workspace Package
+    A package (a folder with a sacr.config or package.json) within a workspace.
+
+    Attributes
+    ----------
+    name
+        The package name, from `[workspace] name` (sacr.config) or `name` (package.json), otherwise its path.
+    path
+        The folder of the package, relative to the workspace root (posix separators).
+    backend
+        The backend loaded from the configuration of the package.
+    depends
+        The names of the workspace packages this package depends on.
+    """
+
+    name: str
+    path: str
+    backend: Union["BackendConfig", "BackendPackage"]
+    depends: list[str]
+
+    def __init__(self, name: str, path: str, backend: Union["BackendConfig", "BackendPackage"]):
+        self.name = name
+        self.path = path
+        self.backend = backend
+        self.depends = []
+
+    @property
+    def folder(self) -> Path:
+        """
+        Class Property
+        The folder of the package.
+
+        Returns
+        -------
+        The package folder (relative to the current working directory, as the workspace root is).
+        """
+
+        return self.backend.base_path
+
+    def defines(self, alias: str) -> bool:
+        """
+        Whether the package defines an alias.
+
+        Parameters
+        ----------
+        alias: The alias.
+
+        Returns
+        -------
+        True when the alias is within the scripts of the package.
+        """
+
+        return alias in self.backend.model.scripts
+
+    def __repr__(self) -> str:
+        return f"WorkspacePackage({self.name}: {self.path})"
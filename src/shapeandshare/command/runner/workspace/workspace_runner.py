@@ -0,0 +1,324 @@
+""" Workspace Runner Definition """
+
+import asyncio
+import fnmatch
+import time
+from typing import Optional
+
+from ..contacts.errors.dependency_cycle_error import DependencyCycleError
+from ..contacts.errors.subprocess_failure_error import SubprocessFailureError
+from ..contacts.output_type import OutputType
+from ..execution.job_graph import JobGraph
+from ..execution.shard_planner import ShardPlanner
+from .workspace_package import WorkspacePackage
+
+
+class WorkspaceRunner:
+    """
+    Workspace Runner
+    Runs an alias across the packages of a workspace (see WorkspaceDiscovery) which define it, as concurrent runs on a
+    single event loop (see AbstractBackend.run_alias) sharing one concurrency limit.  A package starts once every
+    package it depends on (directly, or through packages which do not run) has passed, and a package whose
+    dependencies failed is not run, while independent packages carry on.  A summary of every package is printed once
+    the run concludes, and the first failure is raised.
+
+    Packages are selected by filters, each matching package names or paths (fnmatch patterns): `pattern...` also
+    selects the dependencies of the matching packages, `...pattern` their dependents, and `!pattern` excludes the
+    matching packages.  Without any selecting filter every package is selected.  Selections may be narrowed further to
+    the packages affected by a change (see ChangeDetector) and their dependents.
+
+    Attributes
+    ----------
+    packages
+        Every package within the workspace.
+    """
+
+    packages: list[WorkspacePackage]
+
+    def __init__(self, packages: list[WorkspacePackage]):
+        self.packages = packages
+        self._by_name: dict[str, WorkspacePackage] = {package.name: package for package in packages}
+        self._outcomes: dict[str, tuple[str, Optional[int], Optional[float]]] = {}
+
+    def select(
+        self, alias: str, filters: Optional[list[str]] = None, affected: Optional[set[str]] = None
+    ) -> list[WorkspacePackage]:
+        """
+        Selects the packages to run.
+
+        Parameters
+        ----------
+        alias: The alias to run, packages not defining it are never selected.
+        filters: The filters selecting (or excluding) packages, if any.
+        affected: Only select these packages and their dependents, if provided.
+
+        Returns
+        -------
+        The selected packages, dependencies first.
+        """
+
+        selected: set[str] = set()
+        excluded: set[str] = set()
+        selecting: bool = False
+        for pattern in filters or []:
+            if pattern.startswith("!"):
+                excluded |= self._matching(pattern=pattern[1:])
+                continue
+            selecting = True
+            name: str = pattern.removeprefix("...").removesuffix("...")
+            matched: set[str] = self._matching(pattern=name)
+            selected |= matched
+            if pattern.endswith("..."):
+                selected |= self._closure(names=matched, dependents=False)
+            if pattern.startswith("..."):
+                selected |= self._closure(names=matched, dependents=True)
+        if not selecting:
+            selected = set(self._by_name)
+        if affected is not None:
+            selected &= affected | self._closure(names=affected, dependents=True)
+        return [
+            package
+            for package in self._order()
+            if package.name in selected and package.name not in excluded and package.defines(alias=alias)
+        ]
+
+    @staticmethod
+    def shard(
+        alias: str, selected: list[WorkspacePackage], planner: ShardPlanner
+    ) -> tuple[list[WorkspacePackage], str]:
+        """
+        Narrows the selected packages to a shard of balanced expected duration (see ShardPlanner), by the run history
+        of each package.
+
+        Parameters
+        ----------
+        alias: The alias to run.
+        selected: The packages selected to run.
+        planner: Splits the packages into shards.
+
+        Returns
+        -------
+        The packages of the shard (dependencies first), and a summary of it.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from ..cache.run_history import RunHistory
+
+        expected: dict[str, list[Optional[float]]] = {}
+        for package in selected:
+            graph: JobGraph = JobGraph.build(model=package.backend.model, alias=alias)
+            history: RunHistory = RunHistory(root=package.folder)
+            try:
+                durations: dict[str, float] = history.expected(jobs=graph.jobs)
+            finally:
+                history.close()
+            expected[package.name] = [durations.get(job.name) for job in graph.jobs]
+        chosen: list[str] = planner.assign(units=expected)
+        return [package for package in selected if package.name in chosen], planner.summary(
+            size=f"{len(chosen)} of {len(selected)} packages"
+        )
+
+    async def run(self, alias: str, selected: list[WorkspacePackage], jobs: int, **settings) -> None:
+        """
+        Runs an alias across packages.
+
+        Parameters
+        ----------
+        alias: The alias to run.
+        selected: The packages to run, dependencies first (see select).
+        jobs: The maximum number of commands to run concurrently, across every package.
+        settings: The remaining settings of each run (see AbstractBackend.run_alias).
+        """
+
+        limiter: asyncio.Semaphore = asyncio.Semaphore(jobs)
+        names: set[str] = {package.name for package in selected}
+        if settings.get("output") is None and jobs > 1 and len(selected) > 1:
+            settings["output"] = OutputType.PREFIXED
+        self._outcomes = {}
+        tasks: dict[str, asyncio.Task] = {}
+        for package in selected:
+            prerequisites: dict[str, asyncio.Task] = {
+                name: tasks[name] for name in sorted(self._prerequisites(package=package, names=names))
+            }
+            tasks[package.name] = asyncio.ensure_future(
+                self._run(
+                    package=package,
+                    alias=alias,
+                    prerequisites=prerequisites,
+                    jobs=jobs,
+                    limiter=limiter,
+                    **settings,
+                )
+            )
+
+        try:
+            failures: list = await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            if settings.get("output") != OutputType.QUIET:
+                self.report(selected=selected)
+        for failure in failures:
+            if failure is not None:
+                raise failure
+
+    async def _run(
+        self, package: WorkspacePackage, alias: str, prerequisites: dict[str, asyncio.Task], **settings
+    ) -> Optional[SubprocessFailureError]:
+        """
+        Runs an alias within a package, once its prerequisites passed.
+
+        Parameters
+        ----------
+        package: The package.
+        alias: The alias to run.
+        prerequisites: The runs of the packages which must pass first, by package.
+        settings: The remaining settings of the run (see AbstractBackend.run_alias).
+
+        Returns
+        -------
+        The failure of the run, if it failed.
+        """
+
+        self._outcomes[package.name] = ("cancelled", None, None)
+        if prerequisites:
+            await asyncio.wait(prerequisites.values())
+        if any(self._outcomes[name][0] != "passed" for name in prerequisites):
+            self._outcomes[package.name] = ("not run", None, None)
+            return None
+
+        started: float = time.monotonic()
+        try:
+            await package.backend.run_alias(alias=alias, cwd=package.folder, scope=package.name, **settings)
+        except SubprocessFailureError as error:
+            self._outcomes[package.name] = ("failed", error.returncode, time.monotonic() - started)
+            return error
+        self._outcomes[package.name] = ("passed", 0, time.monotonic() - started)
+        return None
+
+    def report(self, selected: list[WorkspacePackage]) -> None:
+        """
+        Prints the summary of a run across packages.
+
+        Parameters
+        ----------
+        selected: The packages which were run.
+        """
+
+        if not selected:
+            return
+        width: int = max(len(package.name) for package in selected) + 2
+        print(f"Workspace summary ({len(selected)} packages):", flush=True)
+        for package in selected:
+            status, returncode, duration = self._outcomes.get(package.name, ("not run", None, None))
+            code: str = "-" if returncode is None else str(returncode)
+            elapsed: str = "-" if duration is None else f"{duration:.2f}s"
+            print(f"  {package.name:<{width}}{status:<11}{code:>5}{elapsed:>10}", flush=True)
+
+    def _matching(self, pattern: str) -> set[str]:
+        """
+        The packages matching a pattern.
+
+        Parameters
+        ----------
+        pattern: The fnmatch pattern, matched against package names and paths.
+
+        Returns
+        -------
+        The names of the matching packages.
+        """
+
+        pattern = pattern.removeprefix("./").rstrip("/") or "."
+        return {
+            package.name
+            for package in self.packages
+            if fnmatch.fnmatchcase(package.name, pattern) or fnmatch.fnmatchcase(package.path, pattern)
+        }
+
+    def _closure(self, names: set[str], dependents: bool) -> set[str]:
+        """
+        Every package the given packages depend on (transitively), or that depends on them.
+
+        Parameters
+        ----------
+        names: The packages.
+        dependents: Follow dependents rather than dependencies.
+
+        Returns
+        -------
+        The names of the packages reached, excluding the given packages unless reached again.
+        """
+
+        edges: dict[str, list[str]] = {package.name: package.depends for package in self.packages}
+        if dependents:
+            edges = {name: [] for name in edges}
+            for package in self.packages:
+                for dependency in package.depends:
+                    edges[dependency].append(package.name)
+        reached: set[str] = set()
+        pending: list[str] = list(names)
+        while pending:
+            for neighbour in edges[pending.pop()]:
+                if neighbour not in reached:
+                    reached.add(neighbour)
+                    pending.append(neighbour)
+        return reached
+
+    def _prerequisites(self, package: WorkspacePackage, names: set[str]) -> set[str]:
+        """
+        The nearest packages among the given ones which a package depends on, looking through other packages.
+
+        Parameters
+        ----------
+        package: The package.
+        names: The packages being run.
+
+        Returns
+        -------
+        The names of the packages which must pass before the package runs.
+        """
+
+        found: set[str] = set()
+        visited: set[str] = set()
+        pending: list[str] = list(package.depends)
+        while pending:
+            name: str = pending.pop()
+            if name in visited:
+                continue
+            visited.add(name)
+            if name in names:
+                found.add(name)
+            else:
+                pending.extend(self._by_name[name].depends)
+        return found
+
+    def _order(self) -> list[WorkspacePackage]:
+        """
+        Orders the packages so that every package follows its dependencies.
+
+        Returns
+        -------
+        Every package, dependencies first (otherwise by path).
+        """
+
+        ordered: list[WorkspacePackage] = []
+        visited: set[str] = set()
+        stack: list[str] = []
+
+        def visit(package: WorkspacePackage) -> None:
+            if package.name in visited:
+                return
+            if package.name in stack:
+                cycle: str = " -> ".join(stack[stack.index(package.name) :] + [package.name])
+                raise DependencyCycleError(f"Workspace dependency cycle detected: {cycle}")
+            stack.append(package.name)
+            for dependency in package.depends:
+                visit(self._by_name[dependency])
+            stack.pop()
+            visited.add(package.name)
+            ordered.append(package)
+
+        for package in sorted(self.packages, key=lambda item: item.path):
+            visit(package)
+        return ordered
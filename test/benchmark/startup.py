@@ -0,0 +1,121 @@
+"""
+Cold-start benchmark for the `sacr` command line.
+
+Times each subcommand in a fresh interpreter, reports the slowest imports (via `python -X importtime`) and optionally
+compares the results against a stored baseline, failing when a subcommand regresses beyond the threshold.
+
+    python test/benchmark/startup.py [--runs 20] [--save baseline.json] [--baseline baseline.json] [--threshold 0.25]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SOURCE_PATH: Path = Path(__file__).resolve().parents[2] / "src"
+SUBCOMMANDS: dict[str, list[str]] = {
+    "none": [],
+    "help": ["help"],
+    "clean": ["clean", "does-not-exist"],
+    "run": ["run", "noop"],
+}
+
+
+def sacr(arguments: list[str], cwd: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    environment: dict = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, [SOURCE_PATH.as_posix(), os.environ.get("PYTHONPATH")]))
+    interpreter: list[str] = [sys.executable] + (["-X", "importtime"] if importtime else [])
+    return subprocess.run(
+        interpreter + ["-m", "shapeandshare.command.runner.command_line"] + arguments,
+        cwd=cwd,
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+
+
+def time_subcommand(arguments: list[str], cwd: str, runs: int) -> dict:
+    sacr(arguments=arguments, cwd=cwd)  # warm the os file cache and the sacr config cache
+    samples: list[float] = []
+    for _ in range(runs):
+        start: float = time.perf_counter()
+        sacr(arguments=arguments, cwd=cwd)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "min": samples[0],
+        "median": statistics.median(samples),
+        "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+def import_breakdown(arguments: list[str], cwd: str, top: int) -> list[tuple[str, int]]:
+    cumulative: dict[str, int] = {}
+    stderr: str = sacr(arguments=arguments, cwd=cwd, importtime=True).stderr.decode(encoding="utf-8")
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, module = line[len("import time:") :].split("|")
+        if total.strip().isdigit():
+            cumulative[module.strip()] = int(total)
+    return sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions: list[str] = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        limit: float = baseline[name]["median"] * (1 + threshold)
+        if result["median"] > limit:
+            regressions.append(
+                f"{name}: median {result['median'] * 1000:.1f}ms exceeds baseline "
+                f"{baseline[name]['median'] * 1000:.1f}ms by more than {threshold:.0%}"
+            )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="sacr cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--top", type=int, default=10, help="number of imports to report per subcommand")
+    parser.add_argument("--save", type=Path, help="write the results to this file")
+    parser.add_argument("--baseline", type=Path, help="compare against this previously saved result file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed median regression (0.25 = 25%%)")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workspace:
+        Path(workspace, ".sacrrc").write_text("[command]\ntimeout = 60\n\n[config]\ntype = config\n", encoding="utf-8")
+        Path(workspace, "sacr.config").write_text('[scripts]\nnoop = "true"\n', encoding="utf-8")
+
+        results: dict = {}
+        for subcommand, subcommand_arguments in SUBCOMMANDS.items():
+            results[subcommand] = time_subcommand(arguments=subcommand_arguments, cwd=workspace, runs=options.runs)
+            print(
+                f"sacr {subcommand:<6} min {results[subcommand]['min'] * 1000:7.1f}ms"
+                f"  median {results[subcommand]['median'] * 1000:7.1f}ms"
+                f"  p95 {results[subcommand]['p95'] * 1000:7.1f}ms"
+            )
+            for module, microseconds in import_breakdown(
+                arguments=subcommand_arguments, cwd=workspace, top=options.top
+            ):
+                print(f"    {microseconds / 1000:7.1f}ms  {module}")
+
+    if options.save:
+        options.save.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if options.baseline:
+        failures: list[str] = compare(
+            results=results,
+            baseline=json.loads(options.baseline.read_text(encoding="utf-8")),
+            threshold=options.threshold,
+        )
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            raise Exception("Startup Benchmark Regressed")
@@ -0,0 +1,6 @@
+""" shapeandshare unit tests """
+
+import pkgutil
+
+# `shapeandshare` is a namespace package: extend this package over it so that the modules under test stay importable.
+__path__ = pkgutil.extend_path(__path__, __name__)
@@ -0,0 +1,122 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.contacts.errors.parse_error import ParseError
+from shapeandshare.command.runner.contacts.output_type import OutputType
+from shapeandshare.command.runner.execution.admission_controller import AdmissionController
+from shapeandshare.command.runner.execution.job import Job
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+from shapeandshare.command.runner.execution.scheduler import Scheduler
+
+GIB: int = 1024 * 1024 * 1024
+STEP: str = "echo start >> steps && sleep 0.2 && echo end >> steps"
+MODEL: BackendModel = BackendModel(
+    scripts={"light": "true", "heavy": "true", "large": "true", "huge": "true", "ci": [STEP] * 4},
+    parallel={"ci": True},
+    resources={"heavy": {"cpu": 3}, "large": {"mem": "6G"}, "huge": {"cpu": 8}, "ci": {"cpu": 2}},
+)
+
+
+def job(alias: str) -> Job:
+    return JobGraph.build(model=MODEL, alias=alias).jobs[0]
+
+
+class TestAdmissionController(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        self.loadavg: Path = self.root / "loadavg"
+        self.meminfo: Path = self.root / "meminfo"
+        self.loadavg.write_text("0.00 0.00 0.00 1/200 4242\n")
+        self.meminfo.write_text(f"MemTotal: {16 * GIB // 1024} kB\nMemFree: 1 kB\nMemAvailable: {8 * GIB // 1024} kB\n")
+        self.patches: list = [
+            patch.object(AdmissionController, "LOADAVG_PATH", self.loadavg.as_posix()),
+            patch.object(AdmissionController, "MEMINFO_PATH", self.meminfo.as_posix()),
+        ]
+        for patcher in self.patches:
+            patcher.start()
+
+    def tearDown(self):
+        for patcher in self.patches:
+            patcher.stop()
+        shutil.rmtree(self.root)
+
+    def controller(self, jobs: int, adaptive: bool = False) -> AdmissionController:
+        controller: AdmissionController = AdmissionController(jobs=jobs, adaptive=adaptive)
+        controller.cpus = 4
+        return controller
+
+    def test_jobs_occupy_their_cpu_weight(self):
+        controller: AdmissionController = self.controller(jobs=4)
+
+        self.assertTrue(controller.admits(job=job("light"), running=[job("heavy")]))
+        self.assertFalse(controller.admits(job=job("light"), running=[job("heavy"), job("light")]))
+        self.assertFalse(controller.admits(job=job("heavy"), running=[job("light"), job("light")]))
+
+    def test_heavy_job_runs_on_its_own(self):
+        controller: AdmissionController = self.controller(jobs=4)
+
+        self.assertTrue(controller.admits(job=job("huge"), running=[]))
+        self.assertFalse(controller.admits(job=job("light"), running=[job("huge")]))
+
+    def test_load_holds_jobs_back(self):
+        controller: AdmissionController = self.controller(jobs=4, adaptive=True)
+        self.assertTrue(controller.admits(job=job("light"), running=[job("light")]))
+
+        self.loadavg.write_text("3.50 1.00 1.00 9/200 4242\n")
+        self.assertFalse(controller.admits(job=job("light"), running=[job("light")]))
+        self.assertTrue(self.controller(jobs=4).admits(job=job("light"), running=[job("light")]))
+
+        # The average lags behind, the number of runnable tasks caps it.
+        self.loadavg.write_text("3.50 1.00 1.00 2/200 4242\n")
+        self.assertTrue(controller.admits(job=job("light"), running=[job("light")]))
+
+    def test_memory_holds_jobs_back(self):
+        controller: AdmissionController = self.controller(jobs=4, adaptive=True)
+
+        self.assertTrue(controller.admits(job=job("large"), running=[job("light")]))
+        self.assertFalse(controller.admits(job=job("large"), running=[job("large")]))
+
+    def test_unavailable_statistics(self):
+        self.loadavg.unlink()
+        self.meminfo.write_text("MemTotal: 1 kB\n")
+
+        self.assertIsNone(AdmissionController.memory())
+        with patch("os.getloadavg", side_effect=OSError()):
+            self.assertIsNone(AdmissionController.load())
+            self.assertTrue(self.controller(jobs=4, adaptive=True).admits(job=job("large"), running=[job("large")]))
+
+    def test_invalid_resources(self):
+        for resources in ("2", {"mem": "lots"}):
+            with self.subTest(resources=resources):
+                with self.assertRaises(ParseError):
+                    JobGraph.build(model=BackendModel(scripts={"a": "true"}, resources={"a": resources}), alias="a")
+
+
+class TestAdmission(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def test_weighted_jobs_share_the_slots(self):
+        Scheduler(jobs=4, output=OutputType.QUIET).execute(graph=JobGraph.build(model=MODEL, alias="ci"))
+
+        running: int = 0
+        peak: int = 0
+        for line in (self.root / "steps").read_text().splitlines():
+            running += 1 if line == "start" else -1
+            peak = max(peak, running)
+        self.assertEqual(peak, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+
+from shapeandshare.command.runner.cache.artifact_cache import ArtifactCache
+from shapeandshare.command.runner.cache.state_store import StateStore
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.contacts.output_type import OutputType
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+from shapeandshare.command.runner.execution.scheduler import Scheduler
+
+
+class TestArtifactCacheRestore(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        (self.root / "src").mkdir()
+        (self.root / "src" / "main.c").write_text("int main() { return 0; }")
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+        self.state: StateStore = StateStore(root=self.root)
+        self.artifacts: ArtifactCache = ArtifactCache(root=self.root)
+        self.model: BackendModel = BackendModel(
+            scripts={"build": "echo built && mkdir -p out && echo object > out/main.o && echo ran >> runs"},
+            inputs={"build": "src/**"},
+            outputs={"build": "out/**"},
+        )
+
+    def tearDown(self):
+        self.state.close()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def run_build(self, output: Optional[str] = OutputType.PREFIXED) -> str:
+        scheduler: Scheduler = Scheduler(state=self.state, artifacts=self.artifacts, output=output)
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        with patch("sys.stdout", stdout):
+            scheduler.execute(graph=JobGraph.build(model=self.model, alias="build"))
+            stdout.flush()
+        return stdout.buffer.getvalue().decode("utf-8")
+
+    def runs(self) -> int:
+        return len((self.root / "runs").read_text().splitlines())
+
+    def test_clean_outputs_are_restored_without_running(self):
+        self.assertTrue(self.run_build().endswith("runs\n[build[0]] built\n"))
+        shutil.rmtree(self.root / "out")
+
+        self.assertTrue(self.run_build().endswith("(restored from cache)\n[build[0]] built\n"))
+        self.assertEqual((self.root / "out" / "main.o").read_text(), "object\n")
+        self.assertEqual(self.runs(), 1)
+
+    def test_replay_honours_quiet_output(self):
+        self.run_build()
+        shutil.rmtree(self.root / "out")
+
+        self.assertEqual(self.run_build(output=OutputType.QUIET), "")
+        self.assertTrue((self.root / "out" / "main.o").exists())
+        self.assertEqual(self.runs(), 1)
+
+
+class TestArtifactCacheEviction(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        self.artifacts: ArtifactCache = ArtifactCache(root=self.root, max_size=2500)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def store(self, key: str, size: int) -> None:
+        (self.root / f"{key}.o").write_bytes(key.encode("utf-8") * size)
+        with self.artifacts.temporary_file() as stdout, self.artifacts.temporary_file() as stderr:
+            self.artifacts.store(key=key, outputs=[f"{key}.o"], stdout=stdout, stderr=stderr)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        self.store(key="a", size=1000)
+        self.store(key="b", size=1000)
+        self.assertTrue(self.artifacts.restore(key="a"))
+        os.utime(self.root / ".sacr" / "artifacts" / "entries" / "a.json", (time.time() + 10, time.time() + 10))
+        self.store(key="c", size=1000)
+
+        self.assertIsNotNone(self.artifacts.lookup(key="a"))
+        self.assertIsNone(self.artifacts.lookup(key="b"))
+        self.assertIsNotNone(self.artifacts.lookup(key="c"))
+
+    def test_blobs_are_only_measured_once_within_the_limit(self):
+        with patch("os.scandir", wraps=os.scandir) as scandir:
+            self.store(key="a", size=1000)
+            scans: int = scandir.call_count
+            self.store(key="b", size=1000)
+            self.assertEqual(scandir.call_count, scans)
+
+            self.store(key="c", size=1000)
+            self.assertGreater(scandir.call_count, scans)
+
+
+if __name__ == "__main__":
+    unittest.main()
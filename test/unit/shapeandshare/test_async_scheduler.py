@@ -0,0 +1,124 @@
+import asyncio
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.contacts.errors.subprocess_failure_error import SubprocessFailureError
+from shapeandshare.command.runner.contacts.output_type import OutputType
+from shapeandshare.command.runner.execution.async_scheduler import AsyncScheduler
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+from shapeandshare.command.runner.manager import Manager
+
+STEP: str = "echo start >> steps && sleep 0.2 && echo end >> steps"
+MODEL: BackendModel = BackendModel(
+    scripts={"ci": [STEP] * 4, "hung": ["sleep 30", "sleep 0.1 && exit 3"], "slow": "sleep 30"},
+    parallel={"ci": True, "hung": True},
+)
+
+
+class TestAsyncScheduler(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    @staticmethod
+    async def execute(alias: str, timeout: Optional[float] = None, **options) -> None:
+        scheduler: AsyncScheduler = AsyncScheduler(output=OutputType.QUIET, **options)
+        await scheduler.execute(graph=JobGraph.build(model=MODEL, alias=alias), timeout=timeout)
+
+    def concurrency(self) -> int:
+        running: int = 0
+        peak: int = 0
+        for line in (self.root / "steps").read_text().splitlines():
+            running += 1 if line == "start" else -1
+            peak = max(peak, running)
+        return peak
+
+    def test_jobs_bound_concurrency(self):
+        for jobs in (1, 2, 4):
+            with self.subTest(jobs=jobs):
+                asyncio.run(self.execute(alias="ci", jobs=jobs))
+                self.assertEqual(self.concurrency(), jobs)
+                (self.root / "steps").unlink()
+
+    def test_limiter_is_shared_between_runs(self):
+        async def runs() -> None:
+            limiter: asyncio.Semaphore = asyncio.Semaphore(2)
+            await asyncio.gather(*(self.execute(alias="ci", jobs=4, limiter=limiter) for _ in range(2)))
+
+        asyncio.run(runs())
+        self.assertEqual(len((self.root / "steps").read_text().splitlines()), 16)
+        self.assertEqual(self.concurrency(), 2)
+
+    def test_failure_cancels_running_jobs(self):
+        started: float = time.monotonic()
+        with self.assertRaises(SubprocessFailureError) as context:
+            asyncio.run(self.execute(alias="hung", jobs=2))
+
+        self.assertEqual(context.exception.returncode, 3)
+        self.assertLess(time.monotonic() - started, 10)
+
+    def test_run_timeout(self):
+        started: float = time.monotonic()
+        with self.assertRaises(SubprocessFailureError) as context:
+            asyncio.run(self.execute(alias="slow", timeout=0.5))
+
+        self.assertEqual(context.exception.message, "Exceeded run timeout limit of 0.5")
+        self.assertLess(time.monotonic() - started, 10)
+
+
+class TestRunAlias(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        (self.root / ".sacrrc").write_text("[command]\ntimeout = 60\n[config]\ntype = config\n")
+        (self.root / "sacr.config").write_text(
+            '[scripts]\nwhere = ["pwd > where"]\ngreet = ["echo hello", "echo world"]\nci = ["sacr run greet"]\n'
+        )
+        self.elsewhere: str = tempfile.mkdtemp()
+        self.cwd: str = os.getcwd()
+        os.chdir(self.elsewhere)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+        shutil.rmtree(self.elsewhere)
+
+    def test_commands_run_within_the_project(self):
+        asyncio.run(Manager(base_path=self.root.as_posix()).run_alias(alias="where", output=OutputType.QUIET))
+
+        self.assertEqual(Path((self.root / "where").read_text().strip()).resolve(), self.root.resolve())
+        self.assertFalse(Path(self.elsewhere, "where").exists())
+
+    def test_runs_share_the_event_loop(self):
+        manager: Manager = Manager(base_path=self.root.as_posix())
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+
+        async def runs() -> None:
+            await asyncio.gather(
+                manager.run_alias(alias="ci", output=OutputType.PREFIXED),
+                manager.run_alias(alias="greet", output=OutputType.PREFIXED),
+            )
+
+        with patch("sys.stdout", stdout):
+            asyncio.run(runs())
+            stdout.flush()
+        output: str = stdout.buffer.getvalue().decode("utf-8")
+
+        self.assertEqual(output.count("[greet[0]] hello\n"), 2)
+        self.assertEqual(output.count("[greet[1]] world\n"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
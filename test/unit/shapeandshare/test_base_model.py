@@ -0,0 +1,84 @@
+import pickle
+import unittest
+from typing import Optional
+
+from shapeandshare.command.runner.contacts.dtos.base_model import BaseModel
+from shapeandshare.command.runner.contacts.dtos.manager.manager_config import ManagerConfig
+from shapeandshare.command.runner.contacts.errors.parse_error import ParseError
+from shapeandshare.command.runner.contacts.output_type import OutputType
+
+
+class Settings(BaseModel):
+    name: str
+    count: int = 1
+    ratio: Optional[float]
+    enabled: bool = False
+    tags: list = []
+    output: Optional[OutputType] = None
+
+
+class TestBaseModel(unittest.TestCase):
+    def test_coercion(self):
+        settings: Settings = Settings.parse_obj(
+            {"name": 3, "count": "7", "ratio": "0.5", "enabled": "yes", "output": "quiet", "unknown": 1}
+        )
+
+        self.assertEqual(settings.name, "3")
+        self.assertEqual(settings.count, 7)
+        self.assertEqual(settings.ratio, 0.5)
+        self.assertIs(settings.enabled, True)
+        self.assertEqual(settings.output, OutputType.QUIET.value)
+
+    def test_defaults(self):
+        first: Settings = Settings(name="a")
+        second: Settings = Settings(name="b")
+        first.tags.append("x")
+
+        self.assertEqual(first.count, 1)
+        self.assertIsNone(first.ratio)
+        self.assertFalse(first.enabled)
+        self.assertEqual(second.tags, [])
+
+    def test_invalid_values(self):
+        for data in ({}, {"name": "a", "count": "many"}, {"name": "a", "enabled": "maybe"}, {"name": None}):
+            with self.subTest(data=data):
+                with self.assertRaises(ParseError):
+                    Settings.parse_obj(data)
+        with self.assertRaises(ParseError):
+            Settings.parse_obj(["name"])
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            Settings(name="a").other = 1  # pylint: disable=attribute-defined-outside-init
+
+    def test_nested_models(self):
+        config: ManagerConfig = ManagerConfig.parse_obj(
+            {
+                "command": {"timeout": "60", "jobs": None},
+                "config": {"type": "config", "file": None, "path": None},
+                "cache": {"size": "2G"},
+                "logs": {"capture": "true"},
+            }
+        )
+
+        self.assertEqual(config.command.timeout, 60)
+        self.assertIs(config.logs.capture, True)
+        self.assertEqual(config.as_dict()["cache"]["size"], "2G")
+
+    def test_pickling(self):
+        settings: Settings = Settings(name="a", count=2, tags=["x"])
+        restored: Settings = pickle.loads(pickle.dumps(settings))
+
+        self.assertEqual(restored, settings)
+        self.assertEqual(restored.tags, ["x"])
+
+    def test_unpickling_fills_new_fields(self):
+        restored: Settings = object.__new__(Settings)
+        restored.__setstate__({"name": "a"})
+
+        self.assertEqual(restored.count, 1)
+        self.assertEqual(restored.tags, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
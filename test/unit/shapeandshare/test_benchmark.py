@@ -0,0 +1,111 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from shapeandshare.command.runner.contacts.errors.regression_error import RegressionError
+from shapeandshare.command.runner.execution.benchmark import Benchmark
+from shapeandshare.command.runner.manager import Manager
+
+BASELINE: dict[str, dict[str, float]] = {
+    "ci": Benchmark.describe(values=[1.0, 1.0, 1.0]),
+    "ci[0]": Benchmark.describe(values=[0.5, 0.5]),
+}
+
+
+class TestBenchmarkReport(unittest.TestCase):
+    def report(self, summary: dict[str, dict[str, float]], threshold: float = 5.0) -> tuple[list[str], str]:
+        stdout: io.StringIO = io.StringIO()
+        with patch("sys.stdout", stdout):
+            regressions: list[str] = Benchmark(alias="ci").report(
+                summary=summary, baseline=BASELINE, threshold=threshold
+            )
+        return regressions, stdout.getvalue()
+
+    def test_describe(self):
+        stats: dict[str, float] = Benchmark.describe(values=[3.0, 1.0, 2.0, 10.0])
+
+        self.assertEqual(stats["runs"], 4)
+        self.assertEqual((stats["min"], stats["median"], stats["p95"], stats["mean"]), (1.0, 2.5, 10.0, 4.0))
+
+    def test_within_threshold(self):
+        regressions, output = self.report(
+            summary={"ci": Benchmark.describe(values=[1.04]), "ci[0]": Benchmark.describe(values=[0.4])}
+        )
+
+        self.assertEqual(regressions, [])
+        self.assertIn("+4.0%", output)
+        self.assertIn("-20.0%", output)
+        self.assertNotIn("REGRESSION", output)
+
+    def test_regression(self):
+        summary: dict[str, dict[str, float]] = {
+            "ci": Benchmark.describe(values=[1.2]),
+            "ci[0]": Benchmark.describe(values=[0.6]),
+            "ci[1]": Benchmark.describe(values=[9.0]),
+        }
+        regressions, output = self.report(summary=summary)
+
+        self.assertEqual(regressions, ["ci", "ci[0]"])
+        self.assertEqual(output.count("REGRESSION"), 2)
+        self.assertEqual(self.report(summary=summary, threshold=25.0)[0], [])
+
+
+class TestBenchCommand(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        (self.root / ".sacrrc").write_text("[command]\ntimeout = 60\n[config]\ntype = config\n")
+        (self.root / "sacr.config").write_text('[scripts]\nci = ["sleep 0.05"]\n')
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+        self.baseline: Path = Benchmark.DEFAULT_DIRECTORY / "ci.json"
+        Benchmark(alias="ci").save(
+            path=self.baseline,
+            summary={"ci": Benchmark.describe(values=[0.001]), "ci[0]": Benchmark.describe(values=[0.001])},
+        )
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def bench(self, *arguments: str) -> str:
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        with patch("sys.stdout", stdout):
+            try:
+                Manager().backend.bench_command(arguments=["-n", "1", "--warmup", "0", *arguments, "ci"])
+            finally:
+                stdout.flush()
+        return stdout.buffer.getvalue().decode("utf-8")
+
+    def saved(self, path: Path) -> float:
+        return json.loads(path.read_text())["results"]["ci"]["median"]
+
+    def test_regression_keeps_the_baseline(self):
+        with self.assertRaises(RegressionError):
+            self.bench("--baseline", self.baseline.as_posix())
+
+        self.assertEqual(self.saved(path=self.baseline), 0.001)
+
+    def test_save_replaces_the_baseline(self):
+        with self.assertRaises(RegressionError):
+            self.bench("--baseline", self.baseline.as_posix(), "--save", self.baseline.as_posix())
+
+        self.assertGreater(self.saved(path=self.baseline), 0.05)
+
+    def test_results_are_saved_next_to_another_baseline(self):
+        baseline: Path = self.root / "baseline.json"
+        self.baseline.rename(baseline)
+
+        with self.assertRaises(RegressionError):
+            self.bench("--baseline", baseline.as_posix())
+
+        self.assertEqual(self.saved(path=baseline), 0.001)
+        self.assertGreater(self.saved(path=self.baseline), 0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from shapeandshare.command.runner.contacts.errors.unknown_argument_error import UnknownArgumentError
+from shapeandshare.command.runner.manager import Manager
+from shapeandshare.command.runner.workspace.change_detector import ChangeDetector
+from shapeandshare.command.runner.workspace.workspace_discovery import WorkspaceDiscovery
+from shapeandshare.command.runner.workspace.workspace_package import WorkspacePackage
+from shapeandshare.command.runner.workspace.workspace_runner import WorkspaceRunner
+
+FILES: dict[str, str] = {
+    ".sacrrc": "[command]\ntimeout = 60\n[config]\ntype = config\n",
+    "sacr.config": '[scripts]\ntest = ["true"]\n',
+    "libs/core/sacr.config": (
+        '[workspace]\nname = "core"\n[scripts]\ntest = ["echo core >> ../../order"]\n[inputs]\ntest = ["src/**"]\n'
+    ),
+    "libs/core/src/core.py": "VALUE = 1\n",
+    "libs/core/README.md": "core\n",
+    "libs/util/sacr.config": (
+        '[workspace]\nname = "util"\ndepends = ["core"]\n[scripts]\ntest = ["echo util >> ../../order"]\n'
+    ),
+    "libs/util/util.py": "VALUE = 2\n",
+    "libs/util/nested/sacr.config": (
+        '[workspace]\nname = "nested"\n[scripts]\ntest = ["echo nested >> ../../../order"]\n'
+    ),
+    "apps/web/sacr.config": (
+        '[workspace]\nname = "web"\ndepends = ["libs/util"]\n[scripts]\ntest = ["echo web >> ../../order"]\n'
+    ),
+}
+
+
+@unittest.skipUnless(shutil.which("git"), "requires git")
+class TestChangeDetector(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        for path, content in FILES.items():
+            self.write(path=path, content=content)
+        self.git("init", "-q", "-b", "main")
+        self.commit("initial")
+        self.git("checkout", "-q", "-b", "feature")
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def write(self, path: str, content: str) -> None:
+        (self.root / path).parent.mkdir(parents=True, exist_ok=True)
+        (self.root / path).write_text(content)
+
+    def git(self, *arguments: str) -> None:
+        subprocess.run(
+            ["git", "-c", "user.name=sacr", "-c", "user.email=sacr@example.com", *arguments],
+            cwd=self.root,
+            check=True,
+            capture_output=True,
+        )
+
+    def commit(self, message: str) -> None:
+        self.git("add", "-A")
+        self.git("commit", "-q", "-m", message)
+
+    def affected(self, *files: str) -> set[str]:
+        packages: list[WorkspacePackage] = WorkspaceDiscovery(root=self.root).packages()
+        return ChangeDetector(root=self.root).affected(packages=packages, alias="test", files=list(files))
+
+    def test_changed_files(self):
+        # Changes made on main meanwhile are not those of the branch.
+        self.git("checkout", "-q", "main")
+        self.write(path="libs/core/src/main.py", content="")
+        self.commit("main")
+        self.git("checkout", "-q", "feature")
+        self.write(path="libs/core/src/committed.py", content="")
+        self.commit("feature")
+        self.write(path="libs/util/util.py", content="VALUE = 3\n")
+        self.write(path="libs/util/staged.py", content="")
+        self.git("add", "libs/util/staged.py")
+        self.write(path="apps/web/untracked.js", content="")
+        (self.root / "libs" / "core" / "README.md").unlink()
+        self.write(path=".sacr/state/ignored", content="")
+
+        self.assertEqual(
+            ChangeDetector(root=self.root).changed(since="main"),
+            [
+                "apps/web/untracked.js",
+                "libs/core/README.md",
+                "libs/core/src/committed.py",
+                "libs/util/staged.py",
+                "libs/util/util.py",
+            ],
+        )
+
+    def test_unknown_ref(self):
+        with self.assertRaises(UnknownArgumentError):
+            ChangeDetector(root=self.root).changed(since="missing")
+
+    def test_affected_packages(self):
+        for files, expected in (
+            (["libs/core/src/core.py"], {"core"}),
+            (["libs/core/README.md"], set()),
+            (["libs/core/sacr.config"], {"core"}),
+            (["libs/util/util.py"], {"util"}),
+            (["libs/util/nested/notes.txt"], {"nested"}),
+            (["README.md", "apps/web/index.js"], {"web"}),
+        ):
+            with self.subTest(files=files):
+                self.assertEqual(self.affected(*files), expected)
+
+    def test_dependents_are_selected(self):
+        runner: WorkspaceRunner = WorkspaceRunner(packages=WorkspaceDiscovery(root=self.root).packages())
+
+        selected: list[WorkspacePackage] = runner.select(alias="test", affected={"core"})
+        self.assertEqual([package.name for package in selected], ["core", "util", "web"])
+        selected = runner.select(alias="test", filters=["!web"], affected={"util"})
+        self.assertEqual([package.name for package in selected], ["util"])
+
+    def run_since(self) -> str:
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        with patch("sys.argv", ["sacr", "run", "test", "--since", "main", "-j", "4"]), patch("sys.stdout", stdout):
+            Manager(base_path=self.root.as_posix()).main()
+            stdout.flush()
+        return stdout.buffer.getvalue().decode("utf-8")
+
+    def test_since(self):
+        self.assertIn("No workspace package running test is affected since main.", self.run_since())
+
+        self.write(path="libs/core/src/core.py", content="VALUE = 3\n")
+        self.commit("change core")
+        self.run_since()
+
+        self.assertEqual((self.root / "order").read_text().splitlines(), ["core", "util", "web"])
+
+
+if __name__ == "__main__":
+    unittest.main()
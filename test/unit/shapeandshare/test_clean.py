@@ -0,0 +1,117 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from shapeandshare.command.runner.common.glob_walker import GlobWalker
+from shapeandshare.command.runner.common.path_cleaner import PathCleaner
+from shapeandshare.command.runner.common.utils import clean, clean_argument_parser
+from shapeandshare.command.runner.contacts.dtos.clean_parameters import CleanParameters
+from shapeandshare.command.runner.contacts.errors.unknown_argument_error import UnknownArgumentError
+
+FILES: list[str] = [
+    "build/lib/a.o",
+    "build/lib/b.o",
+    "src/main.c",
+    "src/main.o",
+    "src/util/util.o",
+    "src/util/.hidden.o",
+    "src/.cache/c.o",
+    "docs/index.md",
+]
+
+
+class TestGlobWalker(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        for file in FILES:
+            (self.root / file).parent.mkdir(parents=True, exist_ok=True)
+            (self.root / file).write_text(file)
+        os.symlink(self.root / "build", self.root / "src" / "link")
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def expand(self, *patterns: str) -> list[str]:
+        return sorted(GlobWalker().expand(patterns=list(patterns)))
+
+    def test_recursive_patterns(self):
+        self.assertEqual(self.expand("**/*.o"), ["build/lib/a.o", "build/lib/b.o", "src/main.o", "src/util/util.o"])
+        self.assertEqual(self.expand("src/**/.*.o"), ["src/util/.hidden.o"])
+
+    def test_matched_directories_are_not_descended_into(self):
+        self.assertEqual(self.expand("bui*", "build/**/*.o"), ["build", "build/lib/a.o", "build/lib/b.o"])
+        self.assertEqual(self.expand("src/*"), ["src/link", "src/main.c", "src/main.o", "src/util"])
+
+    def test_plain_paths_and_misses(self):
+        self.assertEqual(self.expand("docs", "missing", "missing/*.o", "src/link"), ["docs", "src/link"])
+
+    def test_covers(self):
+        walker: GlobWalker = GlobWalker()
+
+        self.assertTrue(walker.covers(pattern="build", path="build/lib/a.o"))
+        self.assertTrue(walker.covers(pattern="**/*.o", path="new/deep/x.o"))
+        self.assertFalse(walker.covers(pattern="**/*.o", path="src/.cache/c.o"))
+        self.assertFalse(walker.covers(pattern="src/*.c", path="src/util/util.c"))
+
+
+class TestPathCleaner(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        for index in range(PathCleaner.CHUNK_SIZE + 10):
+            (self.root / "node_modules" / f"package{index % 3}").mkdir(parents=True, exist_ok=True)
+            (self.root / "node_modules" / f"file{index}.js").write_text("")
+        (self.root / "keep").write_text("")
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def test_clean(self):
+        clean(arguments=["-j", "4", "node_*", "missing"])
+
+        self.assertEqual(sorted(os.listdir(self.root)), ["keep"])
+
+    def test_fast(self):
+        PathCleaner(fast=True).remove(paths=["node_modules"])
+
+        self.assertEqual(sorted(os.listdir(self.root)), [".sacr", "keep"])
+        deadline: float = time.monotonic() + 10
+        while os.listdir(PathCleaner.DEFAULT_TRASH) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(os.listdir(PathCleaner.DEFAULT_TRASH), [])
+
+    def test_working_directory_is_kept(self):
+        os.chdir(self.root / "node_modules")
+        stderr: io.StringIO = io.StringIO()
+        with patch("sys.stderr", stderr):
+            PathCleaner().remove(paths=[self.root.as_posix()])
+
+        self.assertTrue((self.root / "keep").exists())
+        self.assertIn("it contains the working directory", stderr.getvalue())
+
+
+class TestCleanArgumentParser(unittest.TestCase):
+    def test_options(self):
+        parameters: CleanParameters = clean_argument_parser(arguments=["-j2", "--fast", "build", "--", "-odd"])
+
+        self.assertEqual(parameters.paths, ["build", "-odd"])
+        self.assertEqual(parameters.jobs, 2)
+        self.assertTrue(parameters.fast)
+
+    def test_unknown_option(self):
+        with self.assertRaises(UnknownArgumentError):
+            clean_argument_parser(arguments=["-odd"])
+
+
+if __name__ == "__main__":
+    unittest.main()
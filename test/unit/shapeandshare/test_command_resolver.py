@@ -0,0 +1,88 @@
+import io
+import shutil
+import unittest
+from typing import Optional
+from unittest.mock import patch
+
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.contacts.errors.subprocess_failure_error import SubprocessFailureError
+from shapeandshare.command.runner.contacts.output_type import OutputType
+from shapeandshare.command.runner.execution.command_resolver import CommandResolver
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+from shapeandshare.command.runner.execution.scheduler import Scheduler
+
+PRINTF: Optional[str] = shutil.which("printf")
+
+
+class TestCommandResolver(unittest.TestCase):
+    def setUp(self):
+        self.resolver: CommandResolver = CommandResolver()
+
+    def test_plain_commands_are_resolved(self):
+        self.assertEqual(self.resolver.resolve(command="printf '%s' 'a b'"), (PRINTF, ["printf", "%s", "a b"]))
+        self.assertEqual(self.resolver.resolve(command=["printf", "$HOME"]), (PRINTF, ["printf", "$HOME"]))
+
+    def test_shell_commands_fall_back_to_the_shell(self):
+        for command in (
+            "echo a | wc -l",
+            "echo a && echo b",
+            "echo $HOME",
+            "ls *.py",
+            "cd src",
+            "export A=1",
+            "A=1 printf a",
+            "echo 'unterminated",
+            "sacr-missing-executable --help",
+            "   ",
+        ):
+            with self.subTest(command=command):
+                self.assertIsNone(self.resolver.resolve(command=command))
+
+    def test_missing_argv_executable_is_left_unresolved(self):
+        self.assertEqual(
+            self.resolver.resolve(command=["sacr-missing-executable", "a"]),
+            ("sacr-missing-executable", ["sacr-missing-executable", "a"]),
+        )
+
+    def test_lookups_are_cached(self):
+        with patch("shutil.which", wraps=shutil.which) as which:
+            self.resolver.resolve(command="printf a")
+            self.resolver.resolve(command="printf b")
+
+        self.assertEqual(which.call_count, 1)
+
+    def test_stages_and_display(self):
+        pipeline: list[list[str]] = [["printf", "a b"], ["grep", "-v", "^#"]]
+
+        self.assertEqual(CommandResolver.stages(command=pipeline), pipeline)
+        self.assertIsNone(CommandResolver.stages(command=["printf", "a"]))
+        self.assertIsNone(CommandResolver.stages(command="printf a"))
+        self.assertEqual(CommandResolver.display(command=pipeline), "printf 'a b' | grep -v '^#'")
+        self.assertEqual(CommandResolver.display(command=["printf", "a b"]), "printf 'a b'")
+
+
+class TestDirectSpawn(unittest.TestCase):
+    def execute(self, model: BackendModel) -> str:
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        with patch("sys.stdout", stdout), patch("sys.stderr", io.TextIOWrapper(io.BytesIO())):
+            try:
+                Scheduler(output=OutputType.PLAIN).execute(graph=JobGraph.build(model=model, alias="ci"))
+            finally:
+                stdout.flush()
+        return stdout.buffer.getvalue().decode("utf-8")
+
+    def test_argv_is_not_interpreted_by_a_shell(self):
+        model: BackendModel = BackendModel(scripts={"ci": [["printf", "%s|", "a  b", "$HOME", "*"]]})
+
+        self.assertIn("\na  b|$HOME|*|\n", self.execute(model=model))
+
+    def test_missing_executable(self):
+        for command in (["sacr-missing-executable"], "sacr-missing-executable"):
+            with self.subTest(command=command):
+                with self.assertRaises(SubprocessFailureError) as context:
+                    self.execute(model=BackendModel(scripts={"ci": [command]}))
+                self.assertEqual(context.exception.returncode, 127)
+
+
+if __name__ == "__main__":
+    unittest.main()
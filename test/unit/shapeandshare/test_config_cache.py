@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from shapeandshare.command.runner.cache.config_cache import ConfigCache
+
+
+class TestConfigCache(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        self.source: Path = self.root / "sacr.config"
+        self.source.write_text("first")
+        self.cache: ConfigCache = ConfigCache(namespace="BackendConfig")
+        self.loads: list[str] = []
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def loader(self) -> str:
+        self.loads.append(self.source.read_text())
+        return self.source.read_text().upper()
+
+    def age(self, seconds: int = 10) -> None:
+        stat: os.stat_result = self.source.stat()
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 1_000_000_000))
+
+    def test_unchanged_file_is_not_parsed_again(self):
+        self.age()
+        self.assertEqual(self.cache.load(source=self.source, loader=self.loader), "FIRST")
+        self.assertEqual(self.cache.load(source=self.source, loader=self.loader), "FIRST")
+
+        self.assertEqual(self.loads, ["first"])
+        self.assertTrue(self.cache.entry_path(source=self.source).is_file())
+
+    def test_changed_file_is_parsed_again(self):
+        self.age()
+        self.cache.load(source=self.source, loader=self.loader)
+        self.source.write_text("second")
+
+        self.assertEqual(self.cache.load(source=self.source, loader=self.loader), "SECOND")
+        self.assertEqual(self.loads, ["first", "second"])
+
+    def test_touched_file_is_hashed_rather_than_parsed(self):
+        self.age()
+        self.cache.load(source=self.source, loader=self.loader)
+        self.source.write_text("first")
+        self.assertEqual(self.cache.load(source=self.source, loader=self.loader), "FIRST")
+        self.assertEqual(self.loads, ["first"])
+
+        # A same-size rewrite within the racy window is only caught by the content hash.
+        self.source.write_text("First")
+        self.assertEqual(self.cache.load(source=self.source, loader=self.loader), "FIRST")
+        self.assertEqual(self.loads, ["first", "First"])
+
+    def test_namespaces_are_kept_apart(self):
+        other: ConfigCache = ConfigCache(namespace="Manager")
+
+        self.assertNotEqual(other.entry_path(source=self.source), self.cache.entry_path(source=self.source))
+
+    def test_unreadable_entry_is_ignored(self):
+        self.age()
+        self.cache.load(source=self.source, loader=self.loader)
+        self.cache.entry_path(source=self.source).write_bytes(b"not a pickle")
+
+        self.assertEqual(self.cache.load(source=self.source, loader=self.loader), "FIRST")
+        self.assertEqual(len(self.loads), 2)
+
+    def test_disabled(self):
+        with patch.dict(os.environ, {ConfigCache.DISABLE_ENVIRONMENT_VARIABLE: "1"}):
+            self.cache.load(source=self.source, loader=self.loader)
+            self.cache.load(source=self.source, loader=self.loader)
+
+        self.assertEqual(len(self.loads), 2)
+        self.assertFalse(self.cache.entry_path(source=self.source).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
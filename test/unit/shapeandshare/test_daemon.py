@@ -0,0 +1,131 @@
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+
+from shapeandshare.command.runner.daemon.daemon_client import DaemonClient
+
+SERVER: str = (
+    "import sys\n"
+    "from shapeandshare.command.runner.daemon.daemon_server import DaemonServer\n"
+    "DaemonServer(path=sys.argv[1]).serve()\n"
+)
+CLIENT: str = (
+    "import sys\n"
+    "from shapeandshare.command.runner.daemon.daemon_client import DaemonClient\n"
+    "code = DaemonClient.forward(arguments=sys.argv[1:])\n"
+    "sys.exit(99 if code is None else code)\n"
+)
+# The folder holding the package under test, for the server and client processes.
+SOURCE: str = str(Path(sys.modules[DaemonClient.__module__].__file__).resolve().parents[4])
+
+
+@unittest.skipUnless(hasattr(socket, "send_fds") and hasattr(os, "fork"), "requires SCM_RIGHTS and fork")
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        (self.root / ".sacrrc").write_text("[command]\ntimeout = 60\n[config]\ntype = config\n")
+        (self.root / "sacr.config").write_text(
+            '[scripts]\ngreet = ["echo hello", "echo oops >&2"]\nbroken = ["exit 5"]\n'
+        )
+        self.socket: str = (self.root / "daemon.sock").as_posix()
+        self.environment: dict = {
+            **os.environ,
+            DaemonClient.SOCKET_ENVIRONMENT_VARIABLE: self.socket,
+            DaemonClient.DISABLE_ENVIRONMENT_VARIABLE: "0",
+            "PYTHONPATH": os.pathsep.join(filter(None, (SOURCE, os.environ.get("PYTHONPATH")))),
+        }
+        self.server: subprocess.Popen = subprocess.Popen(
+            [sys.executable, "-c", SERVER, self.socket], env=self.environment, stderr=subprocess.DEVNULL
+        )
+        deadline: float = time.monotonic() + 30
+        while not os.path.exists(self.socket) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.patch = patch.dict(os.environ, {DaemonClient.SOCKET_ENVIRONMENT_VARIABLE: self.socket})
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+        self.server.terminate()
+        self.server.wait(timeout=10)
+        shutil.rmtree(self.root)
+
+    def forward(self, *arguments: str) -> tuple[int, str, str]:
+        process: subprocess.CompletedProcess = subprocess.run(
+            [sys.executable, "-c", CLIENT, *arguments],
+            cwd=self.root,
+            env=self.environment,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            check=False,
+            timeout=60,
+        )
+        return process.returncode, process.stdout.decode("utf-8"), process.stderr.decode("utf-8")
+
+    def test_standard_streams_are_handed_over(self):
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(read_fd, mode="rb") as pipe:
+            connection: Optional[socket.socket] = DaemonClient.connect()
+            self.assertIsNotNone(connection)
+            with connection, open(os.devnull, mode="rb") as stdin:
+                DaemonClient.send(
+                    connection=connection,
+                    message={
+                        "command": "run",
+                        "identity": DaemonClient.identity(),
+                        "argv": ["run", "greet", "--output", "plain"],
+                        "cwd": self.root.as_posix(),
+                        "env": dict(os.environ),
+                        "umask": 0o022,
+                    },
+                    fds=[stdin.fileno(), write_fd, write_fd],
+                )
+                os.close(write_fd)
+                reply: bytes = connection.makefile("rb").readline()
+            output: bytes = pipe.read()
+
+        self.assertEqual(reply, b'{"returncode": 0}\n')
+        self.assertIn(b"hello\n", output)
+        self.assertIn(b"oops\n", output)
+
+    def test_invocations_are_forwarded(self):
+        returncode, stdout, stderr = self.forward("run", "greet", "--output", "plain")
+
+        self.assertEqual(returncode, 0, stderr)
+        self.assertIn("hello\n", stdout)
+        self.assertIn("oops\n", stderr)
+        status: dict = DaemonClient.request(message={"command": "status"})
+        self.assertEqual(status["served"], 1)
+        self.assertEqual(status["projects"], [self.root.as_posix()])
+
+    def test_exit_code_is_relayed(self):
+        returncode, _, _ = self.forward("run", "broken")
+
+        self.assertEqual(returncode, 5)
+
+    def test_other_installations_run_locally(self):
+        with patch.object(DaemonClient, "identity", return_value="elsewhere"):
+            self.assertIsNone(DaemonClient.forward(arguments=["run", "greet"]))
+        self.assertEqual(DaemonClient.request(message={"command": "status"})["served"], 0)
+
+    def test_servers_and_disabled_clients_run_locally(self):
+        self.assertIsNone(DaemonClient.forward(arguments=["daemon", "status"]))
+        with patch.dict(os.environ, {DaemonClient.DISABLE_ENVIRONMENT_VARIABLE: "1"}):
+            self.assertIsNone(DaemonClient.forward(arguments=["run", "greet"]))
+
+    def test_stop(self):
+        self.assertTrue(DaemonClient.request(message={"command": "stop"})["stopping"])
+        self.assertEqual(self.server.wait(timeout=10), 0)
+        self.assertFalse(os.path.exists(self.socket))
+        self.assertIsNone(DaemonClient.forward(arguments=["run", "greet"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.contacts.errors.dependency_cycle_error import DependencyCycleError
+from shapeandshare.command.runner.contacts.errors.unknown_command_error import UnknownCommandError
+from shapeandshare.command.runner.execution.job import Job
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+
+
+def names(jobs) -> set[str]:
+    return {job.name for job in jobs}
+
+
+def job(graph: JobGraph, name: str) -> Job:
+    return next(item for item in graph.jobs if item.name == name)
+
+
+class TestJobGraph(unittest.TestCase):
+    def test_commands_are_chained_by_default(self):
+        graph: JobGraph = JobGraph.build(model=BackendModel(scripts={"ci": ["echo a", "echo b", "echo c"]}), alias="ci")
+
+        self.assertEqual([item.name for item in graph.jobs], ["ci[0]", "ci[1]", "ci[2]"])
+        self.assertEqual(names(graph.roots()), {"ci[0]"})
+        self.assertEqual(names(job(graph, "ci[1]").dependencies), {"ci[0]"})
+        self.assertEqual(names(job(graph, "ci[2]").dependencies), {"ci[1]"})
+
+    def test_parallel_commands_are_independent(self):
+        model: BackendModel = BackendModel(scripts={"lint": ["echo a", "echo b"]}, parallel={"lint": True})
+        graph: JobGraph = JobGraph.build(model=model, alias="lint")
+
+        self.assertEqual(names(graph.roots()), {"lint[0]", "lint[1]"})
+
+    def test_depends_run_first_and_once(self):
+        model: BackendModel = BackendModel(
+            scripts={"build": "echo build", "unit": "echo unit", "docs": "echo docs", "ci": ["echo a", "echo b"]},
+            depends={"unit": "build", "docs": "build", "ci": ["unit", "docs"]},
+            parallel={"ci": True},
+        )
+        graph: JobGraph = JobGraph.build(model=model, alias="ci")
+
+        self.assertEqual([item.name for item in graph.jobs].count("build[0]"), 1)
+        self.assertEqual(names(graph.roots()), {"build[0]"})
+        self.assertEqual(names(job(graph, "unit[0]").dependencies), {"build[0]"})
+        self.assertEqual(names(job(graph, "ci[0]").dependencies), {"unit[0]", "docs[0]"})
+        self.assertEqual(names(job(graph, "ci[1]").dependencies), {"unit[0]", "docs[0]"})
+
+    def test_nested_aliases_are_expanded_in_place(self):
+        model: BackendModel = BackendModel(
+            scripts={"a": "echo a", "b": ["echo b0", "echo b1"], "ci": "sacr run a && sacr run b"}
+        )
+        graph: JobGraph = JobGraph.build(model=model, alias="ci")
+
+        self.assertEqual([item.name for item in graph.jobs], ["a[0]", "b[0]", "b[1]"])
+        self.assertEqual(names(job(graph, "b[0]").dependencies), {"a[0]"})
+
+    def test_cycles_are_detected(self):
+        model: BackendModel = BackendModel(scripts={"a": "sacr run b", "b": "echo b"}, depends={"b": "a"})
+
+        with self.assertRaises(DependencyCycleError) as context:
+            JobGraph.build(model=model, alias="a")
+        self.assertIn("a -> b -> a", str(context.exception))
+
+    def test_unknown_alias(self):
+        with self.assertRaises(UnknownCommandError):
+            JobGraph.build(model=BackendModel(scripts={"a": "sacr run missing"}), alias="a")
+
+
+class TestNestedAliases(unittest.TestCase):
+    def test_chained_invocations(self):
+        self.assertEqual(JobGraph.nested_aliases(command="sacr run a && sacr run b"), ["a", "b"])
+        self.assertEqual(JobGraph.nested_aliases(command="sacr run lint:isort"), ["lint:isort"])
+        self.assertEqual(JobGraph.nested_aliases(command=["sacr", "run", "a"]), ["a"])
+
+    def test_anything_else_is_a_command(self):
+        for command in (
+            "echo sacr",
+            "sacr run a || sacr run b",
+            "sacr run a && echo done",
+            "sacr run a b",
+            "sacr run --force a",
+            "sacr run a &&",
+            "sacr run 'a",
+        ):
+            with self.subTest(command=command):
+                self.assertIsNone(JobGraph.nested_aliases(command=command))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from shapeandshare.command.runner.manager import Manager
+
+
+class TestRunFromSubdirectory(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        (self.root / ".sacrrc").write_text("[command]\ntimeout = 60\n[config]\ntype = config\n")
+        (self.root / "sacr.config").write_text(
+            '[scripts]\nbuild = ["echo built"]\n[inputs]\nbuild = ["src/**"]\n[outputs]\nbuild = ["out/**"]\n'
+        )
+        (self.root / "src").mkdir()
+        (self.root / "src" / "main.c").write_text("int main() { return 0; }")
+        (self.root / "docs").mkdir()
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root / "docs")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def run_build(self) -> str:
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        with patch("sys.argv", ["sacr", "run", "--logs", "--output", "plain", "build"]), patch("sys.stdout", stdout):
+            Manager(base_path=self.root.as_posix()).main()
+            stdout.flush()
+        return stdout.buffer.getvalue().decode("utf-8")
+
+    def test_run_state_lives_in_the_project_root(self):
+        self.assertIn("built\n", self.run_build())
+
+        for path in ("state", "artifacts", "metrics.jsonl", "history", "logs"):
+            with self.subTest(path=path):
+                self.assertTrue((self.root / ".sacr" / path).exists())
+        self.assertFalse((self.root / "docs" / ".sacr").exists())
+        self.assertIn("(restored from cache)", self.run_build())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.contacts.errors.parse_error import ParseError
+from shapeandshare.command.runner.contacts.errors.subprocess_failure_error import SubprocessFailureError
+from shapeandshare.command.runner.execution.job import Job
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+from shapeandshare.command.runner.manager import Manager
+
+MODEL: BackendModel = BackendModel(
+    scripts={
+        "test": ["echo py{python}-{db} ${HOME} {other}", "sacr run report"],
+        "report": "echo {db}",
+        "build": "make",
+    },
+    depends={"test": ["build"]},
+    outputs={"test": ["out/{python}/**"]},
+    matrix={"test": {"python": ["3.9", "3.10"], "db": ["sqlite", "pg"]}},
+)
+
+
+class TestMatrixGraph(unittest.TestCase):
+    def test_alias_is_expanded_per_cell(self):
+        graph: JobGraph = JobGraph.build(model=MODEL, alias="test")
+        jobs: dict[str, Job] = {job.name: job for job in graph.jobs}
+
+        self.assertEqual(
+            list(jobs),
+            [
+                "build[0]",
+                "test{python=3.9,db=sqlite}[0]",
+                "report{python=3.9,db=sqlite}[0]",
+                "test{python=3.9,db=pg}[0]",
+                "report{python=3.9,db=pg}[0]",
+                "test{python=3.10,db=sqlite}[0]",
+                "report{python=3.10,db=sqlite}[0]",
+                "test{python=3.10,db=pg}[0]",
+                "report{python=3.10,db=pg}[0]",
+            ],
+        )
+        cell: Job = jobs["test{python=3.10,db=pg}[0]"]
+        self.assertEqual(cell.command, "echo py3.10-pg ${HOME} {other}")
+        self.assertEqual(cell.outputs, ["out/3.10/**"])
+        self.assertEqual(cell.dependencies, {jobs["build[0]"]})
+        self.assertEqual(jobs["report{python=3.10,db=pg}[0]"].command, "echo pg")
+        self.assertEqual(jobs["report{python=3.10,db=pg}[0]"].dependencies, {cell})
+
+    def test_invalid_matrix(self):
+        for matrix in ({"python": []}, {"python": "3.9"}, ["3.9"]):
+            with self.subTest(matrix=matrix):
+                with self.assertRaises(ParseError):
+                    JobGraph.build(model=BackendModel(scripts={"test": "echo"}, matrix={"test": matrix}), alias="test")
+
+
+class TestMatrixRun(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        (self.root / ".sacrrc").write_text("[command]\ntimeout = 60\n[config]\ntype = config\n")
+        (self.root / "sacr.config").write_text(
+            '[scripts]\ntest = ["sleep 0.3 && exit {code}"]\n[matrix]\ntest = {"code": ["0", "3", "00"]}\n'
+        )
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def test_failing_cell_does_not_cancel_the_others(self):
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        with patch("sys.stdout", stdout), patch("sys.stderr", io.TextIOWrapper(io.BytesIO())):
+            with self.assertRaises(SubprocessFailureError) as context:
+                Manager(base_path=self.root.as_posix()).backend.run_command(
+                    arguments=["test", "-j", "3", "--output", "prefixed"]
+                )
+            stdout.flush()
+        lines: list[str] = stdout.buffer.getvalue().decode("utf-8").splitlines()
+
+        self.assertEqual(context.exception.returncode, 3)
+        summary: list[list[str]] = [line.split() for line in lines[lines.index("Matrix summary (3 cells):") + 1 :]]
+        self.assertEqual(
+            [row[:3] for row in summary],
+            [["test{code=0}", "passed", "0"], ["test{code=3}", "failed", "3"], ["test{code=00}", "passed", "0"]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
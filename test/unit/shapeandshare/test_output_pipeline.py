@@ -0,0 +1,115 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from collections import deque
+from pathlib import Path
+
+from shapeandshare.command.runner.contacts.log_compression import LogCompression
+from shapeandshare.command.runner.execution.output_pipeline import OutputPipeline
+from shapeandshare.command.runner.execution.output_stream import OutputStream
+from shapeandshare.command.runner.execution.step_log import StepLog
+
+
+class ClosedTarget(io.BytesIO):
+    def write(self, *args, **kwargs):
+        raise BrokenPipeError()
+
+
+class TestOutputStream(unittest.TestCase):
+    def test_lines_are_written_as_they_complete(self):
+        target: io.BytesIO = io.BytesIO()
+        capture: io.BytesIO = io.BytesIO()
+        stream: OutputStream = OutputStream(label="build[0]", target=target, capture=capture)
+
+        stream.write(chunk=b"one\ntw")
+        self.assertEqual(target.getvalue(), b"[build[0]] one\n")
+        stream.write(chunk=b"o\nthree")
+        stream.finish()
+
+        self.assertEqual(target.getvalue(), b"[build[0]] one\n[build[0]] two\n[build[0]] three\n")
+        self.assertEqual(capture.getvalue(), b"one\ntwo\nthree")
+        self.assertEqual(OutputStream.render_tail(tail=stream.tail), "one\ntwo\nthree")
+        self.assertTrue(stream.done.is_set())
+
+    def test_memory_is_bounded(self):
+        stream: OutputStream = OutputStream(label=None, target=None)
+        stream.write(chunk=b"".join(b"line %d\n" % index for index in range(500)))
+        stream.write(chunk=b"x" * (OutputStream.MAX_LINE_LENGTH * 3))
+        stream.finish()
+
+        self.assertEqual(len(stream.tail), OutputStream.TAIL_LINES)
+        self.assertEqual(stream.tail[-2], b"line 499")
+        self.assertEqual(stream.tail[-1], b"x" * OutputStream.MAX_LINE_LENGTH)
+
+    def test_tail_is_shared_and_kept_once_the_target_fails(self):
+        tail: deque = OutputStream.new_tail()
+        stdout: OutputStream = OutputStream(label=None, target=ClosedTarget(), tail=tail)
+        stderr: OutputStream = OutputStream(label=None, target=None, tail=tail)
+
+        stdout.write(chunk=b"out\n")
+        stderr.write(chunk=b"err\n")
+
+        self.assertIsNone(stdout.target)
+        self.assertEqual(OutputStream.render_tail(tail=tail), "out\nerr")
+        self.assertIsNone(OutputStream.render_tail(tail=OutputStream.new_tail()))
+
+
+class TestOutputPipeline(unittest.TestCase):
+    def setUp(self):
+        self.pipeline: OutputPipeline = OutputPipeline()
+
+    def tearDown(self):
+        self.pipeline.close()
+
+    def register(self, label: str, target: io.BytesIO, **options) -> tuple[int, OutputStream]:
+        read_fd, write_fd = os.pipe()
+        stream: OutputStream = self.pipeline.register(
+            fd=read_fd, label=label, target=target, capture=None, tail=OutputStream.new_tail(), **options
+        )
+        return write_fd, stream
+
+    def test_streams_are_read_concurrently(self):
+        target: io.BytesIO = io.BytesIO()
+        first, first_stream = self.register(label="a", target=target)
+        second, second_stream = self.register(label="b", target=target)
+
+        os.write(first, b"one\n")
+        os.write(second, b"two\n")
+        os.write(first, b"three")
+        os.close(first)
+        os.close(second)
+
+        self.assertTrue(first_stream.done.wait(timeout=5))
+        self.assertTrue(second_stream.done.wait(timeout=5))
+        self.assertEqual(sorted(target.getvalue().splitlines()), [b"[a] one", b"[a] three", b"[b] two"])
+
+    def test_abandon(self):
+        target: io.BytesIO = io.BytesIO()
+        write_fd, stream = self.register(label="a", target=target)
+        os.write(write_fd, b"buffered\n")
+
+        self.pipeline.abandon(stream=stream)
+        os.close(write_fd)
+
+        self.assertTrue(stream.done.is_set())
+        self.assertEqual(target.getvalue(), b"[a] buffered\n")
+
+    def test_quiet_output_is_spliced_into_an_uncompressed_log(self):
+        root: Path = Path(tempfile.mkdtemp())
+        try:
+            log: StepLog = StepLog(path=root / "build[0].log", compression=LogCompression.NONE, holders=1)
+            write_fd, stream = self.register(label="a", target=None, log=log)
+            os.write(write_fd, b"".join(b"line %d\n" % index for index in range(100)))
+            os.close(write_fd)
+
+            self.assertTrue(stream.done.wait(timeout=5))
+            self.assertEqual(len((root / "build[0].log").read_bytes().splitlines()), 100)
+            self.assertEqual(stream.tail[-1], b"line 99")
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    unittest.main()
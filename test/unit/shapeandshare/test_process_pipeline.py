@@ -0,0 +1,149 @@
+import asyncio
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.contacts.errors.subprocess_failure_error import SubprocessFailureError
+from shapeandshare.command.runner.contacts.output_type import OutputType
+from shapeandshare.command.runner.execution.async_scheduler import AsyncScheduler
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+from shapeandshare.command.runner.execution.process_pipeline import ProcessPipeline
+from shapeandshare.command.runner.execution.scheduler import Scheduler
+
+MODEL: BackendModel = BackendModel(
+    scripts={
+        "sorted": [[["printf", "%s\\n", "c", "a", "b", "a"], ["sort"], ["uniq", "-c"]]],
+        "broken": [[["printf", "a\\n"], ["grep", "-q", "missing"], ["cat"]]],
+        "hung": [[["sleep", "30"], ["cat"]]],
+        "missing": [[["printf", "a"], ["sacr-missing-executable"]]],
+    }
+)
+
+
+class TestProcessPipeline(unittest.TestCase):
+    def run_pipeline(self, stages: list[list[str]]) -> tuple[ProcessPipeline, bytes]:
+        pipeline: ProcessPipeline = ProcessPipeline(stages=stages)
+        pipeline.start(stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        with pipeline:
+            output: bytes = pipeline.stdout.read()
+            pipeline.wait(timeout=10)
+        return pipeline, output
+
+    def test_stages_are_connected(self):
+        pipeline, output = self.run_pipeline(stages=[["printf", "b\\na\\nb\\n"], ["sort"], ["uniq"]])
+
+        self.assertEqual(output, b"a\nb\n")
+        self.assertEqual(pipeline.returncodes, [0, 0, 0])
+        self.assertEqual(pipeline.returncode, 0)
+
+    def test_pipefail(self):
+        pipeline, _ = self.run_pipeline(stages=[["sh", "-c", "exit 2"], ["sh", "-c", "cat; exit 5"], ["cat"]])
+
+        self.assertEqual(pipeline.returncodes, [2, 5, 0])
+        self.assertEqual(pipeline.returncode, 5)
+        self.assertEqual(
+            ProcessPipeline.describe(stages=pipeline.stages, returncodes=pipeline.returncodes),
+            "stage 2 of 3 (`sh -c 'cat; exit 5'`) failed, pipeline exit statuses 2|5|0",
+        )
+
+    def test_outcome(self):
+        self.assertIsNone(ProcessPipeline.outcome(returncodes=[0, None]))
+        self.assertEqual(ProcessPipeline.outcome(returncodes=[0, 0]), 0)
+        self.assertEqual(ProcessPipeline.outcome(returncodes=[-15, 0]), -15)
+
+    def test_stages_share_a_process_group(self):
+        pipeline: ProcessPipeline = ProcessPipeline(stages=[["sleep", "30"], ["sleep", "30"]])
+        pipeline.start(stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, new_group=True)
+        with pipeline:
+            self.assertEqual({os.getpgid(process.pid) for process in pipeline.processes}, {pipeline.pid})
+            os.killpg(pipeline.pid, 15)
+            self.assertEqual(pipeline.wait(timeout=10), -15)
+
+    def test_failing_start_stops_started_stages(self):
+        pipeline: ProcessPipeline = ProcessPipeline(stages=[["sleep", "30"], ["sacr-missing-executable"]])
+
+        with self.assertRaises(OSError):
+            pipeline.start(stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.assertEqual(pipeline.returncodes, [-9])
+
+
+class TestPipelineJobs(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    @staticmethod
+    def execute(alias: str, scheduler: str, per_command_timeout: Optional[int] = None) -> str:
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        graph: JobGraph = JobGraph.build(model=MODEL, alias=alias)
+        with patch("sys.stdout", stdout), patch("sys.stderr", io.TextIOWrapper(io.BytesIO())):
+            try:
+                if scheduler == "async":
+                    asyncio.run(
+                        AsyncScheduler(output=OutputType.PREFIXED, per_command_timeout=per_command_timeout).execute(
+                            graph=graph
+                        )
+                    )
+                else:
+                    Scheduler(output=OutputType.PREFIXED, per_command_timeout=per_command_timeout).execute(graph=graph)
+            finally:
+                stdout.flush()
+        return stdout.buffer.getvalue().decode("utf-8")
+
+    def test_pipeline_output(self):
+        for scheduler in ("threads", "async"):
+            with self.subTest(scheduler=scheduler):
+                lines: list[str] = [
+                    line
+                    for line in self.execute(alias="sorted", scheduler=scheduler).splitlines()
+                    if line.startswith("[sorted[0]]")
+                ]
+
+                self.assertEqual(lines[0], "[sorted[0]] > printf '%s\\n' c a b a | sort | uniq -c")
+                self.assertEqual([line.split()[1:] for line in lines[1:]], [["2", "a"], ["1", "b"], ["1", "c"]])
+
+    def test_failing_stage_is_named(self):
+        for scheduler in ("threads", "async"):
+            with self.subTest(scheduler=scheduler):
+                with self.assertRaises(SubprocessFailureError) as context:
+                    self.execute(alias="broken", scheduler=scheduler)
+
+                self.assertEqual(context.exception.returncode, 1)
+                self.assertEqual(
+                    context.exception.message,
+                    "stage 2 of 3 (`grep -q missing`) failed, pipeline exit statuses 0|1|0",
+                )
+
+    def test_missing_executable(self):
+        for scheduler in ("threads", "async"):
+            with self.subTest(scheduler=scheduler):
+                with self.assertRaises(SubprocessFailureError) as context:
+                    self.execute(alias="missing", scheduler=scheduler)
+
+                self.assertEqual(context.exception.returncode, 127)
+
+    def test_timeout_covers_the_whole_pipeline(self):
+        for scheduler in ("threads", "async"):
+            with self.subTest(scheduler=scheduler):
+                started: float = time.monotonic()
+                with self.assertRaises(SubprocessFailureError):
+                    self.execute(alias="hung", scheduler=scheduler, per_command_timeout=1)
+
+                self.assertLess(time.monotonic() - started, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+import hashlib
+import io
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+
+from shapeandshare.command.runner.cache.artifact_cache import ArtifactCache
+from shapeandshare.command.runner.cache.cache_server import CacheServer
+from shapeandshare.command.runner.cache.remote_cache import RemoteCache
+from shapeandshare.command.runner.cache.state_store import StateStore
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.contacts.output_type import OutputType
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+from shapeandshare.command.runner.execution.scheduler import Scheduler
+
+MODEL: BackendModel = BackendModel(
+    scripts={"build": "echo built && mkdir -p out && cp src/main.c out/main.o && echo ran >> runs"},
+    inputs={"build": "src/**"},
+    outputs={"build": "out/**"},
+)
+
+
+def unused_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class CacheServerTestCase(unittest.TestCase):
+    token: Optional[str] = None
+
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        self.server: CacheServer = CacheServer(address="127.0.0.1:0", path=self.root / "server", token=self.token)
+        self.thread: threading.Thread = threading.Thread(target=self.server.serve, daemon=True)
+        self.thread.start()
+        self.url: str = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join(timeout=10)
+        shutil.rmtree(self.root)
+
+
+class TestRemoteCache(CacheServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.remote: RemoteCache = RemoteCache(url=self.url, transfers=4)
+
+    def tearDown(self):
+        self.remote.close()
+        super().tearDown()
+
+    def blobs(self, *contents: bytes) -> dict[str, Path]:
+        blobs: dict[str, Path] = {}
+        for index, content in enumerate(contents):
+            path: Path = self.root / f"blob{index}"
+            path.write_bytes(content)
+            blobs[hashlib.sha256(content).hexdigest()] = path
+        return blobs
+
+    def test_blobs_round_trip(self):
+        blobs: dict[str, Path] = self.blobs(b"first", b"second" * 100_000, b"")
+        self.assertEqual(self.remote.missing(digests=sorted(blobs)), set(blobs))
+
+        self.remote.upload(blobs=blobs)
+        self.assertEqual(self.remote.missing(digests=sorted(blobs)), set())
+
+        (self.root / "restored").mkdir()
+        self.remote.download(
+            blobs={digest: self.root / "restored" / digest for digest in blobs}, scratch=self.root / "restored"
+        )
+        for digest, path in blobs.items():
+            self.assertEqual((self.root / "restored" / digest).read_bytes(), path.read_bytes())
+        self.assertEqual(sorted(path.name for path in (self.root / "restored").iterdir()), sorted(blobs))
+
+    def test_entries(self):
+        key: str = "a" * 64
+        self.assertIsNone(self.remote.entry(key=key))
+
+        self.remote.publish(key=key, manifest={"outputs": []})
+        self.assertEqual(self.remote.entry(key=key), {"outputs": []})
+
+    def test_mismatching_blob_is_rejected(self):
+        path: Path = self.root / "blob"
+        path.write_bytes(b"content")
+
+        with self.assertRaises(ConnectionError):
+            self.remote.upload(blobs={"0" * 64: path})
+        self.assertEqual(self.remote.missing(digests=["0" * 64]), {"0" * 64})
+
+    def test_missing_blob(self):
+        with self.assertRaises(ConnectionError):
+            self.remote.download(blobs={"0" * 64: self.root / "blob"}, scratch=self.root)
+        self.assertEqual(sorted(path.name for path in self.root.iterdir()), ["server"])
+
+    def test_invalid_url(self):
+        for url in ("ftp://cache", "cache:7879", "http://"):
+            with self.subTest(url=url):
+                with self.assertRaises(ValueError):
+                    RemoteCache(url=url)
+
+
+class TestRemoteCacheToken(CacheServerTestCase):
+    token: Optional[str] = "secret"
+
+    def test_token_is_required(self):
+        for token, accepted in ((None, False), ("wrong", False), ("secret", True)):
+            with self.subTest(token=token):
+                environment: dict = {RemoteCache.TOKEN_ENVIRONMENT_VARIABLE: token or ""}
+                with patch.dict(os.environ, environment):
+                    remote: RemoteCache = RemoteCache(url=self.url)
+                try:
+                    if accepted:
+                        self.assertIsNone(remote.entry(key="a" * 64))
+                    else:
+                        with self.assertRaises(ConnectionError):
+                            remote.entry(key="a" * 64)
+                finally:
+                    remote.close()
+
+
+class TestSharedArtifacts(CacheServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cwd: str = os.getcwd()
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        super().tearDown()
+
+    def machine(self, name: str, source: str = "int main() { return 0; }") -> Path:
+        project: Path = self.root / name
+        (project / "src").mkdir(parents=True)
+        (project / "src" / "main.c").write_text(source)
+        return project
+
+    def run_build(self, project: Path, url: Optional[str] = None) -> str:
+        os.chdir(project)
+        state: StateStore = StateStore(root=project)
+        artifacts: ArtifactCache = ArtifactCache(root=project, remote=RemoteCache(url=url or self.url))
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        try:
+            with patch("sys.stdout", stdout):
+                Scheduler(state=state, artifacts=artifacts, output=OutputType.PREFIXED).execute(
+                    graph=JobGraph.build(model=MODEL, alias="build")
+                )
+                stdout.flush()
+        finally:
+            artifacts.close()
+            state.close()
+        return stdout.buffer.getvalue().decode("utf-8")
+
+    def test_outputs_built_elsewhere_are_restored(self):
+        self.assertIn("[build[0]] built\n", self.run_build(project=self.machine(name="first")))
+
+        second: Path = self.machine(name="second")
+        output: str = self.run_build(project=second)
+
+        self.assertIn("(restored from cache)", output)
+        self.assertIn("[build[0]] built\n", output)
+        self.assertEqual((second / "out" / "main.o").read_text(), "int main() { return 0; }")
+        self.assertFalse((second / "runs").exists())
+
+    def test_changed_inputs_miss(self):
+        self.run_build(project=self.machine(name="first"))
+
+        second: Path = self.machine(name="second", source="int main() { return 1; }")
+        self.assertNotIn("(restored from cache)", self.run_build(project=second))
+        self.assertEqual((second / "runs").read_text(), "ran\n")
+
+        # Published in turn, so a third machine restores it.
+        third: Path = self.machine(name="third", source="int main() { return 1; }")
+        self.assertIn("(restored from cache)", self.run_build(project=third))
+
+    def test_unavailable_server_falls_back_to_the_local_cache(self):
+        project: Path = self.machine(name="offline")
+        with self.assertLogs("shapeandshare.command.runner.cache.artifact_cache", level="WARNING") as logs:
+            self.assertIn(
+                "[build[0]] built\n", self.run_build(project=project, url=f"http://127.0.0.1:{unused_port()}")
+            )
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("unavailable", logs.output[0])
+        self.assertEqual((project / "runs").read_text(), "ran\n")
+
+        shutil.rmtree(project / "out")
+        self.assertIn("(restored from cache)", self.run_build(project=project, url=f"http://127.0.0.1:{unused_port()}"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+
+from shapeandshare.command.runner.cache.run_history import RunHistory
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.contacts.dtos.step_metrics import StepMetrics
+from shapeandshare.command.runner.contacts.output_type import OutputType
+from shapeandshare.command.runner.contacts.step_status import StepStatus
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+from shapeandshare.command.runner.execution.scheduler import Scheduler
+
+MODEL: BackendModel = BackendModel(
+    scripts={
+        "lint": "echo lint >> order",
+        "build": "echo build >> order",
+        "test": "echo test >> order",
+        "ci": ["sacr run lint", "sacr run test"],
+    },
+    depends={"test": "build"},
+    parallel={"ci": True},
+)
+WALLS: dict[str, float] = {"lint[0]": 5.0, "build[0]": 1.0, "test[0]": 10.0}
+
+
+class TestRunHistory(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+        self.history: RunHistory = RunHistory(root=self.root)
+
+    def tearDown(self):
+        self.history.close()
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def record(self, walls: dict[str, float]) -> None:
+        graph: JobGraph = JobGraph.build(model=MODEL, alias="ci")
+        steps: list[StepMetrics] = [
+            StepMetrics(
+                run="previous",
+                alias="ci",
+                step=job.name,
+                command=job.display,
+                status=StepStatus.RAN,
+                started=1000.0,
+                queued=0.0,
+                wall=walls[job.name],
+            )
+            for job in graph.jobs
+            if job.name in walls
+        ]
+        self.history.record(run="previous", alias="ci", steps=steps)
+
+    def execute(self, jobs: int, alias: str = "ci", output: Optional[str] = OutputType.PLAIN) -> str:
+        scheduler: Scheduler = Scheduler(jobs=jobs, output=output, history=self.history)
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        with patch("sys.stdout", stdout):
+            scheduler.execute(graph=JobGraph.build(model=MODEL, alias=alias))
+            stdout.flush()
+        return stdout.buffer.getvalue().decode("utf-8")
+
+    def test_expected(self):
+        self.record(walls=WALLS)
+        self.record(walls={"lint[0]": 7.0})
+        self.record(walls={"lint[0]": 6.0})
+
+        expected: dict[str, float] = self.history.expected(jobs=JobGraph.build(model=MODEL, alias="ci").jobs)
+        self.assertEqual(expected, {**WALLS, "lint[0]": 6.0})
+
+    def test_critical_path_runs_first(self):
+        self.execute(jobs=1)
+        self.assertEqual((self.root / "order").read_text(), "lint\nbuild\ntest\n")
+        (self.root / "order").unlink()
+
+        # build is quick, but test waits on it: their chain (11s) outlasts lint (5s).
+        self.record(walls=WALLS)
+        self.execute(jobs=1)
+        self.assertEqual((self.root / "order").read_text(), "build\ntest\nlint\n")
+
+    def test_forecast(self):
+        self.record(walls={"lint[0]": 5.0, "test[0]": 10.0})
+
+        # build lacks a history, so counts as the median of the others (7.5s), after which test runs.
+        self.assertTrue(self.execute(jobs=2).startswith("Expected to take 17.5s (from the history of 2 of 3 steps)\n"))
+
+    def test_forecast_only_for_concurrent_runs(self):
+        self.record(walls=WALLS)
+
+        for jobs, alias, output in (
+            (1, "ci", OutputType.PLAIN),
+            (2, "lint", OutputType.PLAIN),
+            (2, "ci", OutputType.QUIET),
+        ):
+            with self.subTest(jobs=jobs, alias=alias, output=output):
+                self.assertNotIn("Expected to take", self.execute(jobs=jobs, alias=alias, output=output))
+        self.assertIn("Expected to take 11.0s", self.execute(jobs=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
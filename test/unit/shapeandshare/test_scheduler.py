@@ -0,0 +1,62 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.contacts.output_type import OutputType
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+from shapeandshare.command.runner.execution.scheduler import Scheduler
+
+HUNG: str = "touch started-{name} && trap '' TERM && while :; do sleep 0.1; done"
+
+
+class TestSchedulerCancel(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    @patch.object(Scheduler, "TERMINATE_GRACE_PERIOD", 1)
+    def test_hung_jobs_share_the_grace_period(self):
+        model: BackendModel = BackendModel(
+            scripts={"ci": [HUNG.format(name=name) for name in ("a", "b", "c")]}, parallel={"ci": True}
+        )
+        scheduler: Scheduler = Scheduler(jobs=3, output=OutputType.QUIET)
+        errors: list[BaseException] = []
+
+        def execute() -> None:
+            try:
+                scheduler.execute(graph=JobGraph.build(model=model, alias="ci"))
+            except BaseException as error:  # pylint: disable=broad-except
+                errors.append(error)
+
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        with patch("sys.stdout", stdout):
+            thread: threading.Thread = threading.Thread(target=execute)
+            thread.start()
+            deadline: float = time.monotonic() + 10
+            while len(list(self.root.glob("started-*"))) < 3 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            started: float = time.monotonic()
+            scheduler.cancel()
+            elapsed: float = time.monotonic() - started
+            thread.join(timeout=10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(errors), 1)
+        self.assertGreaterEqual(elapsed, 1)
+        self.assertLess(elapsed, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
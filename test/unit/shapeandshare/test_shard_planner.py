@@ -0,0 +1,88 @@
+import unittest
+from typing import Optional
+
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+from shapeandshare.command.runner.execution.shard_planner import ShardPlanner
+
+UNITS: dict[str, list[Optional[float]]] = {
+    "a": [8.0],
+    "b": [7.0],
+    "c": [6.0],
+    "d": [5.0],
+    "e": [3.5, 1.0],
+    "f": [3.0],
+    "g": [2.0],
+}
+
+
+def shards(units: dict[str, list[Optional[float]]], count: int) -> list[list[str]]:
+    return [ShardPlanner(index=index, count=count).assign(units=units) for index in range(1, count + 1)]
+
+
+class TestShardPlanner(unittest.TestCase):
+    def test_every_unit_runs_once(self):
+        for count in (1, 2, 3, 10):
+            with self.subTest(count=count):
+                assigned: list[str] = [unit for shard in shards(units=UNITS, count=count) for unit in shard]
+                self.assertEqual(sorted(assigned), sorted(UNITS))
+
+    def test_deterministic(self):
+        first: ShardPlanner = ShardPlanner(index=2, count=3)
+        second: ShardPlanner = ShardPlanner(index=2, count=3)
+
+        self.assertEqual(first.assign(units=UNITS), ["b", "e"])
+        self.assertEqual(sorted(second.assign(units=dict(reversed(UNITS.items())))), ["b", "e"])
+        self.assertEqual(first.plan, second.plan)
+
+    def test_balanced(self):
+        planner: ShardPlanner = ShardPlanner(index=1, count=3)
+        planner.assign(units=UNITS)
+
+        self.assertEqual(planner.loads, [13.0, 11.5, 11.0])
+        self.assertTrue(planner.known)
+
+    def test_plan_follows_history(self):
+        planner: ShardPlanner = ShardPlanner(index=1, count=3)
+        planner.assign(units=UNITS)
+        other: ShardPlanner = ShardPlanner(index=1, count=3)
+        other.assign(units={**UNITS, "a": [1.0]})
+
+        self.assertNotEqual(planner.plan, other.plan)
+
+    def test_without_history_balances_steps(self):
+        planner: ShardPlanner = ShardPlanner(index=1, count=2)
+        assigned: list[str] = planner.assign(units={"a": [None, None], "b": [None], "c": [None]})
+
+        self.assertEqual(assigned, ["a"])
+        self.assertEqual(planner.loads, [2.0, 2.0])
+        self.assertFalse(planner.known)
+
+    def test_warning(self):
+        planner: ShardPlanner = ShardPlanner(index=1, count=2)
+        planner.assign(units=UNITS)
+        self.assertIsNone(planner.warning())
+
+        planner.assign(units={"a": [8.0], "b": [None], "c": [None]})
+        self.assertIn("2 of 3 steps have no run history", planner.warning())
+
+        planner.assign(units={"a": [None], "b": [None]})
+        self.assertIn("no step has a run history", planner.warning())
+
+    def test_split(self):
+        model: BackendModel = BackendModel(
+            scripts={"build": "echo build", "a": "echo a", "b": "echo b", "ci": ["sacr run a", "sacr run b"]},
+            depends={"a": "build", "b": "build"},
+            parallel={"ci": True},
+        )
+        expected: dict[str, float] = {"a[0]": 5.0, "b[0]": 1.0}
+        # split moves the jobs of the shard out of the graph, so each shard splits a graph of its own.
+        for index, names in ((1, ["build[0]", "a[0]"]), (2, ["build[0]", "b[0]"])):
+            with self.subTest(index=index):
+                graph: JobGraph = JobGraph.build(model=model, alias="ci")
+                shard: JobGraph = ShardPlanner(index=index, count=2).split(graph=graph, expected=expected)
+                self.assertEqual([job.name for job in shard.jobs], names)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import asyncio
+import gzip
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Union
+from unittest.mock import patch
+
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.contacts.errors.subprocess_failure_error import SubprocessFailureError
+from shapeandshare.command.runner.contacts.log_compression import LogCompression
+from shapeandshare.command.runner.contacts.output_type import OutputType
+from shapeandshare.command.runner.execution.async_scheduler import AsyncScheduler
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+from shapeandshare.command.runner.execution.scheduler import Scheduler
+from shapeandshare.command.runner.execution.shell_session import ShellSession
+from shapeandshare.command.runner.execution.step_logs import StepLogs
+
+MODEL: BackendModel = BackendModel(
+    scripts={
+        "a": ["export GREETING=hello", "echo $GREETING a"],
+        "b": ["echo b", "echo warning >&2"],
+        "ci": ["sacr run a", "sacr run b"],
+        "broken": ["echo first", "echo cause && exit 4", "echo skipped"],
+        "shared": ["cd /", "VALUE=7", "echo $PWD $VALUE"],
+        "slow": ["sleep 30"],
+    },
+    session={"a": True, "b": True, "broken": True, "shared": True, "slow": True},
+    parallel={"ci": True},
+)
+
+
+class TestShellSession(unittest.TestCase):
+    def test_state_carries_over(self):
+        session: ShellSession = ShellSession()
+        try:
+            self.assertEqual(session.run(command="cd / && export VALUE=7"), 0)
+            stdout, stderr = session.outputs()
+            self.assertEqual(session.run(command='echo "$PWD $VALUE" && echo error >&2 && false'), 1)
+            with open(stdout, mode="rb") as out, open(stderr, mode="rb") as err:
+                self.assertEqual(out.read(), b"/ 7\n")
+                self.assertEqual(err.read(), b"error\n")
+        finally:
+            session.close()
+
+    def test_status_forgery_is_ignored(self):
+        session: ShellSession = ShellSession()
+        try:
+            stdout, _ = session.outputs()
+            self.assertEqual(session.run(command="echo __sacr_0000000000000000__ 0; exit 5"), 5)
+            with open(stdout, mode="rb") as out:
+                self.assertEqual(out.read(), b"__sacr_0000000000000000__ 0\n")
+            self.assertFalse(session.alive)
+        finally:
+            session.close()
+
+    def test_timeout(self):
+        session: ShellSession = ShellSession()
+        started: float = time.monotonic()
+        with self.assertRaises(subprocess.TimeoutExpired):
+            session.run(command="sleep 30", timeout=0.2)
+        session.terminate()
+
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertFalse(session.alive)
+        session.close()
+
+    def test_close_removes_pipes(self):
+        session: ShellSession = ShellSession()
+        for reader in session.outputs():
+            os.close(reader)
+        session.close()
+
+        # pylint: disable=protected-access
+        self.assertIsNone(session._directory)
+        self.assertFalse(session.alive)
+
+
+class TestSessionOutput(unittest.TestCase):
+    def execute(self, scheduler: Union[Scheduler, AsyncScheduler], alias: str) -> str:
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        stderr: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        with patch("sys.stdout", stdout), patch("sys.stderr", stderr):
+            try:
+                graph: JobGraph = JobGraph.build(model=MODEL, alias=alias)
+                if isinstance(scheduler, AsyncScheduler):
+                    asyncio.run(scheduler.execute(graph=graph))
+                else:
+                    scheduler.execute(graph=graph)
+            finally:
+                stdout.flush()
+                stderr.flush()
+        return stdout.buffer.getvalue().decode("utf-8") + stderr.buffer.getvalue().decode("utf-8")
+
+    def test_steps_share_the_shell(self):
+        for scheduler in (Scheduler(output=OutputType.PLAIN), AsyncScheduler(output=OutputType.PLAIN)):
+            with self.subTest(scheduler=type(scheduler).__name__):
+                self.assertIn("\n/ 7\n", self.execute(scheduler=scheduler, alias="shared"))
+
+    def test_per_command_timeout(self):
+        for scheduler in (Scheduler, AsyncScheduler):
+            with self.subTest(scheduler=scheduler.__name__):
+                with self.assertRaises(SubprocessFailureError) as context:
+                    self.execute(scheduler=scheduler(per_command_timeout=1, output=OutputType.QUIET), alias="slow")
+                self.assertEqual(context.exception.message, "Exceeded timeout limit of 1")
+
+    def test_prefixed(self):
+        for scheduler in (Scheduler(jobs=2), AsyncScheduler(jobs=2)):
+            with self.subTest(scheduler=type(scheduler).__name__):
+                output: str = self.execute(scheduler=scheduler, alias="ci")
+                self.assertIn("[a[1]] hello a\n", output)
+                self.assertIn("[b[0]] b\n", output)
+                self.assertIn("[b[1]] warning\n", output)
+
+    def test_quiet(self):
+        for scheduler in (Scheduler(output=OutputType.QUIET), AsyncScheduler(output=OutputType.QUIET)):
+            with self.subTest(scheduler=type(scheduler).__name__):
+                self.assertEqual(self.execute(scheduler=scheduler, alias="b"), "")
+
+    def test_failure_tail(self):
+        for scheduler in (Scheduler(output=OutputType.QUIET), AsyncScheduler(output=OutputType.QUIET)):
+            with self.subTest(scheduler=type(scheduler).__name__):
+                with self.assertRaises(SubprocessFailureError) as context:
+                    self.execute(scheduler=scheduler, alias="broken")
+                self.assertEqual(context.exception.returncode, 4)
+                self.assertIn("cause", context.exception.output)
+                self.assertNotIn("skipped", context.exception.output)
+
+    def test_step_log(self):
+        root: Path = Path(tempfile.mkdtemp())
+        try:
+            for scheduler in (Scheduler, AsyncScheduler):
+                with self.subTest(scheduler=scheduler.__name__):
+                    logs: StepLogs = StepLogs(
+                        run=scheduler.__name__, compression=LogCompression.GZIP, keep=2, root=root
+                    )
+                    self.execute(scheduler=scheduler(output=OutputType.QUIET, logs=logs), alias="b")
+                    with gzip.open(logs.folder / "b[0].log.gz") as log:
+                        self.assertEqual(log.read(), b"b\n")
+                    with gzip.open(logs.folder / "b[1].log.gz") as log:
+                        self.assertEqual(log.read(), b"warning\n")
+        finally:
+            shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    unittest.main()
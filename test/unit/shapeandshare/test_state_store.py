@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from shapeandshare.command.runner.cache.state_store import StateStore
+from shapeandshare.command.runner.execution.job import Job
+
+
+class TestStateStore(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        (self.root / "src").mkdir()
+        (self.root / "src" / "main.c").write_text("int main() { return 0; }")
+        self.store: StateStore = StateStore(root=self.root)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.root)
+
+    def job(self, **options) -> Job:
+        return Job(alias="build", index=0, command="make", inputs=["src/**"], **options)
+
+    def build(self, job: Job) -> str:
+        fingerprint: str = self.store.fingerprint(job=job)
+        (self.root / "out").mkdir(exist_ok=True)
+        (self.root / "out" / "main.o").write_text("object")
+        self.store.record(job=job, fingerprint=fingerprint)
+        return fingerprint
+
+    def test_no_inputs_no_fingerprint(self):
+        self.assertIsNone(self.store.fingerprint(job=Job(alias="build", index=0, command="make")))
+        self.assertFalse(self.store.up_to_date(job=Job(alias="build", index=0, command="make"), fingerprint=None))
+
+    def test_fingerprint_is_stable(self):
+        self.assertEqual(self.store.fingerprint(job=self.job()), self.store.fingerprint(job=self.job()))
+
+    def test_fingerprint_covers_inputs_command_and_environment(self):
+        fingerprint: str = self.store.fingerprint(job=self.job())
+
+        self.assertNotEqual(
+            fingerprint, self.store.fingerprint(job=Job(alias="build", index=0, command="make -j", inputs=["src/**"]))
+        )
+        (self.root / "src" / "util.c").write_text("")
+        self.assertNotEqual(fingerprint, self.store.fingerprint(job=self.job()))
+
+        fingerprint = self.store.fingerprint(job=self.job(environment=["SACR_TEST_CC"]))
+        os.environ["SACR_TEST_CC"] = "clang"
+        try:
+            self.assertNotEqual(fingerprint, self.store.fingerprint(job=self.job(environment=["SACR_TEST_CC"])))
+        finally:
+            del os.environ["SACR_TEST_CC"]
+
+    def test_fingerprint_follows_content(self):
+        fingerprint: str = self.store.fingerprint(job=self.job())
+        (self.root / "src" / "main.c").write_text("int main() { return 1; }")
+
+        self.assertNotEqual(fingerprint, self.store.fingerprint(job=self.job()))
+
+    def test_up_to_date(self):
+        job: Job = self.job(outputs=["out/**"])
+        fingerprint: str = self.build(job=job)
+
+        self.assertTrue(self.store.up_to_date(job=job, fingerprint=fingerprint))
+        self.assertFalse(self.store.up_to_date(job=job, fingerprint="0" * 64))
+
+    def test_deleted_output_directory_runs_again(self):
+        job: Job = self.job(outputs=["out/**"])
+        fingerprint: str = self.build(job=job)
+        shutil.rmtree(self.root / "out")
+
+        self.assertFalse(self.store.up_to_date(job=job, fingerprint=fingerprint))
+
+    def test_deleted_output_file_runs_again(self):
+        job: Job = self.job(outputs=["out/main.o"])
+        fingerprint: str = self.build(job=job)
+        (self.root / "out" / "main.o").unlink()
+
+        self.assertFalse(self.store.up_to_date(job=job, fingerprint=fingerprint))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.contacts.errors.subprocess_failure_error import SubprocessFailureError
+from shapeandshare.command.runner.contacts.output_type import OutputType
+from shapeandshare.command.runner.contacts.step_status import StepStatus
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+from shapeandshare.command.runner.execution.scheduler import Scheduler
+from shapeandshare.command.runner.execution.step_recorder import StepRecorder
+
+BUSY: str = "python3 -c 'data = bytearray(64 * 1024 * 1024); sum(range(3000000))'"
+MODEL: BackendModel = BackendModel(
+    scripts={"ci": [BUSY, "sleep 0.3", "sleep 0.3"], "broken": ["exit 4"]},
+    parallel={"ci": True},
+)
+
+
+class TestStepRecorder(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def execute(self, recorder: StepRecorder, alias: str = "ci") -> None:
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        with patch("sys.stdout", stdout):
+            try:
+                Scheduler(jobs=2, output=OutputType.QUIET, recorder=recorder).execute(
+                    graph=JobGraph.build(model=MODEL, alias=alias)
+                )
+            finally:
+                recorder.close()
+
+    def test_steps_are_logged_with_their_resource_usage(self):
+        recorder: StepRecorder = StepRecorder(alias="ci", root=self.root)
+        self.execute(recorder=recorder)
+
+        lines: list[dict] = [
+            json.loads(line) for line in (self.root / StepRecorder.DEFAULT_PATH).read_text().splitlines()
+        ]
+        self.assertEqual(sorted(line["step"] for line in lines), ["ci[0]", "ci[1]", "ci[2]"])
+        self.assertEqual({line["run"] for line in lines}, {recorder.run})
+        self.assertEqual({line["status"] for line in lines}, {StepStatus.RAN.value})
+        self.assertEqual({line["worker"] for line in lines}, {0, 1})
+
+        busy: dict = next(line for line in lines if line["step"] == "ci[0]")
+        self.assertGreater(busy["user"] + busy["system"], 0)
+        self.assertGreater(busy["max_rss"], 64 * 1024 * 1024)
+        self.assertEqual(busy["returncode"], 0)
+
+    def test_failed_step_is_recorded(self):
+        recorder: StepRecorder = StepRecorder(alias="broken", path=None)
+        with self.assertRaises(SubprocessFailureError):
+            self.execute(recorder=recorder, alias="broken")
+
+        self.assertEqual([(step.status, step.returncode) for step in recorder.steps], [(StepStatus.FAILED, 4)])
+
+    def test_trace(self):
+        recorder: StepRecorder = StepRecorder(alias="ci", path=None, trace="out/trace.json")
+        self.execute(recorder=recorder)
+
+        events: list[dict] = json.loads((self.root / "out" / "trace.json").read_text())["traceEvents"]
+        steps: list[dict] = [event for event in events if event["ph"] == "X"]
+        self.assertEqual(sorted(event["name"] for event in steps), ["ci[0]", "ci[1]", "ci[2]"])
+        self.assertEqual(min(event["ts"] for event in steps), 0)
+        self.assertEqual({event["tid"] for event in steps}, {0, 1})
+        self.assertEqual(
+            sorted(event["args"]["name"] for event in events if event["name"] == "thread_name"), ["slot 0", "slot 1"]
+        )
+
+        running: list[int] = [event["args"]["steps"] for event in events if event["ph"] == "C"]
+        self.assertEqual(max(running), 2)
+        self.assertEqual(running[-1], 0)
+        self.assertEqual([path.name for path in (self.root / "out").iterdir()], ["trace.json"])
+
+    def test_log_is_rotated(self):
+        path: Path = self.root / StepRecorder.DEFAULT_PATH
+        path.parent.mkdir(parents=True)
+        path.write_text("old\n" * 10)
+
+        with patch.object(StepRecorder, "MAX_LOG_SIZE", 16):
+            self.execute(recorder=StepRecorder(alias="ci", root=self.root))
+
+        self.assertEqual(path.with_name(f"{path.name}.1").read_text(), "old\n" * 10)
+        self.assertEqual(len(path.read_text().splitlines()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+
+from shapeandshare.command.runner.common.utils import parse_jobs, run_argument_parser, watch_argument_parser
+from shapeandshare.command.runner.contacts.dtos.run_parameters import RunParameters
+from shapeandshare.command.runner.contacts.dtos.watch_parameters import WatchParameters
+from shapeandshare.command.runner.contacts.errors.unknown_argument_error import UnknownArgumentError
+
+
+class TestParseJobs(unittest.TestCase):
+    def test_valid(self):
+        self.assertEqual(parse_jobs(command="run", value="4"), 4)
+        self.assertEqual(parse_jobs(command="run", value="1"), 1)
+
+    def test_invalid(self):
+        for value in ("0", "-2", "many", ""):
+            with self.subTest(value=value):
+                with self.assertRaises(UnknownArgumentError):
+                    parse_jobs(command="run", value=value)
+
+
+class TestRunArgumentParser(unittest.TestCase):
+    def test_defaults(self):
+        parameters: RunParameters = run_argument_parser(arguments=["build"], jobs=3)
+
+        self.assertEqual(parameters.alias, "build")
+        self.assertEqual(parameters.jobs, 3)
+        self.assertFalse(parameters.force)
+        self.assertIsNone(parameters.output)
+
+    def test_job_forms(self):
+        for arguments in (["-j", "2", "build"], ["-j2", "build"], ["--jobs=2", "build"], ["build", "--jobs", "2"]):
+            with self.subTest(arguments=arguments):
+                self.assertEqual(run_argument_parser(arguments=arguments, jobs=8).jobs, 2)
+
+    def test_options(self):
+        parameters: RunParameters = run_argument_parser(
+            arguments=["-f", "--output", "plain", "--trace=trace.json", "build"], jobs=1
+        )
+
+        self.assertTrue(parameters.force)
+        self.assertEqual(parameters.output, "plain")
+        self.assertEqual(parameters.trace, "trace.json")
+
+    def test_logs(self):
+        self.assertTrue(run_argument_parser(arguments=["build", "--logs"], jobs=1).logs)
+        self.assertFalse(run_argument_parser(arguments=["build"], jobs=1).logs)
+        with self.assertRaises(UnknownArgumentError):
+            run_argument_parser(arguments=["build", "--logs"], jobs=1, command="bench")
+
+    def test_exactly_one_alias(self):
+        for arguments in ([], ["a", "b"]):
+            with self.subTest(arguments=arguments):
+                with self.assertRaises(UnknownArgumentError):
+                    run_argument_parser(arguments=arguments, jobs=1)
+
+    def test_invalid_options(self):
+        for arguments in (["build", "--bogus"], ["build", "-j"], ["build", "-j", "0"], ["build", "--output", "loud"]):
+            with self.subTest(arguments=arguments):
+                with self.assertRaises(UnknownArgumentError):
+                    run_argument_parser(arguments=arguments, jobs=1)
+
+
+class TestWatchArgumentParser(unittest.TestCase):
+    def test_options(self):
+        parameters: WatchParameters = watch_argument_parser(
+            arguments=["build", "--debounce", "0.5", "--ignore=*.tmp", "--poll", "-j", "2"], jobs=1
+        )
+
+        self.assertEqual(parameters.alias, "build")
+        self.assertEqual(parameters.debounce, 0.5)
+        self.assertEqual(parameters.ignore, ["*.tmp"])
+        self.assertTrue(parameters.poll)
+        self.assertEqual(parameters.jobs, 2)
+
+    def test_run_options_pass_through(self):
+        parameters: WatchParameters = watch_argument_parser(
+            arguments=["build", "--logs", "-f", "--output=quiet"], jobs=1
+        )
+
+        self.assertTrue(parameters.logs)
+        self.assertTrue(parameters.force)
+        self.assertEqual(parameters.output, "quiet")
+        self.assertFalse(watch_argument_parser(arguments=["build"], jobs=1).logs)
+
+    def test_invalid_options(self):
+        for arguments in (["build", "--trace", "trace.json"], ["build", "--debounce", "soon"], ["build", "--debounce"]):
+            with self.subTest(arguments=arguments):
+                with self.assertRaises(UnknownArgumentError):
+                    watch_argument_parser(arguments=arguments, jobs=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import asyncio
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from shapeandshare.command.runner.watch.alias_watcher import AliasWatcher
+from shapeandshare.command.runner.watch.base_watcher import BaseWatcher
+from shapeandshare.command.runner.watch.inotify_watcher import InotifyWatcher
+from shapeandshare.command.runner.watch.poll_watcher import PollWatcher
+
+TIMEOUT: float = 5
+
+
+class WatchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp()).resolve()
+        for path in ("src/main.c", "src/out/main.o", "src/node_modules/a.js", "docs/index.md"):
+            (self.root / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.root / path).write_text("")
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+
+class TestWatchers(WatchTestCase):
+    def watchers(self) -> list[BaseWatcher]:
+        options: dict = {"patterns": ["src/**/*.c"], "root": self.root.as_posix(), "exclude": ["src/out/**"]}
+        return [PollWatcher(interval=0.05, **options), InotifyWatcher(**options)]
+
+    async def until(self, watcher: BaseWatcher, path: Path) -> set[str]:
+        changed: set[str] = set()
+        while path.as_posix() not in changed:
+            changed |= await asyncio.wait_for(watcher.changes(), timeout=TIMEOUT)
+        return changed
+
+    def watch(self, scenario) -> None:
+        for watcher in self.watchers():
+            with self.subTest(watcher=type(watcher).__name__):
+
+                async def run() -> None:
+                    try:
+                        await watcher.start()
+                    except OSError as error:
+                        self.skipTest(f"{type(watcher).__name__} unavailable: {error}")
+                    try:
+                        await scenario(watcher)
+                    finally:
+                        watcher.close()
+
+                asyncio.run(run())
+
+    def test_ignored_and_excluded_changes_are_disregarded(self):
+        async def scenario(watcher: BaseWatcher) -> None:
+            (self.root / "src" / "out" / "main.o").write_text("object")
+            (self.root / "src" / "node_modules" / "a.js").write_text("module")
+            (self.root / "src" / ".main.c.swp").write_text("swap")
+            (self.root / "docs" / "index.md").write_text("docs")
+            (self.root / "src" / "main.c").write_text("int main() {}")
+
+            changed: set[str] = await self.until(watcher=watcher, path=self.root / "src" / "main.c")
+            await asyncio.sleep(0.2)
+            self.assertEqual(changed, {(self.root / "src" / "main.c").as_posix()})
+
+        self.watch(scenario=scenario)
+
+    def test_new_folders_are_watched(self):
+        async def scenario(watcher: BaseWatcher) -> None:
+            folder: Path = self.root / "src" / type(watcher).__name__ / "deep"
+            folder.mkdir(parents=True)
+            await asyncio.sleep(0.2)
+            (folder / "util.c").write_text("")
+
+            await self.until(watcher=watcher, path=folder / "util.c")
+            os.unlink(folder / "util.c")
+            await self.until(watcher=watcher, path=folder / "util.c")
+
+        self.watch(scenario=scenario)
+
+    def test_plain_files_are_watched_on_their_own(self):
+        watcher: BaseWatcher = PollWatcher(patterns=["docs/index.md"], root=self.root.as_posix())
+
+        self.assertEqual(watcher.files, {(self.root / "docs" / "index.md").as_posix()})
+        self.assertEqual(watcher.folders, set())
+
+
+class TestAliasWatcher(WatchTestCase):
+    def test_runs_again_on_changes(self):
+        runs: list[str] = []
+        started: asyncio.Event
+
+        async def run() -> None:
+            runs.append("started")
+            started.set()
+            await asyncio.sleep(0.5)
+            runs.append("finished")
+
+        async def scenario() -> None:
+            nonlocal started
+            started = asyncio.Event()
+            watcher: AliasWatcher = AliasWatcher(
+                run=run, debounce=0.1, poll=True, patterns=["src/**"], root=self.root.as_posix(), interval=0.05
+            )
+            task: asyncio.Task = asyncio.ensure_future(watcher.watch())
+            try:
+                await asyncio.wait_for(started.wait(), timeout=TIMEOUT)
+                started.clear()
+                # A burst of changes during the run cancels it and starts a single new one.
+                for index in range(3):
+                    (self.root / "src" / f"new{index}.c").write_text("")
+                await asyncio.wait_for(started.wait(), timeout=TIMEOUT)
+                await asyncio.sleep(1)
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+        stdout: io.StringIO = io.StringIO()
+        with patch("sys.stdout", stdout):
+            asyncio.run(scenario())
+
+        self.assertEqual(runs, ["started", "started", "finished"])
+        output: str = stdout.getvalue()
+        self.assertIn("Changes detected, cancelling the current run.\n", output)
+        self.assertIn("src/new0.c, src/new1.c, src/new2.c changed, re-running.\n", output)
+        self.assertEqual(output.count("Waiting for changes...\n"), 1)
+
+    def test_summary(self):
+        changed: set[str] = {(self.root / f"{name}.c").as_posix() for name in "abcde"}
+
+        self.assertEqual(AliasWatcher._summary(changed=changed), "a.c, b.c, c.c and 2 more")
+
+
+if __name__ == "__main__":
+    unittest.main()
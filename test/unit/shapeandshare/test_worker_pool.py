@@ -0,0 +1,119 @@
+import io
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+
+from shapeandshare.command.runner.contacts.dtos.backend_model import BackendModel
+from shapeandshare.command.runner.contacts.errors.subprocess_failure_error import SubprocessFailureError
+from shapeandshare.command.runner.contacts.output_type import OutputType
+from shapeandshare.command.runner.execution.job_graph import JobGraph
+from shapeandshare.command.runner.execution.scheduler import Scheduler
+from shapeandshare.command.runner.worker.worker_pool import WorkerPool
+
+SERVE: str = (
+    "import sys\n"
+    "from shapeandshare.command.runner.worker.worker_server import WorkerServer\n"
+    "WorkerServer(address=sys.argv[1], slots=1).serve(ready=lambda: print('ready', flush=True))\n"
+)
+
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        self.workers: dict[str, subprocess.Popen] = {}
+        for name in ("a", "b"):
+            address: str = f"unix:{self.root / name}.sock"
+            # pylint: disable=consider-using-with
+            process: subprocess.Popen = subprocess.Popen(
+                [sys.executable, "-c", SERVE, address],
+                cwd=self.root,
+                env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            self.workers[address] = process
+            self.assertEqual(process.stdout.readline(), b"ready\n")
+        self.pool: WorkerPool = WorkerPool(addresses=list(self.workers))
+        self.assertEqual(self.pool.connect(), [])
+
+    def tearDown(self):
+        self.pool.close()
+        for process in self.workers.values():
+            process.kill()
+            process.wait()
+            process.stdout.close()
+        shutil.rmtree(self.root)
+
+    def execute(self, model: BackendModel, alias: str) -> str:
+        scheduler: Scheduler = Scheduler(jobs=2, output=OutputType.PREFIXED, workers=self.pool)
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        with patch("sys.stdout", stdout):
+            try:
+                scheduler.execute(graph=JobGraph.build(model=model, alias=alias))
+            finally:
+                stdout.flush()
+        return stdout.buffer.getvalue().decode("utf-8")
+
+    def test_capacity(self):
+        self.assertEqual(self.pool.capacity, 2)
+
+    def test_output(self):
+        model: BackendModel = BackendModel(scripts={"ci": ["echo one", "echo two"]}, parallel={"ci": True})
+        output: str = self.execute(model=model, alias="ci")
+
+        self.assertIn("[ci[0]] one\n", output)
+        self.assertIn("[ci[1]] two\n", output)
+
+    def test_exit_code(self):
+        model: BackendModel = BackendModel(scripts={"ci": ["echo failing && exit 3", "echo skipped"]})
+
+        with self.assertRaises(SubprocessFailureError) as context:
+            self.execute(model=model, alias="ci")
+        self.assertEqual(context.exception.returncode, 3)
+        self.assertIn("failing", context.exception.output)
+
+    def test_lost_worker_step_is_retried(self):
+        attempts: list[tuple[str, Optional[str]]] = []
+        reader, writer = os.pipe()
+        result: dict = {}
+        request: dict = {"command": "echo attempt >> attempts && sleep 1 && echo finished", "timeout": 30}
+
+        def dispatch() -> None:
+            try:
+                result.update(
+                    self.pool.dispatch(
+                        request=request, outputs=(writer, writer), started=lambda *item: attempts.append(item)
+                    )
+                )
+            finally:
+                os.close(writer)
+
+        thread: threading.Thread = threading.Thread(target=dispatch)
+        thread.start()
+        deadline: float = time.monotonic() + 10
+        while not (self.root / "attempts").exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        os.kill(self.workers[attempts[0][0]].pid, signal.SIGKILL)
+        with os.fdopen(reader, mode="rb") as output:
+            self.assertEqual(output.read(), b"finished\n")
+        thread.join()
+
+        self.assertEqual(result["returncode"], 0)
+        self.assertEqual(len(attempts), 2)
+        self.assertNotEqual(attempts[1][0], attempts[0][0])
+        self.assertIn(attempts[0][0], attempts[1][1])
+        self.assertEqual((self.root / "attempts").read_text(), "attempt\nattempt\n")
+        self.assertEqual(self.pool.capacity, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import io
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from shapeandshare.command.runner.contacts.errors.dependency_cycle_error import DependencyCycleError
+from shapeandshare.command.runner.contacts.errors.parse_error import ParseError
+from shapeandshare.command.runner.manager import Manager
+from shapeandshare.command.runner.workspace.workspace_discovery import WorkspaceDiscovery
+from shapeandshare.command.runner.workspace.workspace_package import WorkspacePackage
+from shapeandshare.command.runner.workspace.workspace_runner import WorkspaceRunner
+
+CONFIGS: dict[str, str] = {
+    "sacr.config": '[scripts]\nbuild = ["echo root"]\n',
+    "libs/core/sacr.config": '[workspace]\nname = "core"\n[scripts]\nbuild = ["echo core >> ../../order"]\n',
+    "libs/util/sacr.config": (
+        '[workspace]\nname = "util"\ndepends = ["libs/core"]\n[scripts]\nbuild = ["echo util >> ../../order"]\n'
+    ),
+    "apps/web/package.json": json.dumps(
+        {
+            "name": "@acme/web",
+            "dependencies": {"util": "^1.0.0", "react": "^18.0.0"},
+            "scripts": {"build": "echo web >> ../../order"},
+        }
+    ),
+    "apps/docs/sacr.config": '[scripts]\nlint = ["true"]\n',
+    "node_modules/react/package.json": json.dumps({"name": "react", "scripts": {"build": "exit 1"}}),
+}
+
+
+class WorkspaceTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root: Path = Path(tempfile.mkdtemp())
+        (self.root / ".sacrrc").write_text("[command]\ntimeout = 60\n[config]\ntype = config\n")
+        for path, content in CONFIGS.items():
+            (self.root / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.root / path).write_text(content)
+        self.cwd: str = os.getcwd()
+        os.chdir(self.root)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.root)
+
+    def write(self, path: str, content: str) -> None:
+        (self.root / path).parent.mkdir(parents=True, exist_ok=True)
+        (self.root / path).write_text(content)
+
+
+class TestWorkspaceDiscovery(WorkspaceTestCase):
+    def test_packages(self):
+        packages: list[WorkspacePackage] = WorkspaceDiscovery(root=self.root).packages()
+
+        self.assertEqual(
+            [(package.path, package.name, package.depends) for package in packages],
+            [
+                ("apps/docs", "apps/docs", []),
+                ("apps/web", "@acme/web", ["util"]),
+                ("libs/core", "core", []),
+                ("libs/util", "util", ["core"]),
+            ],
+        )
+
+    def test_unchanged_tree_is_not_walked(self):
+        discovery: WorkspaceDiscovery = WorkspaceDiscovery(root=self.root)
+        with patch.object(WorkspaceDiscovery, "RACY_WINDOW_NS", 0):
+            located: list = discovery.locate()
+            with patch.object(WorkspaceDiscovery, "_walk") as walk:
+                self.assertEqual(discovery.locate(), located)
+            walk.assert_not_called()
+
+            self.write(path="libs/extra/sacr.config", content='[scripts]\nbuild = ["true"]\n')
+            self.assertIn("libs/extra", [path for path, _ in discovery.locate()])
+
+    def test_duplicate_names(self):
+        self.write(path="libs/other/sacr.config", content='[workspace]\nname = "core"\n[scripts]\nbuild = ["true"]\n')
+
+        with self.assertRaises(ParseError):
+            WorkspaceDiscovery(root=self.root).packages()
+
+
+class TestWorkspaceRunner(WorkspaceTestCase):
+    def select(self, *filters: str, alias: str = "build") -> list[str]:
+        runner: WorkspaceRunner = WorkspaceRunner(packages=WorkspaceDiscovery(root=self.root).packages())
+        return [package.name for package in runner.select(alias=alias, filters=list(filters))]
+
+    def test_filters(self):
+        for filters, expected in (
+            ((), ["core", "util", "@acme/web"]),
+            (("util",), ["util"]),
+            (("util...",), ["core", "util"]),
+            (("...util",), ["util", "@acme/web"]),
+            (("...core", "!util"), ["core", "@acme/web"]),
+            (("!libs/*",), ["@acme/web"]),
+            (("./apps/*/",), ["@acme/web"]),
+            (("missing",), []),
+        ):
+            with self.subTest(filters=filters):
+                self.assertEqual(self.select(*filters), expected)
+
+        self.assertEqual(self.select(alias="lint"), ["apps/docs"])
+
+    def test_cycle(self):
+        self.write(
+            path="libs/core/sacr.config",
+            content='[workspace]\nname = "core"\ndepends = ["@acme/web"]\n[scripts]\nbuild = ["true"]\n',
+        )
+
+        with self.assertRaises(DependencyCycleError):
+            self.select()
+
+
+class TestWorkspaceRun(WorkspaceTestCase):
+    def run_build(self, *arguments: str) -> tuple[int, str]:
+        stdout: io.TextIOWrapper = io.TextIOWrapper(io.BytesIO())
+        argv: list[str] = ["sacr", "run", "build", "-j", "4", *arguments]
+        code: int = 0
+        with patch("sys.argv", argv), patch("sys.stdout", stdout):
+            try:
+                Manager(base_path=self.root.as_posix()).main()
+            except SystemExit as error:
+                code = error.code
+            stdout.flush()
+        return code, stdout.buffer.getvalue().decode("utf-8")
+
+    def summary(self, output: str) -> list[list[str]]:
+        lines: list[str] = output.splitlines()
+        start: int = next(index for index, line in enumerate(lines) if line.startswith("Workspace summary"))
+        return [
+            line.split()[:3] for line in itertools.takewhile(lambda line: line.startswith("  "), lines[start + 1 :])
+        ]
+
+    def test_packages_run_after_their_dependencies(self):
+        code, output = self.run_build("--filter", "@acme/web...")
+
+        self.assertEqual(code, 0)
+        self.assertEqual((self.root / "order").read_text().splitlines(), ["core", "util", "web"])
+        self.assertEqual(
+            self.summary(output=output),
+            [["core", "passed", "0"], ["util", "passed", "0"], ["@acme/web", "passed", "0"]],
+        )
+
+    def test_dependents_of_a_failure_are_not_run(self):
+        self.write(
+            path="libs/core/sacr.config",
+            content='[workspace]\nname = "core"\n[scripts]\nbuild = ["exit 3"]\n',
+        )
+        self.write(path="libs/solo/sacr.config", content='[scripts]\nbuild = ["echo solo >> ../../order"]\n')
+
+        code, output = self.run_build("--workspace")
+
+        self.assertEqual(code, 3)
+        self.assertEqual((self.root / "order").read_text().splitlines(), ["solo"])
+        self.assertEqual(
+            self.summary(output=output),
+            [
+                ["core", "failed", "3"],
+                ["util", "not", "run"],
+                ["@acme/web", "not", "run"],
+                ["libs/solo", "passed", "0"],
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()